@@ -0,0 +1,358 @@
+# SPDX-FileCopyrightText: © Jens Bergmann and contributors
+# SPDX-License-Identifier: AGPL-3.0-or-later
+# SPDX-ArtifactOfProjectHomePage: https://github.com/Second-Hand-Friends/kleinanzeigen-bot/
+"""Micro-benchmarks for performance-sensitive code paths.
+
+Each benchmark builds its own synthetic input in a temporary directory and
+compares the current implementation against a baseline, printing the best
+wall-clock time of several rounds.
+
+Usage::
+
+    pdm run benchmark                 # run all benchmarks
+    pdm run benchmark discover -r 5   # run selected benchmarks with 5 rounds
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable, Mapping, Sequence
+from gettext import gettext as _
+from pathlib import Path
+from typing import Any, Final
+
+from wcmatch import glob
+
+from kleinanzeigen_bot.ad_loading import discover_ad_files, load_ad, resolve_ad_images, scan_ad_files
+from kleinanzeigen_bot.ad_record import AdRecord
+from kleinanzeigen_bot.model.ad_model import Ad, AdDefaultsMerger, AdPartial
+from kleinanzeigen_bot.model.config_model import AdDefaults
+from kleinanzeigen_bot.published_ads import PublishedAd, PublishedAdsIndex, ad_matches_id
+from kleinanzeigen_bot.utils import dicts
+from kleinanzeigen_bot.utils.files import abspath
+from kleinanzeigen_bot.utils.misc import ensure
+
+BenchmarkFn = Callable[[argparse.Namespace], None]
+BENCHMARKS:Final[dict[str, BenchmarkFn]] = {}
+
+
+def benchmark(name:str) -> Callable[[BenchmarkFn], BenchmarkFn]:
+    def register(fn:BenchmarkFn) -> BenchmarkFn:
+        BENCHMARKS[name] = fn
+        return fn
+    return register
+
+
+def best_of(rounds:int, fn:Callable[[], Any]) -> float:
+    """Return the fastest of *rounds* runs of *fn* in seconds."""
+    best = float("inf")
+    for _round in range(rounds):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def report(label:str, baseline:float, current:float) -> None:
+    print(f"  {label:<40} baseline {baseline * 1000:9.1f} ms   current {current * 1000:9.1f} ms   speed-up x{baseline / current:5.1f}")
+
+
+# --------------------------------------------------------------------------- #
+# discover: ad file discovery and image globbing
+# --------------------------------------------------------------------------- #
+
+
+def _build_ad_tree(root:Path, *, dirs:int, images_per_ad:int, noise_files:int) -> None:
+    """Create *dirs* ad directories, each with one ad file, images and unrelated files."""
+    for idx in range(dirs):
+        ad_dir = root / "ads" / f"category_{idx % 20:02d}" / f"ad_{idx:05d}"
+        ad_dir.mkdir(parents = True)
+        (ad_dir / f"ad_{idx:05d}.yaml").write_text("title: x\n", encoding = "utf-8")
+        for img in range(images_per_ad):
+            (ad_dir / f"ad_{idx:05d}__img{img}.jpg").touch()
+        for noise in range(noise_files):
+            (ad_dir / f"notes_{noise}.txt").touch()
+    (root / ".git" / "objects").mkdir(parents = True)
+    for idx in range(dirs):
+        (root / ".git" / "objects" / f"{idx:05d}").touch()
+
+
+def _legacy_discover(root_dir:str, patterns:list[str]) -> dict[str, str]:
+    ad_files:dict[str, str] = {}
+    for file_pattern in patterns:
+        for ad_file in glob.glob(file_pattern, root_dir = root_dir, flags = glob.GLOBSTAR | glob.BRACE | glob.EXTGLOB):
+            if not str(ad_file).endswith("ad_fields.yaml"):
+                ad_files[abspath(ad_file, relative_to = root_dir)] = ad_file
+    return ad_files
+
+
+def _legacy_resolve_images(ad_file:str, image_patterns:list[str]) -> list[str]:
+    images:list[str] = []
+    for image_pattern in image_patterns:
+        pattern_images = set()
+        for image_file in glob.glob(image_pattern, root_dir = os.path.dirname(ad_file), flags = glob.GLOBSTAR | glob.BRACE | glob.EXTGLOB):
+            ensure(
+                os.path.splitext(image_file)[1].lower() in {".gif", ".jpg", ".jpeg", ".png"},
+                _("Unsupported image file type [%s]") % image_file,
+            )
+            pattern_images.add(abspath(image_file, relative_to = ad_file))
+        images.extend(sorted(pattern_images))
+    return list(dict.fromkeys(images))
+
+
+@benchmark("discover")
+def bench_discover(args:argparse.Namespace) -> None:
+    patterns = ["./**/ad_*.{json,yml,yaml}", "./ads/**/*.yaml"]
+    image_patterns = ["./*__img*.{jpg,png}"]
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        _build_ad_tree(root, dirs = 1000, images_per_ad = 6, noise_files = 2)
+        config_file = str(root / "config.yaml")
+        file_count = sum(len(files) for _dir, _subdirs, files in os.walk(root))
+        print(f"discover: {file_count} files, ad_files = {patterns}")
+
+        legacy = _legacy_discover(tmp, patterns)
+        current = discover_ad_files(config_file, patterns)
+        if legacy != current:
+            raise RuntimeError("scanner result differs from glob.glob")
+
+        report("find ad files", best_of(args.rounds, lambda: _legacy_discover(tmp, patterns)),
+            best_of(args.rounds, lambda: discover_ad_files(config_file, patterns)))
+
+        scan = scan_ad_files(config_file, patterns)
+        if any(_legacy_resolve_images(ad_file, image_patterns) != resolve_ad_images(ad_file, image_patterns, scan) for ad_file in scan.files):
+            raise RuntimeError("image resolution from directory listings differs from glob.glob")
+
+        def legacy_with_images() -> None:
+            for ad_file in _legacy_discover(tmp, patterns):
+                _legacy_resolve_images(ad_file, image_patterns)
+
+        def current_with_images() -> None:
+            scan = scan_ad_files(config_file, patterns)
+            for ad_file in scan.files:
+                resolve_ad_images(ad_file, image_patterns, scan)
+
+        report("find ad files + resolve images", best_of(args.rounds, legacy_with_images), best_of(args.rounds, current_with_images))
+
+
+# --------------------------------------------------------------------------- #
+# content-hash: AdPartial.update_content_hash
+# --------------------------------------------------------------------------- #
+
+
+def _legacy_content_hash(ad:AdPartial) -> str:
+    raw = ad.model_dump(
+        exclude = {"id", "created_on", "updated_on", "content_hash", "repost_count", "price_reduction_count"},
+        exclude_none = True,
+        exclude_unset = True,
+    )
+
+    def prune(obj:Any) -> Any:
+        if isinstance(obj, Mapping):
+            return {
+                k: prune(v)
+                for k, v in obj.items()
+                if not (isinstance(v, (Mapping, Sequence, set)) and not isinstance(v, (str, bytes)) and len(v) == 0)
+            }
+        if isinstance(obj, Sequence) and not isinstance(obj, (str, bytes)):
+            return [prune(v) for v in obj if not (isinstance(v, (Mapping, Sequence, set)) and not isinstance(v, (str, bytes)) and len(v) == 0)]
+        return obj
+
+    return hashlib.sha256(json.dumps(prune(raw), sort_keys = True).encode()).hexdigest()
+
+
+def _peak_memory(fn:Callable[[], Any]) -> int:
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+@benchmark("content-hash")
+def bench_content_hash(args:argparse.Namespace) -> None:
+    ads = [
+        AdPartial.model_validate({
+            "title": f"Benchmark ad number {idx}",
+            "description": "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 20,
+            "category": "161/278",
+            "price": idx,
+            "price_type": "NEGOTIABLE",
+            "shipping_type": "SHIPPING",
+            "shipping_options": ["DHL_2", "Hermes_Päckchen"],
+            "special_attributes": {"condition_s": "like_new", "color_s": "black"},
+            "images": [f"ad_{idx}__img{img}.jpg" for img in range(8)],
+            "contact": {"name": "Max Mustermann", "zipcode": "12345", "location": "Musterstadt"},
+            "id": idx,
+            "content_hash": "0" * 64,
+        })
+        for idx in range(10_000)
+    ]
+    print(f"content-hash: {len(ads)} ads")
+    if any(_legacy_content_hash(ad) != ad.model_copy().update_content_hash().content_hash for ad in ads[:100]):
+        raise RuntimeError("streaming content hash differs from the previous algorithm")
+
+    def legacy() -> None:
+        for ad in ads:
+            _legacy_content_hash(ad)
+
+    def current() -> None:
+        for ad in ads:
+            ad.update_content_hash()
+
+    report("hash 10k ads", best_of(args.rounds, legacy), best_of(args.rounds, current))
+    legacy_peak, current_peak = _peak_memory(lambda: _legacy_content_hash(ads[0])), _peak_memory(ads[0].update_content_hash)
+    print(f"  {'peak memory per ad':<40} baseline {legacy_peak / 1024:9.1f} KB   current {current_peak / 1024:9.1f} KB")
+
+
+# --------------------------------------------------------------------------- #
+# to-ad: AdPartial.to_ad with a precompiled defaults merger
+# --------------------------------------------------------------------------- #
+
+
+def _legacy_to_ad(partial:AdPartial, ad_defaults:AdDefaults) -> Ad:
+    ad_cfg = partial.model_dump()
+    dicts.apply_defaults(
+        target = ad_cfg,
+        defaults = ad_defaults.model_dump(),
+        ignore = lambda k, _: k == "description",
+        override = lambda _, v: not isinstance(v, list) and (v is None or (isinstance(v, str) and v == "")),  # noqa: PLC1901
+    )
+    if not isinstance(ad_cfg.get("price_reduction_count"), int):
+        ad_cfg["price_reduction_count"] = 0
+    if not isinstance(ad_cfg.get("repost_count"), int):
+        ad_cfg["repost_count"] = 0
+    return Ad.model_validate(ad_cfg)
+
+
+@benchmark("to-ad")
+def bench_to_ad(args:argparse.Namespace) -> None:
+    ad_defaults = AdDefaults.model_validate({
+        "description_prefix": "Hello\n",
+        "images": ["*.jpg"],
+        "contact": {"name": "Max Mustermann", "zipcode": "12345", "location": "Musterstadt"},
+        "auto_price_reduction": {"enabled": True, "strategy": "PERCENTAGE", "amount": 10, "min_price": 1},
+    })
+    partials = [
+        AdPartial.model_validate({"title": f"Benchmark ad number {idx}", "description": "Lorem ipsum", "category": "161/278", "price": idx + 10})
+        for idx in range(10_000)
+    ]
+    print(f"to-ad: {len(partials)} ads")
+    merger = AdDefaultsMerger(ad_defaults)
+    if any(_legacy_to_ad(partial, ad_defaults) != partial.to_ad(merger) for partial in partials[:100]):
+        raise RuntimeError("defaults merger result differs from dicts.apply_defaults")
+
+    report("to_ad 10k ads", best_of(args.rounds, lambda: [_legacy_to_ad(partial, ad_defaults) for partial in partials]),
+        best_of(args.rounds, lambda: [partial.to_ad(merger) for partial in partials]))
+
+
+# --------------------------------------------------------------------------- #
+# ad-records: memory retained by the list of loaded ads
+# --------------------------------------------------------------------------- #
+
+
+def _retained_memory(fn:Callable[[], Any]) -> int:
+    tracemalloc.start()
+    try:
+        result = fn()
+        retained = tracemalloc.get_traced_memory()[0]
+        del result
+        return retained
+    finally:
+        tracemalloc.stop()
+
+
+@benchmark("ad-records")
+def bench_ad_records(_args:argparse.Namespace) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        ad_files = []
+        for idx in range(2000):
+            ad_file = Path(tmp) / f"ad_{idx:05d}.yaml"
+            ad_file.write_text(
+                f"# ad {idx}\n"
+                f"title: Benchmark ad number {idx}\n"
+                f"description: |\n  {'Lorem ipsum dolor sit amet, consectetur adipiscing elit. ' * 20}\n"
+                f"category: 161/278\n"
+                f"price: {idx}\n"
+                "shipping_options: [DHL_2, Hermes_Päckchen]\n"
+                "special_attributes: {condition_s: like_new, color_s: black}\n"
+                f"images: [{', '.join(f'ad_{idx}__img{img}.jpg' for img in range(8))}]\n"
+                "contact: {name: Max Mustermann, zipcode: '12345', location: Musterstadt}\n",
+                encoding = "utf-8")
+            ad_files.append(str(ad_file))
+        ad_defaults = AdDefaults()
+        loaded = [(ad_file, dicts.load_dict(ad_file, "ad")) for ad_file in ad_files]
+        ad_cfgs = [load_ad(raw, ad_defaults) for _ad_file, raw in loaded]
+        print(f"ad-records: {len(ad_files)} ads")
+
+        def legacy() -> list[tuple[str, Any, dict[str, Any]]]:
+            return [(ad_file, ad_cfg, dicts.load_dict(ad_file, "ad")) for ad_file, ad_cfg in zip(ad_files, ad_cfgs, strict = True)]
+
+        def current() -> list[AdRecord]:
+            return [AdRecord(ad_file, ad_cfg) for ad_file, ad_cfg in zip(ad_files, ad_cfgs, strict = True)]
+
+        legacy_mem, current_mem = _retained_memory(legacy), _retained_memory(current)
+        print(f"  {'retained by the loaded ads list':<40} baseline {legacy_mem / 1024:9.1f} KB   current {current_mem / 1024:9.1f} KB")
+
+
+# --------------------------------------------------------------------------- #
+# published-ads-index: matching local ads against the published ads
+# --------------------------------------------------------------------------- #
+
+
+def _legacy_match(local:list[tuple[int | None, str]], published:list[PublishedAd]) -> list[Any]:
+    """Linear scans as publish/update used for ids and delete_ad used for titles."""
+    matches:list[Any] = []
+    for ad_id, title in local:
+        if ad_id is not None:
+            matches.append(next((ad for ad in published if ad_matches_id(ad, ad_id)), None))
+            continue
+        ids:set[int] = set()
+        for ad in published:
+            try:
+                published_id = int(ad["id"])
+            except (KeyError, TypeError, ValueError):
+                continue
+            if title == ad.get("title", ""):
+                ids.add(published_id)
+        matches.append(ids)
+    return matches
+
+
+def _indexed_match(local:list[tuple[int | None, str]], published:list[PublishedAd]) -> list[Any]:
+    index = PublishedAdsIndex(published)
+    return [index.get(ad_id) if ad_id is not None else set(index.ids_by_title(title)) for ad_id, title in local]
+
+
+@benchmark("published-ads-index")
+def bench_published_ads_index(args:argparse.Namespace) -> None:
+    count = 5000
+    # the API returns ids as strings; every tenth local ad is not published yet and matched by title
+    published = [{"id": str(1_000_000 + idx), "state": "active", "title": f"Published ad {idx}"} for idx in range(count)]
+    local = [(None if idx % 10 == 0 else 1_000_000 + (idx * 7) % count, f"Published ad {idx}") for idx in range(count)]
+    print(f"published-ads-index: {count} local ads x {count} published ads")
+
+    ensure(_legacy_match(local, published) == _indexed_match(local, published), "indexed matching differs from the linear scans")
+    rounds = max(1, min(args.rounds, 2))  # the baseline takes seconds per round
+    report("match by id and title", best_of(rounds, lambda: _legacy_match(local, published)), best_of(args.rounds, lambda: _indexed_match(local, published)))
+
+
+def main(argv:list[str]) -> int:
+    parser = argparse.ArgumentParser(description = "Run kleinanzeigen-bot micro-benchmarks")
+    parser.add_argument("names", nargs = "*", choices = [[], *BENCHMARKS], help = "benchmarks to run (default: all)")
+    parser.add_argument("-r", "--rounds", type = int, default = 3, help = "rounds per measurement; the fastest one is reported")
+    args = parser.parse_args(argv)
+    for name in args.names or BENCHMARKS:
+        BENCHMARKS[name](args)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
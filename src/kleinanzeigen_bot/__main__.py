@@ -1,7 +1,7 @@
 # SPDX-FileCopyrightText: © Sebastian Thomschke and contributors
 # SPDX-License-Identifier: AGPL-3.0-or-later
 # SPDX-ArtifactOfProjectHomePage: https://github.com/Second-Hand-Friends/kleinanzeigen-bot/
-import sys, time  # isort: skip
+import multiprocessing, sys, time  # isort: skip
 from gettext import gettext as _
 
 from kleinanzeigen_bot.cli import main
@@ -9,20 +9,27 @@ from kleinanzeigen_bot.utils.exceptions import CaptchaEncountered
 from kleinanzeigen_bot.utils.launch_mode_guard import ensure_not_launched_from_windows_explorer
 from kleinanzeigen_bot.utils.misc import format_timedelta
 
-# --------------------------------------------------------------------------- #
-# Refuse GUI/double-click launch on Windows
-# --------------------------------------------------------------------------- #
-ensure_not_launched_from_windows_explorer()
+if __name__ == "__main__":
+    # ------------------------------------------------------------------------- #
+    # Ad loading may spawn worker processes; frozen builds must hand those
+    # over to multiprocessing and spawned children must not re-run the bot.
+    # ------------------------------------------------------------------------- #
+    multiprocessing.freeze_support()
 
-# --------------------------------------------------------------------------- #
-# Main loop: run bot → if captcha → sleep → restart
-# --------------------------------------------------------------------------- #
-while True:
-    try:
-        main(sys.argv)  # runs & returns when finished
-        sys.exit(0)  # not using `break` to prevent process closing issues
-    except CaptchaEncountered as ex:
-        delay = ex.restart_delay
-        print(_("[INFO] Captcha detected. Sleeping %s before restart...") % format_timedelta(delay))
-        time.sleep(delay.total_seconds())
-        # loop continues and starts a fresh run
+    # ------------------------------------------------------------------------- #
+    # Refuse GUI/double-click launch on Windows
+    # ------------------------------------------------------------------------- #
+    ensure_not_launched_from_windows_explorer()
+
+    # ------------------------------------------------------------------------- #
+    # Main loop: run bot → if captcha → sleep → restart
+    # ------------------------------------------------------------------------- #
+    while True:
+        try:
+            main(sys.argv)  # runs & returns when finished
+            sys.exit(0)  # not using `break` to prevent process closing issues
+        except CaptchaEncountered as ex:
+            delay = ex.restart_delay
+            print(_("[INFO] Captcha detected. Sleeping %s before restart...") % format_timedelta(delay))
+            time.sleep(delay.total_seconds())
+            # loop continues and starts a fresh run
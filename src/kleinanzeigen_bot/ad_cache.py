@@ -0,0 +1,522 @@
+# SPDX-FileCopyrightText: © Jens Bergmann and contributors
+# SPDX-License-Identifier: AGPL-3.0-or-later
+# SPDX-ArtifactOfProjectHomePage: https://github.com/Second-Hand-Friends/kleinanzeigen-bot/
+"""Persistent caches of parsed and validated ad config files.
+
+Parsing ad YAML files with ruamel (round-trip mode) and validating them into
+:class:`~kleinanzeigen_bot.model.ad_model.Ad` models dominates startup on large
+workspaces.  :class:`AdCache` stores the validated ad together with the raw
+round-trip document in the workspace state directory so unchanged files skip
+both steps on the next run.
+
+An entry is only reused when the file's :class:`FileFingerprint` (size,
+``mtime_ns``, inode) still matches, the digest of its raw document, the
+``ad_defaults`` fingerprint and the validated values still matches the one
+recorded with it, and the cache was written by the same app version with the
+same ``ad_defaults``; anything else is a miss.  Cached ads are trusted: they
+are built with ``model_construct`` without running the model validators again,
+unless the caller asks for full validation.  The cache is best-effort: unreadable or
+incompatible cache files are ignored and rebuilt.
+
+:class:`ContentHashManifest` is a much smaller sibling that only remembers the
+last computed content hash per fingerprint, so deciding whether an ad has
+``changed`` does not require validating and hashing it again.
+
+:class:`ImageDigests` extends ``changed`` detection to the image files
+themselves: it caches a SHA-256 digest per image file (re-read only when the
+fingerprint changes) and remembers the combined digest of the images each ad
+was last published with.
+
+:class:`DueIndex` keeps the next republication timestamp of every ad sorted,
+so the ``due`` selector only has to load the ads that are actually due.
+
+:class:`AdIdIndex` maps ad files to their ad ids, so numeric selectors such
+as ``--ads=123456`` only have to load the matching ad files.
+"""
+from __future__ import annotations
+
+import bisect, contextlib, hashlib, json, os, pickle  # isort: skip  # noqa: S403 — only reads back files written by the bot itself
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Final, NamedTuple
+
+from ._version import __version__
+from .utils import loggers as _loggers
+from .utils import pydantics as _pydantics
+from .utils.state_files import load_state, save_state
+
+if TYPE_CHECKING:
+    from collections.abc import Collection, Iterable, Sequence
+    from pathlib import Path
+
+    from .model.ad_model import Ad
+    from .model.config_model import AdDefaults
+
+__all__ = [
+    "CACHE_FILE",
+    "DUE_INDEX_FILE",
+    "ID_INDEX_FILE",
+    "IMAGE_DIGESTS_FILE",
+    "MANIFEST_FILE",
+    "AdCache",
+    "AdIdIndex",
+    "ContentHashManifest",
+    "DueIndex",
+    "FileFingerprint",
+    "ImageDigests",
+    "defaults_fingerprint",
+]
+
+LOG:Final[_loggers.Logger] = _loggers.get_logger(__name__)
+
+CACHE_FILE:Final[str] = "ad_cache.pickle"
+# Bump when the on-disk layout of the cache file changes.
+CACHE_FORMAT_VERSION:Final[int] = 3
+
+MANIFEST_FILE:Final[str] = "content_hashes.json"
+MANIFEST_FORMAT_VERSION:Final[int] = 1
+
+IMAGE_DIGESTS_FILE:Final[str] = "image_digests.json"
+IMAGE_DIGESTS_FORMAT_VERSION:Final[int] = 1
+_READ_CHUNK_SIZE:Final[int] = 1024 * 1024
+
+DUE_INDEX_FILE:Final[str] = "due_index.json"
+DUE_INDEX_FORMAT_VERSION:Final[int] = 1
+_SECONDS_PER_DAY:Final[int] = 24 * 60 * 60
+
+ID_INDEX_FILE:Final[str] = "ad_ids.json"
+ID_INDEX_FORMAT_VERSION:Final[int] = 1
+
+
+class FileFingerprint(NamedTuple):
+    """Cheap identity of a file's current content, taken from ``os.stat``."""
+
+    size:int
+    mtime_ns:int
+    inode:int
+
+    @classmethod
+    def of(cls, path:str) -> FileFingerprint:
+        stat = os.stat(path)
+        return cls(size = stat.st_size, mtime_ns = stat.st_mtime_ns, inode = stat.st_ino)
+
+
+def _fingerprint_files(paths:Iterable[str]) -> dict[str, FileFingerprint]:
+    """Fingerprint the existing *paths* before they are read, so a file modified while the bot runs is a miss on the next run."""
+    fingerprints:dict[str, FileFingerprint] = {}
+    for path in paths:
+        with contextlib.suppress(OSError):
+            fingerprints[path] = FileFingerprint.of(path)
+    return fingerprints
+
+
+def _prune_removed(entries:dict[str, Any], seen:set[str]) -> bool:
+    """Drop entries of files that were not looked up during the run and no longer exist; return whether any were dropped.
+
+    Entries that were merely not looked up are kept, so runs that only load
+    some of the ad files do not throw away the rest of the cache.
+    """
+    removed = [path for path in entries.keys() - seen if not os.path.exists(path)]
+    for path in removed:
+        del entries[path]
+    return bool(removed)
+
+
+def defaults_fingerprint(ad_defaults:AdDefaults) -> str:
+    """Return a stable digest of *ad_defaults*; cached ads are only valid for the defaults they were merged with."""
+    payload = json.dumps(ad_defaults.model_dump(mode = "json"), sort_keys = True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class _Entry(NamedTuple):
+    fingerprint:FileFingerprint
+    # pickled ``(ad_state, raw_dict)``, see :func:`.pydantics.model_state` — serialized
+    # on insert so later in-memory mutations by the caller never leak into the persisted cache
+    payload:bytes
+    # see _entry_digest()
+    digest:bytes
+
+
+def _entry_digest(ad_state:dict[str, Any], raw:dict[str, Any], defaults:str) -> bytes:
+    """Digest of the normalized raw document, the fingerprint of the ``ad_defaults`` it was validated with and the validated values.
+
+    The cached ad is only constructed without validation when the digest still matches.
+    """
+    normalized = json.dumps([raw, defaults, ad_state], sort_keys = True, default = str, separators = (",", ":"))
+    return hashlib.blake2b(normalized.encode(), digest_size = 16).digest()
+
+
+@dataclass(slots = True)
+class AdCache:
+    """On-disk cache of ``(Ad, raw_dict)`` pairs keyed by absolute ad file path.
+
+    Usage: :meth:`load` once per run, :meth:`get`/:meth:`put` per ad file,
+    then :meth:`save`.  Entries of deleted ad files drop out automatically.
+    """
+
+    cache_file:Path
+    defaults_fingerprint:str
+    hits:int = 0
+    misses:int = 0
+    _entries:dict[str, _Entry] = field(default_factory = dict)
+    _seen:set[str] = field(default_factory = set)
+    _dirty:bool = False
+
+    @staticmethod
+    def _header(defaults:str) -> dict[str, Any]:
+        return {"format": CACHE_FORMAT_VERSION, "app_version": __version__, "defaults": defaults}
+
+    @classmethod
+    def load(cls, cache_file:Path, ad_defaults:AdDefaults) -> AdCache:
+        defaults = defaults_fingerprint(ad_defaults)
+        entries = load_state(cache_file, cls._header(defaults), lambda data: dict(data["entries"]), binary = True)
+        return cls(cache_file = cache_file, defaults_fingerprint = defaults, _entries = entries or {})
+
+    def get(self, ad_file:str, fingerprint:FileFingerprint) -> tuple[Ad, dict[str, Any]] | None:
+        """Return a fresh ``(Ad, raw_dict)`` copy for *ad_file*, or ``None`` on a miss.
+
+        The ``Ad`` was validated when it was stored; once the entry digest is verified,
+        it is built with ``model_construct`` without running its validators again.
+        """
+        self._seen.add(ad_file)
+        entry = self._entries.get(ad_file)
+        if entry is not None and entry.fingerprint == fingerprint:
+            try:
+                ad_state, ad_cfg_orig = pickle.loads(entry.payload)  # noqa: S301 — see state_files.load_state()
+                if _entry_digest(ad_state, ad_cfg_orig, self.defaults_fingerprint) != entry.digest:
+                    raise ValueError("digest mismatch")
+                ad_cfg:Ad = _pydantics.construct_model(ad_state)
+            except Exception as ex:  # noqa: BLE001
+                LOG.debug("Ignoring corrupted ad cache entry for [%s]: %s", ad_file, ex)
+            else:
+                self.hits += 1
+                return ad_cfg, ad_cfg_orig
+        self.misses += 1
+        return None
+
+    def put(self, ad_file:str, fingerprint:FileFingerprint, ad_cfg:Ad, ad_cfg_orig:dict[str, Any]) -> None:
+        self._seen.add(ad_file)
+        ad_state = _pydantics.model_state(ad_cfg)
+        payload = pickle.dumps((ad_state, ad_cfg_orig), pickle.HIGHEST_PROTOCOL)
+        self._entries[ad_file] = _Entry(fingerprint = fingerprint, payload = payload, digest = _entry_digest(ad_state, ad_cfg_orig, self.defaults_fingerprint))
+        self._dirty = True
+
+    def save(self) -> None:
+        """Persist the entries of all existing ad files (atomic replace, best-effort)."""
+        if not _prune_removed(self._entries, self._seen) and not self._dirty:
+            return
+
+        if save_state(self.cache_file, self._header(self.defaults_fingerprint), {"entries": self._entries}, binary = True):
+            self._dirty = False
+
+
+@dataclass(slots = True)
+class ContentHashManifest:
+    """On-disk mapping of ad file → (fingerprint, last computed content hash).
+
+    :meth:`load` fingerprints the given ad files *before* they are read, so a
+    file modified while the bot runs is recorded with its old fingerprint and
+    simply becomes a miss on the next run.  Hashes only depend on the raw ad
+    file content, hence entries are independent of ``ad_defaults``.
+    """
+
+    manifest_file:Path
+    fingerprints:dict[str, FileFingerprint]
+    hits:int = 0
+    misses:int = 0
+    _entries:dict[str, tuple[FileFingerprint, str | None]] = field(default_factory = dict)
+    _seen:set[str] = field(default_factory = set)
+    _dirty:bool = False
+
+    @classmethod
+    def load(cls, manifest_file:Path, ad_files:Iterable[str]) -> ContentHashManifest:
+        fingerprints = _fingerprint_files(ad_files)
+        entries = load_state(manifest_file, {"format": MANIFEST_FORMAT_VERSION, "app_version": __version__}, lambda data: {
+            ad_file: (FileFingerprint(*fingerprint), content_hash) for ad_file, (fingerprint, content_hash) in data["entries"].items()
+        })
+        return cls(manifest_file = manifest_file, fingerprints = fingerprints, _entries = entries or {})
+
+    def get(self, ad_file:str) -> tuple[bool, str | None]:
+        """Return ``(True, content_hash)`` when the hash recorded for *ad_file* is still valid, else ``(False, None)``."""
+        self._seen.add(ad_file)
+        entry = self._entries.get(ad_file)
+        if entry is not None and entry[0] == self.fingerprints.get(ad_file):
+            self.hits += 1
+            return True, entry[1]
+        self.misses += 1
+        return False, None
+
+    def put(self, ad_file:str, content_hash:str | None) -> None:
+        if (fingerprint := self.fingerprints.get(ad_file)) is None:
+            return
+        self._seen.add(ad_file)
+        self._entries[ad_file] = (fingerprint, content_hash)
+        self._dirty = True
+
+    def save(self) -> None:
+        """Persist the entries of all existing ad files (atomic replace, best-effort)."""
+        if not _prune_removed(self._entries, self._seen) and not self._dirty:
+            return
+
+        entries = {ad_file: (list(fingerprint), content_hash) for ad_file, (fingerprint, content_hash) in self._entries.items()}
+        if save_state(self.manifest_file, {"format": MANIFEST_FORMAT_VERSION, "app_version": __version__}, {"entries": entries}):
+            self._dirty = False
+
+
+def _sha256_file(path:str) -> str | None:
+    """Return the hex SHA-256 digest of *path*, or ``None`` when it cannot be read."""
+    hasher = hashlib.sha256()
+    try:
+        with open(path, "rb") as fd:
+            while chunk := fd.read(_READ_CHUNK_SIZE):
+                hasher.update(chunk)
+    except OSError:
+        return None
+    return hasher.hexdigest()
+
+
+@dataclass(slots = True)
+class ImageDigests:
+    """On-disk SHA-256 digests of image files plus the image digest each ad was published with.
+
+    Image bytes are only read when a file's :class:`FileFingerprint` differs
+    from the recorded one; :meth:`prefetch` hashes all such files of a run in a
+    thread pool (file reads and ``hashlib`` release the GIL).  Published image
+    sets are keyed by ad ID and combine the per-file digests in image order, so
+    renaming an image file without changing its bytes is not a change.
+    """
+
+    digests_file:Path
+    hashed:int = 0
+    reused:int = 0
+    _files:dict[str, tuple[FileFingerprint, str]] = field(default_factory = dict)
+    _published:dict[str, str] = field(default_factory = dict)
+    _checked:set[str] = field(default_factory = set)
+    _dirty:bool = False
+
+    @classmethod
+    def load(cls, digests_file:Path) -> ImageDigests:
+        state = load_state(digests_file, {"format": IMAGE_DIGESTS_FORMAT_VERSION}, lambda data: (
+            {image_file: (FileFingerprint(*fingerprint), digest) for image_file, (fingerprint, digest) in data["files"].items()},
+            dict(data["published"]),
+        ))
+        files, published = state or ({}, {})
+        return cls(digests_file = digests_file, _files = files, _published = published)
+
+    def prefetch(self, image_files:Iterable[str], *, max_workers:int | None = None) -> None:
+        """Make sure digests of all *image_files* are current, hashing modified files concurrently."""
+        pending:dict[str, FileFingerprint] = {}
+        for image_file in image_files:
+            if image_file in self._checked:
+                continue
+            self._checked.add(image_file)
+            try:
+                # fingerprint before reading so a concurrent edit shows up as a miss next run
+                fingerprint = FileFingerprint.of(image_file)
+            except OSError:
+                continue
+            entry = self._files.get(image_file)
+            if entry is not None and entry[0] == fingerprint:
+                self.reused += 1
+            else:
+                pending[image_file] = fingerprint
+        if not pending:
+            return
+
+        if len(pending) == 1:
+            results:Iterable[str | None] = map(_sha256_file, pending)
+        else:
+            with ThreadPoolExecutor(max_workers = max_workers, thread_name_prefix = "image-digest") as executor:
+                results = list(executor.map(_sha256_file, pending))
+        for (image_file, fingerprint), digest in zip(pending.items(), results, strict = True):
+            if digest is not None:
+                self._files[image_file] = (fingerprint, digest)
+                self.hashed += 1
+                self._dirty = True
+
+    def digest(self, image_files:Sequence[str]) -> str | None:
+        """Return the combined digest of *image_files* in order, or ``None`` if any of them cannot be read."""
+        self.prefetch(image_files)
+        hasher = hashlib.sha256()
+        for image_file in image_files:
+            if (entry := self._files.get(image_file)) is None:
+                return None
+            hasher.update(entry[1].encode())
+        return hasher.hexdigest()
+
+    def has_changed(self, ad_id:int, image_files:Sequence[str], *, record:bool = True) -> bool:
+        """Return ``True`` when the images of *ad_id* differ from the ones it was published with.
+
+        Without a record for *ad_id* (e.g. ads published before image digests
+        existed) the images are reported as unchanged and, unless *record* is
+        ``False`` (read-only callers such as the ``status`` command), the
+        current images are recorded as baseline.
+        """
+        if (current := self.digest(image_files)) is None:
+            return False
+        if (published := self._published.get(str(ad_id))) is None:
+            if record:
+                self._published[str(ad_id)] = current
+                self._dirty = True
+            return False
+        return published != current
+
+    def record_published(self, ad_id:int, image_files:Sequence[str], *, replaces:int | None = None) -> None:
+        """Remember the images *ad_id* has just been published with, dropping the record of the *replaces* ad ID."""
+        if replaces is not None:
+            self._published.pop(str(replaces), None)
+        if (current := self.digest(image_files)) is None:
+            self._published.pop(str(ad_id), None)
+        else:
+            self._published[str(ad_id)] = current
+        self._dirty = True
+
+    def save(self) -> None:
+        """Persist digests of still existing image files (atomic replace, best-effort)."""
+        if not self._dirty:
+            return
+        files = {image_file: (list(fingerprint), digest) for image_file, (fingerprint, digest) in self._files.items() if os.path.exists(image_file)}
+        if save_state(self.digests_file, {"format": IMAGE_DIGESTS_FORMAT_VERSION}, {"files": files, "published": self._published}):
+            self._dirty = False
+
+
+class _DueEntry(NamedTuple):
+    fingerprint:FileFingerprint
+    due_at:float | None  # POSIX timestamp, ``None`` for ads that were never published
+    active:bool
+
+
+@dataclass(slots = True)
+class DueIndex:
+    """On-disk index of ad file → (fingerprint, next republication timestamp, active).
+
+    Entries are kept sorted by due timestamp, so :meth:`candidates` finds the
+    due ads with a binary search instead of validating every ad file.  Ad
+    files without a current entry (new, modified or written with other
+    ``ad_defaults``) are always candidates; :meth:`put` records them once
+    they are loaded.  Like :class:`ContentHashManifest`, :meth:`load`
+    fingerprints the ad files before they are read.
+    """
+
+    index_file:Path
+    defaults_fingerprint:str
+    fingerprints:dict[str, FileFingerprint]
+    _entries:dict[str, _DueEntry] = field(default_factory = dict)
+    _order:list[tuple[float, str]] | None = None
+    _dirty:bool = False
+
+    @staticmethod
+    def _header(defaults:str) -> dict[str, Any]:
+        return {"format": DUE_INDEX_FORMAT_VERSION, "app_version": __version__, "defaults": defaults}
+
+    @classmethod
+    def load(cls, index_file:Path, ad_defaults:AdDefaults, ad_files:Iterable[str]) -> DueIndex:
+        fingerprints = _fingerprint_files(ad_files)
+        defaults = defaults_fingerprint(ad_defaults)
+        entries = load_state(index_file, cls._header(defaults), lambda data: {
+            ad_file: _DueEntry(FileFingerprint(*fingerprint), due_at, active) for ad_file, (fingerprint, due_at, active) in data["entries"].items()
+        })
+        return cls(index_file = index_file, defaults_fingerprint = defaults, fingerprints = fingerprints, _entries = entries or {})
+
+    def _current(self, ad_file:str) -> _DueEntry | None:
+        entry = self._entries.get(ad_file)
+        return entry if entry is not None and entry.fingerprint == self.fingerprints.get(ad_file) else None
+
+    def _sorted(self) -> list[tuple[float, str]]:
+        if self._order is None:
+            self._order = sorted((entry.due_at, ad_file) for ad_file, entry in self._entries.items() if entry.due_at is not None)
+        return self._order
+
+    def _bisect(self, now:float) -> int:
+        """Return the number of entries due at *now*."""
+        return bisect.bisect_right(self._sorted(), now, key = lambda item: item[0])
+
+    def candidates(self, now:float, *, ignore_inactive:bool = True) -> set[str]:
+        """Return the fingerprinted ad files that are due at POSIX timestamp *now* or have no current entry."""
+        order = self._sorted()
+        due = {ad_file for _due_at, ad_file in order[:self._bisect(now)]}
+        candidates:set[str] = set()
+        for ad_file in self.fingerprints:
+            entry = self._current(ad_file)
+            if entry is None or ((entry.due_at is None or ad_file in due) and (entry.active or not ignore_inactive)):
+                candidates.add(ad_file)
+        return candidates
+
+    def put(self, ad_file:str, ad_cfg:Ad) -> None:
+        if (fingerprint := self.fingerprints.get(ad_file)) is None:
+            return
+        latest = ad_cfg.updated_on or ad_cfg.created_on
+        due_at = latest.timestamp() + ad_cfg.republication_interval * _SECONDS_PER_DAY if latest is not None else None
+        entry = _DueEntry(fingerprint = fingerprint, due_at = due_at, active = ad_cfg.active)
+        if self._entries.get(ad_file) != entry:
+            self._entries[ad_file] = entry
+            self._order = None
+            self._dirty = True
+
+    def next_due_at(self, now:float) -> float | None:
+        """Return the earliest due timestamp after *now* of an active ad with a current entry."""
+        order = self._sorted()
+        for due_at, ad_file in order[self._bisect(now):]:
+            entry = self._current(ad_file)
+            if entry is not None and entry.active:
+                return due_at
+        return None
+
+    def save(self) -> None:
+        """Persist the entries of all existing ad files (atomic replace, best-effort)."""
+        if not _prune_removed(self._entries, set(self.fingerprints)) and not self._dirty:
+            return
+
+        entries = {ad_file: (list(entry.fingerprint), entry.due_at, entry.active) for ad_file, entry in self._entries.items()}
+        if save_state(self.index_file, self._header(self.defaults_fingerprint), {"entries": entries}):
+            self._dirty = False
+
+
+@dataclass(slots = True)
+class AdIdIndex:
+    """On-disk mapping of ad file → (fingerprint, ad id).
+
+    :meth:`candidates` narrows a numeric selector down to the ad files whose
+    recorded id matches, plus all files without a current entry (new or
+    modified since they were last loaded), so the result is never missing an
+    ad.  Ids do not depend on ``ad_defaults``; like :class:`DueIndex`,
+    :meth:`load` fingerprints the ad files before they are read.
+    """
+
+    index_file:Path
+    fingerprints:dict[str, FileFingerprint]
+    _entries:dict[str, tuple[FileFingerprint, int | None]] = field(default_factory = dict)
+    _dirty:bool = False
+
+    @classmethod
+    def load(cls, index_file:Path, ad_files:Iterable[str]) -> AdIdIndex:
+        fingerprints = _fingerprint_files(ad_files)
+        entries = load_state(index_file, {"format": ID_INDEX_FORMAT_VERSION, "app_version": __version__}, lambda data: {
+            ad_file: (FileFingerprint(*fingerprint), ad_id) for ad_file, (fingerprint, ad_id) in data["entries"].items()
+        })
+        return cls(index_file = index_file, fingerprints = fingerprints, _entries = entries or {})
+
+    def candidates(self, ids:Collection[int]) -> set[str]:
+        """Return the fingerprinted ad files that have one of the *ids* or no current entry."""
+        candidates:set[str] = set()
+        for ad_file, fingerprint in self.fingerprints.items():
+            entry = self._entries.get(ad_file)
+            if entry is None or entry[0] != fingerprint or entry[1] in ids:
+                candidates.add(ad_file)
+        return candidates
+
+    def put(self, ad_file:str, ad_id:int | None) -> None:
+        if (fingerprint := self.fingerprints.get(ad_file)) is None:
+            return
+        if self._entries.get(ad_file) != (fingerprint, ad_id):
+            self._entries[ad_file] = (fingerprint, ad_id)
+            self._dirty = True
+
+    def save(self) -> None:
+        """Persist the entries of all existing ad files (atomic replace, best-effort)."""
+        if not _prune_removed(self._entries, set(self.fingerprints)) and not self._dirty:
+            return
+
+        entries = {ad_file: (list(fingerprint), ad_id) for ad_file, (fingerprint, ad_id) in self._entries.items()}
+        if save_state(self.index_file, {"format": ID_INDEX_FORMAT_VERSION, "app_version": __version__}, {"entries": entries}):
+            self._dirty = False
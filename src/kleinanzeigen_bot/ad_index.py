@@ -0,0 +1,209 @@
+# SPDX-FileCopyrightText: © Jens Bergmann and contributors
+# SPDX-License-Identifier: AGPL-3.0-or-later
+# SPDX-ArtifactOfProjectHomePage: https://github.com/Second-Hand-Friends/kleinanzeigen-bot/
+"""In-memory index of all ad files for long-running commands (``watch``).
+
+:class:`AdIndex` is built with :func:`~kleinanzeigen_bot.ad_loading.load_ad_configs`
+and kept current by :meth:`AdIndex.refresh`, which rescans the ad file
+patterns and only loads files that are new or whose
+:class:`~kleinanzeigen_bot.ad_cache.FileFingerprint` changed.  Selector
+queries (:meth:`AdIndex.select`) and due dates are then answered from memory.
+"""
+from __future__ import annotations
+
+import contextlib, dataclasses  # isort: skip
+from datetime import datetime, timedelta
+from gettext import gettext as _
+from typing import TYPE_CHECKING, Any, Final, NamedTuple
+
+from . import ad_cache as _ad_cache
+from . import ad_loading
+from .utils import loggers as _loggers
+from .utils import misc as _misc
+
+if TYPE_CHECKING:
+    from collections.abc import Collection, Iterable
+    from pathlib import Path
+
+    from .model.ad_model import Ad
+    from .model.config_model import AdDefaults
+    from .utils.glob_scanner import GlobScan
+
+__all__ = [
+    "AdIndex",
+    "IndexChanges",
+    "IndexedAd",
+]
+
+LOG:Final[_loggers.Logger] = _loggers.get_logger(__name__)
+
+
+class IndexedAd(NamedTuple):
+    ad_file_relative:str
+    fingerprint:_ad_cache.FileFingerprint
+    ad_cfg:Ad
+    ad_cfg_orig:dict[str, Any]
+    changed:bool
+    """the stored content hash differs from the current content (see :func:`~kleinanzeigen_bot.ad_loading.has_ad_content_changed`)"""
+
+
+class IndexChanges(NamedTuple):
+    added:list[str]
+    modified:list[str]
+    removed:list[str]
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.modified or self.removed)
+
+
+@dataclasses.dataclass(slots = True)
+class AdIndex:
+    """All ad files matching *ad_file_patterns*, keyed by absolute path.
+
+    Files that fail to load are logged and skipped until they change again.
+    """
+
+    config_file_path:str
+    ad_file_patterns:list[str]
+    ad_defaults:AdDefaults
+    cache_file:Path | None = None
+    image_digests_file:Path | None = None
+    validate_cached:bool = False
+    workers:int = 1
+    entries:dict[str, IndexedAd] = dataclasses.field(default_factory = dict)
+    scan:GlobScan | None = None
+    _invalid:dict[str, _ad_cache.FileFingerprint] = dataclasses.field(default_factory = dict)
+    _images_changed:set[str] = dataclasses.field(default_factory = set)
+
+    def refresh(self) -> IndexChanges:
+        """Rescan the ad files and (re)load the ones that were added or modified since the last call."""
+        self.scan = scan = ad_loading.scan_ad_files(self.config_file_path, self.ad_file_patterns)
+        fingerprints:dict[str, _ad_cache.FileFingerprint] = {}
+        for ad_file in scan.files:
+            # fingerprint before reading so a concurrent edit shows up on the next refresh
+            with contextlib.suppress(OSError):
+                fingerprints[ad_file] = _ad_cache.FileFingerprint.of(ad_file)
+
+        removed = [ad_file for ad_file in self.entries if ad_file not in fingerprints]
+        for ad_file in removed:
+            del self.entries[ad_file]
+        self._invalid = {ad_file: fingerprint for ad_file, fingerprint in self._invalid.items() if fingerprints.get(ad_file) == fingerprint}
+
+        added:list[str] = []
+        modified:list[str] = []
+        pending:list[str] = []
+        for ad_file, fingerprint in fingerprints.items():
+            entry = self.entries.get(ad_file)
+            if entry is None and ad_file not in self._invalid:
+                added.append(ad_file)
+                pending.append(ad_file)
+            elif entry is not None and entry.fingerprint != fingerprint:
+                modified.append(ad_file)
+                pending.append(ad_file)
+
+        for ad_file, ad_file_relative, ad_cfg, ad_cfg_orig in self._load(pending, scan, fingerprints):
+            self.entries[ad_file] = IndexedAd(
+                ad_file_relative = ad_file_relative,
+                fingerprint = fingerprints[ad_file],
+                ad_cfg = ad_cfg,
+                ad_cfg_orig = ad_cfg_orig,
+                changed = ad_loading.has_ad_content_changed(ad_cfg, ad_cfg_orig),
+            )
+        self._refresh_image_changes()
+        return IndexChanges(added = added, modified = modified, removed = removed)
+
+    def _load(
+        self,
+        ad_files:list[str],
+        scan:GlobScan,
+        fingerprints:dict[str, _ad_cache.FileFingerprint],
+    ) -> list[tuple[str, str, Ad, dict[str, Any]]]:
+        if not ad_files:
+            return []
+        try:
+            return self._load_subset(ad_files, scan)
+        except Exception as ex:  # noqa: BLE001 — retried per file below to find the broken ones
+            LOG.debug("Loading %d ad files failed, retrying them one by one: %s", len(ad_files), ex)
+
+        loaded:list[tuple[str, str, Ad, dict[str, Any]]] = []
+        for ad_file in ad_files:
+            try:
+                loaded.extend(self._load_subset([ad_file], scan))
+            except Exception as ex:  # noqa: BLE001 — a broken ad file must not end a long-running command
+                LOG.warning("Skipping ad file [%s] until it changes: %s", scan.files[ad_file], ex)
+                self._invalid[ad_file] = fingerprints[ad_file]
+        return loaded
+
+    def _load_subset(self, ad_files:Iterable[str], scan:GlobScan) -> list[tuple[str, str, Ad, dict[str, Any]]]:
+        return ad_loading.load_ad_configs(
+            config_file_path = self.config_file_path,
+            ad_file_patterns = self.ad_file_patterns,
+            ad_defaults = self.ad_defaults,
+            cache_file = self.cache_file,
+            validate_cached = self.validate_cached,
+            workers = self.workers,
+            scan = self.subset_scan(ad_files, scan),
+        )
+
+    def _refresh_image_changes(self) -> None:
+        self._images_changed.clear()
+        if self.image_digests_file is None:
+            return
+        image_digests = _ad_cache.ImageDigests.load(self.image_digests_file)
+        ad_images = ad_loading.published_ad_images(
+            [(ad_file, entry.ad_file_relative, entry.ad_cfg, entry.ad_cfg_orig) for ad_file, entry in self.entries.items()],
+            self.scan,
+        )
+        for ad_file, image_files in ad_images.items():
+            ad_id = self.entries[ad_file].ad_cfg.id
+            if ad_id is not None and image_digests.has_changed(ad_id, image_files):
+                self._images_changed.add(ad_file)
+        image_digests.save()
+
+    def subset_scan(self, ad_files:Iterable[str], scan:GlobScan | None = None) -> GlobScan:
+        """Return the current scan restricted to *ad_files*, e.g. to pass it to :func:`~kleinanzeigen_bot.ad_loading.load_ads`."""
+        scan = scan or self.scan
+        if scan is None:
+            raise AssertionError(_("The ad index must be refreshed before it can be queried"))
+        return dataclasses.replace(scan, files = {ad_file: scan.files[ad_file] for ad_file in ad_files})
+
+    def directories(self) -> Collection[str]:
+        """Directories visited by the last scan, i.e. the ones that can contain ad files and their images."""
+        return self.scan.listings.keys() if self.scan is not None else ()
+
+    def is_changed(self, ad_file:str) -> bool:
+        entry = self.entries[ad_file]
+        return entry.ad_cfg.id is not None and (entry.changed or ad_file in self._images_changed)
+
+    def select(self, tokens:Collection[str], *, now:datetime | None = None) -> list[str]:
+        """Return the active ad files matched by the selector *tokens* (``new``, ``due``, ``changed``, ``all``).
+
+        Mirrors the filtering of :func:`~kleinanzeigen_bot.ad_loading.load_ads`
+        without its logging and without modifying any ad.
+        """
+        if now is None:
+            now = _misc.now()
+        selected:list[str] = []
+        for ad_file, entry in sorted(self.entries.items()):
+            if entry.ad_cfg.active and self._matches(ad_file, entry.ad_cfg, tokens, now):
+                selected.append(ad_file)
+        return selected
+
+    def _matches(self, ad_file:str, ad_cfg:Ad, tokens:Collection[str], now:datetime) -> bool:
+        if "all" in tokens:
+            return True
+        if "new" in tokens and ad_cfg.id is None:
+            return True
+        if "due" in tokens and ad_loading.is_ad_due_for_republication(ad_cfg, now = now):
+            return True
+        return "changed" in tokens and self.is_changed(ad_file)
+
+    def next_due_at(self) -> datetime | None:
+        """Return when the next active ad that is not yet due becomes due, if any."""
+        due_dates = [
+            latest + timedelta(days = entry.ad_cfg.republication_interval)
+            for entry in self.entries.values()
+            if entry.ad_cfg.active and (latest := entry.ad_cfg.updated_on or entry.ad_cfg.created_on) is not None
+        ]
+        now = _misc.now()
+        return min((due for due in due_dates if due > now), default = None)
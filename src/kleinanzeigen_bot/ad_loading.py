@@ -6,44 +6,80 @@
 All functions take explicit dependencies — no implicit ``self`` plumbing, no
 browser imports.  The module owns:
 
-- file discovery from glob patterns
+- file discovery from glob patterns (single directory walk, see
+  :mod:`.utils.glob_scanner`)
 - selector validation and filtering (``new``, ``changed``, ``due``, ``all``,
   numeric IDs)
 - ad model validation and default application
 - category alias resolution
 - image globbing and validation
 - content-hash comparison and persistence
+- image file change detection (see :class:`.ad_cache.ImageDigests`)
+- skipping ads that are not due without loading them (see :class:`.ad_cache.DueIndex`)
+- loading only the ad files matching numeric selectors (see :class:`.ad_cache.AdIdIndex`)
+- optional persistent caching of parsed ads (see :mod:`.ad_cache`)
+- optional multi-process parsing of large ad collections
 
 Orchestration entry point: :func:`load_ads`.
 """
 from __future__ import annotations
 
-import os
-from datetime import datetime  # noqa: TC003 — used in runtime type narrowing via _misc.now()
+import contextlib, dataclasses, itertools, multiprocessing, os  # isort: skip
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
 from gettext import gettext as _
-from typing import Any, Final
+from typing import TYPE_CHECKING, Any, Final
 
 from wcmatch import glob
 
+from . import ad_cache as _ad_cache
 from . import download_selection as _download_selection
 from . import price_reduction as _price_reduction
 from .ad_description import get_ad_description
-from .model.ad_model import Ad, AdPartial
+from .ad_record import AdRecord
+from .model.ad_model import Ad, AdDefaultsMerger, AdPartial
 from .utils import dicts as _dicts
+from .utils import glob_scanner as _glob_scanner
 from .utils import loggers as _loggers
 from .utils import misc as _misc
 from .utils.files import abspath
 from .utils.i18n import pluralize
 from .utils.misc import ensure
+from .utils.pydantics import ContextualValidationError
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
 
 LOG:Final[_loggers.Logger] = _loggers.get_logger(__name__)
 
+# below this number of ad files to parse, worker start-up costs more than it saves
+PARALLEL_LOAD_THRESHOLD:Final[int] = 100
+
 
 # --------------------------------------------------------------------------- #
 # File discovery
 # --------------------------------------------------------------------------- #
 
 
+def scan_ad_files(
+    config_file_path:str,
+    ad_file_patterns:list[str],
+) -> _glob_scanner.GlobScan:
+    """Find ad config files matching *ad_file_patterns* in a single walk of
+    the config file's directory.
+
+    Files whose basename is ``ad_fields.yaml`` are excluded.  The listings
+    of the visited directories are kept in the result and reused by
+    :func:`resolve_ad_images`.
+    """
+    scan = _glob_scanner.scan(os.path.dirname(config_file_path), ad_file_patterns)
+    for ad_file, ad_file_relative in list(scan.files.items()):
+        if ad_file_relative.endswith("ad_fields.yaml"):
+            del scan.files[ad_file]
+    return scan
+
+
 def discover_ad_files(
     config_file_path:str,
     ad_file_patterns:list[str],
@@ -53,17 +89,7 @@ def discover_ad_files(
     Returns a ``{abspath: relative_path}`` dict, excluding any file whose
     basename is ``ad_fields.yaml``.
     """
-    ad_files:dict[str, str] = {}
-    data_root_dir = os.path.dirname(config_file_path)
-    for file_pattern in ad_file_patterns:
-        for ad_file in glob.glob(
-            file_pattern,
-            root_dir = data_root_dir,
-            flags = glob.GLOBSTAR | glob.BRACE | glob.EXTGLOB,
-        ):
-            if not str(ad_file).endswith("ad_fields.yaml"):
-                ad_files[abspath(ad_file, relative_to = data_root_dir)] = ad_file
-    return ad_files
+    return scan_ad_files(config_file_path, ad_file_patterns).files
 
 
 # --------------------------------------------------------------------------- #
@@ -72,10 +98,75 @@ def discover_ad_files(
 
 
 def load_ad(ad_cfg_orig:dict[str, Any], ad_defaults:Any) -> Ad:
-    """Validate a raw YAML dict into an :class:`Ad` with *ad_defaults* applied."""
+    """Validate a raw YAML dict into an :class:`Ad` with *ad_defaults* applied.
+
+    *ad_defaults* is an ``AdDefaults`` or, when loading many ads, an :class:`AdDefaultsMerger`.
+    """
     return AdPartial.model_validate(ad_cfg_orig).to_ad(ad_defaults)
 
 
+def _validate_ad_file(ad_file:str, ad_cfg_orig:dict[str, Any], ad_defaults:Any) -> Ad:
+    try:
+        return load_ad(ad_cfg_orig, ad_defaults)
+    except ContextualValidationError as ex:
+        ex.context = ad_file
+        raise
+
+
+def _load_ad_file(ad_file:str, ad_defaults:Any) -> tuple[Ad, dict[str, Any]]:
+    ad_cfg_orig = _dicts.load_dict(ad_file, "ad")
+    return _validate_ad_file(ad_file, ad_cfg_orig, ad_defaults), ad_cfg_orig
+
+
+# compiled ad defaults handed to each worker process once instead of with every file
+_worker_ad_defaults:Any = None
+
+
+def _init_worker(ad_defaults:Any) -> None:
+    global _worker_ad_defaults  # noqa: PLW0603 — per-process state of the loader pool
+    _worker_ad_defaults = ad_defaults
+
+
+def _load_ad_file_in_worker(ad_file:str) -> tuple[Ad, dict[str, Any]]:
+    return _load_ad_file(ad_file, _worker_ad_defaults)
+
+
+def _load_ad_files(ad_files:list[str], ad_defaults:Any, workers:int) -> list[tuple[Ad, dict[str, Any]]]:
+    """Parse and validate *ad_files*, in worker processes when worthwhile.
+
+    Results keep the order of *ad_files*.  A validation error raised in a
+    worker is re-raised here with the offending file as its context.
+    """
+    if not ad_files:
+        return []
+    merger = AdDefaultsMerger(ad_defaults)
+    if workers == 0:
+        workers = os.cpu_count() or 1
+    workers = min(workers, len(ad_files))
+    if workers <= 1 or len(ad_files) < PARALLEL_LOAD_THRESHOLD:
+        return [_load_ad_file(ad_file, merger) for ad_file in ad_files]
+
+    LOG.debug("Loading %d ad files using %d worker processes", len(ad_files), workers)
+    # "spawn" avoids forking the running event loop and browser connection on POSIX
+    with ProcessPoolExecutor(
+        max_workers = workers,
+        mp_context = multiprocessing.get_context("spawn"),
+        initializer = _init_worker,
+        initargs = (merger,),
+    ) as executor:
+        results = executor.map(_load_ad_file_in_worker, ad_files, chunksize = max(1, len(ad_files) // (workers * 4)))
+        loaded:list[tuple[Ad, dict[str, Any]]] = []
+        for ad_file in ad_files:
+            try:
+                loaded.append(next(results))
+            except ContextualValidationError as ex:
+                # the context attribute does not survive pickling
+                ex.context = ad_file
+                executor.shutdown(cancel_futures = True)
+                raise
+        return loaded
+
+
 # --------------------------------------------------------------------------- #
 # Selector helpers
 # --------------------------------------------------------------------------- #
@@ -100,21 +191,64 @@ def is_valid_ads_selector(ads_selector:str, valid_keywords:set[str]) -> bool:
 # --------------------------------------------------------------------------- #
 
 
-def has_ad_content_changed(ad_cfg:Ad, ad_cfg_orig:dict[str, Any]) -> bool:
+def compute_content_hash(ad_cfg_orig:dict[str, Any]) -> str | None:
+    """Validate the raw ad dict and return its current content hash."""
+    return AdPartial.model_validate(ad_cfg_orig).update_content_hash().content_hash
+
+
+def current_content_hash(
+    ad_cfg_orig:dict[str, Any],
+    *,
+    ad_file:str | None = None,
+    manifest:_ad_cache.ContentHashManifest | None = None,
+) -> str | None:
+    """Return the current content hash of *ad_cfg_orig*.
+
+    With a *manifest* and the *ad_file* the dict was loaded from, the hash
+    recorded for an unchanged file is reused instead of validating and
+    hashing the ad again; computed hashes are recorded in the manifest.
+    """
+    if manifest is None or ad_file is None:
+        return compute_content_hash(ad_cfg_orig)
+    found, content_hash = manifest.get(ad_file)
+    if not found:
+        content_hash = compute_content_hash(ad_cfg_orig)
+        manifest.put(ad_file, content_hash)
+    return content_hash
+
+
+def _changed_content_hash(
+    ad_cfg:Ad,
+    ad_cfg_orig:dict[str, Any],
+    ad_file:str | None,
+    manifest:_ad_cache.ContentHashManifest | None,
+) -> str | None:
+    """Return the current content hash if it differs from the stored one, else ``None``."""
+    if ad_cfg.id is None:
+        return None
+    stored_hash = ad_cfg_orig.get("content_hash")
+    if not stored_hash:  # None or empty string — hash never computed
+        return None
+    current_hash = current_content_hash(ad_cfg_orig, ad_file = ad_file, manifest = manifest)
+    return current_hash if current_hash is not None and current_hash != stored_hash else None
+
+
+def has_ad_content_changed(
+    ad_cfg:Ad,
+    ad_cfg_orig:dict[str, Any],
+    *,
+    ad_file:str | None = None,
+    manifest:_ad_cache.ContentHashManifest | None = None,
+) -> bool:
     """Return ``True`` when the ad's stored *content_hash* differs from the
     current computed hash.
 
     Unlike :func:`check_ad_changed`, this function is **pure** — no logging,
     no mutation of *ad_cfg_orig*.  A missing or empty stored hash is treated
-    as "not changed".
+    as "not changed".  See :func:`current_content_hash` for *ad_file* and
+    *manifest*.
     """
-    if ad_cfg.id is None:
-        return False
-    stored_hash = ad_cfg_orig.get("content_hash")
-    if not stored_hash:  # None or empty string — hash never computed
-        return False
-    current_hash = AdPartial.model_validate(ad_cfg_orig).update_content_hash().content_hash
-    return current_hash is not None and current_hash != stored_hash
+    return _changed_content_hash(ad_cfg, ad_cfg_orig, ad_file, manifest) is not None
 
 
 def is_ad_due_for_republication(ad_cfg:Ad, *, now:datetime | None = None) -> bool:
@@ -174,20 +308,22 @@ def check_ad_changed(
     ad_cfg:Ad,
     ad_cfg_orig:dict[str, Any],
     ad_file_relative:str,
+    *,
+    ad_file:str | None = None,
+    manifest:_ad_cache.ContentHashManifest | None = None,
 ) -> bool:
     """Return ``True`` when the ad's content hash differs from its stored hash.
 
+    See :func:`current_content_hash` for *ad_file* and *manifest*.
+
     .. important::
 
         As a deliberate side effect, this function **mutates**
         ``ad_cfg_orig["content_hash"]`` with the freshly computed hash when a
         change is detected.  Callers must be aware of this mutation.
     """
-    if not has_ad_content_changed(ad_cfg, ad_cfg_orig):
+    if (current_hash := _changed_content_hash(ad_cfg, ad_cfg_orig, ad_file, manifest)) is None:
         return False
-
-    # Recompute hash for logging and mutation
-    current_hash = AdPartial.model_validate(ad_cfg_orig).update_content_hash().content_hash
     stored_hash = ad_cfg_orig.get("content_hash")
 
     LOG.debug("Hash comparison for [%s]:", ad_file_relative)
@@ -200,6 +336,44 @@ def check_ad_changed(
     return True
 
 
+def check_ad_images_changed(
+    ad_cfg:Ad,
+    ad_file_relative:str,
+    image_files:list[str] | None,
+    image_digests:_ad_cache.ImageDigests | None,
+) -> bool:
+    """Return ``True`` when the image files of a published ad differ from the ones it was published with.
+
+    *image_files* are the resolved images of the ad (see :func:`published_ad_images`).
+    """
+    if ad_cfg.id is None or not image_files or image_digests is None:
+        return False
+    if not image_digests.has_changed(ad_cfg.id, image_files):
+        return False
+    LOG.info("Changed image files detected in ad [%s], will republish", ad_file_relative)
+    return True
+
+
+@contextlib.contextmanager
+def recording_published_images(image_digests_file:Path | None) -> Iterator[list[AdRecord]]:
+    """Record the image digests of the ads (re)published inside the ``with`` block.
+
+    Yields a list the publish/update flow appends each successfully
+    published :class:`~kleinanzeigen_bot.ad_record.AdRecord` to; their
+    round-trip documents then hold the (new) ad id.
+    """
+    published:list[AdRecord] = []
+    try:
+        yield published
+    finally:
+        if image_digests_file is not None and published:
+            image_digests = _ad_cache.ImageDigests.load(image_digests_file)
+            for record in published:
+                if ad_id := record.raw.get("id"):
+                    image_digests.record_published(int(ad_id), record.ad_cfg.images or [], replaces = record.ad_cfg.id)
+            image_digests.save()
+
+
 # --------------------------------------------------------------------------- #
 # Category & image resolution
 # --------------------------------------------------------------------------- #
@@ -231,11 +405,12 @@ def resolve_ad_category(ad_cfg:Ad, categories:dict[str, str]) -> None:
         ad_cfg.category = resolved_category_id
 
 
-def resolve_ad_images(ad_file:str, image_patterns:list[str]) -> list[str]:
+def resolve_ad_images(ad_file:str, image_patterns:list[str], scan:_glob_scanner.GlobScan | None = None) -> list[str]:
     """Glob and validate image files matching *image_patterns*.
 
     Images are resolved relative to *ad_file*'s directory.  Supported
-    extensions: ``.gif``, ``.jpg``, ``.jpeg``, ``.png``.
+    extensions: ``.gif``, ``.jpg``, ``.jpeg``, ``.png``.  Patterns that can
+    be answered from the directory listings of *scan* do not hit the disk.
 
     Returns a deduplicated, ordered list of absolute paths.
     """
@@ -246,29 +421,41 @@ def resolve_ad_images(ad_file:str, image_patterns:list[str]) -> list[str]:
     ad_dir = os.path.dirname(ad_file)
     for image_pattern in image_patterns:
         pattern_images = set()
-        for image_file in glob.glob(
-            image_pattern,
-            root_dir = ad_dir,
-            flags = glob.GLOBSTAR | glob.BRACE | glob.EXTGLOB,
-        ):
-            image_file_ext = os.path.splitext(image_file)[1]
-            ensure(
-                image_file_ext.lower() in {".gif", ".jpg", ".jpeg", ".png"},
-                _("Unsupported image file type [%s]") % image_file,
-            )
+        image_files = scan.glob_listed(ad_dir, image_pattern) if scan is not None else None
+        if image_files is None:
+            image_files = glob.glob(image_pattern, root_dir = ad_dir, flags = _glob_scanner.DEFAULT_FLAGS)
+        for image_file in image_files:
+            # check before building the error message, translating it for every image is expensive
+            if os.path.splitext(image_file)[1].lower() not in {".gif", ".jpg", ".jpeg", ".png"}:
+                raise AssertionError(_("Unsupported image file type [%s]") % image_file)
             if os.path.isabs(image_file):
                 pattern_images.add(image_file)
             else:
                 pattern_images.add(abspath(image_file, relative_to = ad_file))
         images.extend(sorted(pattern_images))
 
-    ensure(
-        images or not image_patterns,
-        _("No images found for given file patterns %s at %s") % (image_patterns, ad_dir),
-    )
+    if not images:
+        raise AssertionError(_("No images found for given file patterns %s at %s") % (image_patterns, ad_dir))
     return list(dict.fromkeys(images))
 
 
+def published_ad_images(
+    loaded:list[tuple[str, str, Ad, dict[str, Any]]],
+    scan:_glob_scanner.GlobScan | None = None,
+) -> dict[str, list[str]]:
+    """Map the ad file of every active, published ad in *loaded* to its resolved image files.
+
+    Ads whose image patterns cannot be resolved are left out; loading them
+    for publishing reports the problem.
+    """
+    images:dict[str, list[str]] = {}
+    for ad_file, _ad_file_relative, ad_cfg, _ad_cfg_orig in loaded:
+        if ad_cfg.active and ad_cfg.id is not None and ad_cfg.images:
+            with contextlib.suppress(AssertionError):
+                images[ad_file] = resolve_ad_images(ad_file, ad_cfg.images, scan)
+    return images
+
+
 # --------------------------------------------------------------------------- #
 # Main ad loading orchestration
 # --------------------------------------------------------------------------- #
@@ -304,6 +491,10 @@ def _should_include_ad(
     command:str,
     *,
     exclude_ads_with_id:bool = True,
+    ad_file:str | None = None,
+    manifest:_ad_cache.ContentHashManifest | None = None,
+    image_files:list[str] | None = None,
+    image_digests:_ad_cache.ImageDigests | None = None,
 ) -> bool:
     """Return ``True`` when *ad_cfg* matches the given filter *tokens*.
 
@@ -312,7 +503,9 @@ def _should_include_ad(
     """
     should_include = False
 
-    if "changed" in tokens and check_ad_changed(ad_cfg, ad_cfg_orig, ad_file_relative):
+    if "changed" in tokens and check_ad_changed(ad_cfg, ad_cfg_orig, ad_file_relative, ad_file = ad_file, manifest = manifest):
+        should_include = True
+    elif "changed" in tokens and check_ad_images_changed(ad_cfg, ad_file_relative, image_files, image_digests):
         should_include = True
     elif "changed" in tokens and command == "update" and _price_reduction.is_auto_price_reduction_due(ad_cfg, ad_file_relative):
         # Only the "update" command considers pending price reductions
@@ -342,6 +535,7 @@ def _prepare_selected_ad_entry(
     ad_cfg:Ad,
     ad_defaults:Any,
     categories:dict[str, str],
+    scan:_glob_scanner.GlobScan | None = None,
 ) -> None:
     """Validate description, resolve category, and resolve images for an ad
     that has already passed inactive and selector filtering.
@@ -358,7 +552,7 @@ def _prepare_selected_ad_entry(
     resolve_ad_category(ad_cfg, categories)
 
     if ad_cfg.images:
-        ad_cfg.images = resolve_ad_images(ad_file, ad_cfg.images)
+        ad_cfg.images = resolve_ad_images(ad_file, ad_cfg.images, scan)
 
 
 def load_ad_configs(
@@ -366,19 +560,62 @@ def load_ad_configs(
     config_file_path:str,
     ad_file_patterns:list[str],
     ad_defaults:Any,
+    cache_file:Path | None = None,
+    validate_cached:bool = False,
+    workers:int = 1,
+    scan:_glob_scanner.GlobScan | None = None,
 ) -> list[tuple[str, str, Ad, dict[str, Any]]]:
     """Discover, load raw YAML, validate, and apply defaults for every ad file.
 
     This is a **neutral** loading step — no selector filtering, no category
     resolution, no image globbing, no ``_prepare_selected_ad_entry()``.
     Returns a sorted list of ``(abspath, relpath, Ad, raw_dict)`` tuples.
+
+    When *cache_file* is given, unchanged ad files are served from the
+    persistent :class:`~kleinanzeigen_bot.ad_cache.AdCache` instead of being
+    parsed and validated again, and the cache is updated afterwards.
+    Cached ads are trusted as they were validated when stored; with
+    *validate_cached*, their cached raw documents are validated again
+    (only the YAML parsing is skipped).
+
+    Files that need parsing are spread over *workers* processes
+    (``0`` = one per CPU core) once there are at least
+    :data:`PARALLEL_LOAD_THRESHOLD` of them; otherwise, and with
+    ``workers = 1``, they are loaded sequentially.
+
+    Pass a *scan* from :func:`scan_ad_files` to reuse an existing
+    directory scan instead of searching for the ad files again.
     """
-    ad_files = discover_ad_files(config_file_path, ad_file_patterns)
-    result:list[tuple[str, str, Ad, dict[str, Any]]] = []
-    for ad_file, ad_file_relative in sorted(ad_files.items()):
-        ad_cfg_orig = _dicts.load_dict(ad_file, "ad")
-        ad_cfg = load_ad(ad_cfg_orig, ad_defaults)
-        result.append((ad_file, ad_file_relative, ad_cfg, ad_cfg_orig))
+    if scan is None:
+        scan = scan_ad_files(config_file_path, ad_file_patterns)
+    ad_files = sorted(scan.files.items())
+    cache = _ad_cache.AdCache.load(cache_file, ad_defaults) if cache_file is not None else None
+
+    merger = AdDefaultsMerger(ad_defaults) if cache is not None and validate_cached else None
+
+    loaded:dict[str, tuple[Ad, dict[str, Any]]] = {}
+    fingerprints:dict[str, _ad_cache.FileFingerprint] = {}
+    pending:list[str] = []
+    for ad_file, _ad_file_relative in ad_files:
+        if cache is not None:
+            # fingerprint before reading so a concurrent edit shows up as a miss next run
+            fingerprints[ad_file] = fingerprint = _ad_cache.FileFingerprint.of(ad_file)
+            if (cached := cache.get(ad_file, fingerprint)) is not None:
+                if merger is not None:
+                    cached = (_validate_ad_file(ad_file, cached[1], merger), cached[1])
+                loaded[ad_file] = cached
+                continue
+        pending.append(ad_file)
+
+    for ad_file, (ad_cfg, ad_cfg_orig) in zip(pending, _load_ad_files(pending, ad_defaults, workers), strict = True):
+        loaded[ad_file] = (ad_cfg, ad_cfg_orig)
+        if cache is not None:
+            cache.put(ad_file, fingerprints[ad_file], ad_cfg, ad_cfg_orig)
+
+    result = [(ad_file, ad_file_relative, *loaded[ad_file]) for ad_file, ad_file_relative in ad_files]
+    if cache is not None:
+        cache.save()
+        LOG.info("Ad cache: %d hit(s), %d miss(es)", cache.hits, cache.misses)
     return result
 
 
@@ -392,33 +629,92 @@ def load_ads(
     command:str,
     ignore_inactive:bool = True,
     exclude_ads_with_id:bool = True,
-) -> list[tuple[str, Ad, dict[str, Any]]]:
+    cache_file:Path | None = None,
+    manifest_file:Path | None = None,
+    image_digests_file:Path | None = None,
+    due_index_file:Path | None = None,
+    id_index_file:Path | None = None,
+    validate_cached:bool = False,
+    workers:int = 1,
+    scan:_glob_scanner.GlobScan | None = None,
+) -> list[AdRecord]:
     """Load and validate all ad config files, optionally filtering inactive or already-published ads.
 
     This is the main orchestration function — it wires together file
     discovery, model validation, selector filtering, category resolution,
-    and image globbing.  All inputs are explicit.
+    and image globbing.  All inputs are explicit; *cache_file*,
+    *validate_cached* and *workers* are passed through to :func:`load_ad_configs`.  With a
+    *manifest_file*, the ``changed`` selector reuses content hashes recorded
+    for unchanged files (see :class:`~kleinanzeigen_bot.ad_cache.ContentHashManifest`).
+    With an *image_digests_file*, ``changed`` also selects published ads
+    whose image files were modified (see :class:`~kleinanzeigen_bot.ad_cache.ImageDigests`).
+    With a *due_index_file*, the plain ``due`` selector only loads ad files
+    that are due or changed since the last run (see :class:`~kleinanzeigen_bot.ad_cache.DueIndex`).
+    With an *id_index_file*, numeric selectors only load ad files recorded
+    with a matching id or changed since (see :class:`~kleinanzeigen_bot.ad_cache.AdIdIndex`);
+    other selectors neither read nor update the index.
+    Pass a *scan* from :func:`scan_ad_files` to only consider the ad files it contains.
 
     Returns:
-        list[tuple[str, Ad, dict[str, Any]]]:
-        Tuples of ``(file_path, validated Ad model, original raw data)``.
+        list[AdRecord]:
+        The selected ads.  Their round-trip documents are not kept but
+        reloaded from the ad files when needed (see :attr:`.AdRecord.raw`).
     """
+    ids, tokens = _parse_ad_selector(ads_selector)
+
     LOG.info("Searching for ad config files...")
+    if scan is None:
+        scan = scan_ad_files(config_file_path, ad_file_patterns)
+    LOG.info(" -> found %s", pluralize("ad config file", scan.files))
+    if not scan.files:
+        return []
+
+    due_index:_ad_cache.DueIndex | None = None
+    not_due = 0
+    if due_index_file is not None and ids is None and tokens == {"due"}:
+        due_index = _ad_cache.DueIndex.load(due_index_file, ad_defaults, scan.files)
+        candidates = due_index.candidates(_misc.now().timestamp(), ignore_inactive = ignore_inactive)
+        not_due = len(scan.files) - len(candidates)
+        scan = dataclasses.replace(scan, files = {ad_file: rel for ad_file, rel in scan.files.items() if ad_file in candidates})
+
+    id_index:_ad_cache.AdIdIndex | None = None
+    not_in_ids = 0
+    if id_index_file is not None and ids is not None:
+        id_index = _ad_cache.AdIdIndex.load(id_index_file, scan.files)
+        candidates = id_index.candidates(ids)
+        not_in_ids = len(scan.files) - len(candidates)
+        scan = dataclasses.replace(scan, files = {ad_file: rel for ad_file, rel in scan.files.items() if ad_file in candidates})
+
+    manifest = _ad_cache.ContentHashManifest.load(manifest_file, scan.files) if manifest_file is not None and "changed" in tokens else None
     loaded = load_ad_configs(
         config_file_path = config_file_path,
         ad_file_patterns = ad_file_patterns,
         ad_defaults = ad_defaults,
+        cache_file = cache_file,
+        validate_cached = validate_cached,
+        workers = workers,
+        scan = scan,
     )
-    LOG.info(" -> found %s", pluralize("ad config file", loaded))
-    if not loaded:
-        return []
+    for ad_file, _ad_file_relative, ad_cfg, _ad_cfg_orig in loaded:
+        if due_index is not None:
+            due_index.put(ad_file, ad_cfg)
+        if id_index is not None:
+            id_index.put(ad_file, ad_cfg.id)
+
+    image_digests:_ad_cache.ImageDigests | None = None
+    ad_images:dict[str, list[str]] = {}
+    if image_digests_file is not None and "changed" in tokens:
+        image_digests = _ad_cache.ImageDigests.load(image_digests_file)
+        ad_images = published_ad_images(loaded, scan)
+        image_digests.prefetch(itertools.chain.from_iterable(ad_images.values()))
 
-    ids, tokens = _parse_ad_selector(ads_selector)
     if ids is not None:
         LOG.info("Start fetch task for the ad(s) with id(s):")
         LOG.info(" | ".join(str(id_) for id_ in ids))
+        if not_in_ids:
+            LOG.info(" -> SKIPPED: %s not in list of given ids", pluralize("ad", not_in_ids))
 
-    ads:list[tuple[str, Ad, dict[str, Any]]] = []
+    ads:list[AdRecord] = []
     for ad_file, ad_file_relative, ad_cfg, ad_cfg_orig in loaded:
 
         # Inactive check runs before numeric ID filtering — an inactive ad
@@ -434,14 +730,30 @@ def load_ads(
         elif not _should_include_ad(
             ad_cfg, ad_cfg_orig, ad_file_relative,
             tokens, command, exclude_ads_with_id = exclude_ads_with_id,
+            ad_file = ad_file, manifest = manifest,
+            image_files = ad_images.get(ad_file), image_digests = image_digests,
         ):
             continue
 
-        _prepare_selected_ad_entry(ad_file, ad_cfg, ad_defaults, categories)
+        _prepare_selected_ad_entry(ad_file, ad_cfg, ad_defaults, categories, scan)
 
         LOG.info(" -> LOADED: ad [%s]", ad_file_relative)
-        ads.append((ad_file, ad_cfg, ad_cfg_orig))
-
+        ads.append(AdRecord(ad_file, ad_cfg, ad_file_relative = ad_file_relative))
+
+    if manifest is not None:
+        manifest.save()
+        LOG.debug("Content hash manifest: %d hit(s), %d miss(es)", manifest.hits, manifest.misses)
+    if image_digests is not None:
+        image_digests.save()
+        LOG.debug("Image digests: %d reused, %d hashed", image_digests.reused, image_digests.hashed)
+    if id_index is not None:
+        id_index.save()
+    if due_index is not None:
+        due_index.save()
+        if not_due:
+            LOG.info(" -> SKIPPED: %s not due for republication yet", pluralize("ad", not_due))
+        if (next_due := due_index.next_due_at(_misc.now().timestamp())) is not None:
+            LOG.info("Next ad becomes due at %s", datetime.fromtimestamp(next_due).astimezone().isoformat(sep = " ", timespec = "minutes"))
     LOG.info("Loaded %s", pluralize("ad", ads))
     return ads
 
@@ -451,20 +763,22 @@ def load_ads(
 # --------------------------------------------------------------------------- #
 
 
-def update_content_hashes(ads:list[tuple[str, Ad, dict[str, Any]]]) -> int:
+def update_content_hashes(ads:list[AdRecord]) -> int:
     """Recompute and persist content hashes for every loaded ad.
 
     Returns the count of ads whose hash actually changed.
     """
     changed = 0
 
-    for idx, (ad_file, ad_cfg, ad_cfg_orig) in enumerate(ads, start = 1):
-        LOG.info("Processing %s/%s: '%s' from [%s]...", idx, len(ads), ad_cfg.title, ad_file)
-        current_hash = AdPartial.model_validate(ad_cfg_orig).update_content_hash().content_hash
+    for idx, record in enumerate(ads, start = 1):
+        LOG.info("Processing %s/%s: '%s' from [%s]...", idx, len(ads), record.ad_cfg.title, record.ad_file)
+        ad_cfg_orig = record.raw
+        current_hash = compute_content_hash(ad_cfg_orig)
         if current_hash != ad_cfg_orig.get("content_hash"):
             changed += 1
             ad_cfg_orig["content_hash"] = current_hash
-            _dicts.save_dict(ad_file, ad_cfg_orig)
+            _dicts.save_dict(record.ad_file, ad_cfg_orig)
+        record.release_raw()
 
     LOG.info("############################################")
     LOG.info("DONE: Updated [content_hash] in %s", pluralize("ad", changed))
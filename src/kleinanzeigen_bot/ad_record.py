@@ -0,0 +1,60 @@
+# SPDX-FileCopyrightText: © Jens Bergmann and contributors
+# SPDX-License-Identifier: AGPL-3.0-or-later
+# SPDX-ArtifactOfProjectHomePage: https://github.com/Second-Hand-Friends/kleinanzeigen-bot/
+"""Compact representation of a loaded ad passed between the command flows."""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from .utils import dicts as _dicts
+
+if TYPE_CHECKING:
+    from .model.ad_model import Ad
+
+__all__ = [
+    "AdRecord",
+]
+
+
+class AdRecord:
+    """A loaded ad: its file, the validated :class:`Ad` and the round-trip YAML document.
+
+    The round-trip document (a ruamel ``CommentedMap`` with comments, line
+    info and key order) is only needed to write the ad file back, yet is
+    several times larger than the :class:`Ad` itself.  Records created
+    without *raw* read it from *ad_file* on first access to :attr:`raw` and
+    keep it until :meth:`release_raw`, so only the ads currently being
+    processed hold one.
+
+    *ad_file_relative* is the path shown to the user; it defaults to *ad_file*.
+    """
+
+    __slots__ = ("_raw", "ad_cfg", "ad_file", "ad_file_relative")
+
+    def __init__(self, ad_file:str, ad_cfg:Ad, raw:dict[str, Any] | None = None, *, ad_file_relative:str | None = None) -> None:
+        self.ad_file = ad_file
+        self.ad_file_relative = ad_file if ad_file_relative is None else ad_file_relative
+        self.ad_cfg = ad_cfg
+        self._raw = raw
+
+    @property
+    def raw(self) -> dict[str, Any]:
+        """The round-trip document of the ad file, loaded on first access.
+
+        :raises FileNotFoundError: when it has to be loaded and the ad file no longer exists
+        """
+        if self._raw is None:
+            self._raw = _dicts.load_dict(self.ad_file, "ad")
+        return self._raw
+
+    @property
+    def has_raw(self) -> bool:
+        """Whether the round-trip document is currently held in memory."""
+        return self._raw is not None
+
+    def release_raw(self) -> None:
+        """Drop the round-trip document; the next access to :attr:`raw` reads the ad file again."""
+        self._raw = None
+
+    def __repr__(self) -> str:
+        return f"AdRecord({self.ad_file!r}, id={self.ad_cfg.id!r})"
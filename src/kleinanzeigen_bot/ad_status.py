@@ -18,6 +18,9 @@ from . import price_reduction as _price_reduction
 from .model.ad_model import AdUpdateStrategy
 
 if TYPE_CHECKING:
+    from collections.abc import Collection
+
+    from .ad_record import AdRecord
     from .model.ad_model import Ad
 
 
@@ -45,6 +48,7 @@ class StatusRow:
     status:str  # One of: "disabled", "draft", "changed", "due", "published-local"
     apr_repost_detail:AprDetail | None = None
     apr_update_detail:AprDetail | None = None
+    price_forecast:tuple[int, ...] | None = None  # Projected prices at each of the next reposts
 
 
 def _translate_status(status:str) -> str:
@@ -167,9 +171,13 @@ def compute_ad_status(
     ad_cfg_orig:dict[str, Any],
     *,
     now:datetime | None = None,
+    changed:bool | None = None,
 ) -> str:
     """Map a single :class:`Ad` to a status string.
 
+    Pass *changed* when the content-hash verdict is already known, otherwise
+    it is computed via :func:`~kleinanzeigen_bot.ad_loading.has_ad_content_changed`.
+
     Precedence (first match wins):
         1. ``disabled`` — *ad.active* is ``False``
         2. ``draft`` — *ad.id* is ``None``
@@ -183,7 +191,7 @@ def compute_ad_status(
         return "disabled"
     if ad.id is None:
         return "draft"
-    if ad_loading.has_ad_content_changed(ad, ad_cfg_orig):
+    if changed if changed is not None else ad_loading.has_ad_content_changed(ad, ad_cfg_orig):
         return "changed"
     if ad_loading.is_ad_due_for_republication(ad, now = now):
         return "due"
@@ -191,18 +199,25 @@ def compute_ad_status(
 
 
 def build_status_rows(
-    ads:list[tuple[str, Ad, dict[str, Any]]],
+    ads:list[AdRecord],
     *,
     now:datetime | None = None,
+    changed:Collection[str] | None = None,
+    forecast:int = 0,
 ) -> list[StatusRow]:
-    """Build status rows from ad-file / Ad / raw-dict triples.
-
-    The first element of each triple is the **relative** ad file path,
-    used for APR evaluation (``evaluate_auto_price_reduction``).
+    """Build status rows from loaded ad records.
+
+    The **relative** ad file path of each record (``ad_file_relative``) is
+    shown and used for APR evaluation (``evaluate_auto_price_reduction``).
+    *changed* optionally holds the relative paths of ads whose content
+    changed, as determined by the caller.  With *forecast* > 0, active ads
+    with a price reduction get the projected prices of their next *forecast*
+    reposts (see :func:`~kleinanzeigen_bot.price_reduction.forecast_auto_price`).
     """
     rows:list[StatusRow] = []
-    for ad_file_rel, ad_cfg, ad_cfg_orig in ads:
-        status = compute_ad_status(ad_cfg, ad_cfg_orig, now = now)
+    for record in ads:
+        ad_file_rel, ad_cfg = record.ad_file_relative, record.ad_cfg
+        status = compute_ad_status(ad_cfg, record.raw, now = now, changed = None if changed is None else ad_file_rel in changed)
 
         if ad_cfg.active:
             replace_dec = _price_reduction.evaluate_auto_price_reduction(
@@ -216,9 +231,11 @@ def build_status_rows(
                 apr_update_detail = _format_apr_detail(modify_dec)
             else:
                 apr_update_detail = None
+            price_forecast = _price_reduction.forecast_auto_price(ad_cfg, forecast) if forecast > 0 else None
         else:
             apr_repost_detail = None
             apr_update_detail = None
+            price_forecast = None
 
         rows.append(
             StatusRow(
@@ -228,6 +245,7 @@ def build_status_rows(
                 status = status,
                 apr_repost_detail = apr_repost_detail,
                 apr_update_detail = apr_update_detail,
+                price_forecast = None if price_forecast is None else tuple(price_forecast),
             )
         )
     return rows
@@ -297,6 +315,8 @@ def _render_status_block(row:StatusRow, *, color:bool) -> list[str]:
                 _render_apr_detail(row.apr_repost_detail, color = color),
             )
         )
+    if row.price_forecast is not None:
+        lines.append(_render_detail_line(_("price forecast"), " -> ".join(str(price) for price in row.price_forecast)))
     return lines
 
 
@@ -1,30 +1,40 @@
 # SPDX-FileCopyrightText: © Jens Bergmann and contributors
 # SPDX-License-Identifier: AGPL-3.0-or-later
 # SPDX-ArtifactOfProjectHomePage: https://github.com/Second-Hand-Friends/kleinanzeigen-bot/
-import asyncio, importlib, os, sys  # isort: skip
+import asyncio, contextlib, importlib, itertools, os, sys, time  # isort: skip
 from gettext import gettext as _
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, Final, cast
 
 import certifi
 
-from . import ad_loading, ad_status, delete_flow, download_flow, extend_flow
+from . import ad_cache as _ad_cache
+from . import ad_index as _ad_index
+from . import ad_loading, ad_status, delete_flow, download_flow, extend_flow, published_ads
+from . import browser_daemon as _browser_daemon
 from . import login_flow as _login_flow
 from . import publishing_workflow as _publishing_workflow
 from . import runtime_config as _runtime_config
 from . import update_checker as _update_checker
 from ._version import __version__
+from .ad_record import AdRecord
 from .login_flow import LoginDetectionResult
 from .model.ad_model import Ad, AdUpdateStrategy
 from .model.config_model import Config  # noqa: TC001 — used at runtime, config injection
 from .published_ads import PublishedAd
 from .utils import color as _color
 from .utils import diagnostics as _diagnostics
+from .utils import file_watcher as _file_watcher
 from .utils import loggers as _loggers
 from .utils import misc as _misc
+from .utils import timing_collector as _timing_collector
+from .utils import timing_tuner as _timing_tuner
 from .utils import xdg_paths as _xdg_paths
 from .utils.files import abspath
+from .utils.glob_scanner import GlobScan  # noqa: TC001 — used at runtime in load_ads() annotations
+from .utils.i18n import pluralize
 from .utils.misc import is_frozen
+from .utils.resource_policy import ResourcePolicy
 from .utils.web_scraping_mixin import WebScrapingMixin
 
 if TYPE_CHECKING:
@@ -34,6 +44,9 @@ if TYPE_CHECKING:
 
 LOG:Final[_loggers.Logger] = _loggers.get_logger(__name__)
 
+# upper bound for one wait of the watch command, so clock changes and missed events cannot stall it for long
+_WATCH_MAX_SLEEP_SECONDS:Final[int] = 3600
+
 
 class KleinanzeigenBot(WebScrapingMixin):  # noqa: PLR0904
     def __init__(self) -> None:
@@ -63,12 +76,17 @@ class KleinanzeigenBot(WebScrapingMixin):  # noqa: PLR0904
         self.ads_selector = "due"
         self._ads_selector_explicit:bool = False
         self.keep_old_ads = False
+        self.use_ad_cache = True
+        self.status_forecast = 0
+        self._published_ads:published_ads.PublishedAdsSnapshot | None = None
 
         # Ensure the attribute always exists on the bot object so that
         # capture_login_detection_diagnostics_if_enabled can read/write it
         # via getattr/setattr. The per-attempt reset happens in login_flow.login().
         self._login_detection_diagnostics_captured:bool = False
         self._timing_collector:"TimingCollector | None" = None
+        # attachment to the browser of a running `serve` command, released with the browser session
+        self._browser_daemon_lease:_browser_daemon.DaemonLease | None = None
 
     def __del__(self) -> None:
         if self.file_log:
@@ -88,6 +106,59 @@ class KleinanzeigenBot(WebScrapingMixin):  # noqa: PLR0904
     def _update_check_state_path(self) -> Path:
         return self._workspace_or_raise().state_dir / "update_check_state.json"
 
+    @property
+    def _ad_cache_file(self) -> Path | None:
+        """Location of the persistent ad cache, or ``None`` when caching is disabled (``--no-cache``)."""
+        if not self.use_ad_cache or self.workspace is None:
+            return None
+        return self.workspace.state_dir / _ad_cache.CACHE_FILE
+
+    @property
+    def _content_hash_manifest_file(self) -> Path | None:
+        """Location of the content hash manifest, or ``None`` when caching is disabled (``--no-cache``)."""
+        if not self.use_ad_cache or self.workspace is None:
+            return None
+        return self.workspace.state_dir / _ad_cache.MANIFEST_FILE
+
+    @property
+    def _due_index_file(self) -> Path | None:
+        """Location of the due index, or ``None`` when caching is disabled (``--no-cache``)."""
+        if not self.use_ad_cache or self.workspace is None:
+            return None
+        return self.workspace.state_dir / _ad_cache.DUE_INDEX_FILE
+
+    @property
+    def _id_index_file(self) -> Path | None:
+        """Location of the ad id index, or ``None`` when caching is disabled (``--no-cache``)."""
+        if not self.use_ad_cache or self.workspace is None:
+            return None
+        return self.workspace.state_dir / _ad_cache.ID_INDEX_FILE
+
+    @property
+    def _published_ads_file(self) -> Path | None:
+        """Location of the persisted published ads, or ``None`` when caching is disabled (``--no-cache``)."""
+        if not self.use_ad_cache or self.workspace is None:
+            return None
+        return self.workspace.state_dir / published_ads.PUBLISHED_ADS_FILE
+
+    def _published_ads_snapshot(self) -> published_ads.PublishedAdsSnapshot:
+        """Return the published ads shared by all flows of the current run."""
+        if self._published_ads is None:
+            self._published_ads = published_ads.PublishedAdsSnapshot(
+                self, self.root_url,
+                account = self.config.login.username,
+                cache_file = self._published_ads_file,
+                ttl = self.config.publishing.published_ads_ttl,
+            )
+        return self._published_ads
+
+    @property
+    def _image_digests_file(self) -> Path | None:
+        """Location of the image digests; not affected by ``--no-cache`` because it also records what was published."""
+        if self.workspace is None:
+            return None
+        return self.workspace.state_dir / _ad_cache.IMAGE_DIGESTS_FILE
+
     async def run(self, args:list[str]) -> None:
         _cli = importlib.import_module("kleinanzeigen_bot.cli")
         parsed = _cli.parse_args(args)
@@ -95,6 +166,8 @@ class KleinanzeigenBot(WebScrapingMixin):  # noqa: PLR0904
         self.ads_selector = parsed.ads_selector
         self._ads_selector_explicit = parsed.ads_selector_explicit
         self.keep_old_ads = parsed.keep_old_ads
+        self.use_ad_cache = parsed.use_ad_cache
+        self.status_forecast = parsed.status_forecast
         self._preserve_local_settings = parsed.preserve_local_settings
         self._config_arg = parsed.config_arg
         self._workspace_mode_arg = cast(_xdg_paths.InstallationMode, parsed.workspace_mode) if parsed.workspace_mode else None
@@ -136,6 +209,8 @@ class KleinanzeigenBot(WebScrapingMixin):  # noqa: PLR0904
                     self._handle_update_check()
                 case "update-content-hash":
                     self._handle_update_content_hash()
+                case "timing-tune":
+                    self._handle_timing_tune()
                 case "status":
                     self._handle_status()
                 case "publish":
@@ -148,11 +223,15 @@ class KleinanzeigenBot(WebScrapingMixin):  # noqa: PLR0904
                     await self._handle_extend()
                 case "download":
                     await self._handle_download()
+                case "watch":
+                    await self._handle_watch()
+                case "serve":
+                    await self._handle_serve()
                 case _:
                     LOG.error("Unknown command: %s", self.command)
                     sys.exit(2)
         finally:
-            self.close_browser_session()
+            await self._close_browser_session()
             if self._timing_collector is not None:
                 try:
                     loop = asyncio.get_running_loop()
@@ -175,6 +254,7 @@ class KleinanzeigenBot(WebScrapingMixin):  # noqa: PLR0904
         self.config = runtime_state.config
         self.categories = runtime_state.categories
         self._timing_collector = runtime_state.timing_collector
+        self._learned_timeouts = runtime_state.learned_timeouts
         _runtime_config.apply_browser_config(self.browser_config, self.config, self.workspace, self.config_file_path)
 
     def _check_for_updates(self) -> None:
@@ -183,10 +263,64 @@ class KleinanzeigenBot(WebScrapingMixin):  # noqa: PLR0904
         checker.check_for_updates()
 
     async def _open_logged_in_browser(self) -> None:
-        """Create a browser session and log in."""
-        await self.create_browser_session()
+        """Create a browser session, reusing the browser of a running `serve` command if possible, and log in."""
+        if self.config.serve.attach and self.workspace is not None and self.command != "serve":
+            self._browser_daemon_lease = await _browser_daemon.attach(
+                self, state_dir = self.workspace.state_dir, timeout = self.config.serve.attach_timeout,
+            )
+        if self._browser_daemon_lease is None:
+            await self.create_browser_session()
+        blocking = self.config.browser.resource_blocking
+        if blocking.enabled and (kinds := blocking.commands.get(self.command)):
+            await self.set_resource_policy(ResourcePolicy.for_site(kinds, self.root_url, blocking.allowed_hosts))
         await self.login()
 
+    async def _close_browser_session(self) -> None:
+        """Stop blocking resources, then close the browser session; a browser daemon's tabs must not keep intercepting requests."""
+        try:
+            await self.stop_resource_blocking()
+        finally:
+            self.close_browser_session()
+
+    def close_browser_session(self) -> None:
+        try:
+            super().close_browser_session()
+        finally:
+            if self._browser_daemon_lease is not None:
+                self._browser_daemon_lease.release()
+                self._browser_daemon_lease = None
+
+    async def _load_ads_and_open_browser(self, *, scan:GlobScan | None = None) -> list[AdRecord]:
+        """Load the selected ads and, if there are any, open a logged-in browser.
+
+        With ``ad_loading.start_browser_early``, the browser is launched and
+        logged in while the ads are loaded in a worker thread; it is closed
+        again when no ads are selected or loading fails.
+        """
+        if not self.config.ad_loading.start_browser_early:
+            if ads := self.load_ads(scan = scan):
+                await self._open_logged_in_browser()
+            return ads
+
+        browser_task = asyncio.create_task(self._open_logged_in_browser())
+        try:
+            ads = await asyncio.to_thread(self.load_ads, scan = scan)
+        except BaseException:
+            await self._discard_browser(browser_task)
+            raise
+        if not ads:
+            await self._discard_browser(browser_task)
+            return ads
+        await browser_task
+        return ads
+
+    async def _discard_browser(self, browser_task:"asyncio.Task[None]") -> None:
+        """Cancel a browser launch started by :meth:`_load_ads_and_open_browser` and close the session."""
+        browser_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError, Exception):
+            await browser_task
+        await self._close_browser_session()
+
     # ------------------------------------------------------------------
     # Command handlers
     # ------------------------------------------------------------------
@@ -240,23 +374,51 @@ class KleinanzeigenBot(WebScrapingMixin):  # noqa: PLR0904
             LOG.info("DONE: No active ads found.")
             LOG.info("############################################")
 
+    def _handle_timing_tune(self) -> None:
+        """Show the timeouts learned from the recorded timing data next to the configured ones."""
+        self._bootstrap_runtime()
+        sessions = _timing_collector.load_sessions(_runtime_config.timing_dir(self._workspace_or_raise()))
+        proposals = _timing_tuner.propose_timeouts(sessions, self.config.timeouts)
+        print(_timing_tuner.render_proposals(proposals, self.config.timeouts), end = "")
+
     def _handle_status(self) -> None:
         """Show status overview of all local ads."""
         self._bootstrap_runtime()
         self._check_for_updates()
 
+        scan = ad_loading.scan_ad_files(self.config_file_path, self.config.ad_files)
+        manifest_file = self._content_hash_manifest_file
+        manifest = _ad_cache.ContentHashManifest.load(manifest_file, scan.files) if manifest_file is not None else None
         loaded = ad_loading.load_ad_configs(
             config_file_path = self.config_file_path,
             ad_file_patterns = self.config.ad_files,
             ad_defaults = self.config.ad_defaults,
+            cache_file = self._ad_cache_file,
+            validate_cached = self.config.ad_loading.validate_cached_ads,
+            workers = self.config.ad_loading.workers,
+            scan = scan,
         )
         if not loaded:
             LOG.info("No ad files found.")
             return
 
         now = _misc.now()
-        ads_for_status = [(relpath, ad_cfg, raw) for _abspath, relpath, ad_cfg, raw in loaded]
-        rows = ad_status.build_status_rows(ads_for_status, now = now)
+        ads_for_status = [AdRecord(abspath, ad_cfg, raw, ad_file_relative = relpath) for abspath, relpath, ad_cfg, raw in loaded]
+        changed = {
+            relpath for abspath, relpath, ad_cfg, raw in loaded
+            if ad_cfg.active and ad_loading.has_ad_content_changed(ad_cfg, raw, ad_file = abspath, manifest = manifest)
+        }
+        if manifest is not None:
+            manifest.save()
+        if (image_digests_file := self._image_digests_file) is not None:
+            image_digests = _ad_cache.ImageDigests.load(image_digests_file)
+            ad_images = ad_loading.published_ad_images(loaded, scan)
+            image_digests.prefetch(itertools.chain.from_iterable(ad_images.values()))
+            changed.update(
+                relpath for abspath, relpath, ad_cfg, _raw in loaded
+                if ad_cfg.id is not None and abspath in ad_images and image_digests.has_changed(ad_cfg.id, ad_images[abspath], record = False)
+            )
+        rows = ad_status.build_status_rows(ads_for_status, now = now, changed = changed, forecast = self.status_forecast)
         use_color = _color.should_use_color()
         output = ad_status.render_status_rows(rows, color = use_color)
         print(output)
@@ -274,8 +436,7 @@ class KleinanzeigenBot(WebScrapingMixin):  # noqa: PLR0904
                 sys.exit(2)
             self.ads_selector = "due"
 
-        if ads := self.load_ads():
-            await self._open_logged_in_browser()
+        if ads := await self._load_ads_and_open_browser():
             await self.publish_ads(ads)
         else:
             LOG.info("############################################")
@@ -292,8 +453,7 @@ class KleinanzeigenBot(WebScrapingMixin):  # noqa: PLR0904
                 sys.exit(2)
             self.ads_selector = "changed"
 
-        if ads := self.load_ads():
-            await self._open_logged_in_browser()
+        if ads := await self._load_ads_and_open_browser():
             await self.update_ads(ads)
         else:
             LOG.info("############################################")
@@ -303,13 +463,13 @@ class KleinanzeigenBot(WebScrapingMixin):  # noqa: PLR0904
     async def _handle_delete(self) -> None:
         self._bootstrap_runtime()
         self._check_for_updates()
-        if ads := self.load_ads():
-            await self._open_logged_in_browser()
+        if ads := await self._load_ads_and_open_browser():
             await delete_flow.delete_ads(
                 web = self, root_url = self.root_url,
                 after_delete = self.config.deleting.after_delete,
                 delete_old_ads_by_title = self.config.publishing.delete_old_ads_by_title,
                 ad_cfgs = ads,
+                snapshot = self._published_ads_snapshot(),
             )
         else:
             LOG.info("############################################")
@@ -328,11 +488,11 @@ class KleinanzeigenBot(WebScrapingMixin):  # noqa: PLR0904
             LOG.info("Extending all ads within 8-day window...")
             self.ads_selector = "all"
 
-        if ads := self.load_ads():
-            await self._open_logged_in_browser()
+        if ads := await self._load_ads_and_open_browser():
             await extend_flow.extend_ads(
                 web = self, root_url = self.root_url,
                 ad_cfgs = ads,
+                snapshot = self._published_ads_snapshot(),
             )
         else:
             LOG.info("############################################")
@@ -358,13 +518,102 @@ class KleinanzeigenBot(WebScrapingMixin):  # noqa: PLR0904
             ads_selector = self.ads_selector,
             load_ads_func = self.load_ads,
             root_url = self.root_url,
+            snapshot = self._published_ads_snapshot(),
         )
 
-    def load_ads(self, *, ignore_inactive:bool = True, exclude_ads_with_id:bool = True) -> list[tuple[str, Ad, dict[str, Any]]]:
+    async def _handle_watch(self) -> None:
+        """Keep an in-memory index of all ads and publish whenever ads become due or change."""
+        self._bootstrap_runtime()
+        self._check_for_updates()
+
+        tokens = {token.strip() for token in self.ads_selector.split(",") if token.strip()}
+        if not tokens or not tokens <= {"new", "due", "changed"}:
+            if self._ads_selector_explicit:
+                LOG.error('Invalid --ads selector: "%s". Valid values: comma-separated keywords (new, due, changed).', self.ads_selector)
+                sys.exit(2)
+            self.ads_selector = "due,changed"
+            tokens = {"due", "changed"}
+
+        index = _ad_index.AdIndex(
+            config_file_path = self.config_file_path,
+            ad_file_patterns = self.config.ad_files,
+            ad_defaults = self.config.ad_defaults,
+            cache_file = self._ad_cache_file,
+            image_digests_file = self._image_digests_file,
+            validate_cached = self.config.ad_loading.validate_cached_ads,
+            workers = self.config.ad_loading.workers,
+        )
+        index.refresh()
+        watch_cfg = self.config.watch
+        watcher = _file_watcher.create_watcher(watch_cfg.poll_interval)
+        LOG.info("Watching %s for changes, publishing [%s] ads", pluralize("ad file", index.entries), self.ads_selector)
+
+        last_publish:float | None = None
+        try:
+            while True:
+                try:
+                    watcher.watch(index.directories())
+                except OSError as ex:
+                    LOG.warning("Cannot watch the ad directories (%s), checking for changes every %s seconds instead", ex, watch_cfg.poll_interval)
+                    watcher.close()
+                    watcher = _file_watcher.PollingWatcher(watch_cfg.poll_interval)
+
+                selected = index.select(tokens)
+                cooldown = 0.0 if last_publish is None else last_publish + watch_cfg.publish_cooldown - time.monotonic()
+                if selected and cooldown <= 0:
+                    last_publish = time.monotonic()
+                    await self._publish_from_index(index, selected)
+                    index.refresh()
+                    continue
+
+                timeout = float(_WATCH_MAX_SLEEP_SECONDS)
+                if selected:
+                    timeout = min(timeout, cooldown)
+                if (next_due := index.next_due_at()) is not None:
+                    timeout = min(timeout, max((next_due - _misc.now()).total_seconds(), 0) + 1)
+                if await asyncio.to_thread(watcher.wait, timeout) and (changes := index.refresh()):
+                    LOG.info(
+                        "Ad files changed: %d added, %d modified, %d removed",
+                        len(changes.added), len(changes.modified), len(changes.removed),
+                    )
+        finally:
+            watcher.close()
+
+    async def _handle_serve(self) -> None:
+        """Keep a logged-in browser running that later runs of this workspace attach to."""
+        self._bootstrap_runtime()
+        self._check_for_updates()
+        await _browser_daemon.serve(
+            self,
+            state_dir = self._workspace_or_raise().state_dir,
+            config = self.config.serve,
+            login = self.login,
+        )
+
+    async def _publish_from_index(self, index:_ad_index.AdIndex, selected:list[str]) -> None:
+        """Load and publish the *selected* ad files of *index*; failures are logged and retried after the cooldown."""
+        LOG.info("%s to publish", pluralize("ad", selected))
+        try:
+            if ads := await self._load_ads_and_open_browser(scan = index.subset_scan(selected)):
+                await self.publish_ads(ads)
+        except Exception:  # noqa: BLE001 — keep watching, the ads are retried after the cooldown
+            LOG.error("Publishing failed, retrying after the cooldown", exc_info = True)  # noqa: G201 — .error(exc_info=True) for translation lookup
+        finally:
+            await self._close_browser_session()
+            self._published_ads = None  # every watch cycle sees the ads published in the meantime
+
+    def load_ads(
+        self,
+        *,
+        ignore_inactive:bool = True,
+        exclude_ads_with_id:bool = True,
+        scan:GlobScan | None = None,
+    ) -> list[AdRecord]:
         """Load and validate all ad config files.
 
         Delegates to :func:`ad_loading.load_ads` with the current config,
-        selector, and category context for filtering and validation.
+        selector, and category context for filtering and validation.  With a
+        *scan*, only the ad files it contains are considered.
         """
         return ad_loading.load_ads(
             config_file_path = self.config_file_path,
@@ -375,6 +624,14 @@ class KleinanzeigenBot(WebScrapingMixin):  # noqa: PLR0904
             command = self.command,
             ignore_inactive = ignore_inactive,
             exclude_ads_with_id = exclude_ads_with_id,
+            cache_file = self._ad_cache_file,
+            manifest_file = self._content_hash_manifest_file,
+            image_digests_file = self._image_digests_file,
+            due_index_file = self._due_index_file,
+            id_index_file = self._id_index_file,
+            validate_cached = self.config.ad_loading.validate_cached_ads,
+            workers = self.config.ad_loading.workers,
+            scan = scan,
         )
 
     # ------------------------------------------------------------------
@@ -469,15 +726,18 @@ class KleinanzeigenBot(WebScrapingMixin):  # noqa: PLR0904
     async def is_logged_in(self) -> bool:
         return await _login_flow.is_logged_in(self, username = self.config.login.username)
 
-    async def publish_ads(self, ad_cfgs:list[tuple[str, Ad, dict[str, Any]]]) -> None:
-        await _publishing_workflow.publish_ads(
-            self, ad_cfgs,
-            root_url = self.root_url,
-            config = self.config,
-            keep_old_ads = self.keep_old_ads,
-            capture_diagnostics = self._capture_publish_error_diagnostics_if_enabled,
-            config_file_path = self.config_file_path,
-        )
+    async def publish_ads(self, ad_cfgs:list[AdRecord]) -> None:
+        with ad_loading.recording_published_images(self._image_digests_file) as published:
+            await _publishing_workflow.publish_ads(
+                self, ad_cfgs,
+                root_url = self.root_url,
+                config = self.config,
+                keep_old_ads = self.keep_old_ads,
+                capture_diagnostics = self._capture_publish_error_diagnostics_if_enabled,
+                config_file_path = self.config_file_path,
+                published = published,
+                snapshot = self._published_ads_snapshot(),
+            )
 
     async def publish_ad(
         self, ad_file:str, ad_cfg:Ad, ad_cfg_orig:dict[str, Any], published_ads_list:list[PublishedAd], mode:AdUpdateStrategy = AdUpdateStrategy.REPLACE
@@ -504,7 +764,7 @@ class KleinanzeigenBot(WebScrapingMixin):  # noqa: PLR0904
             config_file_path = self.config_file_path,
         )
 
-    async def update_ads(self, ad_cfgs:list[tuple[str, Ad, dict[str, Any]]]) -> None:
+    async def update_ads(self, ad_cfgs:list[AdRecord]) -> None:
         """
         Updates a list of ads.
         The list gets filtered, so that only already published ads will be updated.
@@ -516,11 +776,14 @@ class KleinanzeigenBot(WebScrapingMixin):  # noqa: PLR0904
         Returns:
             None
         """
-        await _publishing_workflow.update_ads(
-            self, ad_cfgs,
-            root_url = self.root_url,
-            config = self.config,
-            keep_old_ads = self.keep_old_ads,
-            capture_diagnostics = self._capture_publish_error_diagnostics_if_enabled,
-            config_file_path = self.config_file_path,
-        )
+        with ad_loading.recording_published_images(self._image_digests_file) as published:
+            await _publishing_workflow.update_ads(
+                self, ad_cfgs,
+                root_url = self.root_url,
+                config = self.config,
+                keep_old_ads = self.keep_old_ads,
+                capture_diagnostics = self._capture_publish_error_diagnostics_if_enabled,
+                config_file_path = self.config_file_path,
+                published = published,
+                snapshot = self._published_ads_snapshot(),
+            )
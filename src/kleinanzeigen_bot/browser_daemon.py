@@ -0,0 +1,284 @@
+# SPDX-FileCopyrightText: © Jens Bergmann and contributors
+# SPDX-License-Identifier: AGPL-3.0-or-later
+# SPDX-ArtifactOfProjectHomePage: https://github.com/Second-Hand-Friends/kleinanzeigen-bot/
+"""Logged-in browser kept alive across bot runs by the `serve` command.
+
+`serve(...)` launches the browser of the workspace, logs in and publishes the remote debugging
+endpoint of the browser in `browser-daemon.json` in the workspace state directory. Later runs
+`attach(...)` to that browser instead of launching their own, skipping the browser start and the
+Chrome version checks, and only find themselves already logged in.
+
+Two lock files keep the processes apart:
+
+- `browser-daemon.lock` allows a single daemon per workspace, since the daemon's browser holds
+  the browser profile. Runs started while the daemon is still starting wait for its endpoint.
+- `browser-session.lock` is held by the run attached to the browser, so runs that overlap use the
+  browser one after another. The daemon holds it while starting and while checking the browser.
+
+Both contain the PID of their owner, so locks of crashed processes are taken over.
+"""
+
+from __future__ import annotations
+
+import asyncio, contextlib, json, os, signal, time  # isort: skip
+from dataclasses import asdict, dataclass
+from gettext import gettext as _
+from typing import TYPE_CHECKING, Final
+
+import psutil
+from nodriver.cdp import browser as cdp_browser
+
+from .utils import loggers as _loggers
+from .utils import misc as _misc
+from .utils import xdg_paths as _xdg_paths
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+    from pathlib import Path
+
+    from .model.config_model import ServeConfig
+    from .utils.web_scraping_mixin import WebScrapingMixin
+
+LOG:Final[_loggers.Logger] = _loggers.get_logger(__name__)
+
+ENDPOINT_FILE:Final[str] = "browser-daemon.json"
+DAEMON_LOCK_FILE:Final[str] = "browser-daemon.lock"
+SESSION_LOCK_FILE:Final[str] = "browser-session.lock"
+
+# a lock file whose PID is not written yet is only treated as stale after this many seconds
+_LOCK_WRITE_GRACE_SECONDS:Final[float] = 5.0
+_LOCK_POLL_INTERVAL_SECONDS:Final[float] = 0.5
+_HEALTH_CHECK_TIMEOUT_SECONDS:Final[float] = 10.0
+
+
+class PidLock:
+    """Exclusive lock file that contains the PID of its owner; the lock of a process that is gone is taken over."""
+
+    def __init__(self, path:Path) -> None:
+        self.path:Final[Path] = path
+
+    def owner(self) -> int | None:
+        """PID of the process holding the lock, None if the lock is free or stale."""
+        try:
+            content = self.path.read_text(encoding = "utf-8").strip()
+            age = time.time() - self.path.stat().st_mtime
+        except OSError:
+            return None
+        if not content.isdigit():
+            # the owner may not have written its PID yet
+            return -1 if age < _LOCK_WRITE_GRACE_SECONDS else None
+        pid = int(content)
+        return pid if psutil.pid_exists(pid) else None
+
+    def try_acquire(self) -> bool:
+        """Take the lock if it is free or stale, without waiting."""
+        for _attempt in range(2):
+            try:
+                fd = os.open(self.path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+            except FileExistsError:
+                if self.owner() is not None:
+                    return False
+                LOG.debug("Taking over stale lock %s", self.path)
+                with contextlib.suppress(FileNotFoundError):
+                    self.path.unlink()
+                continue
+            with os.fdopen(fd, "w", encoding = "utf-8") as lock_file:
+                lock_file.write(str(os.getpid()))
+            return True
+        return False
+
+    async def acquire(self, timeout:float) -> bool:
+        """Wait up to `timeout` seconds for the lock, return whether it was taken."""
+        deadline = time.monotonic() + timeout
+        while not self.try_acquire():
+            if time.monotonic() >= deadline:
+                return False
+            await asyncio.sleep(_LOCK_POLL_INTERVAL_SECONDS)
+        return True
+
+    def release(self) -> None:
+        """Remove the lock file if this process holds the lock."""
+        if self.owner() == os.getpid():
+            with contextlib.suppress(FileNotFoundError):
+                self.path.unlink()
+
+
+@dataclass(frozen = True, slots = True)
+class DaemonEndpoint:
+    """Remote debugging endpoint of the daemon's browser, as stored in `browser-daemon.json`."""
+
+    pid:int  # PID of the serve process
+    host:str
+    port:int
+    started_at:str  # ISO timestamp
+
+
+def read_endpoint(state_dir:Path) -> DaemonEndpoint | None:
+    """Return the endpoint of the running daemon of the workspace, None if no daemon is running."""
+    try:
+        endpoint = DaemonEndpoint(**json.loads((state_dir / ENDPOINT_FILE).read_text(encoding = "utf-8")))
+    except FileNotFoundError:
+        return None
+    except (OSError, TypeError, ValueError) as ex:
+        LOG.debug("Ignoring unreadable browser daemon endpoint: %s", ex)
+        return None
+    if not psutil.pid_exists(endpoint.pid):
+        LOG.debug("Ignoring endpoint of the browser daemon with PID %d, which is no longer running", endpoint.pid)
+        return None
+    return endpoint
+
+
+def _write_endpoint(state_dir:Path, endpoint:DaemonEndpoint) -> None:
+    tmp_file = state_dir / f"{ENDPOINT_FILE}.tmp"
+    tmp_file.write_text(json.dumps(asdict(endpoint)), encoding = "utf-8")
+    tmp_file.replace(state_dir / ENDPOINT_FILE)
+
+
+class DaemonLease:
+    """The attachment of a run to the daemon's browser, held until the run closes its browser session."""
+
+    def __init__(self, state_dir:Path, endpoint:DaemonEndpoint, session_lock:PidLock) -> None:
+        self.endpoint:Final[DaemonEndpoint] = endpoint
+        self._state_dir = state_dir
+        self._session_lock = session_lock
+
+    def release(self) -> None:
+        """Hand the browser back to the daemon, which measures its idle time from now on."""
+        with contextlib.suppress(OSError):
+            os.utime(self._state_dir / ENDPOINT_FILE)
+        self._session_lock.release()
+
+
+async def _wait_for_endpoint(state_dir:Path, timeout:float) -> DaemonEndpoint | None:
+    """Wait up to `timeout` seconds for the daemon holding the daemon lock to publish its endpoint, None if no daemon is running."""
+    daemon_lock = PidLock(state_dir / DAEMON_LOCK_FILE)
+    deadline = time.monotonic() + timeout
+    waiting = False
+    while (endpoint := read_endpoint(state_dir)) is None:
+        if daemon_lock.owner() is None:
+            return None  # no daemon, or it stopped before its browser was up
+        if not waiting:
+            LOG.info("Waiting for the browser daemon to start its browser...")
+            waiting = True
+        if time.monotonic() >= deadline:
+            raise TimeoutError(_("The browser daemon did not start its browser within %s seconds") % timeout)
+        await asyncio.sleep(_LOCK_POLL_INTERVAL_SECONDS)
+    return endpoint
+
+
+async def attach(web:WebScrapingMixin, *, state_dir:Path, timeout:float) -> DaemonLease | None:
+    """
+    Connect `web` to the browser of the running daemon of the workspace.
+
+    Waits up to `timeout` seconds while the daemon is still starting its browser and logging in,
+    or while another run is using the browser.
+
+    :return: the lease to release when the browser session is closed, None if no daemon is running
+        or its browser is not reachable, so a browser has to be launched
+    :raises TimeoutError: if the browser was not available after `timeout` seconds
+    """
+    deadline = time.monotonic() + timeout
+    if await _wait_for_endpoint(state_dir, timeout) is None:
+        return None
+    session_lock = PidLock(state_dir / SESSION_LOCK_FILE)
+    if not session_lock.try_acquire():
+        LOG.info("Waiting for another run to finish using the browser daemon...")
+        if not await session_lock.acquire(max(0.0, deadline - time.monotonic())):
+            raise TimeoutError(_("The browser daemon was still in use after %s seconds") % timeout)
+
+    # the daemon may have shut down or restarted its browser in the meantime
+    endpoint = read_endpoint(state_dir)
+    if endpoint is None:
+        session_lock.release()
+        return None
+    try:
+        await web.connect_browser_session(endpoint.host, endpoint.port)
+    except Exception as ex:  # noqa: BLE001 fall back to launching a browser
+        session_lock.release()
+        LOG.warning("Could not attach to the browser daemon at %s:%d, launching a browser instead: %s", endpoint.host, endpoint.port, ex)
+        return None
+    LOG.info("Attached to the browser daemon (PID %d) at %s:%d", endpoint.pid, endpoint.host, endpoint.port)
+    return DaemonLease(state_dir, endpoint, session_lock)
+
+
+def _idle_seconds(state_dir:Path) -> float:
+    """Seconds since the last run released the browser, or since the browser was started."""
+    return time.time() - (state_dir / ENDPOINT_FILE).stat().st_mtime
+
+
+async def _is_browser_healthy(web:WebScrapingMixin) -> bool:
+    try:
+        await asyncio.wait_for(web.browser.send(cdp_browser.get_version()), timeout = _HEALTH_CHECK_TIMEOUT_SECONDS)
+    except Exception as ex:  # noqa: BLE001 any failure means the browser is unusable
+        LOG.debug("Browser health check failed: %s", ex)
+        return False
+    return True
+
+
+async def _start_browser(web:WebScrapingMixin, state_dir:Path, login:Callable[[], Awaitable[None]]) -> DaemonEndpoint:
+    await web.create_browser_session()
+    await login()
+    endpoint = DaemonEndpoint(
+        pid = os.getpid(),
+        host = web.browser.config.host,
+        port = web.browser.config.port,
+        started_at = _misc.now().isoformat(),
+    )
+    _write_endpoint(state_dir, endpoint)
+    return endpoint
+
+
+async def serve(web:WebScrapingMixin, *, state_dir:Path, config:ServeConfig, login:Callable[[], Awaitable[None]]) -> None:
+    """
+    Keep a logged-in browser running for later runs until it was not used for `config.idle_timeout` seconds.
+
+    Every `config.health_check_interval` seconds, while no run is attached, the browser is checked with a
+    CDP round trip and restarted and logged in again if it does not answer. SIGTERM shuts the daemon down.
+    """
+    _xdg_paths.ensure_directory(state_dir, "state directory")
+    daemon_lock = PidLock(state_dir / DAEMON_LOCK_FILE)
+    if not daemon_lock.try_acquire():
+        LOG.info("The browser daemon of this workspace is already running (PID %s)", daemon_lock.owner())
+        return
+
+    session_lock = PidLock(state_dir / SESSION_LOCK_FILE)
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    with contextlib.suppress(NotImplementedError, AttributeError, RuntimeError):  # not available on Windows
+        loop.add_signal_handler(signal.SIGTERM, stop.set)
+    try:
+        if not await session_lock.acquire(config.attach_timeout):
+            raise TimeoutError(_("The browser of this workspace was still in use after %s seconds") % config.attach_timeout)
+        try:
+            endpoint = await _start_browser(web, state_dir, login)
+        finally:
+            session_lock.release()
+        LOG.info("Browser daemon is running at %s:%d, runs of this workspace will use its browser", endpoint.host, endpoint.port)
+
+        while True:
+            with contextlib.suppress(TimeoutError, asyncio.TimeoutError):
+                await asyncio.wait_for(stop.wait(), timeout = config.health_check_interval)
+            if stop.is_set():
+                LOG.info("Browser daemon stopped")
+                break
+            if not session_lock.try_acquire():
+                continue  # a run is using the browser
+            try:
+                idle = _idle_seconds(state_dir)
+                if config.idle_timeout and idle >= config.idle_timeout:
+                    LOG.info("Browser daemon was not used for %d seconds, shutting down", idle)
+                    break
+                if not await _is_browser_healthy(web):
+                    LOG.warning("The browser of the browser daemon does not respond, restarting it...")
+                    web.close_browser_session()
+                    endpoint = await _start_browser(web, state_dir, login)
+                    LOG.info("Browser daemon is running at %s:%d, runs of this workspace will use its browser", endpoint.host, endpoint.port)
+            finally:
+                session_lock.release()
+    finally:
+        with contextlib.suppress(NotImplementedError, AttributeError, RuntimeError):
+            loop.remove_signal_handler(signal.SIGTERM)
+        with contextlib.suppress(FileNotFoundError):
+            (state_dir / ENDPOINT_FILE).unlink()
+        web.close_browser_session()
+        daemon_lock.release()
@@ -50,6 +50,8 @@ class ParsedArgs:
     ads_selector:str = "due"
     ads_selector_explicit:bool = False
     keep_old_ads:bool = False
+    use_ad_cache:bool = True
+    status_forecast:int = 0
     preserve_local_settings:bool = False
     config_arg:str | None = None
     config_file_path:str | None = None
@@ -136,9 +138,12 @@ def help_text(*, executable:str | None = None, language:str | None = None) -> st
               update-content-hash - Berechnet den content_hash aller Anzeigen anhand der aktuellen ad_defaults neu;
                                     nach Änderungen an den config.yaml/ad_defaults verhindert es, dass alle Anzeigen als
                                     "geändert" gelten und neu veröffentlicht werden.
+              timing-tune - Zeigt die aus den Zeitmessdaten gelernten Timeouts neben den konfigurierten an
               create-config - Erstellt eine neue Standard-Konfigurationsdatei, falls noch nicht vorhanden
               diagnose - Diagnostiziert Browser-Verbindungsprobleme und zeigt Troubleshooting-Informationen
               status   - Zeigt Anzeigenstatus und APR-Vorschau an
+              watch    - Läuft dauerhaft, überwacht die Anzeigendateien und veröffentlicht Anzeigen, sobald sie fällig oder geändert sind
+              serve    - Hält einen angemeldeten Browser offen, den nachfolgende Aufrufe sofort weiterverwenden
               --
               help     - Zeigt diese Hilfe an (Standardbefehl)
               version  - Zeigt die Version der Anwendung an
@@ -168,8 +173,13 @@ def help_text(*, executable:str | None = None, language:str | None = None) -> st
                     * all: Verlängert alle Anzeigen, die innerhalb von 8 Tagen ablaufen
                     * <id(s)>: Gibt bestimmte Anzeigen-IDs an, z. B. "--ads=1,2,3"
                     * Hinweis: Anzeigen außerhalb des 8-Tage-Fensters werden übersprungen.
+              --ads=new|due|changed (watch) - Gibt an, welche Anzeigen automatisch veröffentlicht werden (STANDARD: due,changed)
+                    * Kombinationen wie bei publish, z. B. "--ads=new,due"
+              --forecast=N (status) - Zeigt für Anzeigen mit automatischer Preisreduzierung den voraussichtlichen Preis
+                    bei jeder der nächsten N Wiederveröffentlichungen
               --force           - Alias für '--ads=all'
               --keep-old        - Verhindert das Löschen alter Anzeigen bei erneuter Veröffentlichung
+              --no-cache        - Liest und validiert alle Anzeigendateien neu, statt den Anzeigen-Cache im State-Verzeichnis zu verwenden
               --preserve-local-settings - Erzwingt das Beibehalten lokaler Einstellungen bei erneutem Download (überschreibt config-Wert false)
               --config=<PATH>   - Pfad zur YAML- oder JSON-Konfigurationsdatei (ändert den Workspace-Modus nicht implizit)
               --workspace-mode=portable|xdg - Überschreibt den Workspace-Modus für diesen Lauf
@@ -193,9 +203,12 @@ def help_text(*, executable:str | None = None, language:str | None = None) -> st
           update-check - checks for available updates
           update-content-hash – recalculates each ad's content_hash based on the current ad_defaults;
                                 use this after changing config.yaml/ad_defaults to avoid every ad being marked "changed" and republished
+          timing-tune - shows the timeouts learned from the recorded timing data next to the configured ones
           create-config - creates a new default configuration file if one does not exist
           diagnose - diagnoses browser connection issues and shows troubleshooting information
           status   - shows ad status and APR preview details
+          watch    - keeps running, watches the ad files and publishes ads as soon as they become due or change
+          serve    - keeps a logged-in browser running, which subsequent runs reuse instantly
           --
           help     - displays this help (default command)
           version  - displays the application version
@@ -224,8 +237,13 @@ def help_text(*, executable:str | None = None, language:str | None = None) -> st
                 * all: extend all ads expiring within 8 days
                 * <id(s)>: specify ad IDs to extend, e.g. "--ads=1,2,3"
                 * Note: ads outside the 8-day window are skipped.
+          --ads=new|due|changed (watch) - specifies which ads to publish automatically (DEFAULT: due,changed)
+                * Combinations work like for publish, e.g. "--ads=new,due"
+          --forecast=N (status) - shows the projected price at each of the next N republications
+                of ads with auto price reduction
           --force           - alias for '--ads=all'
           --keep-old        - don't delete old ads on republication
+          --no-cache        - re-parse and re-validate all ad files instead of using the ad cache in the state directory
           --preserve-local-settings - force-enable preservation of local-only settings on re-download (overrides config value of false)
           --config=<PATH>   - path to the config YAML or JSON file (does not implicitly change workspace mode)
           --workspace-mode=portable|xdg - overrides workspace mode for this run
@@ -247,7 +265,10 @@ def parse_args(args:Sequence[str]) -> ParsedArgs:
         options, arguments = getopt.gnu_getopt(
             list(args)[1:],
             "hv",
-            ["ads=", "config=", "force", "help", "keep-old", "logfile=", "lang=", "preserve-local-settings", "verbose", "workspace-mode="],
+            [
+                "ads=", "config=", "force", "forecast=", "help", "keep-old", "logfile=", "lang=", "no-cache", "preserve-local-settings",
+                "verbose", "workspace-mode=",
+            ],
         )
     except getopt.error as ex:
         LOG.error(ex.msg)
@@ -274,11 +295,18 @@ def parse_args(args:Sequence[str]) -> ParsedArgs:
             case "--ads":
                 parsed.ads_selector = value.strip().lower()
                 parsed.ads_selector_explicit = True
+            case "--forecast":
+                if not value.isdigit() or int(value) < 1:
+                    LOG.error("Invalid --forecast '%s'. Use a positive number of reposts.", value)
+                    sys.exit(2)
+                parsed.status_forecast = int(value)
             case "--force":
                 parsed.ads_selector = "all"
                 parsed.ads_selector_explicit = True
             case "--keep-old":
                 parsed.keep_old_ads = True
+            case "--no-cache":
+                parsed.use_ad_cache = False
             case "--preserve-local-settings":
                 parsed.preserve_local_settings = True
             case "--lang":
@@ -3,13 +3,15 @@
 # SPDX-ArtifactOfProjectHomePage: https://github.com/Second-Hand-Friends/kleinanzeigen-bot/
 """Ad deletion browser workflow."""
 
+from collections.abc import Sequence
 from gettext import gettext as _
-from typing import Any, Final, Literal, NamedTuple
+from typing import Final, Literal, NamedTuple
 
 from . import ad_state as _ad_state
 from . import published_ads
+from .ad_record import AdRecord
 from .model.ad_model import Ad
-from .published_ads import PublishedAd
+from .published_ads import PublishedAd, PublishedAdsIndex, PublishedAdsSnapshot
 from .utils import dicts as _dicts
 from .utils import loggers as _loggers
 from .utils.i18n import pluralize
@@ -39,23 +41,27 @@ async def delete_ads(
     after_delete:Literal["NONE", "RESET", "DISABLE"],
     *,
     delete_old_ads_by_title:bool,
-    ad_cfgs:list[tuple[str, Ad, dict[str, Any]]],
+    ad_cfgs:list[AdRecord],
+    snapshot:PublishedAdsSnapshot | None = None,
 ) -> None:
+    """Delete the given ads; *snapshot* (the run's published ads) is invalidated by the first delete attempt."""
     count = 0
     deleted_count = 0
 
-    needs_title_matching = delete_old_ads_by_title and any(ad_cfg.id is None for _, ad_cfg, _ in ad_cfgs)
+    snapshot = snapshot or PublishedAdsSnapshot(web, root_url)
+    needs_title_matching = delete_old_ads_by_title and any(record.ad_cfg.id is None for record in ad_cfgs)
     title_matching_fetch_error:published_ads.PublishedAdsFetchIncompleteError | None = None
     if needs_title_matching:
         try:
-            published_ads_list = await published_ads.fetch_published_ads(web, root_url, strict = True)
+            published_ads_list = await snapshot.get(strict = True)
         except published_ads.PublishedAdsFetchIncompleteError as ex:
-            published_ads_list = []
+            published_ads_list = PublishedAdsIndex()
             title_matching_fetch_error = ex
     else:
-        published_ads_list = []
+        published_ads_list = PublishedAdsIndex()
 
-    for ad_file, ad_cfg, ad_cfg_orig in ad_cfgs:
+    for record in ad_cfgs:
+        ad_file, ad_cfg = record.ad_file, record.ad_cfg
         count += 1
         LOG.info("Processing %s/%s: '%s' from [%s]...", count, len(ad_cfgs), ad_cfg.title, ad_file)
 
@@ -67,12 +73,15 @@ async def delete_ads(
             result = DeleteResult(deleted = False, attempted = False)
         else:
             result = await delete_ad(web, root_url, ad_cfg, published_ads_list, delete_old_ads_by_title = delete_old_ads_by_title)
+        if result.attempted:
+            snapshot.invalidate()
         if result.deleted:
             deleted_count += 1
 
         if result.attempted and after_delete != "NONE":
-            if _ad_state.apply_after_delete_policy(ad_cfg, ad_cfg_orig, mode = after_delete):
-                _dicts.save_dict(ad_file, ad_cfg_orig)
+            if _ad_state.apply_after_delete_policy(ad_cfg, record.raw, mode = after_delete):
+                _dicts.save_dict(ad_file, record.raw)
+            record.release_raw()
         await web.web_sleep()
 
     LOG.info("############################################")
@@ -84,7 +93,7 @@ async def delete_ad(
     web:WebScrapingMixin,
     root_url:str,
     ad_cfg:Ad,
-    published_ads_list:list[PublishedAd],
+    published_ads_list:Sequence[PublishedAd],
     *,
     delete_old_ads_by_title:bool,
 ) -> DeleteResult:
@@ -108,20 +117,9 @@ async def delete_ad(
     if ad_cfg.id is not None:
         ids_to_delete.add(ad_cfg.id)
     elif delete_old_ads_by_title:
-        for published_ad in published_ads_list:
-            raw_id = published_ad.get("id")
-            if raw_id is None:
-                LOG.debug("Skipping published ad with missing id: %r", published_ad.get("title"))
-                continue
-            try:
-                published_ad_id = int(raw_id)
-            except (ValueError, TypeError):
-                LOG.debug("Skipping published ad with invalid id: %r", raw_id)
-                continue
-            published_ad_title = published_ad.get("title", "")
-            if ad_cfg.title == published_ad_title:
-                LOG.debug(" -> matched ad %s '%s' for deletion", published_ad_id, published_ad_title)
-                ids_to_delete.add(published_ad_id)
+        for published_ad_id in PublishedAdsIndex.of(published_ads_list).ids_by_title(ad_cfg.title):
+            LOG.debug(" -> matched ad %s '%s' for deletion", published_ad_id, ad_cfg.title)
+            ids_to_delete.add(published_ad_id)
 
         if len(ids_to_delete) > 1:
             LOG.error(
@@ -4,13 +4,13 @@
 """Ad download browser workflow."""
 
 from pathlib import Path
-from typing import Any, Protocol
+from typing import Protocol
 
 from . import download_selection as _download_selection
-from . import extract, published_ads
-from .model.ad_model import Ad
+from . import extract
+from .ad_record import AdRecord
 from .model.config_model import DEFAULT_DOWNLOAD_DIR, Config
-from .published_ads import PublishedAd
+from .published_ads import PublishedAd, PublishedAdsSnapshot
 from .utils import loggers as _loggers
 from .utils import xdg_paths as _xdg_paths
 from .utils.files import abspath
@@ -21,7 +21,7 @@ from .utils.web_scraping_mixin import WebScrapingMixin
 class LoadAdsFunc(Protocol):
     """Protocol for callable that loads ads, matching ad_loading.load_ads signature."""
 
-    def __call__(self, *, ignore_inactive:bool = True, exclude_ads_with_id:bool = True) -> list[tuple[str, Ad, dict[str, Any]]]:
+    def __call__(self, *, ignore_inactive:bool = True, exclude_ads_with_id:bool = True) -> list[AdRecord]:
         raise NotImplementedError
 
 
@@ -82,22 +82,17 @@ async def _download_ad_with_resolved_state(
 
 
 async def _fetch_published_ads_by_id(
-    web:WebScrapingMixin,
-    root_url:str,
+    snapshot:PublishedAdsSnapshot,
     *,
     strict:bool,
 ) -> dict[int, PublishedAd]:
     """Fetch published ads from manage-ads API and build a lookup dict."""
     LOG.info("Fetching ad metadata (status, expiry dates)...")
-    published_ads_list = await published_ads.fetch_published_ads(web, root_url, strict = strict)
-    published_ads_by_id:dict[int, PublishedAd] = {}
-    for published_ad in published_ads_list:
-        try:
-            ad_id = published_ad.get("id")
-            if ad_id is not None:
-                published_ads_by_id[int(ad_id)] = published_ad
-        except (ValueError, TypeError):
+    published_ads_index = await snapshot.get(strict = strict)
+    for published_ad in published_ads_index.unindexed:
+        if published_ad.get("id") is not None:
             LOG.warning("Skipping ad with non-numeric id: %s", published_ad.get("id"))
+    published_ads_by_id = dict(published_ads_index.by_id)
     LOG.info("Loaded metadata for %s published ads.", len(published_ads_by_id))
     return published_ads_by_id
 
@@ -138,10 +133,10 @@ async def _download_new_ads(
     # check which ads already saved
     saved_ad_ids:set[int] = set()
     ads = load_ads_func(ignore_inactive = False, exclude_ads_with_id = False)
-    for ad in ads:
-        saved_ad_id = ad[1].id
+    for record in ads:
+        saved_ad_id = record.ad_cfg.id
         if saved_ad_id is None:
-            LOG.debug("Skipping saved ad without id (likely unpublished or manually created): %s", ad[0])
+            LOG.debug("Skipping saved ad without id (likely unpublished or manually created): %s", record.ad_file)
             continue
         saved_ad_ids.add(int(saved_ad_id))
 
@@ -204,10 +199,12 @@ async def download_ads(
     *,
     load_ads_func:LoadAdsFunc,
     root_url:str,
+    snapshot:PublishedAdsSnapshot | None = None,
 ) -> None:
     """
     Determines which download mode was chosen with the arguments, and calls the specified download routine.
     This downloads either all, only unsaved(new), or specific ads given by ID.
+    The ad metadata is taken from *snapshot*, the run's published ads (a fresh one when omitted).
     """
     # Normalize comma-separated keyword selectors; set deduplication collapses "new,new" → {"new"}
     selector_tokens = {s.strip() for s in ads_selector.split(",")}
@@ -226,7 +223,7 @@ async def download_ads(
 
     # Fetch published ads once and build a lookup dict
     published_ads_by_id = await _fetch_published_ads_by_id(
-        web, root_url, strict = is_numeric_selector,
+        snapshot or PublishedAdsSnapshot(web, root_url), strict = is_numeric_selector,
     )
 
     download_dir = resolve_download_dir(config, config_file_path, workspace)
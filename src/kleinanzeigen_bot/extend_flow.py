@@ -8,11 +8,11 @@ from __future__ import annotations
 from datetime import datetime
 from typing import TYPE_CHECKING, Any
 
-from . import published_ads
-from .published_ads import ad_matches_id
+from .published_ads import PublishedAdsSnapshot
 from .utils import dicts as _dicts
 
 if TYPE_CHECKING:
+    from .ad_record import AdRecord
     from .model.ad_model import Ad
     from .published_ads import PublishedAd
 from .utils import loggers as _loggers
@@ -26,23 +26,24 @@ LOG:_loggers.Logger = _loggers.get_logger(__name__)
 async def extend_ads(
     web:WebScrapingMixin,
     root_url:str,
-    ad_cfgs:list[tuple[str, Ad, dict[str, Any]]],
+    ad_cfgs:list[AdRecord],
+    snapshot:PublishedAdsSnapshot | None = None,
 ) -> None:
-    """Extends ads that are close to expiry."""
+    """Extends ads that are close to expiry; *snapshot* (the run's published ads) is invalidated before the first extension."""
     # Fetch currently published ads from API
-    published_ads_list = await published_ads.fetch_published_ads(web, root_url)
+    snapshot = snapshot or PublishedAdsSnapshot(web, root_url)
+    published_ads_list = await snapshot.get()
 
     # Filter ads that need extension
-    ads_to_extend:list[tuple[str, Ad, dict[str, Any]]] = []
-    for ad_file, ad_cfg, ad_cfg_orig in ad_cfgs:
+    ads_to_extend:list[AdRecord] = []
+    for record in ad_cfgs:
+        ad_cfg = record.ad_cfg
         # Skip unpublished ads (no ID)
         if ad_cfg.id is None:
             LOG.info(" -> SKIPPED: ad '%s' is not published yet", ad_cfg.title)
             continue
 
-        published_ad:PublishedAd | None = next(
-            (ad for ad in published_ads_list if ad_matches_id(ad, ad_cfg.id)), None
-        )
+        published_ad:PublishedAd | None = published_ads_list.get(ad_cfg.id)
         if not published_ad:
             LOG.warning(" -> SKIPPED: ad '%s' (ID: %s) not found in published ads", ad_cfg.title, ad_cfg.id)
             continue
@@ -69,7 +70,7 @@ async def extend_ads(
         # Magic value 8 is kleinanzeigen.de's platform policy: extensions only possible within 8 days of expiry
         if days_until_expiry <= 8:  # noqa: PLR2004
             LOG.info(" -> ad '%s' expires in %d days, will extend", ad_cfg.title, days_until_expiry)
-            ads_to_extend.append((ad_file, ad_cfg, ad_cfg_orig))
+            ads_to_extend.append(record)
         else:
             LOG.info(" -> SKIPPED: ad '%s' expires in %d days (can only extend within 8 days)", ad_cfg.title, days_until_expiry)
 
@@ -81,11 +82,13 @@ async def extend_ads(
         return
 
     # Process extensions
+    snapshot.invalidate()
     success_count = 0
-    for idx, (ad_file, ad_cfg, ad_cfg_orig) in enumerate(ads_to_extend, start = 1):
-        LOG.info("Processing %s/%s: '%s' from [%s]...", idx, len(ads_to_extend), ad_cfg.title, ad_file)
-        if await _extend_ad(web, root_url, ad_file, ad_cfg, ad_cfg_orig):
+    for idx, record in enumerate(ads_to_extend, start = 1):
+        LOG.info("Processing %s/%s: '%s' from [%s]...", idx, len(ads_to_extend), record.ad_cfg.title, record.ad_file)
+        if await _extend_ad(web, root_url, record.ad_file, record.ad_cfg, record.raw):
             success_count += 1
+        record.release_raw()
         await web.web_sleep()
 
     LOG.info("############################################")
@@ -10,7 +10,7 @@ import time
 from gettext import gettext as _
 from string import Formatter
 
-import json, mimetypes, re, shutil  # isort: skip
+import mimetypes, re, shutil  # isort: skip
 import urllib.error as urllib_error
 import urllib.request as urllib_request
 from datetime import datetime
@@ -22,7 +22,7 @@ from kleinanzeigen_bot.model.ad_model import ContactPartial
 from .model.ad_model import OPTION_NAME_BY_CARRIER_CODE, AdPartial, validate_condition_api_mapping
 from .model.config_model import AutoPriceReductionConfig, Config
 from .utils import dicts, files, i18n, loggers, misc, reflect
-from .utils.web_scraping_mixin import Browser, By, Element, WebScrapingMixin
+from .utils.web_scraping_mixin import MISSING, Browser, By, Read, SnapshotField, WebScrapingMixin
 
 __all__ = [
     "AdExtractor",
@@ -54,6 +54,26 @@ _LABEL_TO_KEY:Final[dict[str, str]] = {
 }
 DOWNLOAD_CREATION_DATE_SELECTOR:Final[str] = "#viewad-extra-info > div:nth-child(1) > span:nth-child(2)"
 
+# Fields read by the _extract_*_from_ad_page helpers, one web_snapshot per helper.
+_CATEGORY_FIELDS:Final[dict[str, SnapshotField]] = {
+    "breadcrumb": SnapshotField(By.ID, "vap-brdcrmb", Read.EXISTS),
+    "breadcrumb_hrefs": SnapshotField(By.CSS_SELECTOR, "#vap-brdcrmb a", Read.ATTRIBUTE, "href", multiple = True),
+    "legacy_first_href": SnapshotField(By.CSS_SELECTOR, "#vap-brdcrmb a:nth-of-type(2)", Read.ATTRIBUTE, "href"),
+    "legacy_second_href": SnapshotField(By.CSS_SELECTOR, "#vap-brdcrmb a:nth-of-type(3)", Read.ATTRIBUTE, "href"),
+}
+_PRICE_FIELDS:Final[dict[str, SnapshotField]] = {"price": SnapshotField(By.ID, "viewad-price")}
+_SHIPPING_FIELDS:Final[dict[str, SnapshotField]] = {"shipping": SnapshotField(By.CLASS_NAME, "boxedarticle--details--shipping")}
+# the contact name is read from the first '.iconlist-text' element of the contact box only
+_CONTACT_NAME_XPATH:Final[str] = "(//*[@id='viewad-contact']//*[contains(concat(' ', normalize-space(@class), ' '), ' iconlist-text ')])[1]"
+_CONTACT_FIELDS:Final[dict[str, SnapshotField]] = {
+    "locality": SnapshotField(By.ID, "viewad-locality"),
+    "street": SnapshotField(By.ID, "street-address"),
+    "contact": SnapshotField(By.CSS_SELECTOR, "#viewad-contact .iconlist-text", Read.EXISTS),
+    "name_link": SnapshotField(By.XPATH, _CONTACT_NAME_XPATH + "//a"),
+    "name_text": SnapshotField(By.XPATH, _CONTACT_NAME_XPATH + "//span"),
+    "phone": SnapshotField(By.CSS_SELECTOR, "#viewad-contact-phone a"),
+}
+
 
 def _is_retryable_rmtree_error(error:BaseException) -> bool:
     if isinstance(error, PermissionError):
@@ -783,19 +803,14 @@ class AdExtractor(WebScrapingMixin):
         :return: a category string of form abc/def, where a-f are digits
         """
         try:
-            category_line = await self.web_find(By.ID, "vap-brdcrmb")
+            snapshot = await self.web_snapshot(_CATEGORY_FIELDS, required = ("breadcrumb",))
         except TimeoutError as exc:
             LOG.warning("Breadcrumb container 'vap-brdcrmb' not found; cannot extract ad category: %s", exc)
             raise
-        try:
-            breadcrumb_links = await self.web_find_all(By.CSS_SELECTOR, "a", parent = category_line)
-        except TimeoutError:
-            breadcrumb_links = []
 
         category_ids:list[str] = []
-        for link in breadcrumb_links:
-            href = str(link.attrs.get("href", "") or "")
-            matches = BREADCRUMB_RE.findall(href)
+        for href in snapshot["breadcrumb_hrefs"]:
+            matches = BREADCRUMB_RE.findall(str(href or ""))
             if matches:
                 category_ids.extend(matches)
 
@@ -807,17 +822,13 @@ class AdExtractor(WebScrapingMixin):
 
         # Fallback to legacy selectors in case the breadcrumb structure is unexpected.
         LOG.debug("Falling back to legacy breadcrumb selectors; collected ids: %s", category_ids)
-        fallback_timeout = self.effective_timeout()
-        try:
-            category_first_part = await self.web_find(By.CSS_SELECTOR, "a:nth-of-type(2)", parent = category_line)
-            category_second_part = await self.web_find(By.CSS_SELECTOR, "a:nth-of-type(3)", parent = category_line)
-        except TimeoutError as exc:
+        href_first, href_second = snapshot["legacy_first_href"], snapshot["legacy_second_href"]
+        if href_first is MISSING or href_second is MISSING:
+            fallback_timeout = self.effective_timeout()
             LOG.error("Legacy breadcrumb selectors not found within %.1f seconds (collected ids: %s)", fallback_timeout, category_ids)
-            raise TimeoutError(_("Unable to locate breadcrumb fallback selectors within %(seconds).1f seconds.") % {"seconds": fallback_timeout}) from exc
-        href_first:str = str(category_first_part.attrs["href"])
-        href_second:str = str(category_second_part.attrs["href"])
-        cat_num_first_raw = href_first.rsplit("/", maxsplit = 1)[-1]
-        cat_num_second_raw = href_second.rsplit("/", maxsplit = 1)[-1]
+            raise TimeoutError(_("Unable to locate breadcrumb fallback selectors within %(seconds).1f seconds.") % {"seconds": fallback_timeout})
+        cat_num_first_raw = str(href_first).rsplit("/", maxsplit = 1)[-1]
+        cat_num_second_raw = str(href_second).rsplit("/", maxsplit = 1)[-1]
         cat_num_first = cat_num_first_raw[1:] if cat_num_first_raw.startswith("c") else cat_num_first_raw
         cat_num_second = cat_num_second_raw[1:] if cat_num_second_raw.startswith("c") else cat_num_second_raw
         category:str = cat_num_first + "/" + cat_num_second
@@ -891,25 +902,26 @@ class AdExtractor(WebScrapingMixin):
         :return: the price of the offer (optional); and the pricing type
         """
         try:
-            price_str:str = await self.web_text(By.ID, "viewad-price")
-            price:int | None = None
-            match price_str.rsplit(maxsplit = 1)[-1]:
-                case "€":
-                    price_type = "FIXED"
-                    # replace('.', '') is to remove the thousands separator before parsing as int
-                    price = int(price_str.replace(".", "").split(maxsplit = 1)[0])
-                case "VB":
-                    price_type = "NEGOTIABLE"
-                    if price_str != "VB":  # can be either 'X € VB', or just 'VB'
-                        price = int(price_str.replace(".", "").split(maxsplit = 1)[0])
-                case "verschenken":
-                    price_type = "GIVE_AWAY"
-                case _:
-                    price_type = "NOT_APPLICABLE"
-            return price, price_type
+            price_str = (await self.web_snapshot(_PRICE_FIELDS, required = ("price",)))["price"]
         except TimeoutError:  # no 'commercial' ad, has no pricing box etc.
             return None, "NOT_APPLICABLE"
 
+        price:int | None = None
+        match price_str.rsplit(maxsplit = 1)[-1]:
+            case "€":
+                price_type = "FIXED"
+                # replace('.', '') is to remove the thousands separator before parsing as int
+                price = int(price_str.replace(".", "").split(maxsplit = 1)[0])
+            case "VB":
+                price_type = "NEGOTIABLE"
+                if price_str != "VB":  # can be either 'X € VB', or just 'VB'
+                    price = int(price_str.replace(".", "").split(maxsplit = 1)[0])
+            case "verschenken":
+                price_type = "GIVE_AWAY"
+            case _:
+                price_type = "NOT_APPLICABLE"
+        return price, price_type
+
     async def _extract_shipping_info_from_ad_page(self) -> tuple[str, float | None, list[str] | None]:
         """
         Extracts shipping information from an ad page.
@@ -918,60 +930,60 @@ class AdExtractor(WebScrapingMixin):
         """
         ship_type, ship_costs, shipping_options = "NOT_APPLICABLE", None, None
         try:
-            shipping_text = await self.web_text(By.CLASS_NAME, "boxedarticle--details--shipping")
-            # e.g. '+ Versand ab 5,49 €' OR 'Nur Abholung'
-            if shipping_text == "Nur Abholung":
-                ship_type = "PICKUP"
-            elif shipping_text == "Versand möglich":
-                ship_type = "SHIPPING"
-            elif "€" in shipping_text:
-                shipping_price_parts = shipping_text.split(" ")
-                ship_type = "SHIPPING"
-                ship_costs = float(misc.parse_decimal(shipping_price_parts[-2]))
-
-                # reading shipping option from kleinanzeigen
-                # and find the right one by price
-                shipping_costs = json.loads(
-                    (await self.web_request("https://gateway.kleinanzeigen.de/postad/api/v1/shipping-options?posterType=PRIVATE"))["content"]
-                )["data"]["shippingOptionsResponse"]["options"]
-
-                # map to internal shipping identifiers used by kleinanzeigen-bot
-                shipping_option_mapping = OPTION_NAME_BY_CARRIER_CODE
-
-                # Convert Euro to cents and round to nearest integer
-                price_in_cent = round(ship_costs * 100)
-
-                # If include_all_matching_shipping_options is enabled, get all options for the same package size
-                if self.config.download.include_all_matching_shipping_options:
-                    # Find all options with the same price to determine the package size
-                    matching_options = [opt for opt in shipping_costs if opt["priceInEuroCent"] == price_in_cent]
-                    if not matching_options:
-                        return "SHIPPING", ship_costs, None
-
-                    # Use the package size of the first matching option
-                    matching_size = matching_options[0]["packageSize"]
-
-                    # Get all options of the same size
-                    shipping_options = [
-                        shipping_option_mapping[opt["id"]]
-                        for opt in shipping_costs
-                        if opt["packageSize"] == matching_size
-                        and opt["id"] in shipping_option_mapping
-                        and shipping_option_mapping[opt["id"]] not in self.config.download.excluded_shipping_options
-                    ]
-                else:
-                    # Only use the matching option if it's not excluded
-                    matching_option = next((x for x in shipping_costs if x["priceInEuroCent"] == price_in_cent), None)
-                    if not matching_option:
-                        return "SHIPPING", ship_costs, None
-
-                    shipping_option = shipping_option_mapping.get(matching_option["id"])
-                    if not shipping_option or shipping_option in self.config.download.excluded_shipping_options:
-                        return "SHIPPING", ship_costs, None
-                    shipping_options = [shipping_option]
-
+            shipping_text = (await self.web_snapshot(_SHIPPING_FIELDS, required = ("shipping",)))["shipping"]
         except TimeoutError:  # no pricing box -> no shipping given
-            ship_type = "NOT_APPLICABLE"
+            return ship_type, ship_costs, shipping_options
+
+        # e.g. '+ Versand ab 5,49 €' OR 'Nur Abholung'
+        if shipping_text == "Nur Abholung":
+            ship_type = "PICKUP"
+        elif shipping_text == "Versand möglich":
+            ship_type = "SHIPPING"
+        elif "€" in shipping_text:
+            shipping_price_parts = shipping_text.split(" ")
+            ship_type = "SHIPPING"
+            ship_costs = float(misc.parse_decimal(shipping_price_parts[-2]))
+
+            # reading shipping option from kleinanzeigen
+            # and find the right one by price
+            shipping_costs = (
+                await self.web_request("https://gateway.kleinanzeigen.de/postad/api/v1/shipping-options?posterType=PRIVATE", json_response = True)
+            )["json"]["data"]["shippingOptionsResponse"]["options"]
+
+            # map to internal shipping identifiers used by kleinanzeigen-bot
+            shipping_option_mapping = OPTION_NAME_BY_CARRIER_CODE
+
+            # Convert Euro to cents and round to nearest integer
+            price_in_cent = round(ship_costs * 100)
+
+            # If include_all_matching_shipping_options is enabled, get all options for the same package size
+            if self.config.download.include_all_matching_shipping_options:
+                # Find all options with the same price to determine the package size
+                matching_options = [opt for opt in shipping_costs if opt["priceInEuroCent"] == price_in_cent]
+                if not matching_options:
+                    return "SHIPPING", ship_costs, None
+
+                # Use the package size of the first matching option
+                matching_size = matching_options[0]["packageSize"]
+
+                # Get all options of the same size
+                shipping_options = [
+                    shipping_option_mapping[opt["id"]]
+                    for opt in shipping_costs
+                    if opt["packageSize"] == matching_size
+                    and opt["id"] in shipping_option_mapping
+                    and shipping_option_mapping[opt["id"]] not in self.config.download.excluded_shipping_options
+                ]
+            else:
+                # Only use the matching option if it's not excluded
+                matching_option = next((x for x in shipping_costs if x["priceInEuroCent"] == price_in_cent), None)
+                if not matching_option:
+                    return "SHIPPING", ship_costs, None
+
+                shipping_option = shipping_option_mapping.get(matching_option["id"])
+                if not shipping_option or shipping_option in self.config.download.excluded_shipping_options:
+                    return "SHIPPING", ship_costs, None
+                shipping_options = [shipping_option]
 
         return ship_type, ship_costs, shipping_options
 
@@ -1016,42 +1028,27 @@ class AdExtractor(WebScrapingMixin):
         :return: a dictionary containing the address parts with their corresponding values
         """
         contact:dict[str, (str | None)] = {}
-        address_text = await self.web_text(By.ID, "viewad-locality")
+        snapshot = await self.web_snapshot(_CONTACT_FIELDS, required = ("locality", "contact"))
         # format: e.g. (Beispiel Allee 42,) 12345 Bundesland - Stadt
-        street_element = await self.web_probe(By.ID, "street-address")
-        if street_element is not None:
-            try:
-                street = (await self.extract_visible_text(street_element))[:-1]  # trailing comma
-            except TimeoutError:
-                LOG.debug("Skipping street extraction after timeout.")
-            else:
-                contact["street"] = street
+        street = snapshot["street"]
+        if street is not MISSING:
+            contact["street"] = street[:-1]  # trailing comma
         else:
             LOG.info("No street given in the contact.")
+            contact["street"] = None
 
-        (zipcode, location) = address_text.split(" ", maxsplit = 1)
+        (zipcode, location) = snapshot["locality"].split(" ", maxsplit = 1)
         contact["zipcode"] = zipcode  # e.g. 19372
         contact["location"] = location  # e.g. Mecklenburg-Vorpommern - Steinbeck
 
-        contact_person_element:Element = await self.web_find(By.ID, "viewad-contact")
-        name_element = await self.web_find(By.CLASS_NAME, "iconlist-text", parent = contact_person_element)
-        try:
-            name = await self.web_text(By.TAG_NAME, "a", parent = name_element)
-        except TimeoutError:  # edge case: name without link
-            name = await self.web_text(By.TAG_NAME, "span", parent = name_element)
+        name = snapshot["name_link"] if snapshot["name_link"] is not MISSING else snapshot["name_text"]  # edge case: name without link
+        if name is MISSING:
+            raise TimeoutError(_("No contact name found on ad page"))
         contact["name"] = name
 
-        if "street" not in contact:
-            contact["street"] = None
-        phone_element = await self.web_probe(By.ID, "viewad-contact-phone")
-        if phone_element is not None:
-            try:
-                phone_number = await self.web_text(By.TAG_NAME, "a", parent = phone_element)
-            except TimeoutError:
-                LOG.debug("Skipping phone extraction after timeout.")
-                contact["phone"] = None
-            else:
-                contact["phone"] = "".join(phone_number.replace("-", " ").split(" ")).replace("+49(0)", "0")
+        phone_number = snapshot["phone"]
+        if phone_number is not MISSING:
+            contact["phone"] = "".join(phone_number.replace("-", " ").split(" ")).replace("+49(0)", "0")
         else:
             contact["phone"] = None  # phone seems to be a deprecated feature (for non-professional users)
         # also see 'https://themen.kleinanzeigen.de/hilfe/deine-anzeigen/Telefon/
@@ -27,7 +27,7 @@ from .model.config_model import CaptchaConfig, DiagnosticsConfig
 from .utils import diagnostics as _diagnostics
 from .utils import loggers as _loggers
 from .utils.misc import ainput
-from .utils.web_scraping_mixin import By, WebScrapingMixin
+from .utils.web_scraping_mixin import By, Read, SnapshotField, WebScrapingMixin
 
 LOG:Final[_loggers.Logger] = _loggers.get_logger(__name__)
 
@@ -339,8 +339,10 @@ async def _classify_post_submit_state(web:WebScrapingMixin) -> str:
     verification signals (gated to non-destination URLs). Never raises —
     all callers must treat the result as non-fatal diagnostic context.
 
-    Each probe/text-extraction failure uses a local ``try/except`` so the
-    signal is treated as absent without discarding already-detected facts.
+    The DOM signals are read with one ``web_snapshot`` per check instead of one
+    probe per selector; the snapshot is retaken until any signal shows up or
+    ``quick_dom`` expires. If the snapshot fails, the DOM signals are treated
+    as absent without discarding the URL-based facts.
 
     Returns coarse labels only (no raw page text):
         "STILL_ON_PASSWORD_PAGE"
@@ -361,87 +363,62 @@ async def _classify_post_submit_state(web:WebScrapingMixin) -> str:
     if is_password_page:
         facts.append("STILL_ON_PASSWORD_PAGE")
 
-    try:
-        quick_dom = web.timeout("quick_dom")
-    except Exception:  # noqa: BLE001
-        quick_dom = 5.0
-
-    # 2) Auth0 inline error selectors — gated to password page only because
-    #    ``[role='alert']`` is a broad selector that could match unrelated UI.
-    #    Appears as the coarse label ``AUTH0_INLINE_ERROR`` (no raw text).
-    if is_password_page:
-        for sel_type, sel_value in _AUTH0_POST_SUBMIT_ERROR_SELECTORS:
-            try:
-                element = await web.web_probe(sel_type, sel_value, timeout = quick_dom)
-            except Exception:  # noqa: S112, BLE001
-                continue
-            if element is not None:
-                try:
-                    text = await web.extract_visible_text(element)
-                except Exception:  # noqa: BLE001
-                    text = None
-                if text and text.strip():
-                    facts.append("AUTH0_INLINE_ERROR")
-                    break
-
-    # 2b) IP range block detection — gated to password page only.
-    #      When Kleinanzeigen returns its IP-range block page (div#error with
-    #      German text) instead of proceeding after password submit, the URL
-    #      stays on /u/login/password but the DOM is the block page. Probe
-    #      for the distinctive heading text.
+    # All DOM signals are read in a single snapshot of the settled page.
+    #    Auth0 inline error selectors and the IP range block text are gated to
+    #    the password page only, because ``[role='alert']`` is a broad selector
+    #    that could match unrelated UI. MFA/verification signals are gated to
+    #    URLs that are not a known valid Kleinanzeigen destination (i.e. still on
+    #    login/knotenpunkt or an Auth0 challenge page).
+    fields:dict[str, SnapshotField] = {}
     if is_password_page:
+        for index, (sel_type, sel_value) in enumerate(_AUTH0_POST_SUBMIT_ERROR_SELECTORS):
+            fields[f"auth0_error_{index}"] = SnapshotField(sel_type, sel_value)
+        fields["ip_range_blocked"] = SnapshotField(By.TEXT, _IP_RANGE_BLOCKED_TEXT, Read.EXISTS)
+    check_mfa = not is_valid_post_auth0_destination(url)
+    if check_mfa:
+        fields["one_time_code_input"] = SnapshotField(By.CSS_SELECTOR, "input[autocomplete='one-time-code']", Read.EXISTS)
+        # same texts as check_sms_verification / check_email_verification
+        fields["sms_verification"] = SnapshotField(By.TEXT, "Wir haben dir gerade einen 6-stelligen Code für die Telefonnummer", Read.EXISTS)
+        fields["email_verification"] = SnapshotField(By.TEXT, "Um dein Konto zu schützen haben wir dir eine E-Mail geschickt", Read.EXISTS)
+
+    snapshot:dict[str, object] = {}
+
+    async def signal_found() -> bool:
+        snapshot.update(await web.web_snapshot(fields))
+        return any(value is True or (isinstance(value, str) and value.strip()) for value in snapshot.values())
+
+    if fields:
         try:
-            ip_block_element = await web.web_probe(
-                By.TEXT,
-                _IP_RANGE_BLOCKED_TEXT,
-                timeout = quick_dom,
-            )
-            if ip_block_element is not None:
-                facts.append("IP_RANGE_BLOCKED")
-        except Exception:  # noqa: S110, BLE001
-            pass
-
-    # 3) High-confidence MFA/verification probes.
-    #    Gate: only run when URL is not a known valid Kleinanzeigen destination
-    #    (i.e. still on login/knotenpunkt or an Auth0 challenge page).
-    if not is_valid_post_auth0_destination(url):
-        mfa_facts:list[str] = []
-
-        # Locale-independent one-time code input field
-        try:
-            otc_element = await web.web_probe(
-                By.CSS_SELECTOR, "input[autocomplete='one-time-code']",
-                timeout = quick_dom,
-            )
-            if otc_element is not None:
-                mfa_facts.append("ONE_TIME_CODE_INPUT")
-        except Exception:  # noqa: S110, BLE001
-            pass
-
-        # German SMS verification prompt (same text as check_sms_verification)
-        try:
-            sms_element = await web.web_probe(
-                By.TEXT,
-                "Wir haben dir gerade einen 6-stelligen Code für die Telefonnummer",
-                timeout = quick_dom,
-            )
-            if sms_element is not None:
-                mfa_facts.append("SMS_VERIFICATION")
-        except Exception:  # noqa: S110, BLE001
-            pass
+            await web.web_await(signal_found, timeout = web.timeout("quick_dom"))
+        except TimeoutError:
+            pass  # none of the signals showed up, the page is classified by its URL
+        except Exception as ex:  # noqa: BLE001
+            LOG.debug("Post-submit page snapshot failed, DOM signals treated as absent: %s", ex)
 
-        # German email verification prompt (same text as check_email_verification)
-        try:
-            email_element = await web.web_probe(
-                By.TEXT,
-                "Um dein Konto zu schützen haben wir dir eine E-Mail geschickt",
-                timeout = quick_dom,
+    # 2) Auth0 inline error selectors. Appears as the coarse label
+    #    ``AUTH0_INLINE_ERROR`` (no raw text).
+    if is_password_page:
+        if any(isinstance(text, str) and text.strip() for name, text in snapshot.items() if name.startswith("auth0_error_")):
+            facts.append("AUTH0_INLINE_ERROR")
+
+        # 2b) IP range block detection. When Kleinanzeigen returns its IP-range
+        #      block page (div#error with German text) instead of proceeding after
+        #      password submit, the URL stays on /u/login/password but the DOM is
+        #      the block page.
+        if snapshot.get("ip_range_blocked"):
+            facts.append("IP_RANGE_BLOCKED")
+
+    # 3) High-confidence MFA/verification signals.
+    if check_mfa:
+        mfa_facts = [
+            label
+            for name, label in (
+                ("one_time_code_input", "ONE_TIME_CODE_INPUT"),
+                ("sms_verification", "SMS_VERIFICATION"),
+                ("email_verification", "EMAIL_VERIFICATION"),
             )
-            if email_element is not None:
-                mfa_facts.append("EMAIL_VERIFICATION")
-        except Exception:  # noqa: S110, BLE001
-            pass
-
+            if snapshot.get(name)
+        ]
         if mfa_facts:
             facts.append(f"MFA_DETECTED ({', '.join(mfa_facts)})")
 
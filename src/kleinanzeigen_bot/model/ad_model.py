@@ -3,9 +3,10 @@
 # SPDX-ArtifactOfProjectHomePage: https://github.com/Second-Hand-Friends/kleinanzeigen-bot/
 from __future__ import annotations
 
+import copy
 import enum
-
-import hashlib, json  # isort: skip
+import functools
+import hashlib
 from collections.abc import Mapping, Sequence
 from dataclasses import dataclass
 from datetime import datetime  # noqa: TC003 Move import into a type-checking block
@@ -17,7 +18,7 @@ from pydantic import AfterValidator, Field, field_validator, model_validator
 from typing_extensions import Self
 
 from kleinanzeigen_bot.model.config_model import AdDefaults, AutoPriceReductionConfig  # noqa: TC001 Move application import into a type-checking block
-from kleinanzeigen_bot.utils import dicts
+from kleinanzeigen_bot.utils import canonical_json
 from kleinanzeigen_bot.utils.misc import parse_datetime, parse_decimal
 from kleinanzeigen_bot.utils.pydantics import ContextualModel
 
@@ -172,6 +173,55 @@ def _validate_auto_price_reduction_constraints(price:int | None, auto_price_redu
             raise ValueError(_("min_price must not exceed price"))
 
 
+# (key, default, ignored when missing, shareable without copying, compiled nested defaults)
+_DefaultsEntry = tuple[str, Any, bool, bool, "tuple[_DefaultsEntry, ...] | None"]
+
+
+def _is_immutable(value:Any) -> bool:
+    return value is None or isinstance(value, (str, bytes, int, float, Decimal, enum.Enum))
+
+
+def _compile_defaults(defaults:Mapping[str, Any]) -> tuple[_DefaultsEntry, ...]:
+    return tuple(
+        (key, value, key == "description", _is_immutable(value), _compile_defaults(value) if isinstance(value, dict) else None)
+        for key, value in defaults.items()
+    )
+
+
+def _merge_defaults(target:dict[str, Any], entries:tuple[_DefaultsEntry, ...]) -> None:
+    for key, default_value, ignored, shared, nested in entries:
+        if key in target:
+            value = target[key]
+            if nested is not None and isinstance(value, dict):
+                _merge_defaults(value, nested)
+            elif not isinstance(value, list) and (value is None or (isinstance(value, str) and value == "")):  # noqa: PLC1901
+                target[key] = default_value if shared else copy.deepcopy(default_value)
+        elif not ignored:
+            target[key] = default_value if shared else copy.deepcopy(default_value)
+
+
+class AdDefaultsMerger:
+    """
+    The `ad_defaults` of a run compiled for repeated use by `AdPartial.to_ad`.
+
+    Merging is equivalent to `dicts.apply_defaults` with the rules documented on `AdPartial.to_ad`,
+    but `ad_defaults` is dumped once instead of once per ad, and immutable default values
+    (strings, numbers, enums, `None`) are shared instead of deep-copied.
+
+    Changes made to `ad_defaults` after construction are not picked up.
+    """
+
+    __slots__ = ("_entries",)
+
+    def __init__(self, ad_defaults:AdDefaults) -> None:
+        self._entries = _compile_defaults(ad_defaults.model_dump())
+
+    def apply(self, ad_cfg:dict[str, Any]) -> dict[str, Any]:
+        """Fill *ad_cfg* in place with the defaults it lacks and return it."""
+        _merge_defaults(ad_cfg, self._entries)
+        return ad_cfg
+
+
 class AdPartial(ContextualModel):
     active:bool | None = _OPTIONAL()
     type:Literal["OFFER", "WANTED"] | None = _OPTIONAL()
@@ -282,43 +332,24 @@ class AdPartial(ContextualModel):
             exclude_unset = True,
         )
 
-        # 2) Recursively prune any empty containers:
-        def prune(obj:Any) -> Any:
-            if isinstance(obj, Mapping):
-                return {
-                    k: prune(v)
-                    for k, v in obj.items()
-                    # drop keys whose values are empty list/dict/set
-                    if not (isinstance(v, (Mapping, Sequence, set)) and not isinstance(v, (str, bytes)) and len(v) == 0)
-                }
-            if isinstance(obj, Sequence) and not isinstance(obj, (str, bytes)):
-                return [prune(v) for v in obj if not (isinstance(v, (Mapping, Sequence, set)) and not isinstance(v, (str, bytes)) and len(v) == 0)]
-            return obj
-
-        pruned = prune(raw)
-
-        # 3) Produce a canonical JSON string and hash it:
-        json_string = json.dumps(pruned, sort_keys = True)
-        self.content_hash = hashlib.sha256(json_string.encode()).hexdigest()
+        # 2) Hash the canonical JSON (sorted keys, empty containers pruned) of it:
+        hasher = hashlib.sha256()
+        canonical_json.update_hash(hasher, raw)
+        self.content_hash = hasher.hexdigest()
         return self
 
-    def to_ad(self, ad_defaults:AdDefaults) -> Ad:
+    def to_ad(self, ad_defaults:AdDefaults | AdDefaultsMerger) -> Ad:
         """
         Returns a complete, validated Ad by merging this partial with values from ad_defaults.
 
         Any field that is `None` or `""` is filled from `ad_defaults` when it's not a list.
+        The legacy global `description` default is ignored.
+        Pass an `AdDefaultsMerger` when converting many ads with the same defaults.
 
         Raises `ValidationError` when, after merging with `ad_defaults`, not all fields required by `Ad` are populated.
         """
-        ad_cfg = self.model_dump()
-        dicts.apply_defaults(
-            target = ad_cfg,
-            defaults = ad_defaults.model_dump(),
-            ignore = lambda k, _: k == "description",  # ignore legacy global description config
-            override = lambda _, v: (
-                not isinstance(v, list) and (v is None or (isinstance(v, str) and v == ""))  # noqa: PLC1901
-            ),
-        )
+        merger = ad_defaults if isinstance(ad_defaults, AdDefaultsMerger) else AdDefaultsMerger(ad_defaults)
+        ad_cfg = merger.apply(self.model_dump())
         # Ensure internal counters are integers (not user-configurable)
         if not isinstance(ad_cfg.get("price_reduction_count"), int):
             ad_cfg["price_reduction_count"] = 0
@@ -327,6 +358,59 @@ class AdPartial(ContextualModel):
         return Ad.model_validate(ad_cfg)
 
 
+class PriceReductionSchedule:
+    """
+    The reduction trace of one base price and reduction config, computed up to the cycles asked for so far.
+
+    Instances are shared through `price_reduction_schedule`, so every caller asking for the same
+    configuration extends and reads the same trace instead of recomputing it cycle by cycle.
+    Once the floor is reached, the price stays constant and the trace ends.
+    """
+
+    __slots__ = ("_amount", "_percentage", "_steps", "base_price", "finished", "price_floor")
+
+    def __init__(self, base_price:int | float, strategy:str, amount:int | float, min_price:int | float) -> None:
+        self.base_price = Decimal(str(base_price))
+        # Prices are published as whole euros; ensure the configured floor cannot be undercut by int() conversion.
+        self.price_floor = Decimal(str(min_price)).quantize(EURO_PRECISION, rounding = ROUND_CEILING)
+        self._amount = Decimal(str(amount))
+        self._percentage = strategy == "PERCENTAGE"
+        self._steps:list[PriceReductionStep] = []
+        self.finished = False
+
+    def steps(self, cycles:int) -> list[PriceReductionStep]:
+        """Return the trace of the first *cycles* reduction cycles (shorter when the floor is reached earlier)."""
+        while len(self._steps) < cycles and not self.finished:
+            price_before = self._steps[-1].price_after_rounding if self._steps else self.base_price
+            reduction_value = price_before * self._amount / Decimal("100") if self._percentage else self._amount
+            # Commercial rounding: round to full euros after each reduction step
+            price = (price_before - reduction_value).quantize(EURO_PRECISION, rounding = ROUND_HALF_UP)
+            floor_applied = price <= self.price_floor
+            if floor_applied:
+                price = self.price_floor
+            self._steps.append(PriceReductionStep(
+                cycle = len(self._steps) + 1,
+                price_before = price_before,
+                reduction_value = reduction_value,
+                price_after_rounding = price,
+                floor_applied = floor_applied,
+            ))
+            self.finished = floor_applied
+        return self._steps[:cycles]
+
+    def price_at(self, cycle:int) -> int:
+        """Return the whole-euro price after *cycle* reduction cycles (0 = the rounded base price)."""
+        steps = self.steps(cycle) if cycle > 0 else None
+        price = steps[-1].price_after_rounding if steps else self.base_price.quantize(EURO_PRECISION, rounding = ROUND_HALF_UP)
+        return int(price)
+
+
+@functools.lru_cache(maxsize = 1024)
+def price_reduction_schedule(base_price:int | float, strategy:str, amount:int | float, min_price:int | float) -> PriceReductionSchedule:
+    """Return the shared `PriceReductionSchedule` for the given base price and reduction config."""
+    return PriceReductionSchedule(base_price, strategy, amount, min_price)
+
+
 def _calculate_auto_price_internal(
     *, base_price:int | float | None, auto_price_reduction:AutoPriceReductionConfig | None, target_reduction_cycle:int, with_trace:bool
 ) -> tuple[int | None, list[PriceReductionStep], Decimal | None]:
@@ -340,57 +424,24 @@ def _calculate_auto_price_internal(
 
     Percentage reductions apply to the current price each cycle (compounded). Each reduction step is rounded
     to full euros (commercial rounding with ROUND_HALF_UP) before the next reduction is applied.
+    The trace is memoized per base price and reduction config, see `price_reduction_schedule`.
     Returns an int representing whole euros, or None when base_price is None.
     """
     if base_price is None:
         return None, [], None
 
-    price = Decimal(str(base_price))
-
     if not auto_price_reduction or not auto_price_reduction.enabled or target_reduction_cycle <= 0:
-        return int(price.quantize(EURO_PRECISION, rounding = ROUND_HALF_UP)), [], None
+        return int(Decimal(str(base_price)).quantize(EURO_PRECISION, rounding = ROUND_HALF_UP)), [], None
 
     if auto_price_reduction.strategy is None or auto_price_reduction.amount is None:
-        return int(price.quantize(EURO_PRECISION, rounding = ROUND_HALF_UP)), [], None
+        return int(Decimal(str(base_price)).quantize(EURO_PRECISION, rounding = ROUND_HALF_UP)), [], None
 
     if auto_price_reduction.min_price is None:
         raise ValueError(_("min_price must be specified when auto_price_reduction is enabled"))
 
-    # Prices are published as whole euros; ensure the configured floor cannot be undercut by int() conversion.
-    price_floor = Decimal(str(auto_price_reduction.min_price)).quantize(EURO_PRECISION, rounding = ROUND_CEILING)
-    repost_cycles = target_reduction_cycle
-    steps:list[PriceReductionStep] = []
-
-    for cycle_idx in range(repost_cycles):
-        price_before = price
-        reduction_value = (
-            price * Decimal(str(auto_price_reduction.amount)) / Decimal("100")
-            if auto_price_reduction.strategy == "PERCENTAGE"
-            else Decimal(str(auto_price_reduction.amount))
-        )
-        price -= reduction_value
-        # Commercial rounding: round to full euros after each reduction step
-        price = price.quantize(EURO_PRECISION, rounding = ROUND_HALF_UP)
-        floor_applied = False
-        if price <= price_floor:
-            price = price_floor
-            floor_applied = True
-
-        if with_trace:
-            steps.append(
-                PriceReductionStep(
-                    cycle = cycle_idx + 1,
-                    price_before = price_before,
-                    reduction_value = reduction_value,
-                    price_after_rounding = price,
-                    floor_applied = floor_applied,
-                )
-            )
-
-        if floor_applied:
-            break
-
-    return int(price), steps, price_floor
+    schedule = price_reduction_schedule(base_price, auto_price_reduction.strategy, auto_price_reduction.amount, auto_price_reduction.min_price)
+    steps = schedule.steps(target_reduction_cycle)
+    return int(steps[-1].price_after_rounding), steps if with_trace else [], schedule.price_floor
 
 
 def calculate_auto_price(*, base_price:int | float | None, auto_price_reduction:AutoPriceReductionConfig | None, target_reduction_cycle:int) -> int | None:
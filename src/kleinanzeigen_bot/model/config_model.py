@@ -23,6 +23,17 @@ _FIELD_NAME_PREFIX:Final[str] = "download."
 _DOWNLOAD_TEMPLATE_ALLOWED_FIELDS:Final[frozenset[str]] = frozenset({"id", "title"})
 DEFAULT_DOWNLOAD_DIR:Final[str] = "downloaded-ads"
 
+ResourceKind = Literal["image", "media", "font", "stylesheet", "third_party"]
+
+# captcha and login providers embedded into kleinanzeigen.de pages, which must keep working while resources are blocked
+DEFAULT_RESOURCE_ALLOWED_HOSTS:Final[tuple[str, ...]] = (
+    "google.com", "gstatic.com", "recaptcha.net", "hcaptcha.com", "challenges.cloudflare.com", "arkoselabs.com", "funcaptcha.com", "auth0.com",
+)
+_DEFAULT_BLOCKED_RESOURCES:Final[dict[str, list[ResourceKind]]] = {
+    "delete": ["image", "media", "font", "third_party"],
+    "extend": ["image", "media", "font", "third_party"],
+}
+
 
 class AutoPriceReductionConfig(ContextualModel):
     enabled:bool = Field(default = False, description = "automatically lower the price of reposted ads")
@@ -126,6 +137,77 @@ class AdDefaults(ContextualModel):
         return values
 
 
+class AdLoadingConfig(ContextualModel):
+    workers:int = Field(
+        default = 0,
+        ge = 0,
+        description = (
+            "number of worker processes used to parse and validate ad files in parallel. "
+            "0 = one per CPU core, 1 = always load sequentially. "
+            "Small workspaces and ads served from the ad cache are always loaded in the main process"
+        ),
+        examples = [0, 1, 4],
+    )
+    start_browser_early:bool = Field(
+        default = False,
+        description = (
+            "launch the browser and log in while the ad files are still being loaded (publish, update, delete, extend). "
+            "The browser is closed again if no ads are selected"
+        ),
+    )
+    validate_cached_ads:bool = Field(
+        default = False,
+        description = (
+            "validate ads served from the ad cache again instead of trusting the validation done when they were cached. "
+            "Slower; only the YAML parsing is skipped"
+        ),
+    )
+
+
+class WatchConfig(ContextualModel):
+    poll_interval:int = Field(
+        default = 60,
+        ge = 1,
+        description = (
+            "seconds between two scans of the ad files in watch mode when file system events are not available (non-Linux systems, "
+            "exhausted inotify watches)"
+        ),
+        examples = [30, 60, 300],
+    )
+    publish_cooldown:int = Field(
+        default = 900,
+        ge = 0,
+        description = (
+            "minimum seconds between two publish runs started by watch mode. "
+            "Ads that are still due or changed after a run (e.g. because publishing failed) are retried once it has passed"
+        ),
+        examples = [300, 900, 3600],
+    )
+
+
+class ServeConfig(ContextualModel):
+    attach:bool = Field(
+        default = True,
+        description = "let publish, update, delete, extend and download runs use the logged-in browser of a running serve command instead of launching one",
+    )
+    idle_timeout:int = Field(
+        default = 3600,
+        ge = 0,
+        description = "seconds without any run using the browser after which the serve command closes the browser and exits. 0 = never",
+        examples = [900, 3600, 0],
+    )
+    health_check_interval:int = Field(
+        default = 30,
+        ge = 1,
+        description = "seconds between two checks whether the browser of the serve command still responds; it is restarted if not",
+    )
+    attach_timeout:int = Field(
+        default = 900,
+        ge = 0,
+        description = "seconds a run waits while the serve command is still starting its browser or another run is using it before it gives up",
+    )
+
+
 class DownloadConfig(ContextualModel):
     dir:str = Field(
         default = DEFAULT_DOWNLOAD_DIR,
@@ -213,6 +295,28 @@ class DownloadConfig(ContextualModel):
         return self
 
 
+class ResourceBlockingConfig(ContextualModel):
+    enabled:bool = Field(
+        default = False,
+        description = "skip loading page resources the commands listed in 'commands' do not need, e.g. images and third-party trackers",
+    )
+    commands:dict[str, list[ResourceKind]] = Field(
+        default_factory = lambda: copy.deepcopy(_DEFAULT_BLOCKED_RESOURCES),
+        json_schema_extra = {"default": {"delete": ["image", "media", "font", "third_party"], "extend": ["image", "media", "font", "third_party"]}},
+        description = (
+            "resource kinds blocked per command. Commands not listed load everything. "
+            "third_party blocks all requests to other sites than kleinanzeigen.de, except the page itself and allowed_hosts"
+        ),
+        examples = ['"delete": ["image", "media", "font", "third_party"]', '"download": ["media", "font"]'],
+    )
+    allowed_hosts:list[str] = Field(
+        default_factory = lambda: list(DEFAULT_RESOURCE_ALLOWED_HOSTS),
+        json_schema_extra = {"default": list(DEFAULT_RESOURCE_ALLOWED_HOSTS)},
+        description = "hosts (including their subdomains) that are never blocked, e.g. captcha and login providers",
+        examples = ['"hcaptcha.com"'],
+    )
+
+
 class BrowserConfig(ContextualModel):
     arguments:list[str] = Field(
         default_factory = list,
@@ -239,6 +343,10 @@ class BrowserConfig(ContextualModel):
         description = "browser profile name (optional). Leave empty for default profile",
         examples = ['"Profile 1"'],
     )
+    resource_blocking:ResourceBlockingConfig = Field(
+        default_factory = ResourceBlockingConfig,
+        description = "per-command blocking of page resources that are not needed, to speed up page loads",
+    )
 
 
 class LoginConfig(ContextualModel):
@@ -270,6 +378,16 @@ class PublishingConfig(ContextualModel):
         default = True,
         description = "match ads by title when deleting old ads before publish or deleting ID-less ads; ambiguous title matches are skipped",
     )
+    published_ads_ttl:int = Field(
+        default = 0,
+        ge = 0,
+        description = (
+            "seconds a fetched list of your published ads is kept in the state directory and reused by later runs "
+            "(publish, update, delete, extend, download). 0 = fetch it once per run and do not keep it. "
+            "The list is always fetched again after ads were published, updated, extended or deleted"
+        ),
+        examples = [0, 300, 3600],
+    )
     local_path_renaming:LocalPathRenamingConfig = Field(
         default_factory = LocalPathRenamingConfig,
         description = (
@@ -319,6 +437,18 @@ class TimeoutConfig(ContextualModel):
     retry_enabled:bool = Field(default = True, description = "Enable built-in retry/backoff for DOM operations.")
     retry_max_attempts:int = Field(default = 2, ge = 1, description = "Max retry attempts when retry is enabled.")
     retry_backoff_factor:float = Field(default = 1.5, ge = 1.0, description = "Exponential factor applied per retry attempt.")
+    adaptive_enabled:bool = Field(
+        default = False,
+        description = "Shorten DOM lookup timeouts to budgets learned from recorded timing data (requires diagnostics.timing_collection).",
+    )
+    adaptive_percentile:float = Field(
+        default = 95.0, ge = 50.0, le = 100.0, description = "Percentile of successful lookup durations a learned timeout is based on."
+    )
+    adaptive_headroom:float = Field(default = 1.5, ge = 1.0, description = "Factor applied to the percentile to get a learned timeout.")
+    adaptive_min_samples:int = Field(default = 20, ge = 1, description = "Recorded first attempts an operation needs before its timeout is learned.")
+    adaptive_min:float = Field(
+        default = 1.0, ge = 0.0, description = "Lower bound (seconds) for learned timeouts; the configured timeout is the upper bound."
+    )
 
     def resolve(self, key:str = "default", override:float | None = None) -> float:
         """
@@ -579,6 +709,9 @@ class Config(ContextualModel):
         examples = ['"Elektronik > Notebooks": "161/278"', '"Jobs > Praktika": "102/125"'],
     )
 
+    ad_loading:AdLoadingConfig = Field(default_factory = AdLoadingConfig, description = "ad file loading performance settings")
+    watch:WatchConfig = Field(default_factory = WatchConfig, description = "settings of the long-running watch command")
+    serve:ServeConfig = Field(default_factory = ServeConfig, description = "settings of the serve command, which keeps a logged-in browser running")
     download:DownloadConfig = Field(default_factory = DownloadConfig)
     publishing:PublishingConfig = Field(default_factory = PublishingConfig)
     deleting:DeletingConfig = Field(default_factory = DeletingConfig, description = "post-delete YAML cleanup configuration")
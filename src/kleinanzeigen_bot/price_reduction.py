@@ -8,6 +8,7 @@ __all__ = [
     "PriceReductionDecision",
     "apply_auto_price_reduction",
     "evaluate_auto_price_reduction",
+    "forecast_auto_price",
     "is_auto_price_reduction_due",
 ]
 
@@ -20,6 +21,7 @@ from kleinanzeigen_bot.model.ad_model import (
     AdUpdateStrategy,
     calculate_auto_price,
     calculate_auto_price_with_trace,
+    price_reduction_schedule,
 )
 
 # Import 'misc' as a module (not functions directly) so tests can monkeypatch
@@ -295,6 +297,33 @@ def evaluate_auto_price_reduction(ad_cfg:Ad, _ad_file_relative:str, *, mode:AdUp
     )
 
 
+def forecast_auto_price(ad_cfg:Ad, reposts:int) -> list[int] | None:
+    """Project the price of an ad at each of its next *reposts* republications.
+
+    Follows the repost-delay rules of a republication (REPLACE mode) and
+    assumes ``delay_days`` has elapsed by each repost.  Prices are read from
+    the shared :func:`~kleinanzeigen_bot.model.ad_model.price_reduction_schedule`.
+
+    Returns:
+        The projected prices, or ``None`` when no price reduction is configured for the ad.
+    """
+    cfg = ad_cfg.auto_price_reduction
+    if cfg is None or not cfg.enabled or ad_cfg.price is None:
+        return None
+    if cfg.strategy is None or cfg.amount is None or cfg.min_price is None:
+        return None
+
+    schedule = price_reduction_schedule(ad_cfg.price, cfg.strategy, cfg.amount, cfg.min_price)
+    total_reposts, delay_reposts, applied_cycles, _eligible_cycles = _repost_delay_state(ad_cfg)
+    prices:list[int] = []
+    for _repost in range(reposts):
+        if total_reposts - delay_reposts > applied_cycles:
+            applied_cycles += 1
+        prices.append(schedule.price_at(applied_cycles))
+        total_reposts += 1
+    return prices
+
+
 def is_auto_price_reduction_due(ad_cfg:Ad, ad_file_relative:str) -> bool:
     """Check if an ad has a pending auto price reduction that should trigger an update.
 
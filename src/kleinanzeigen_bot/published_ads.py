@@ -3,13 +3,17 @@
 # SPDX-ArtifactOfProjectHomePage: https://github.com/Second-Hand-Friends/kleinanzeigen-bot/
 """Published ads fetching with API pagination."""
 
-import json
+import asyncio, contextlib, json, time, unicodedata  # isort: skip
+from collections.abc import Iterable, Iterator, Mapping, Sequence
 from gettext import gettext as _
-from typing import Any, Final, TypeAlias
+from pathlib import Path
+from typing import Any, Final, TypeAlias, overload
 
+from ._version import __version__
 from .utils import loggers as _loggers
 from .utils import misc as _misc
 from .utils.exceptions import KleinanzeigenBotError
+from .utils.state_files import load_state, save_state
 from .utils.web_scraping_mixin import WebScrapingMixin
 
 PublishedAd:TypeAlias = dict[str, Any]
@@ -36,11 +40,101 @@ def ad_matches_id(ad:PublishedAd, target_id:int | None) -> bool:
 
 LOG:Final = _loggers.get_logger(__name__)
 
+PUBLISHED_ADS_FILE:Final[str] = "published_ads.json"
+PUBLISHED_ADS_FORMAT_VERSION:Final[int] = 1
+
+MAX_CONCURRENT_PAGE_REQUESTS:Final[int] = 8
+"""Upper bound of manage-ads page requests that are in flight at the same time."""
+
 
 class PublishedAdsFetchIncompleteError(KleinanzeigenBotError):
     """Raised when published ads cannot be fetched completely for ownership-critical operations."""
 
 
+def normalize_title(title:str) -> str:
+    """Return *title* in the form published ads are matched by (Unicode NFC, otherwise unchanged)."""
+    return unicodedata.normalize("NFC", title)
+
+
+class PublishedAdsIndex(Sequence[PublishedAd]):
+    """A fetched list of published ads with lookup tables, built once per fetch.
+
+    Behaves like (and compares equal to) the list it was built from; :meth:`get`, :meth:`ids_by_title`
+    and :meth:`with_state` replace linear scans over it.  IDs are normalized
+    like :func:`ad_matches_id` does; if an ID occurs twice, :meth:`get` returns
+    the first ad.  Ads without a usable ID are only reachable by iteration and
+    :attr:`unindexed`.
+    """
+
+    __slots__ = ("_ads", "_by_id", "_by_state", "_by_title", "unindexed")
+
+    def __init__(self, ads:Iterable[PublishedAd] = ()) -> None:
+        self._ads = list(ads)
+        self._by_id:dict[int, PublishedAd] = {}
+        self._by_title:dict[str, list[int]] = {}
+        self._by_state:dict[Any, list[PublishedAd]] = {}
+        self.unindexed:list[PublishedAd] = []
+        for ad in self._ads:
+            self._by_state.setdefault(ad.get("state"), []).append(ad)
+            try:
+                ad_id = int(ad["id"])
+            except (KeyError, TypeError, ValueError):
+                LOG.debug("Published ad without usable id: %r", ad.get("id"))
+                self.unindexed.append(ad)
+                continue
+            self._by_id.setdefault(ad_id, ad)
+            if isinstance(title := ad.get("title"), str):
+                self._by_title.setdefault(normalize_title(title), []).append(ad_id)
+
+    @classmethod
+    def of(cls, ads:Sequence[PublishedAd]) -> "PublishedAdsIndex":
+        """Return *ads* if it is already indexed, otherwise index it."""
+        return ads if isinstance(ads, cls) else cls(ads)
+
+    @overload
+    def __getitem__(self, index:int) -> PublishedAd: ...
+
+    @overload
+    def __getitem__(self, index:slice) -> list[PublishedAd]: ...
+
+    def __getitem__(self, index:int | slice) -> PublishedAd | list[PublishedAd]:
+        return self._ads[index]
+
+    def __len__(self) -> int:
+        return len(self._ads)
+
+    def __iter__(self) -> Iterator[PublishedAd]:
+        return iter(self._ads)
+
+    def __eq__(self, other:object) -> bool:
+        if isinstance(other, PublishedAdsIndex):
+            return self._ads == other._ads
+        if isinstance(other, list):
+            return self._ads == other
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]  # mutable like the list it stands for
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self._ads!r})"
+
+    @property
+    def by_id(self) -> Mapping[int, PublishedAd]:
+        return self._by_id
+
+    def get(self, ad_id:int | None) -> PublishedAd | None:
+        """Return the published ad with *ad_id*, or ``None``."""
+        return None if ad_id is None else self._by_id.get(ad_id)
+
+    def ids_by_title(self, title:str) -> list[int]:
+        """Return the IDs of all published ads titled *title* (see :func:`normalize_title`)."""
+        return self._by_title.get(normalize_title(title), [])
+
+    def with_state(self, state:str) -> list[PublishedAd]:
+        """Return the published ads in *state* (e.g. ``"active"`` or ``"paused"``)."""
+        return self._by_state.get(state, [])
+
+
 def _parse_published_ads_page(
     response:dict[str, Any],
     page:int,
@@ -53,33 +147,38 @@ def _parse_published_ads_page(
     def _truncate_preview(text:str, limit:int = _SNIPPET_LIMIT) -> str:
         return text[:limit] + ("..." if len(text) > limit else "")
 
-    content = response.get("content", "")
-    if isinstance(content, bytearray):
-        content = bytes(content)
-    if isinstance(content, bytes):
-        content = content.decode("utf-8", errors = "replace")
-    if not isinstance(content, str):
-        LOG.warning("Unexpected response content type on page %s: %s", page, type(content).__name__)
-        if strict:
-            raise PublishedAdsFetchIncompleteError(_("Unexpected response content type on page %s: %s") % (page, type(content).__name__))
-        return None
+    if "json" in response:
+        # already decoded by web_request(json_response = True)
+        json_data = response["json"]
+        content:Any = ""
+    else:
+        content = response.get("content", "")
+        if isinstance(content, bytearray):
+            content = bytes(content)
+        if isinstance(content, bytes):
+            content = content.decode("utf-8", errors = "replace")
+        if not isinstance(content, str):
+            LOG.warning("Unexpected response content type on page %s: %s", page, type(content).__name__)
+            if strict:
+                raise PublishedAdsFetchIncompleteError(_("Unexpected response content type on page %s: %s") % (page, type(content).__name__))
+            return None
 
-    try:
-        json_data = json.loads(content)
-    except (json.JSONDecodeError, TypeError) as ex:
-        if not content:
-            LOG.warning("Empty JSON response content on page %s", page)
+        try:
+            json_data = json.loads(content)
+        except (json.JSONDecodeError, TypeError) as ex:
+            if not content:
+                LOG.warning("Empty JSON response content on page %s", page)
+                if strict:
+                    raise PublishedAdsFetchIncompleteError(_("Empty JSON response content on page %s") % page) from ex
+                return None
+            snippet = _truncate_preview(content)
+            LOG.warning("Failed to parse JSON response on page %s: %s (content: %s)", page, ex, snippet)
             if strict:
-                raise PublishedAdsFetchIncompleteError(_("Empty JSON response content on page %s") % page) from ex
+                raise PublishedAdsFetchIncompleteError(_("Failed to parse JSON response on page %s: %s (content: %s)") % (page, ex, snippet)) from ex
             return None
-        snippet = _truncate_preview(content)
-        LOG.warning("Failed to parse JSON response on page %s: %s (content: %s)", page, ex, snippet)
-        if strict:
-            raise PublishedAdsFetchIncompleteError(_("Failed to parse JSON response on page %s: %s (content: %s)") % (page, ex, snippet)) from ex
-        return None
 
     if not isinstance(json_data, dict):
-        snippet = _truncate_preview(content)
+        snippet = _truncate_preview(content or json.dumps(json_data, ensure_ascii = False))
         LOG.warning("Unexpected JSON payload on page %s (content: %s)", page, snippet)
         if strict:
             raise PublishedAdsFetchIncompleteError(_("Unexpected JSON payload on page %s (content: %s)") % (page, snippet))
@@ -160,6 +259,32 @@ def _determine_next_page(
     return next_page
 
 
+def _page_url(root_url:str, page:int) -> str:
+    return f"{root_url}/m-meine-anzeigen-verwalten.json?sort=DEFAULT&pageNum={page}"
+
+
+async def _request_page(web:WebScrapingMixin, root_url:str, page:int) -> Any:
+    """Request one manage-ads page, returning a ``TimeoutError`` instead of raising it."""
+    try:
+        return await web.web_request(_page_url(root_url, page), json_response = True)
+    except TimeoutError as ex:
+        return ex
+
+
+async def _request_pages(web:WebScrapingMixin, root_url:str, pages:Iterable[int]) -> dict[int, Any]:
+    """Request the given pages concurrently (bounded by ``MAX_CONCURRENT_PAGE_REQUESTS``), keyed by page number."""
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_PAGE_REQUESTS)
+
+    async def _bounded(page:int) -> Any:
+        async with semaphore:
+            return await _request_page(web, root_url, page)
+
+    pages = list(pages)
+    LOG.debug("Requesting pages %s-%s concurrently", pages[0], pages[-1])
+    responses = await asyncio.gather(*(_bounded(page) for page in pages))
+    return dict(zip(pages, responses, strict = True))
+
+
 async def fetch_published_ads(
     web:WebScrapingMixin,
     root_url:str,
@@ -168,6 +293,11 @@ async def fetch_published_ads(
 ) -> list[PublishedAd]:
     """Fetch all published ads, handling API pagination.
 
+    Page 1 is requested on its own. Once its paging info reveals the last page,
+    the remaining pages are requested concurrently and then processed in page
+    order, so validation, logging and strict-mode failures behave exactly as
+    with one request after another.
+
     Args:
         web: A WebScrapingMixin instance for making web requests.
         root_url: The base URL of the Kleinanzeigen site.
@@ -179,6 +309,7 @@ async def fetch_published_ads(
     ads:list[PublishedAd] = []
     page = 1
     MAX_PAGE_LIMIT:Final[int] = 100
+    prefetched:dict[int, Any] | None = None
     while True:
         # Safety check: don't paginate beyond reasonable limit
         if page > MAX_PAGE_LIMIT:
@@ -187,12 +318,15 @@ async def fetch_published_ads(
                 raise PublishedAdsFetchIncompleteError(_("Stopping pagination after %s pages to avoid infinite loop") % MAX_PAGE_LIMIT)
             break
 
-        try:
-            response = await web.web_request(f"{root_url}/m-meine-anzeigen-verwalten.json?sort=DEFAULT&pageNum={page}")
-        except TimeoutError as ex:
-            LOG.warning("Pagination request failed on page %s: %s", page, ex)
+        if prefetched is not None and page in prefetched:
+            response = prefetched.pop(page)
+        else:
+            response = await _request_page(web, root_url, page)
+
+        if isinstance(response, TimeoutError):
+            LOG.warning("Pagination request failed on page %s: %s", page, response)
             if strict:
-                raise PublishedAdsFetchIncompleteError(_("Pagination request failed on page %s: %s") % (page, ex)) from ex
+                raise PublishedAdsFetchIncompleteError(_("Pagination request failed on page %s: %s") % (page, response)) from response
             break
 
         if not isinstance(response, dict):
@@ -210,6 +344,108 @@ async def fetch_published_ads(
         next_page = _determine_next_page(paging, page, raw_ads_count, strict = strict)
         if next_page is None:
             break
+
+        if prefetched is None:
+            total_pages = _misc.coerce_page_number(paging.get("last"))
+            if total_pages is not None and total_pages > next_page:
+                if strict and total_pages > MAX_PAGE_LIMIT:
+                    LOG.warning("Stopping pagination after %s pages to avoid infinite loop", MAX_PAGE_LIMIT)
+                    raise PublishedAdsFetchIncompleteError(_("Stopping pagination after %s pages to avoid infinite loop") % MAX_PAGE_LIMIT)
+                prefetched = await _request_pages(web, root_url, range(next_page, min(total_pages, MAX_PAGE_LIMIT) + 1))
         page = next_page
 
     return ads
+
+
+class PublishedAdsSnapshot:
+    """The published ads of one run, shared by all flows.
+
+    The list is fetched once with ``strict = True``; lenient callers get the
+    same list.  Only when the strict fetch is incomplete does :meth:`get`
+    fall back to one lenient fetch for lenient callers, while strict callers
+    get the original error again.
+
+    With a *cache_file* and a positive *ttl* (seconds), a complete list is
+    also persisted and reused by later runs of the same account until it is
+    older than *ttl*.  Flows that change the published ads call
+    :meth:`invalidate` before their first change, so nothing after them
+    works with a stale list.
+    """
+
+    def __init__(
+        self,
+        web:WebScrapingMixin,
+        root_url:str,
+        *,
+        account:str = "",
+        cache_file:Path | None = None,
+        ttl:float = 0,
+    ) -> None:
+        self.web = web
+        self.root_url = root_url
+        self.account = account
+        self.cache_file = cache_file if ttl > 0 else None
+        self.ttl = ttl
+        self._ads:PublishedAdsIndex | None = None
+        self._lenient_ads:PublishedAdsIndex | None = None
+        self._error:PublishedAdsFetchIncompleteError | None = None
+        self._fetched_at = 0.0
+
+    async def get(self, *, strict:bool = False) -> PublishedAdsIndex:
+        """Return the indexed published ads; see :func:`fetch_published_ads` for *strict*."""
+        if self.ttl > 0 and self._fetched_at and time.time() - self._fetched_at >= self.ttl:
+            self._clear()
+        if self._ads is None and self._error is None and not self._load_persisted():
+            await self._fetch()
+
+        if self._ads is not None:
+            return self._ads
+        if strict and self._error is not None:
+            raise self._error
+        if self._lenient_ads is None:
+            self._lenient_ads = PublishedAdsIndex(await fetch_published_ads(self.web, self.root_url))
+        return self._lenient_ads
+
+    def invalidate(self) -> None:
+        """Forget the fetched list, including its persisted copy."""
+        self._clear()
+        if self.cache_file is not None:
+            with contextlib.suppress(OSError):
+                self.cache_file.unlink(missing_ok = True)
+
+    def _clear(self) -> None:
+        self._ads = self._lenient_ads = self._error = None
+        self._fetched_at = 0.0
+
+    async def _fetch(self) -> None:
+        self._fetched_at = time.time()
+        try:
+            self._ads = PublishedAdsIndex(await fetch_published_ads(self.web, self.root_url, strict = True))
+        except PublishedAdsFetchIncompleteError as ex:
+            self._error = ex
+            return
+        self._persist()
+
+    def _header(self) -> dict[str, Any]:
+        return {"format": PUBLISHED_ADS_FORMAT_VERSION, "app_version": __version__, "root_url": self.root_url, "account": self.account}
+
+    def _load_persisted(self) -> bool:
+        if self.cache_file is None:
+            return False
+
+        def _parse(data:dict[str, Any]) -> tuple[float, list[dict[str, Any]]]:
+            if not isinstance(data["ads"], list):
+                raise TypeError("ads is not a list")
+            return float(data["fetched_at"]), data["ads"]
+
+        state = load_state(self.cache_file, self._header(), _parse)
+        if state is None or not 0 <= time.time() - state[0] < self.ttl:
+            return False
+        fetched_at, ads = state
+        LOG.debug("Reusing published ads fetched %.0f seconds ago", time.time() - fetched_at)
+        self._ads, self._fetched_at = PublishedAdsIndex(ads), fetched_at
+        return True
+
+    def _persist(self) -> None:
+        if self.cache_file is not None:
+            save_state(self.cache_file, self._header(), {"fetched_at": self._fetched_at, "ads": list(self._ads or ())})
@@ -15,21 +15,22 @@ captcha mechanics (:mod:`captcha_flow`), submit/confirm/ad-id recovery
 
 import asyncio
 import sys
-from collections.abc import Awaitable, Callable
+from collections.abc import Awaitable, Callable, Sequence
 from typing import Any, Final
 
 from nodriver.core.connection import ProtocolException
 from ruamel.yaml import YAML
 
 from . import ad_state as _ad_state
-from . import delete_flow, published_ads
+from . import delete_flow
 from . import price_reduction as _price_reduction
 from . import publishing_form as _publishing_form
 from . import publishing_persistence as _publishing_persistence
 from . import publishing_submission as _publishing_submission
+from .ad_record import AdRecord
 from .model.ad_model import Ad, AdUpdateStrategy
 from .model.config_model import Config
-from .published_ads import PublishedAd, PublishedAdsFetchIncompleteError, ad_matches_id
+from .published_ads import PublishedAd, PublishedAdsFetchIncompleteError, PublishedAdsIndex, PublishedAdsSnapshot
 from .utils import loggers as _loggers
 from .utils.exceptions import CategoryResolutionError, PublishSubmissionUncertainError
 from .utils.i18n import pluralize
@@ -55,10 +56,19 @@ async def check_publishing_result(web:WebScrapingMixin) -> bool:
     return await web.web_check(By.ID, "checking-done", Is.DISPLAYED) or await web.web_check(By.ID, "not-completed", Is.DISPLAYED)
 
 
+async def _await_publishing_result(web:WebScrapingMixin) -> bool:
+    """Wait for the publishing result page; False if it did not show up in time."""
+    try:
+        await web.web_await(lambda: check_publishing_result(web), timeout = web.timeout("publishing_result"))
+    except TimeoutError:
+        return False
+    return True
+
+
 async def delete_old_ad_if_needed(  # noqa: SLF001 — accessed by bot seam via publishing_workflow.delete_old_ad_if_needed
     web:WebScrapingMixin,
     ad_cfg:Ad,
-    published_ads_list:list[PublishedAd],
+    published_ads_list:Sequence[PublishedAd],
     *,
     timing:str,
     keep_old_ads:bool,
@@ -94,7 +104,7 @@ async def publish_ad(
     ad_file:str,
     ad_cfg:Ad,
     ad_cfg_orig:dict[str, Any],
-    published_ads_list:list[PublishedAd],
+    published_ads_list:Sequence[PublishedAd],
     mode:AdUpdateStrategy = AdUpdateStrategy.REPLACE,
     *,
     root_url:str,
@@ -109,8 +119,9 @@ async def publish_ad(
         ad_file: Path to the ad configuration YAML file.
         ad_cfg: The effective ad configuration with default values applied.
         ad_cfg_orig: The original ad config as present in the YAML file.
-        published_ads_list: List of published ads from the API, used for
-            deduplication and old ad deletion.
+        published_ads_list: Published ads from the API (ideally a
+            :class:`.PublishedAdsIndex`), used for deduplication and old ad
+            deletion.
         mode: The ad editing strategy. REPLACE creates a new ad (full
             republish), MODIFY updates an existing ad in-place.
         root_url: Base Kleinanzeigen URL.
@@ -184,30 +195,25 @@ async def publish_ad(
 
 
 async def _fetch_published_ads_for_publish(
-    web:WebScrapingMixin,
-    root_url:str,
+    snapshot:PublishedAdsSnapshot,
     config:Config,
-    ad_cfgs:list[tuple[str, Ad, dict[str, Any]]],
+    ad_cfgs:list[AdRecord],
     *,
     keep_old_ads:bool,
-) -> tuple[list[PublishedAd], list[PublishedAd] | None, bool]:
+) -> tuple[PublishedAdsIndex, PublishedAdsIndex | None, bool]:
     """Fetch published ads for publish flow, strictly when title cleanup needs it."""
     require_strict_fetch = (
         not keep_old_ads
         and config.publishing.delete_old_ads == "BEFORE_PUBLISH"
         and config.publishing.delete_old_ads_by_title
-        and any(ad_cfg.id is None for _ad_file, ad_cfg, _ad_cfg_orig in ad_cfgs)
+        and any(record.ad_cfg.id is None for record in ad_cfgs)
     )
-    published_ads_list = await published_ads.fetch_published_ads(web, root_url)
-    strict_published_ads_list:list[PublishedAd] | None = None
+    published_ads_list = await snapshot.get()
+    strict_published_ads_list:PublishedAdsIndex | None = None
 
     if require_strict_fetch:
         try:
-            strict_published_ads_list = await published_ads.fetch_published_ads(
-                web,
-                root_url,
-                strict = True,
-            )
+            strict_published_ads_list = await snapshot.get(strict = True)
         except PublishedAdsFetchIncompleteError as ex:
             LOG.error(
                 "Skipping title-based publishes because full published-ad list could not "
@@ -220,19 +226,21 @@ async def _fetch_published_ads_for_publish(
 
 async def publish_ads(
     web:WebScrapingMixin,
-    ad_cfgs:list[tuple[str, Ad, dict[str, Any]]],
+    ad_cfgs:list[AdRecord],
     *,
     root_url:str,
     config:Config,
     keep_old_ads:bool,
     capture_diagnostics:Callable[..., Awaitable[None]] | None = None,
     config_file_path:str,
+    published:list[AdRecord] | None = None,
+    snapshot:PublishedAdsSnapshot | None = None,
 ) -> None:
     """Publish multiple ads with retry and uncertainty handling.
 
     Args:
         web: A WebScrapingMixin instance for browser interactions.
-        ad_cfgs: List of (ad_file, ad_cfg, ad_cfg_orig) tuples.
+        ad_cfgs: The ads to process.
         root_url: Base Kleinanzeigen URL.
         config: Full application config.
         keep_old_ads: If True, skip old-ad deletion.
@@ -241,19 +249,24 @@ async def publish_ads(
             ``(ad_cfg, ad_cfg_orig, ad_file, attempt, exc)``.
         config_file_path: Path to the config file (for relative path
             resolution).
+        published: Optional list each successfully persisted ad is
+            appended to (see :func:`.ad_loading.recording_published_images`).
+        snapshot: The run's published ads; a fresh one is used when omitted.
+            Invalidated before the first ad is submitted.
     """
     count = 0
     failed_count = 0
     max_retries = SUBMISSION_MAX_RETRIES
+    snapshot = snapshot or PublishedAdsSnapshot(web, root_url)
     published_ads_list, strict_published_ads_list, require_strict_fetch = await _fetch_published_ads_for_publish(
-        web,
-        root_url,
+        snapshot,
         config,
         ad_cfgs,
         keep_old_ads = keep_old_ads,
     )
 
-    for idx, (ad_file, ad_cfg, ad_cfg_orig) in enumerate(ad_cfgs, start = 1):
+    for idx, record in enumerate(ad_cfgs, start = 1):
+        ad_file, ad_cfg = record.ad_file, record.ad_cfg
         LOG.info("Processing %s/%s: '%s' from [%s]...", idx, len(ad_cfgs), ad_cfg.title, ad_file)
 
         published_ads_for_matching = (
@@ -272,14 +285,16 @@ async def publish_ads(
             failed_count += 1
             continue
 
-        if any(ad_matches_id(x, ad_cfg.id) and x.get("state") == "paused" for x in published_ads_for_matching):
+        if (published_ad := published_ads_for_matching.get(ad_cfg.id)) is not None and published_ad.get("state") == "paused":
             LOG.info("Skipping because ad is reserved")
             continue
 
         count += 1
         success = False
+        ad_cfg_orig = record.raw
         baseline_price = ad_cfg.price
         baseline_price_reduction_count = ad_cfg.price_reduction_count
+        snapshot.invalidate()
 
         for attempt in range(1, max_retries + 1):
             try:
@@ -295,6 +310,8 @@ async def publish_ads(
                     config_file_path = config_file_path,
                 )
                 success = True
+                if published is not None:
+                    published.append(record)
                 break  # Publish succeeded, exit retry loop
             except asyncio.CancelledError:
                 raise  # Respect task cancellation
@@ -356,13 +373,7 @@ async def publish_ads(
 
         # Check publishing result separately (no retry - ad is already submitted)
         if success:
-            try:
-                publish_timeout = web.timeout("publishing_result")
-                await web.web_await(
-                    lambda: check_publishing_result(web),
-                    timeout = publish_timeout,
-                )
-            except TimeoutError:
+            if not await _await_publishing_result(web):
                 LOG.warning(
                     " -> Could not confirm publishing for '%s', but ad may be online",
                     ad_cfg.title,
@@ -375,6 +386,7 @@ async def publish_ads(
                 config = config,
                 root_url = root_url,
             )
+        record.release_raw()
 
     LOG.info("############################################")
     if failed_count > 0:
@@ -389,13 +401,15 @@ async def publish_ads(
 
 async def update_ads(
     web:WebScrapingMixin,
-    ad_cfgs:list[tuple[str, Ad, dict[str, Any]]],
+    ad_cfgs:list[AdRecord],
     *,
     root_url:str,
     config:Config,
     keep_old_ads:bool,
     capture_diagnostics:Callable[..., Awaitable[None]] | None = None,
     config_file_path:str,
+    published:list[AdRecord] | None = None,
+    snapshot:PublishedAdsSnapshot | None = None,
 ) -> None:
     """Update multiple published ads with retry and uncertainty handling.
 
@@ -404,7 +418,7 @@ async def update_ads(
 
     Args:
         web: A WebScrapingMixin instance for browser interactions.
-        ad_cfgs: List of (ad_file, ad_cfg, ad_cfg_orig) tuples.
+        ad_cfgs: The ads to process.
         root_url: Base Kleinanzeigen URL.
         config: Full application config.
         keep_old_ads: If True, skip old-ad deletion.
@@ -413,17 +427,23 @@ async def update_ads(
             ``(ad_cfg, ad_cfg_orig, ad_file, attempt, exc)``.
         config_file_path: Path to the config file (for relative path
             resolution).
+        published: Optional list each successfully persisted ad is
+            appended to (see :func:`.ad_loading.recording_published_images`).
+        snapshot: The run's published ads; a fresh one is used when omitted.
+            Invalidated before the first ad is submitted.
     """
     count = 0
     failed_count = 0
     max_retries = SUBMISSION_MAX_RETRIES
 
-    published_ads_list = await published_ads.fetch_published_ads(web, root_url)
+    snapshot = snapshot or PublishedAdsSnapshot(web, root_url)
+    published_ads_list = await snapshot.get()
 
-    for idx, (ad_file, ad_cfg, ad_cfg_orig) in enumerate(ad_cfgs, start = 1):
+    for idx, record in enumerate(ad_cfgs, start = 1):
+        ad_file, ad_cfg = record.ad_file, record.ad_cfg
         LOG.info("Processing %s/%s: '%s' from [%s]...", idx, len(ad_cfgs), ad_cfg.title, ad_file)
 
-        ad = next((published_ad for published_ad in published_ads_list if ad_matches_id(published_ad, ad_cfg.id)), None)
+        ad = published_ads_list.get(ad_cfg.id)
 
         if not ad:
             LOG.warning(
@@ -438,8 +458,10 @@ async def update_ads(
 
         count += 1
         success = False
+        ad_cfg_orig = record.raw
         baseline_price = ad_cfg.price
         baseline_price_reduction_count = ad_cfg.price_reduction_count
+        snapshot.invalidate()
 
         for attempt in range(1, max_retries + 1):
             try:
@@ -453,6 +475,8 @@ async def update_ads(
                     config_file_path = config_file_path,
                 )
                 success = True
+                if published is not None:
+                    published.append(record)
                 break
             except asyncio.CancelledError:
                 raise
@@ -507,18 +531,12 @@ async def update_ads(
                 )
                 await web.web_sleep(2_000)
 
-        if success:
-            try:
-                publish_timeout = web.timeout("publishing_result")
-                await web.web_await(
-                    lambda: check_publishing_result(web),
-                    timeout = publish_timeout,
-                )
-            except TimeoutError:
-                LOG.warning(
-                    " -> Could not confirm update for '%s', but changes may be online",
-                    ad_cfg.title,
-                )
+        if success and not await _await_publishing_result(web):
+            LOG.warning(
+                " -> Could not confirm update for '%s', but changes may be online",
+                ad_cfg.title,
+            )
+        record.release_raw()
 
     LOG.info("############################################")
     if failed_count > 0:
@@ -9,6 +9,7 @@ browser config application, and file-logging setup. Central types:
 """
 from __future__ import annotations
 
+import dataclasses
 import os
 import re
 import sys
@@ -21,9 +22,10 @@ from kleinanzeigen_bot import resources as _resources
 from kleinanzeigen_bot.model.config_model import Config
 from kleinanzeigen_bot.utils import dicts as _dicts
 from kleinanzeigen_bot.utils import loggers as _loggers
+from kleinanzeigen_bot.utils import timing_tuner as _timing_tuner
 from kleinanzeigen_bot.utils import xdg_paths as _xdg_paths
 from kleinanzeigen_bot.utils.files import abspath
-from kleinanzeigen_bot.utils.timing_collector import TimingCollector
+from kleinanzeigen_bot.utils.timing_collector import TimingCollector, load_sessions
 
 LOG:Final[_loggers.Logger] = _loggers.get_logger(__name__)
 LOG.setLevel(_loggers.INFO)
@@ -35,8 +37,8 @@ WORKSPACE_FREE_COMMANDS:Final[frozenset[str]] = frozenset({"help", "version", "c
 # All valid CLI commands.  Keep in sync with the dispatch in app.py/run().
 VALID_COMMANDS:Final[frozenset[str]] = frozenset({
     "help", "version", "create-config", "diagnose", "verify",
-    "update-check", "update-content-hash",
-    "publish", "status", "update", "delete", "extend", "download",
+    "update-check", "update-content-hash", "timing-tune",
+    "publish", "status", "update", "delete", "extend", "download", "watch", "serve",
 })
 
 
@@ -45,6 +47,12 @@ class RuntimeState:
     config:Config
     categories:dict[str, str]
     timing_collector:TimingCollector | None
+    learned_timeouts:dict[str, float] = dataclasses.field(default_factory = dict)
+
+
+def timing_dir(workspace:_xdg_paths.Workspace) -> Path:
+    """Directory holding `timing_data.json`; diagnostics live under the workspace diagnostics tree, timing data sits next to it."""
+    return workspace.diagnostics_dir.parent / "timing"
 
 
 def create_default_config(config_file_path:str, workspace:_xdg_paths.Workspace | None) -> None:
@@ -103,7 +111,8 @@ def load_config(config_file_path:str, workspace:_xdg_paths.Workspace | None, com
         command: Active CLI command, used for timing collection labels.
 
     Returns:
-        RuntimeState: Parsed config, merged categories, and optional timing collector.
+        RuntimeState: Parsed config, merged categories, optional timing collector, and the
+        timeouts learned from recorded timing data when ``timeouts.adaptive_enabled`` is set.
 
     Example:
         `load_config("config.yaml", workspace, "verify")` returns a RuntimeState whose
@@ -122,13 +131,17 @@ def load_config(config_file_path:str, workspace:_xdg_paths.Workspace | None, com
 
     timing_enabled = config.diagnostics.timing_collection
     if timing_enabled and workspace:
-        # Diagnostics live under the workspace diagnostics tree; timing data sits next to it.
-        timing_dir = workspace.diagnostics_dir.parent / "timing"
-        timing_collector:TimingCollector | None = TimingCollector(timing_dir, command)
+        timing_collector:TimingCollector | None = TimingCollector(timing_dir(workspace), command)
     else:
         # No workspace or disabled timing collection means we skip the collector entirely.
         timing_collector = None
 
+    learned_timeouts:dict[str, float] = {}
+    if config.timeouts.adaptive_enabled and workspace:
+        proposals = _timing_tuner.propose_timeouts(load_sessions(timing_dir(workspace)), config.timeouts)
+        learned_timeouts = _timing_tuner.learned_timeouts(proposals)
+        LOG.debug("Learned shorter timeouts for %d of %d recorded operations", len(learned_timeouts), len(proposals))
+
     # Merge order matters: bundled defaults first, deprecated aliases second, user overrides last.
     categories:dict[str, str] = _dicts.load_dict_from_module(_resources, "categories.yaml", "")
     LOG.debug("Loaded %s categories from categories.yaml", len(categories))
@@ -143,7 +156,7 @@ def load_config(config_file_path:str, workspace:_xdg_paths.Workspace | None, com
         LOG.warning("No categories loaded - category files may be missing or empty")
     LOG.debug("Loaded %s categories in total", len(categories))
 
-    return RuntimeState(config = config, categories = categories, timing_collector = timing_collector)
+    return RuntimeState(config = config, categories = categories, timing_collector = timing_collector, learned_timeouts = learned_timeouts)
 
 
 def apply_browser_config(browser_config:Any, config:Config, workspace:_xdg_paths.Workspace | None, config_file_path:str) -> None:
@@ -0,0 +1,146 @@
+# SPDX-FileCopyrightText: © Jens Bergmann and contributors
+# SPDX-License-Identifier: AGPL-3.0-or-later
+# SPDX-ArtifactOfProjectHomePage: https://github.com/Second-Hand-Friends/kleinanzeigen-bot/
+"""Incremental canonical JSON encoding for content hashing.
+
+:func:`update_hash` feeds a hash object with exactly the bytes of
+``json.dumps(prune_empty(obj), sort_keys = True)`` while walking *obj* once,
+without building the pruned copy or the complete JSON document in memory.
+Output is flushed to the hash object in small chunks.
+"""
+import json
+from collections.abc import Callable, Mapping, Sequence
+from typing import Any, Final, Protocol
+
+# same escaping json.dumps uses with its default ensure_ascii=True
+_encode_str:Final[Callable[[str], str]] = json.encoder.encode_basestring_ascii
+# like json.dumps, bypass __repr__ overrides of int/float subclasses (e.g. IntEnum)
+_int_repr:Final[Callable[[int], str]] = int.__repr__
+_float_repr:Final[Callable[[float], str]] = float.__repr__
+
+_FLUSH_THRESHOLD:Final[int] = 512  # buffered fragments before the hash object is updated
+
+
+class _Hasher(Protocol):
+    def update(self, data:bytes, /) -> None: ...
+
+
+_SCALAR_TYPES:Final[frozenset[type]] = frozenset({str, int, float, bool, type(None)})
+_CONTAINER_TYPES:Final[frozenset[type]] = frozenset({dict, list, tuple, set})
+
+
+def is_empty_container(value:Any) -> bool:
+    """Return ``True`` for empty mappings, sequences and sets (but not empty strings)."""
+    # exact type checks first, isinstance() against the ABCs is comparatively slow
+    value_type = type(value)
+    if value_type in _SCALAR_TYPES:
+        return False
+    if value_type in _CONTAINER_TYPES:
+        return not value
+    return isinstance(value, (Mapping, Sequence, set)) and not isinstance(value, (str, bytes)) and len(value) == 0
+
+
+def prune_empty(obj:Any) -> Any:
+    """Recursively drop empty containers from mappings and sequences.
+
+    Only the direct values are tested, so a container that becomes empty by
+    pruning its own children is kept.
+    """
+    if isinstance(obj, Mapping):
+        return {k: prune_empty(v) for k, v in obj.items() if not is_empty_container(v)}
+    if isinstance(obj, Sequence) and not isinstance(obj, (str, bytes)):
+        return [prune_empty(v) for v in obj if not is_empty_container(v)]
+    return obj
+
+
+def _encode_float(value:float) -> str:
+    if value != value:  # noqa: PLR0124 — NaN check
+        return "NaN"
+    if value in {float("inf"), float("-inf")}:
+        return "Infinity" if value > 0 else "-Infinity"
+    return _float_repr(value)
+
+
+def _encode_key(key:Any) -> str:
+    # mirrors the key coercion of json.dumps
+    if isinstance(key, str):
+        return _encode_str(key)
+    if isinstance(key, float):
+        return _encode_str(_encode_float(key))
+    if key is True:
+        return '"true"'
+    if key is False:
+        return '"false"'
+    if key is None:
+        return '"null"'
+    if isinstance(key, int):
+        return _encode_str(_int_repr(key))
+    raise TypeError(f"keys must be str, int, float, bool or None, not {type(key).__name__}")
+
+
+def update_hash(hasher:_Hasher, obj:Any) -> None:
+    """Feed *hasher* with ``json.dumps(prune_empty(obj), sort_keys = True).encode()``.
+
+    Raises :class:`TypeError` for values ``json.dumps`` cannot serialize.
+    """
+    buffer:list[str] = []
+    write = buffer.append
+
+    def flush() -> None:
+        hasher.update("".join(buffer).encode())
+        buffer.clear()
+
+    def encode(value:Any) -> None:  # noqa: C901, PLR0912 — flat type dispatch is the fast path
+        value_type = type(value)
+        if value_type is str:
+            write(_encode_str(value))
+        elif value_type is dict:
+            encode_mapping(value)
+        elif value_type is list or value_type is tuple:
+            encode_sequence(value)
+        elif value_type is int:
+            write(_int_repr(value))
+        # generic fallbacks in the order json.dumps checks them
+        elif isinstance(value, str):
+            write(_encode_str(value))
+        elif value is None:
+            write("null")
+        elif value is True:
+            write("true")
+        elif value is False:
+            write("false")
+        elif isinstance(value, int):
+            write(_int_repr(value))
+        elif isinstance(value, float):
+            write(_encode_float(value))
+        elif isinstance(value, Mapping):
+            encode_mapping(value)
+        elif isinstance(value, Sequence) and not isinstance(value, (str, bytes)):
+            encode_sequence(value)
+        else:
+            raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+        if len(buffer) >= _FLUSH_THRESHOLD:
+            flush()
+
+    def encode_mapping(value:Mapping[Any, Any]) -> None:
+        separator = "{"
+        for key, item in sorted(value.items()):
+            if is_empty_container(item):
+                continue
+            write(separator + _encode_key(key) + ": ")
+            separator = ", "
+            encode(item)
+        write("}" if separator == ", " else "{}")
+
+    def encode_sequence(value:Sequence[Any]) -> None:
+        separator = "["
+        for item in value:
+            if is_empty_container(item):
+                continue
+            write(separator)
+            separator = ", "
+            encode(item)
+        write("]" if separator == ", " else "[]")
+
+    encode(obj)
+    flush()
@@ -0,0 +1,166 @@
+# SPDX-FileCopyrightText: © Jens Bergmann and contributors
+# SPDX-License-Identifier: AGPL-3.0-or-later
+# SPDX-ArtifactOfProjectHomePage: https://github.com/Second-Hand-Friends/kleinanzeigen-bot/
+"""Wait for changes below a set of directories.
+
+:class:`InotifyWatcher` uses the Linux inotify API through :mod:`ctypes`, so
+no extra dependency is needed.  Everywhere else (and when inotify is not
+usable, e.g. because the watch limit is exhausted) :func:`create_watcher`
+returns a :class:`PollingWatcher` that simply reports a possible change
+every *poll_interval* seconds.
+
+Watchers only tell *that* something may have changed; callers rescan to find
+out *what* changed.  Directories are not watched recursively, pass every
+directory of interest to :meth:`~InotifyWatcher.watch`.
+"""
+from __future__ import annotations
+
+import ctypes, ctypes.util, errno, os, select, struct, sys, time  # isort: skip
+from typing import TYPE_CHECKING, Final, Protocol
+
+from . import loggers as _loggers
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+__all__ = [
+    "FileWatcher",
+    "InotifyWatcher",
+    "PollingWatcher",
+    "create_watcher",
+]
+
+LOG:Final[_loggers.Logger] = _loggers.get_logger(__name__)
+
+# events that can change the content or the set of watched files, see inotify(7)
+_IN_MODIFY:Final[int] = 0x00000002
+_IN_ATTRIB:Final[int] = 0x00000004
+_IN_CLOSE_WRITE:Final[int] = 0x00000008
+_IN_MOVED_FROM:Final[int] = 0x00000040
+_IN_MOVED_TO:Final[int] = 0x00000080
+_IN_CREATE:Final[int] = 0x00000100
+_IN_DELETE:Final[int] = 0x00000200
+_IN_DELETE_SELF:Final[int] = 0x00000400
+_IN_MOVE_SELF:Final[int] = 0x00000800
+_IN_IGNORED:Final[int] = 0x00008000  # watch removed, e.g. by inotify_rm_watch()
+_IN_ONLYDIR:Final[int] = 0x01000000
+_IN_NONBLOCK:Final[int] = os.O_NONBLOCK
+_IN_CLOEXEC:Final[int] = getattr(os, "O_CLOEXEC", 0)
+_WATCH_MASK:Final[int] = (
+    _IN_MODIFY | _IN_ATTRIB | _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE | _IN_DELETE_SELF | _IN_MOVE_SELF | _IN_ONLYDIR
+)
+_EVENT_HEADER:Final[struct.Struct] = struct.Struct("iIII")  # wd, mask, cookie, len (of the name that follows)
+_READ_SIZE:Final[int] = 64 * 1024
+
+# editors and the bot itself write files in several steps; wait for this much quiet before reporting
+DEBOUNCE_SECONDS:Final[float] = 0.3
+
+
+class FileWatcher(Protocol):
+    def watch(self, directories:Iterable[str]) -> None:
+        """Replace the set of watched directories."""
+
+    def wait(self, timeout:float) -> bool:
+        """Block for at most *timeout* seconds; return ``True`` when the watched directories may have changed."""
+
+    def close(self) -> None: ...
+
+
+class PollingWatcher:
+    """Reports a possible change every *poll_interval* seconds."""
+
+    def __init__(self, poll_interval:float) -> None:
+        self.poll_interval = poll_interval
+        self._next_poll = time.monotonic() + poll_interval
+
+    def watch(self, directories:Iterable[str]) -> None:
+        pass
+
+    def wait(self, timeout:float) -> bool:
+        remaining = self._next_poll - time.monotonic()
+        if timeout < remaining:
+            time.sleep(max(timeout, 0))
+            return False
+        time.sleep(max(remaining, 0))
+        self._next_poll = time.monotonic() + self.poll_interval
+        return True
+
+    def close(self) -> None:
+        pass
+
+
+class InotifyWatcher:
+    """Watches directories with Linux inotify; raises :class:`OSError` when inotify is unavailable."""
+
+    def __init__(self) -> None:
+        if not sys.platform.startswith("linux"):
+            raise OSError(errno.ENOSYS, "inotify is only available on Linux")
+        libc_name = ctypes.util.find_library("c")
+        self._libc = ctypes.CDLL(libc_name or "libc.so.6", use_errno = True)
+        self._libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self._libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+        fd = self._libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+        self._fd:int = fd
+        self._watches:dict[str, int] = {}
+
+    def watch(self, directories:Iterable[str]) -> None:
+        wanted = set(directories)
+        for directory in self._watches.keys() - wanted:
+            self._libc.inotify_rm_watch(self._fd, self._watches.pop(directory))
+        for directory in wanted - self._watches.keys():
+            wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), _WATCH_MASK)
+            if wd >= 0:
+                self._watches[directory] = wd
+                continue
+            err = ctypes.get_errno()
+            if err == errno.ENOSPC:  # fs.inotify.max_user_watches reached, events would silently go missing
+                raise OSError(err, os.strerror(err), directory)
+            LOG.debug("Cannot watch [%s]: %s", directory, os.strerror(err))  # e.g. deleted in the meantime
+
+    def wait(self, timeout:float) -> bool:
+        if not self._drain(timeout):
+            return False
+        while self._drain(DEBOUNCE_SECONDS):
+            pass
+        return True
+
+    def _drain(self, timeout:float) -> bool:
+        """Wait up to *timeout* seconds for events and discard them; return whether there were relevant ones."""
+        deadline = time.monotonic() + max(timeout, 0)
+        while True:
+            readable, _writable, _errors = select.select([self._fd], [], [], max(deadline - time.monotonic(), 0))
+            if not readable:
+                return False
+            if self._read_events():
+                return True
+
+    def _read_events(self) -> bool:
+        relevant = False
+        try:
+            while data := os.read(self._fd, _READ_SIZE):
+                offset = 0
+                while offset < len(data):
+                    _wd, mask, _cookie, name_len = _EVENT_HEADER.unpack_from(data, offset)
+                    offset += _EVENT_HEADER.size + name_len
+                    relevant = relevant or mask != _IN_IGNORED
+        except BlockingIOError:
+            pass
+        return relevant
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+            self._watches.clear()
+
+
+def create_watcher(poll_interval:float) -> FileWatcher:
+    """Return an :class:`InotifyWatcher` where available, otherwise a :class:`PollingWatcher`."""
+    try:
+        return InotifyWatcher()
+    except (OSError, AttributeError) as ex:  # AttributeError: libc without inotify symbols
+        LOG.debug("File system events unavailable, polling every %s seconds: %s", poll_interval, ex)
+        return PollingWatcher(poll_interval)
@@ -0,0 +1,181 @@
+# SPDX-FileCopyrightText: © Jens Bergmann and contributors
+# SPDX-License-Identifier: AGPL-3.0-or-later
+# SPDX-ArtifactOfProjectHomePage: https://github.com/Second-Hand-Friends/kleinanzeigen-bot/
+"""Single-pass, multi-pattern glob scanner.
+
+:func:`scan` resolves a set of glob patterns relative to a root directory by
+walking the tree **once** with :func:`os.scandir` instead of calling
+:func:`wcmatch.glob.glob` per pattern.  All patterns are compiled into one
+matcher, subtrees that no pattern can reach are never entered, and the file
+listing of every visited directory is kept so follow-up globs in those
+directories (e.g. ad images) can be answered without touching the disk again.
+
+Results match :func:`wcmatch.glob.glob` with the same flags, except that only
+regular files are returned.  Patterns that point outside the root (absolute
+paths, ``..`` segments) are delegated to :func:`wcmatch.glob.glob`.
+"""
+from __future__ import annotations
+
+import math, os  # isort: skip
+from dataclasses import dataclass, field
+from typing import Final, NamedTuple
+
+from wcmatch import glob
+
+DEFAULT_FLAGS:Final[int] = glob.GLOBSTAR | glob.BRACE | glob.EXTGLOB
+
+_CURDIR_PREFIX:Final[str] = "./"
+
+
+class _PatternScope(NamedTuple):
+    """The part of the tree a single pattern can match in."""
+
+    literal_prefix:tuple[str, ...]  # leading directory names without glob syntax
+    max_depth:float  # deepest directory level that can hold a match (root = 0)
+    first_globstar:float  # index of the first ``**`` segment; symlinks are not followed from there on
+    matches_hidden:bool  # pattern explicitly names a dot-file or dot-directory
+
+    @classmethod
+    def of(cls, pattern:str, flags:int) -> _PatternScope:
+        segments = [s for s in pattern.split("/") if s not in {"", "."}]
+        has_globstar = "**" in segments
+        first_globstar = segments.index("**") if has_globstar else math.inf
+        max_depth = math.inf if has_globstar else len(segments) - 1
+        if flags & (glob.BRACE | glob.EXTGLOB) and (cut := next((i for i, s in enumerate(segments) if any(ch in s for ch in "{(")), None)) is not None:
+            # braces and extglob groups may contain "/", so nothing after them can be trusted
+            segments = segments[:cut + 1]
+            first_globstar = min(first_globstar, cut)
+            max_depth = math.inf
+
+        literal:list[str] = []
+        for segment in segments[:-1]:
+            if glob.is_magic(segment, flags = flags):
+                break
+            literal.append(segment)
+        return cls(
+            literal_prefix = tuple(literal),
+            max_depth = max_depth,
+            first_globstar = first_globstar,
+            matches_hidden = any(s.startswith(".") for s in pattern.split("/") if s not in {".", ".."}),
+        )
+
+    def may_contain(self, dir_segments:tuple[str, ...], *, is_symlink:bool) -> bool:
+        depth = len(dir_segments)
+        if depth > self.max_depth:
+            return False
+        if is_symlink and depth > self.first_globstar:
+            return False
+        common = min(depth, len(self.literal_prefix))
+        return all(os.path.normcase(a) == os.path.normcase(b) for a, b in zip(dir_segments[:common], self.literal_prefix[:common], strict = True))
+
+
+@dataclass(slots = True)
+class GlobScan:
+    """Result of :func:`scan`."""
+
+    root_dir:str
+    flags:int
+    files:dict[str, str] = field(default_factory = dict)
+    """``{absolute path: path relative to root_dir}`` of every matching file"""
+    listings:dict[str, tuple[str, ...]] = field(default_factory = dict)
+    """``{absolute directory: file names}`` of every directory visited during the walk"""
+
+    def glob_listed(self, base_dir:str, pattern:str) -> list[str] | None:
+        """Match *pattern* relative to *base_dir* against the recorded listings.
+
+        Returns the matching paths relative to *base_dir* (like
+        :func:`wcmatch.glob.glob` with ``root_dir = base_dir``), or ``None``
+        when the pattern cannot be answered from the listings, i.e. it spans
+        several directory levels or targets a directory that was not visited.
+        """
+        if os.path.isabs(pattern) or "**" in pattern:
+            return None
+        dir_part, _sep, name_pattern = pattern.rpartition("/")
+        if glob.is_magic(dir_part, flags = self.flags) or ".." in dir_part.split("/"):
+            return None
+        names = self.listings.get(os.path.normpath(os.path.join(base_dir, dir_part)))
+        if names is None:
+            return None
+        prefix = dir_part + "/" if dir_part else ""
+        return [prefix + str(name) for name in glob.globfilter(names, name_pattern, flags = self.flags)]
+
+
+def _name_matcher(patterns:list[str], flags:int) -> glob.WcMatcher[str] | None:
+    """Compile the file name parts of *patterns*, or return ``None`` if some
+    pattern does not have a plain file name part."""
+    name_patterns:list[str] = []
+    for pattern in patterns:
+        dir_part, _sep, name_pattern = pattern.rpartition("/")
+        if name_pattern in {"", "**"} or (flags & (glob.BRACE | glob.EXTGLOB) and any(ch in dir_part for ch in "{(")):
+            return None
+        name_patterns.append(name_pattern)
+    return glob.compile(name_patterns, flags = flags)
+
+
+def scan(root_dir:str, patterns:list[str], flags:int = DEFAULT_FLAGS) -> GlobScan:
+    """Resolve *patterns* relative to *root_dir* in a single directory walk."""
+    root_dir = os.path.abspath(root_dir)
+    result = GlobScan(root_dir, flags)
+
+    # patterns are grouped by their "./" prefix because glob.glob keeps it in the returned paths;
+    # like repeated glob.glob calls, the last pattern that matches a file decides its relative path
+    grouped:dict[str, list[str]] = {}
+    scopes:list[_PatternScope] = []
+    for pattern in patterns:
+        if os.path.isabs(pattern) or ".." in pattern.split("/"):
+            for match in glob.glob(pattern, root_dir = root_dir, flags = flags):
+                if os.path.isfile(os.path.join(root_dir, match)):
+                    result.files[os.path.normpath(os.path.join(root_dir, match))] = match
+            continue
+        prefix = _CURDIR_PREFIX if pattern.startswith(_CURDIR_PREFIX) else ""
+        grouped.setdefault(prefix, []).append(pattern.removeprefix(prefix))
+        grouped[prefix] = grouped.pop(prefix)  # move to the end = highest precedence
+        scopes.append(_PatternScope.of(pattern.removeprefix(prefix), flags))
+    if not scopes:
+        return result
+
+    matchers = [(prefix, _name_matcher(group, flags), glob.compile(group, flags = flags)) for prefix, group in reversed(grouped.items())]
+    visit_hidden = any(scope.matches_hidden for scope in scopes)
+    seen_dirs:set[tuple[int, int]] = set()
+
+    def walk(dir_path:str, dir_segments:tuple[str, ...]) -> None:
+        try:
+            stat = os.stat(dir_path)
+            if (stat.st_dev, stat.st_ino) in seen_dirs:
+                return
+            seen_dirs.add((stat.st_dev, stat.st_ino))
+            with os.scandir(dir_path) as it:
+                entries = list(it)
+        except OSError:
+            return
+
+        names:list[str] = []
+        subdirs:list[tuple[os.DirEntry[str], bool]] = []
+        for entry in entries:
+            try:
+                if entry.is_dir():
+                    subdirs.append((entry, entry.is_symlink()))
+                elif entry.is_file():
+                    names.append(entry.name)
+            except OSError:
+                continue
+        result.listings[dir_path] = tuple(names)
+
+        rel_dir = "/".join(dir_segments)
+        for name in names:
+            rel_path = f"{rel_dir}/{name}" if rel_dir else name
+            for prefix, name_matcher, matcher in matchers:
+                # matching full paths against "**" patterns is expensive, so reject by file name first
+                if (name_matcher is None or name_matcher.match(name)) and matcher.match(rel_path):
+                    result.files[os.path.join(dir_path, name)] = prefix + os.path.join(*dir_segments, name)
+                    break
+
+        for entry, is_symlink in subdirs:
+            if entry.name.startswith(".") and not visit_hidden:
+                continue
+            sub_segments = (*dir_segments, entry.name)
+            if any(scope.may_contain(sub_segments, is_symlink = is_symlink) for scope in scopes):
+                walk(entry.path, sub_segments)
+
+    walk(root_dir, ())
+    return result
@@ -1,6 +1,7 @@
 # SPDX-FileCopyrightText: © Sebastian Thomschke and contributors
 # SPDX-License-Identifier: AGPL-3.0-or-later
 # SPDX-ArtifactOfProjectHomePage: https://github.com/Second-Hand-Friends/kleinanzeigen-bot/
+from collections.abc import Mapping
 from gettext import gettext as _
 from typing import Any, Literal, cast
 
@@ -55,6 +56,28 @@ class ContextualModel(BaseModel):
             raise new_ex from ex
 
 
+def model_state(model:BaseModel) -> dict[str, Any]:
+    """Return what :func:`construct_model` needs to rebuild *model*: its class, field values and set fields, nested models included."""
+    values:dict[str, Any] = {}
+    models:dict[str, dict[str, Any]] = {}
+    for name, value in model.__dict__.items():
+        if isinstance(value, BaseModel):
+            models[name] = model_state(value)
+        else:
+            values[name] = value
+    return {"model": type(model), "values": values, "models": models, "fields_set": sorted(model.model_fields_set)}
+
+
+def construct_model(state:Mapping[str, Any]) -> Any:
+    """
+    Rebuild a model from its :func:`model_state` with ``model_construct``, i.e. without running any validator.
+
+    Only for states of models that passed validation before, e.g. entries of a verified cache.
+    """
+    nested = {name: construct_model(model) for name, model in state["models"].items()}
+    return state["model"].model_construct(_fields_set = set(state["fields_set"]), **state["values"], **nested)
+
+
 def format_validation_error(ex:ValidationError) -> str:
     """
     Turn a Pydantic ValidationError into the classic:
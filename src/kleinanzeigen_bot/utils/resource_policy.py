@@ -0,0 +1,129 @@
+# SPDX-FileCopyrightText: © Jens Bergmann and contributors
+# SPDX-License-Identifier: AGPL-3.0-or-later
+# SPDX-ArtifactOfProjectHomePage: https://github.com/Second-Hand-Friends/kleinanzeigen-bot/
+"""
+Resource policies for page loads.
+
+Contains ResourcePolicy, which decides which requests of a page are not needed, and
+ResourceBlocker, which enforces a policy on browser tabs via CDP request interception
+(`Fetch` domain) and counts the blocked requests.
+"""
+import collections
+from collections.abc import Iterable
+from dataclasses import dataclass
+from gettext import gettext as _
+from typing import Final
+from urllib.parse import urlparse
+
+from nodriver.cdp import fetch as cdp_fetch
+from nodriver.cdp import network as cdp_network
+from nodriver.core.tab import Tab as Page
+
+from kleinanzeigen_bot.utils import loggers
+
+LOG:Final[loggers.Logger] = loggers.get_logger(__name__)
+
+# blockable resource kinds, each but THIRD_PARTY maps to one CDP resource type
+THIRD_PARTY:Final[str] = "third_party"
+_RESOURCE_TYPES:Final[dict[str, cdp_network.ResourceType]] = {
+    "image": cdp_network.ResourceType.IMAGE,
+    "media": cdp_network.ResourceType.MEDIA,
+    "font": cdp_network.ResourceType.FONT,
+    "stylesheet": cdp_network.ResourceType.STYLESHEET,
+}
+RESOURCE_KINDS:Final[tuple[str, ...]] = (*_RESOURCE_TYPES, THIRD_PARTY)
+
+
+def _is_same_or_subdomain(host:str, domain:str) -> bool:
+    return host == domain or host.endswith("." + domain)
+
+
+@dataclass(frozen = True, slots = True)
+class ResourcePolicy:
+    """Resource kinds to block while pages load.
+
+    Requests to `site_domain` (e.g. `kleinanzeigen.de`) and its subdomains are first-party, requests to
+    `allowed_hosts` and their subdomains (e.g. captcha providers) are never blocked.
+    """
+
+    blocked:frozenset[str]
+    site_domain:str
+    allowed_hosts:tuple[str, ...] = ()
+
+    @classmethod
+    def for_site(cls, blocked:Iterable[str], site_url:str, allowed_hosts:Iterable[str] = ()) -> "ResourcePolicy":
+        """Build a policy for the site of `site_url`, e.g. `https://www.kleinanzeigen.de` -> `kleinanzeigen.de`."""
+        host = urlparse(site_url).hostname or ""
+        unknown = set(blocked) - set(RESOURCE_KINDS)
+        if unknown:
+            raise ValueError(_("Unknown resource kinds: %s") % ", ".join(sorted(unknown)))
+        return cls(blocked = frozenset(blocked), site_domain = host.removeprefix("www."), allowed_hosts = tuple(allowed_hosts))
+
+    def request_patterns(self) -> list[cdp_fetch.RequestPattern]:
+        """Requests the browser has to pause for `match(...)`; only the blocked resource types unless third parties are blocked."""
+        if THIRD_PARTY in self.blocked:
+            return [cdp_fetch.RequestPattern(url_pattern = "*", request_stage = cdp_fetch.RequestStage.REQUEST)]
+        return [
+            cdp_fetch.RequestPattern(url_pattern = "*", resource_type = resource_type, request_stage = cdp_fetch.RequestStage.REQUEST)
+            for kind, resource_type in _RESOURCE_TYPES.items()
+            if kind in self.blocked
+        ]
+
+    def match(self, resource_type:cdp_network.ResourceType, url:str) -> str | None:
+        """Return the blocked kind the request falls under, None if it may load."""
+        host = urlparse(url).hostname
+        if not host:
+            return None  # data:, blob: and similar URLs do not hit the network
+        if any(_is_same_or_subdomain(host, allowed) for allowed in self.allowed_hosts):
+            return None
+        for kind, blocked_type in _RESOURCE_TYPES.items():
+            if kind in self.blocked and resource_type == blocked_type:
+                return kind
+        if (
+            THIRD_PARTY in self.blocked
+            and resource_type != cdp_network.ResourceType.DOCUMENT  # the page itself, even when redirected
+            and not _is_same_or_subdomain(host, self.site_domain)
+        ):
+            return THIRD_PARTY
+        return None
+
+
+class ResourceBlocker:
+    """Enforces a ResourcePolicy on the tabs it is attached to and counts the blocked requests per kind."""
+
+    def __init__(self, policy:ResourcePolicy) -> None:
+        self.policy:Final[ResourcePolicy] = policy
+        self.blocked:collections.Counter[str] = collections.Counter()
+        self._pages:dict[str, Page] = {}  # attached tabs by target ID
+
+    def is_attached(self, page:Page) -> bool:
+        return page.target.target_id in self._pages
+
+    async def attach(self, page:Page) -> None:
+        """Start intercepting the requests of `page`; does nothing if already attached or nothing is blocked."""
+        if not self.policy.blocked or self.is_attached(page):
+            return
+        page.add_handler(cdp_fetch.RequestPaused, self._on_request_paused)
+        await page.send(cdp_fetch.enable(patterns = self.policy.request_patterns()))
+        self._pages[page.target.target_id] = page
+
+    async def detach(self) -> None:
+        """Stop intercepting the requests of all attached tabs."""
+        pages, self._pages = list(self._pages.values()), {}
+        for page in pages:
+            page.remove_handler(cdp_fetch.RequestPaused, self._on_request_paused)
+            try:
+                await page.send(cdp_fetch.disable())
+            except Exception as ex:  # noqa: BLE001 the tab may already be closed
+                LOG.debug("Disabling request interception failed: %s", ex)
+
+    async def _on_request_paused(self, event:cdp_fetch.RequestPaused, page:Page) -> None:
+        kind = self.policy.match(event.resource_type, event.request.url)
+        try:
+            if kind is None:
+                await page.send(cdp_fetch.continue_request(request_id = event.request_id))
+            else:
+                self.blocked[kind] += 1
+                await page.send(cdp_fetch.fail_request(request_id = event.request_id, error_reason = cdp_network.ErrorReason.BLOCKED_BY_CLIENT))
+        except Exception as ex:  # noqa: BLE001 the tab may have navigated away or been closed meanwhile
+            LOG.debug("Resolving paused request %s failed: %s", event.request.url, ex)
@@ -0,0 +1,65 @@
+# SPDX-FileCopyrightText: © Jens Bergmann and contributors
+# SPDX-License-Identifier: AGPL-3.0-or-later
+# SPDX-ArtifactOfProjectHomePage: https://github.com/Second-Hand-Friends/kleinanzeigen-bot/
+"""
+Best-effort state files of the workspace state directory.
+
+Contains load_state and save_state, which read and write caches and indexes (e.g. the
+ad cache or the published ads snapshot) as JSON or pickle, tagged with a header that
+identifies the format. A missing, outdated or broken state file is ignored and rebuilt,
+it never breaks a run.
+"""
+from __future__ import annotations
+
+import json, os, pickle  # isort: skip  # noqa: S403 — only reads back files written by the bot itself
+from typing import TYPE_CHECKING, Any, Final, TypeVar
+
+from kleinanzeigen_bot.utils import loggers
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Mapping
+    from pathlib import Path
+
+LOG:Final[loggers.Logger] = loggers.get_logger(__name__)
+
+_T = TypeVar("_T")
+
+
+def _replace_atomically(target:Path, data:bytes) -> None:
+    """Write *data* to a temp file next to *target* and move it into place."""
+    temp_file = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+    try:
+        target.parent.mkdir(parents = True, exist_ok = True)
+        temp_file.write_bytes(data)
+        temp_file.replace(target)
+    except OSError:
+        temp_file.unlink(missing_ok = True)
+        raise
+
+
+def load_state(state_file:Path, header:Mapping[str, Any], parse:Callable[[dict[str, Any]], _T], *, binary:bool = False) -> _T | None:
+    """Return ``parse(data)`` of *state_file*, or ``None`` when it is missing, was written with another *header* or cannot be read."""
+    if not state_file.is_file():
+        return None
+    try:
+        content = state_file.read_bytes()
+        # state files live in the user's own state directory and are only ever written by the bot itself
+        data = pickle.loads(content) if binary else json.loads(content)  # noqa: S301
+        if not isinstance(data, dict) or any(data.get(key) != value for key, value in header.items()):
+            LOG.debug("Discarding outdated state file [%s]", state_file)
+            return None
+        return parse(data)
+    except Exception as ex:  # noqa: BLE001
+        LOG.debug("Ignoring unreadable state file [%s]: %s", state_file, ex)
+        return None
+
+
+def save_state(state_file:Path, header:Mapping[str, Any], content:Mapping[str, Any], *, binary:bool = False) -> bool:
+    """Write *header* and *content* to *state_file* (atomic replace); return whether it was saved."""
+    data = {**header, **content}
+    try:
+        _replace_atomically(state_file, pickle.dumps(data, pickle.HIGHEST_PROTOCOL) if binary else json.dumps(data).encode())
+    except OSError as ex:
+        LOG.warning("Failed to save state file [%s]: %s", state_file, ex)
+        return False
+    return True
@@ -0,0 +1,84 @@
+# SPDX-FileCopyrightText: © Jens Bergmann and contributors
+# SPDX-License-Identifier: AGPL-3.0-or-later
+# SPDX-ArtifactOfProjectHomePage: https://github.com/Second-Hand-Friends/kleinanzeigen-bot/
+"""
+Tab pool for concurrent page work.
+
+Contains TabPool, which hands out a bounded number of extra tabs of one browser
+session, so page work can run in parallel next to the main page of WebScrapingMixin.
+"""
+import asyncio
+from gettext import gettext as _
+from typing import Final
+
+from nodriver.core.browser import Browser
+from nodriver.core.tab import Tab as Page
+
+from kleinanzeigen_bot.utils import loggers
+
+LOG:Final[loggers.Logger] = loggers.get_logger(__name__)
+
+
+class TabPool:
+    """Bounded pool of browser tabs sharing the cookies and login of one browser session.
+
+    Tabs are opened lazily on `acquire()` and reused after `release()`. At most `size` tabs
+    are handed out at the same time, further `acquire()` calls wait for a released tab.
+    """
+
+    def __init__(self, browser:Browser, size:int) -> None:
+        if size < 1:
+            raise ValueError(_("Tab pool size must be at least 1, got %s") % size)
+        self.size:Final[int] = size
+        self._browser = browser
+        self._slots = asyncio.Semaphore(size)
+        self._idle:list[Page] = []
+        self._tabs:list[Page] = []  # every tab opened by the pool that is still open
+
+    @property
+    def in_use(self) -> int:
+        """Number of tabs currently handed out."""
+        return len(self._tabs) - len(self._idle)
+
+    async def acquire(self) -> Page:
+        """Return an idle tab, opening a new one while fewer than `size` tabs are in use."""
+        await self._slots.acquire()
+        if self._idle:
+            return self._idle.pop()
+        try:
+            page = await self._browser.get("about:blank", new_tab = True)
+        except BaseException:
+            self._slots.release()
+            raise
+        self._tabs.append(page)
+        LOG.debug("Opened pooled tab %d of %d", len(self._tabs), self.size)
+        return page
+
+    def release(self, page:Page) -> None:
+        """Hand a tab obtained from `acquire()` back to the pool for reuse."""
+        if page not in self._tabs or page in self._idle:
+            raise ValueError(_("Tab does not belong to this pool or was already released"))
+        self._idle.append(page)
+        self._slots.release()
+
+    async def discard(self, page:Page) -> None:
+        """Close a tab obtained from `acquire()` instead of reusing it, e.g. after it failed."""
+        if page not in self._tabs or page in self._idle:
+            raise ValueError(_("Tab does not belong to this pool or was already released"))
+        self._tabs.remove(page)
+        self._slots.release()
+        await self._close_tab(page)
+
+    async def close(self) -> None:
+        """Close the idle tabs, e.g. once the concurrent work is done. Tabs in use are left open."""
+        idle, self._idle = self._idle, []
+        for page in idle:
+            self._tabs.remove(page)
+            await self._close_tab(page)
+
+    @staticmethod
+    async def _close_tab(page:Page) -> None:
+        try:
+            await page.close()
+        except Exception as ex:  # noqa: BLE001 the tab may already be gone with its browser
+            LOG.debug("Closing pooled tab failed: %s", ex)
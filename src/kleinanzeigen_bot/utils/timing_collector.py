@@ -7,12 +7,14 @@
 `TimingCollector` records operation durations in seconds, grouped by a single bot run
 (`session_id`). Call `record(...)` during runtime and `flush()` once at command end to
 append the current session to `timing_data.json` with automatic 30-day retention.
+`count(...)` adds to per-run counters (e.g. saved CDP calls) that are stored next to the
+records, so they never end up as timing samples.
 The collector is best-effort and designed for troubleshooting, not strict telemetry.
 """
 
 from __future__ import annotations
 
-import json, uuid  # isort: skip
+import collections, json, uuid  # isort: skip
 import os
 from dataclasses import asdict, dataclass
 from datetime import timedelta
@@ -52,6 +54,7 @@ class TimingCollector:
         self.session_id = uuid.uuid4().hex[:8]
         self.started_at = misc.now().isoformat()
         self.records:list[TimingRecord] = []
+        self.counters:collections.Counter[str] = collections.Counter()
         self._flushed = False
 
         LOG.debug("Timing collection initialized (session=%s, output_dir=%s, command=%s)", self.session_id, self.output_dir, command)
@@ -90,17 +93,21 @@ class TimingCollector:
             success,
         )
 
+    def count(self, name:str, amount:int = 1) -> None:
+        self.counters[name] += amount
+        LOG.debug("Timing counter: %s += %d", name, amount)
+
     def flush(self) -> Path | None:
         if self._flushed:
             LOG.debug("Timing collection already flushed for this run")
             return None
-        if not self.records:
+        if not self.records and not self.counters:
             LOG.debug("Timing collection enabled but no records captured in this run")
             return None
 
         try:
             self.output_dir.mkdir(parents = True, exist_ok = True)
-            data = self._load_existing_sessions()
+            data = load_sessions(self.output_dir)
             data.append(
                 {
                     "session_id": self.session_id,
@@ -108,6 +115,7 @@ class TimingCollector:
                     "started_at": self.started_at,
                     "ended_at": misc.now().isoformat(),
                     "records": [record.to_dict() for record in self.records],
+                    "counters": dict(self.counters),
                 }
             )
 
@@ -147,22 +155,25 @@ class TimingCollector:
                 RETENTION_DAYS,
             )
             self.records = []
+            self.counters.clear()
             self._flushed = True
             return output_file
         except Exception as exc:  # noqa: BLE001
             LOG.warning("Failed to flush timing collection data: %s", exc)
             return None
 
-    def _load_existing_sessions(self) -> list[dict[str, Any]]:
-        file_path = self.output_dir / TIMING_FILE
-        if not file_path.exists():
-            return []
 
-        try:
-            with file_path.open(encoding = "utf-8") as fd:
-                payload = json.load(fd)
-            if isinstance(payload, list):
-                return [item for item in payload if isinstance(item, dict)]
-        except Exception as exc:  # noqa: BLE001
-            LOG.warning("Unable to load timing collection data from %s: %s", file_path, exc)
+def load_sessions(output_dir:Path) -> list[dict[str, Any]]:
+    """Return the sessions stored in `output_dir`, or an empty list if there are none or they are unreadable."""
+    file_path = output_dir / TIMING_FILE
+    if not file_path.exists():
         return []
+
+    try:
+        with file_path.open(encoding = "utf-8") as fd:
+            payload = json.load(fd)
+        if isinstance(payload, list):
+            return [item for item in payload if isinstance(item, dict)]
+    except Exception as exc:  # noqa: BLE001
+        LOG.warning("Unable to load timing collection data from %s: %s", file_path, exc)
+    return []
@@ -0,0 +1,159 @@
+# SPDX-FileCopyrightText: © Jens Bergmann and contributors
+# SPDX-License-Identifier: AGPL-3.0-or-later
+# SPDX-ArtifactOfProjectHomePage: https://github.com/Second-Hand-Friends/kleinanzeigen-bot/
+
+"""Derive per-operation timeout budgets from recorded timing sessions.
+
+`propose_timeouts(...)` groups the records of the sessions stored by `TimingCollector` by
+operation (e.g. `web_find(ID, vap-brdcrmb)`) and proposes a budget for each one from a high
+percentile of its successful first attempts, clamped between `timeouts.adaptive_min` and the
+configured timeout. Probes that keep missing (e.g. for an optional dialog that is no longer shown)
+get `timeouts.adaptive_min`. `learned_timeouts(...)` turns the proposals into the lookup table used by
+`WebScrapingMixin.effective_timeout`, `render_proposals(...)` into the `timing-tune` report.
+"""
+
+from __future__ import annotations
+
+import math
+from collections import defaultdict
+from dataclasses import dataclass
+from gettext import gettext as _
+from typing import TYPE_CHECKING, Any, Final
+
+from kleinanzeigen_bot.utils import loggers
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from kleinanzeigen_bot.model.config_model import TimeoutConfig
+
+LOG:Final[loggers.Logger] = loggers.get_logger(__name__)
+
+
+@dataclass(frozen = True, slots = True)
+class TimeoutProposal:
+    """Learned timeout for one operation, as shown by the `timing-tune` report."""
+
+    description:str  # e.g. "web_find(ID, vap-brdcrmb)"
+    operation_key:str  # TimeoutConfig key the operation is configured with
+    samples:int  # recorded first attempts
+    successes:int  # successful first attempts
+    configured_timeout:float  # configured first-attempt timeout in seconds, multiplier applied
+    observed:float | None  # percentile of the successful first attempts in seconds
+    proposed_timeout:float | None  # None keeps the configured timeout
+
+
+def percentile(values:Iterable[float], pct:float) -> float:
+    """Return the nearest-rank percentile of `values`."""
+    ordered = sorted(values)
+    if not ordered:
+        raise ValueError(_("percentile of an empty sequence"))
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def propose_timeouts(sessions:Iterable[dict[str, Any]], timeouts:TimeoutConfig) -> list[TimeoutProposal]:
+    """
+    Propose a first-attempt timeout for every operation found in `sessions`.
+
+    Only first attempts are evaluated, since retries run with a grown budget. An operation is left
+    at its configured timeout while it has fewer than `adaptive_min_samples` first attempts, or as
+    soon as any of its retries succeeded, which means the first attempt was too short. An operation
+    whose latest `adaptive_min_samples` first attempts all missed, without a retry ever finding it,
+    is a probe for something that is not there and gets `adaptive_min`.
+    """
+    first_attempts:dict[str, list[dict[str, Any]]] = defaultdict(list)
+    retried_successfully:set[str] = set()
+    for session in sessions:
+        records = session.get("records")
+        if not isinstance(records, list):
+            continue
+        for record in records:
+            if not isinstance(record, dict) or not isinstance(record.get("description"), str):
+                continue
+            if record.get("operation_key") not in type(timeouts).model_fields:
+                continue  # not governed by a configurable timeout, e.g. recorded by an older version
+            if record.get("attempt_index") == 0:
+                first_attempts[record["description"]].append(record)
+            elif record.get("success"):
+                retried_successfully.add(record["description"])
+
+    proposals:list[TimeoutProposal] = []
+    for description, records in sorted(first_attempts.items()):
+        try:
+            durations = [float(record["actual_duration_sec"]) for record in records if record.get("success")]
+            # the latest configured value counts, the timeouts may have been changed since
+            configured = float(records[-1]["configured_timeout_sec"]) * timeouts.multiplier
+        except (KeyError, TypeError, ValueError) as ex:
+            LOG.debug("Skipping malformed timing records of %s: %s", description, ex)
+            continue
+
+        observed = percentile(durations, timeouts.adaptive_percentile) if durations else None
+        misses = 0  # latest first attempts in a row that did not succeed
+        for record in reversed(records):
+            if record.get("success"):
+                break
+            misses += 1
+        proposed:float | None = None
+        if len(records) >= timeouts.adaptive_min_samples and description not in retried_successfully:
+            if misses >= timeouts.adaptive_min_samples:
+                proposed = min(configured, timeouts.adaptive_min)
+            elif observed is not None:
+                proposed = min(configured, max(timeouts.adaptive_min, observed * timeouts.adaptive_headroom))
+
+        proposals.append(TimeoutProposal(
+            description = description,
+            operation_key = records[-1]["operation_key"],
+            samples = len(records),
+            successes = len(durations),
+            configured_timeout = configured,
+            observed = observed,
+            proposed_timeout = proposed,
+        ))
+    return proposals
+
+
+def learned_timeouts(proposals:Iterable[TimeoutProposal]) -> dict[str, float]:
+    """Map each operation with a proposal below its configured timeout to the proposed timeout."""
+    return {
+        proposal.description: proposal.proposed_timeout
+        for proposal in proposals
+        if proposal.proposed_timeout is not None and proposal.proposed_timeout < proposal.configured_timeout
+    }
+
+
+def render_proposals(proposals:list[TimeoutProposal], timeouts:TimeoutConfig) -> str:
+    """Format the proposals as a table comparing configured and proposed first-attempt timeouts."""
+    if not proposals:
+        return _("No timing data found. Enable diagnostics.timing_collection and run the bot to record some.") + "\n"
+
+    def seconds(value:float | None) -> str:
+        return "-" if value is None else f"{value:.2f}s"
+
+    header = (_("configured"), _("proposed"), f"p{timeouts.adaptive_percentile:g}", _("ok/runs"), _("operation"))
+    rows = [
+        (
+            seconds(proposal.configured_timeout),
+            seconds(proposal.proposed_timeout),
+            seconds(proposal.observed),
+            f"{proposal.successes}/{proposal.samples}",
+            f"{proposal.description} [{proposal.operation_key}]",
+        )
+        for proposal in proposals
+    ]
+    widths = [max(len(row[column]) for row in (header, *rows)) for column in range(len(header) - 1)]
+    lines = ["  ".join([*(cell.rjust(width) for cell, width in zip(row, widths, strict = False)), row[-1]]) for row in (header, *rows)]
+
+    learned = learned_timeouts(proposals)
+    saved = sum(proposal.configured_timeout - learned[proposal.description] for proposal in proposals if proposal.description in learned)
+    lines.append("")
+    lines.append(
+        _("%(learned)d of %(total)d operations would get a shorter timeout (%(saved).1fs less in total, adaptive timeouts are %(state)s).")
+        % {
+            "learned": len(learned),
+            "total": len(proposals),
+            "saved": saved,
+            "state": _("enabled") if timeouts.adaptive_enabled else _("disabled"),
+        }
+    )
+    return "\n".join(lines) + "\n"
@@ -2,10 +2,10 @@
 # SPDX-License-Identifier: AGPL-3.0-or-later
 # SPDX-ArtifactOfProjectHomePage: https://github.com/Second-Hand-Friends/kleinanzeigen-bot/
 import asyncio, enum, inspect, json, math, os, platform, secrets, shutil, subprocess  # isort: skip # noqa: S404
-from collections.abc import Awaitable, Callable, Coroutine, Iterable, Sequence
+from collections.abc import Awaitable, Callable, Coroutine, Iterable, Mapping, Sequence
 from gettext import gettext as _
 from pathlib import Path, PureWindowsPath
-from typing import Any, Final, Optional, cast
+from typing import Any, Final, NamedTuple, Optional, cast
 from urllib.parse import urlparse
 
 try:
@@ -14,7 +14,7 @@ except ImportError:
     from typing import NoReturn as Never  # Python <3.11
 
 import nodriver, psutil  # isort: skip
-from nodriver.cdp import browser as cdp_browser, input_ as cdp_input  # isort: skip
+from nodriver.cdp import browser as cdp_browser, input_ as cdp_input, runtime as cdp_runtime  # isort: skip
 from typing import TYPE_CHECKING, TypeGuard
 
 from nodriver.core.browser import Browser
@@ -35,6 +35,7 @@ from .chrome_version_detector import (
     detect_chrome_version_from_remote_debugging,
 )
 from .misc import T, ensure
+from .resource_policy import ResourceBlocker, ResourcePolicy
 
 if TYPE_CHECKING:
     from nodriver.cdp.runtime import RemoteObject
@@ -57,6 +58,18 @@ _BACKUP_SELECTOR_BUDGET_FLOOR_SECONDS:Final[float] = 0.25
 _VIEWPORT_JITTER_W:Final[int] = 24
 _VIEWPORT_JITTER_H:Final[int] = 16
 
+# web_await re-checks its condition after a short wait that backs off towards the cap.
+# In event-driven mode the wait ends early as soon as the page reports a DOM mutation
+# or navigation; the backoff then stays where it is instead of growing.
+_AWAIT_POLL_INTERVAL_MIN:Final[float] = 0.005
+_AWAIT_POLL_INTERVAL_MAX:Final[float] = 0.5
+# Minimum time between two checks woken by page changes, so busy pages are not checked continuously.
+_AWAIT_CHANGE_MIN_GAP_SECONDS:Final[float] = 0.05
+# Extra time granted to the in-page wait before giving up on its CDP response.
+_AWAIT_CHANGE_GRACE_SECONDS:Final[float] = 1.0
+# Delay after the first mutation so bursts of DOM updates are checked once.
+_AWAIT_CHANGE_SETTLE_MS:Final[int] = 10
+
 
 def _resolve_user_data_dir_paths(arg_value:str, config_value:str) -> tuple[Any, Any]:
     """Resolve the argument and config user_data_dir paths for comparison."""
@@ -86,12 +99,15 @@ def _is_remote_object(obj:Any) -> TypeGuard["RemoteObject"]:
 
 
 __all__ = [
+    "MISSING",
     "Browser",
     "BrowserConfig",
     "By",
     "Element",
     "Page",
     "Is",
+    "Read",
+    "SnapshotField",
     "WebScrapingMixin",
 ]
 
@@ -118,6 +134,153 @@ class Is(enum.Enum):
     SELECTED = enum.auto()
 
 
+class Read(enum.Enum):
+    """What :meth:`WebScrapingMixin.web_snapshot` reads from a matched element."""
+
+    TEXT = enum.auto()
+    ATTRIBUTE = enum.auto()
+    DISPLAYED = enum.auto()
+    EXISTS = enum.auto()
+
+
+class SnapshotField(NamedTuple):
+    """One field of a :meth:`WebScrapingMixin.web_snapshot` spec.
+
+    `attribute` names the attribute for `Read.ATTRIBUTE`. With `multiple=True` the field
+    holds a list with one value per matching element instead of the first match only.
+    """
+
+    selector_type:By
+    selector_value:str
+    read:Read = Read.TEXT
+    attribute:str = ""
+    multiple:bool = False
+
+
+class _Missing(enum.Enum):
+    MISSING = enum.auto()
+
+    def __bool__(self) -> bool:
+        return False
+
+    def __repr__(self) -> str:
+        return "MISSING"
+
+
+# Value of a snapshot field whose element is not on the page.
+MISSING:Final = _Missing.MISSING
+
+_SNAPSHOT_JS:Final[str] = """
+    (fields => {
+        const visibleText = elem => {
+            const sel = window.getSelection();
+            sel.removeAllRanges();
+            const range = document.createRange();
+            range.selectNode(elem);
+            sel.addRange(range);
+            const text = sel.toString().trim();
+            sel.removeAllRanges();
+            return text;
+        };
+        const displayed = elem => {
+            const style = window.getComputedStyle(elem);
+            return style.display !== "none" && style.visibility !== "hidden" && style.opacity !== "0"
+                && elem.offsetWidth > 0 && elem.offsetHeight > 0;
+        };
+        const byText = (text, multiple) => {
+            const found = [];
+            const walker = document.createTreeWalker(document.body || document.documentElement, NodeFilter.SHOW_TEXT);
+            for (let node = walker.nextNode(); node; node = walker.nextNode()) {
+                if (node.nodeValue.includes(text) && node.parentElement) {
+                    found.push(node.parentElement);
+                    if (!multiple) break;
+                }
+            }
+            return found;
+        };
+        const byXPath = (xpath, multiple) => {
+            const result = document.evaluate(xpath, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+            const count = multiple ? result.snapshotLength : Math.min(result.snapshotLength, 1);
+            return Array.from({length: count}, (_, i) => result.snapshotItem(i));
+        };
+        const find = (kind, value, multiple) => {
+            switch (kind) {
+                case "text": return byText(value, multiple);
+                case "xpath": return byXPath(value, multiple);
+                default: return multiple ? Array.from(document.querySelectorAll(value)) : [document.querySelector(value)].filter(Boolean);
+            }
+        };
+        const read = (elem, how, attribute) => {
+            switch (how) {
+                case "TEXT": return visibleText(elem);
+                case "ATTRIBUTE": return elem.getAttribute(attribute);
+                case "DISPLAYED": return displayed(elem);
+                default: return true;
+            }
+        };
+        const snapshot = {};
+        for (const [name, kind, value, how, attribute, multiple] of fields) {
+            const elements = find(kind, value, multiple);
+            if (multiple) {
+                snapshot[name] = elements.map(elem => read(elem, how, attribute));
+            } else if (elements.length) {
+                snapshot[name] = read(elements[0], how, attribute);
+            }
+        }
+        return JSON.stringify(snapshot);
+    })(%s)
+"""
+
+
+def _snapshot_locator(selector_type:By, selector_value:str) -> tuple[str, str]:
+    """Translate a selector into the (kind, value) pair understood by `_SNAPSHOT_JS`."""
+    match selector_type:
+        case By.ID:
+            return "css", f"#{selector_value.translate(METACHAR_ESCAPER)}"
+        case By.CLASS_NAME:
+            return "css", f".{selector_value.translate(METACHAR_ESCAPER)}"
+        case By.TAG_NAME | By.CSS_SELECTOR:
+            return "css", selector_value
+        case By.TEXT:
+            return "text", selector_value
+        case By.XPATH:
+            return "xpath", selector_value
+    raise AssertionError(_("Unsupported selector type: %s") % selector_type)
+
+
+def _is_absent(value:Any) -> bool:
+    """Return True for snapshot values that mean the element was not found."""
+    return value is MISSING or value is False or (isinstance(value, list) and not value)
+
+
+# Scrolls down (and optionally back up at double speed) in steps of `length` px at `speed` px/s,
+# driven by animation frames inside the page. Resolves with the page height scrolled through.
+_SCROLL_JS:Final[str] = """
+    (async (length, speed, backTop) => {
+        const bottom = document.body.scrollHeight;
+        // background tabs pause requestAnimationFrame, the timer keeps the animation moving there
+        const frame = () => new Promise(resolve => {
+            const timer = setTimeout(resolve, 100);
+            requestAnimationFrame(() => { clearTimeout(timer); resolve(); });
+        });
+        const glide = async (from, to, pxPerMs) => {
+            const distance = Math.abs(to - from);
+            const start = performance.now();
+            for (;;) {
+                const travelled = Math.min(distance, Math.ceil((performance.now() - start) * pxPerMs / length) * length);
+                window.scrollTo(0, from < to ? from + travelled : from - travelled);
+                if (travelled >= distance) return;
+                await frame();
+            }
+        };
+        const end = Math.ceil(bottom / length) * length;
+        await glide(0, end, speed / 1000);
+        if (backTop) await glide(end, 0, speed / 500);
+        return bottom;
+    })(%d, %d, %s)
+"""
+
+
 def _write_initial_prefs(prefs_file:str) -> None:
     with open(prefs_file, "w", encoding = "UTF-8") as fd:
         json.dump(
@@ -312,9 +475,12 @@ class WebScrapingMixin:  # noqa: PLR0904
         self.browser_config:Final[BrowserConfig] = BrowserConfig()
         self.browser:Browser = None  # pyright: ignore[reportAttributeAccessIssue]
         self.page:Page = None  # pyright: ignore[reportAttributeAccessIssue]
+        self._resource_blocker:ResourceBlocker | None = None
         self._browser_session_is_remote:bool = False
         self._viewport_resize_attempted:bool = False
         self._default_timeout_config:TimeoutConfig | None = None
+        # first-attempt timeouts learned from recorded timing data, keyed by operation description
+        self._learned_timeouts:dict[str, float] = {}
         self._default_humanization_config:HumanizationConfig | None = None
         self.config:BotConfig = cast(BotConfig, None)
 
@@ -347,11 +513,23 @@ class WebScrapingMixin:  # noqa: PLR0904
         """
         return self._get_timeout_config().resolve(key, override)
 
-    def effective_timeout(self, key:str = "default", override:float | None = None, *, attempt:int = 0) -> float:
+    def effective_timeout(self, key:str = "default", override:float | None = None, *, attempt:int = 0, operation:str | None = None) -> float:
         """
         Return the effective timeout (seconds) with multiplier/backoff applied.
+
+        With `timeouts.adaptive_enabled`, an `operation` that has a learned timeout (see
+        `timing_tuner`) gets that timeout instead, grown by the same backoff on retries and never
+        longer than the configured one.
         """
-        return self._get_timeout_config().effective(key, override, attempt = attempt)
+        cfg = self._get_timeout_config()
+        effective = cfg.effective(key, override, attempt = attempt)
+        if operation is None or not cfg.adaptive_enabled:
+            return effective
+        learned = self._learned_timeouts.get(operation)
+        if learned is None:
+            return effective
+        backoff = cfg.retry_backoff_factor**attempt if attempt > 0 else 1.0
+        return min(effective, learned * backoff)
 
     def _timeout_attempts(self) -> int:
         cfg = self._get_timeout_config()
@@ -401,7 +579,7 @@ class WebScrapingMixin:  # noqa: PLR0904
         loop = asyncio.get_running_loop()
 
         for attempt in range(attempts):
-            effective_timeout = self.effective_timeout(key, override, attempt = attempt)
+            effective_timeout = self.effective_timeout(key, override, attempt = attempt, operation = description)
             attempt_started = loop.time()
             try:
                 result = await operation(effective_timeout)
@@ -559,9 +737,7 @@ class WebScrapingMixin:  # noqa: PLR0904
         remote_host, remote_port = _parse_remote_debugging_args(self.browser_config.arguments)
 
         if remote_port > 0:
-            self.browser = await self._connect_to_remote_browser(remote_host, remote_port)
-            LOG.info("New Browser session is %s", self.browser.websocket_url)
-            self._browser_session_is_remote = True
+            await self.connect_browser_session(remote_host, remote_port)
             return
 
         ########################################################
@@ -611,6 +787,15 @@ class WebScrapingMixin:  # noqa: PLR0904
                 LOG.error("5. Check if any antivirus or security software is blocking the browser")
             raise
 
+    async def connect_browser_session(self, host:str, port:int) -> None:
+        """Use an already running browser with remote debugging enabled, e.g. the browser of the `serve` command."""
+        self._viewport_resize_attempted = False
+        if not self.browser_config.binary_location:
+            self.browser_config.binary_location = self.get_compatible_browser()
+        self.browser = await self._connect_to_remote_browser(host, port)
+        LOG.info("New Browser session is %s", self.browser.websocket_url)
+        self._browser_session_is_remote = True
+
     async def _connect_to_remote_browser(self, host:str, port:int) -> Browser:
         """Connect to an existing browser process via remote debugging."""
         LOG.info("Using existing browser process at %s:%s", host, port)
@@ -923,6 +1108,7 @@ class WebScrapingMixin:  # noqa: PLR0904
         LOG.debug("Closing Browser session...")
         browser = self.browser
         self.page = None  # pyright: ignore[reportAttributeAccessIssue]
+        self._log_blocked_resources()
         # Safely read private nodriver PID. In tests/mocked sessions this can be non-int,
         # and in externally managed browser sessions it can be None.
         browser_pid = getattr(browser, "_process_pid", None)
@@ -957,6 +1143,7 @@ class WebScrapingMixin:  # noqa: PLR0904
         # Reset browser and page references
         self.browser = None  # pyright: ignore[reportAttributeAccessIssue]
         self.page = None  # pyright: ignore[reportAttributeAccessIssue]
+        self._resource_blocker = None
 
     def get_compatible_browser(self) -> str:
         browser_paths:list[str | None] = []
@@ -1012,6 +1199,37 @@ class WebScrapingMixin:  # noqa: PLR0904
 
         raise AssertionError(_("Installed browser could not be detected"))
 
+    async def set_resource_policy(self, policy:ResourcePolicy | None) -> None:
+        """
+        Blocks the requests `policy` does not allow in every tab opened by `web_open` from now on, None allows all requests again.
+
+        Applies until replaced, stopped or the browser session is closed, each of which logs how many requests were blocked.
+        """
+        await self.stop_resource_blocking()
+        if policy and policy.blocked:
+            self._resource_blocker = ResourceBlocker(policy)
+            LOG.debug("Blocking page resources: %s", ", ".join(sorted(policy.blocked)))
+
+    async def stop_resource_blocking(self) -> None:
+        """
+        Stops intercepting requests in all tabs and logs how many requests were blocked.
+
+        Must be awaited before closing a session whose browser keeps running (e.g. the one of a `serve` command),
+        otherwise its tabs keep pausing requests no one resolves anymore.
+        """
+        if self._resource_blocker:
+            await self._resource_blocker.detach()
+        self._log_blocked_resources()
+
+    def _log_blocked_resources(self) -> None:
+        blocker, self._resource_blocker = self._resource_blocker, None
+        if blocker and blocker.blocked:
+            LOG.info(
+                "Blocked %d page resources not needed by this command (%s)",
+                blocker.blocked.total(),
+                ", ".join(f"{kind}: {count}" for kind, count in blocker.blocked.most_common()),
+            )
+
     async def web_await(
         self,
         condition:Callable[[], T | Never | Coroutine[Any, Any, T | Never]],
@@ -1019,21 +1237,30 @@ class WebScrapingMixin:  # noqa: PLR0904
         timeout:int | float | None = None,
         timeout_error_message:str = "",
         apply_multiplier:bool = True,
+        event_driven:bool = True,
     ) -> T:
         """
         Blocks/waits until the given condition is met.
 
+        The condition is re-checked with an adaptive backoff. In event-driven mode the page
+        additionally signals DOM mutations and navigations, so the condition is re-checked as soon
+        as the page changes, but at most once per `_AWAIT_CHANGE_MIN_GAP_SECONDS`; where no observer
+        can be installed, plain adaptive polling is used.
+
         :param timeout: timeout in seconds (base value, multiplier applied unless disabled)
+        :param event_driven: wake up on page changes instead of only polling
         :raises TimeoutError: if element could not be found within time
         """
         loop = asyncio.get_running_loop()
         start_at = loop.time()
         base_timeout = timeout if timeout is not None else self.timeout()
         effective_timeout = self.effective_timeout(override = base_timeout) if apply_multiplier else base_timeout
+        poll_interval = _AWAIT_POLL_INTERVAL_MIN
 
         while True:
             await self.page
             ex:Exception | None = None
+            checked_at = loop.time()
             try:
                 result_raw = condition()
                 result:T = cast(T, await result_raw if inspect.isawaitable(result_raw) else result_raw)
@@ -1063,7 +1290,64 @@ class WebScrapingMixin:  # noqa: PLR0904
                     raise ex
                 raise TimeoutError(timeout_error_message or f"Condition not met within {effective_timeout} seconds")
             remaining_timeout = max(effective_timeout - elapsed, 0.0)
-            await asyncio.sleep(min(0.5, remaining_timeout))
+            wait = min(poll_interval, remaining_timeout)
+            changed = await self._web_await_change(wait) if event_driven else None
+            if changed is None:
+                await asyncio.sleep(wait)
+            if not changed:
+                poll_interval = min(poll_interval * 2, _AWAIT_POLL_INTERVAL_MAX)
+            elif (gap := _AWAIT_CHANGE_MIN_GAP_SECONDS - (loop.time() - checked_at)) > 0:
+                # coalesce bursts of page changes into one check per minimum gap
+                await asyncio.sleep(min(gap, max(effective_timeout - (loop.time() - start_at), 0.0)))
+
+    async def _web_await_change(self, wait:float) -> bool | None:
+        """
+        Waits up to `wait` seconds for the current page to change.
+
+        Installs a one-shot `MutationObserver` plus navigation listeners in the page. The page is
+        evaluated directly via CDP without deep serialization, since only a short string comes back.
+
+        :return: True if the page reported a DOM mutation or navigation, False if it stayed quiet,
+            None if no observer could be installed (e.g. while the page is navigating)
+        """
+        wait_ms = max(int(wait * 1_000), 0)
+        jscode = f"""
+            new Promise(resolve => {{
+                let observer = null;
+                let settle = null;
+                const events = ["pagehide", "popstate", "hashchange"];
+                const done = reason => {{
+                    observer?.disconnect();
+                    clearTimeout(timer);
+                    clearTimeout(settle);
+                    events.forEach(name => window.removeEventListener(name, onNavigation));
+                    document.removeEventListener("readystatechange", onNavigation);
+                    resolve(reason);
+                }};
+                const onNavigation = () => done("navigation");
+                const timer = setTimeout(() => done("timeout"), {wait_ms});
+                observer = new MutationObserver(() => {{
+                    settle ??= setTimeout(() => done("mutation"), {_AWAIT_CHANGE_SETTLE_MS});
+                }});
+                observer.observe(document, {{subtree: true, childList: true, attributes: true, characterData: true}});
+                events.forEach(name => window.addEventListener(name, onNavigation));
+                document.addEventListener("readystatechange", onNavigation);
+            }})
+        """
+        try:
+            remote_object, errors = await asyncio.wait_for(
+                self.page.send(cdp_runtime.evaluate(expression = jscode, await_promise = True, return_by_value = True)),
+                timeout = wait + _AWAIT_CHANGE_GRACE_SECONDS,
+            )
+        except (TimeoutError, asyncio.TimeoutError):
+            return False
+        except Exception as ex:  # noqa: BLE001 observers are optional, polling takes over
+            LOG.debug("Waiting for page changes failed, polling instead: %s", ex)
+            return None
+        reason = None if errors else getattr(remote_object, "value", None)
+        if reason == "timeout":
+            return False
+        return True if reason in {"mutation", "navigation"} else None
 
     async def web_check(self, selector_type:By, selector_value:str, attr:Is, *, timeout:int | float | None = None) -> bool:
         """
@@ -1436,6 +1720,8 @@ class WebScrapingMixin:  # noqa: PLR0904
         if not reload_if_already_open and self.page and url == self.page.url:
             LOG.debug("  => skipping, [%s] is already open", url)
             return
+        if self._resource_blocker:
+            await self._resource_blocker.attach(self.page or self.browser.main_tab)
         self.page = await self.browser.get(url = url, new_tab = False, new_window = False)
         page_timeout = self.effective_timeout("page_load", timeout)
         await self.web_await(
@@ -1451,6 +1737,63 @@ class WebScrapingMixin:  # noqa: PLR0904
         element = await self.web_find(selector_type, selector_value, parent = parent, timeout = timeout)
         return await self.extract_visible_text(element)
 
+    async def web_snapshot(
+        self,
+        spec:Mapping[str, SnapshotField],
+        *,
+        required:Iterable[str] = (),
+        timeout:int | float | None = None,
+    ) -> dict[str, Any]:
+        """
+        Reads many fields of the current page with a single `Runtime.evaluate`.
+
+        Each field of `spec` is located and read in the page. The page returns one compact JSON
+        string, so the whole snapshot costs one CDP round trip and one `json.loads`. Fields whose
+        element is not on the page are `MISSING`. `Read.EXISTS` fields are True or False, and
+        fields with `multiple=True` are lists, which are empty when nothing matches.
+
+        Without `required` the page is read exactly once, as it currently is. Otherwise the
+        snapshot is retaken (see `web_await`) until every required field is present.
+
+        :param timeout: timeout in seconds for the required fields (base value, multiplier applied)
+        :raises TimeoutError: if a required field is still absent when the timeout expires
+        :raises ProtocolException: if the page did not return a snapshot
+        """
+        fields = [
+            [name, *_snapshot_locator(field.selector_type, field.selector_value), field.read.name, field.attribute, field.multiple]
+            for name, field in spec.items()
+        ]
+        jscode = _SNAPSHOT_JS % json.dumps(fields)
+
+        async def take() -> dict[str, Any]:
+            started = asyncio.get_running_loop().time()
+            raw = await self.web_execute(jscode)
+            if not isinstance(raw, str):
+                raise ProtocolException(f"Unexpected snapshot result: {raw!r}")
+            found = json.loads(raw)
+            LOG.debug("web_snapshot(%d fields) took %.1f ms", len(fields), (asyncio.get_running_loop().time() - started) * 1000)
+            return {
+                name: found.get(name, []) if field.multiple else (name in found) if field.read is Read.EXISTS else found.get(name, MISSING)
+                for name, field in spec.items()
+            }
+
+        required = list(required)
+        if not required:
+            return await take()
+
+        snapshot:dict[str, Any] = {}
+
+        async def complete() -> bool:
+            snapshot.update(await take())
+            return not any(_is_absent(snapshot[name]) for name in required)
+
+        try:
+            await self.web_await(complete, timeout = timeout)
+        except TimeoutError as ex:
+            absent = [name for name in required if name not in snapshot or _is_absent(snapshot[name])]
+            raise TimeoutError(f"Snapshot fields {absent} not found within {self.effective_timeout(override = timeout)} seconds.") from ex
+        return snapshot
+
     async def web_sleep(self, min_ms:int | None = None, max_ms:int | None = None) -> None:
         """Pause for a randomized duration.
 
@@ -1590,26 +1933,82 @@ class WebScrapingMixin:  # noqa: PLR0904
 
         return False
 
-    async def web_request(self, url:str, method:str = "GET", valid_response_codes:int | Iterable[int] = 200, headers:dict[str, str] | None = None) -> Any:
+    async def web_request(
+        self,
+        url:str,
+        method:str = "GET",
+        valid_response_codes:int | Iterable[int] = 200,
+        headers:dict[str, str] | None = None,
+        *,
+        json_response:bool = False,
+    ) -> Any:
+        """
+        Performs an HTTP request from within the current page using `fetch`.
+
+        The returned dict contains `statusCode`, `statusMessage`, `headers` and the body as text in `content`.
+
+        With `json_response=True` the page validates the body as JSON and hands the whole response back as one
+        compact JSON string, which is decoded here with a single `json.loads` instead of going through the
+        RemoteObject conversion. The parsed body is then returned in `json`; a body that is not valid JSON is
+        returned as text in `content` so callers can report it.
+
+        :raises ProtocolException: if the page did not return a response
+        :raises AssertionError: if the status code is not one of `valid_response_codes`
+        """
         method = method.upper()
         LOG.debug(" -> HTTP %s [%s]...", method, url)
-        response = await self.web_execute(f"""
+        fetch_js = f"""
             fetch("{url}", {{
                 method: "{method}",
                 redirect: "follow",
                 headers: {headers or {}}
-            }})
-            .then(response => response.text().then(responseText => {{
-                headers = {{}};
+            }})"""
+        if not json_response:
+            response = await self.web_execute(fetch_js + """
+            .then(response => response.text().then(responseText => {
+                headers = {};
                 response.headers.forEach((v, k) => headers[k] = v);
-                return {{
+                return {
                     statusCode: response.status,
                     statusMessage: response.statusText,
                     headers: headers,
                     content: responseText
-                }}
-            }}))
+                }
+            }))
         """)
+        else:
+            # The body is only validated in the page and spliced into the envelope as-is,
+            # so it is neither re-serialized there nor deep-serialized by CDP.
+            loop = asyncio.get_running_loop()
+            started = loop.time()
+            response = await self.web_execute(fetch_js + """
+            .then(response => response.text().then(responseText => {
+                const headers = {};
+                response.headers.forEach((v, k) => headers[k] = v);
+                const envelope = JSON.stringify({
+                    statusCode: response.status,
+                    statusMessage: response.statusText,
+                    headers: headers
+                });
+                try {
+                    JSON.parse(responseText);
+                } catch (e) {
+                    return envelope.slice(0, -1) + ',"content":' + JSON.stringify(responseText) + '}';
+                }
+                return envelope.slice(0, -1) + ',"json":' + responseText + '}';
+            }))
+        """)
+            if isinstance(response, str):
+                received = loop.time()
+                payload_size = len(response)
+                try:
+                    response = json.loads(response)
+                except json.JSONDecodeError as ex:
+                    raise ProtocolException(f"Malformed JSON response for HTTP {method} to {url}: {ex}") from ex
+                LOG.debug(
+                    " <- HTTP %s [%s]: %d chars in %.1f ms, decoded in %.1f ms",
+                    method, url, payload_size, (received - started) * 1000, (loop.time() - received) * 1000,
+                )
         if isinstance(valid_response_codes, int):
             valid_response_codes = [valid_response_codes]
         # web_execute may return a CDP ExceptionDetails (or None) instead of the
@@ -1632,22 +2031,24 @@ class WebScrapingMixin:  # noqa: PLR0904
         """
         Smoothly scrolls the current web page down.
 
+        The whole animation runs inside the page and is awaited with a single CDP call.
+
         :param scroll_length: the length of a single scroll iteration, determines smoothness of scrolling, lower is smoother
         :param scroll_speed: the speed of scrolling, higher is faster
         :param scroll_back_top: whether to scroll the page back to the top after scrolling to the bottom
         """
-        current_y_pos = 0
-        bottom_y_pos:int = await self.web_execute("document.body.scrollHeight")  # get bottom position
-        while current_y_pos < bottom_y_pos:  # scroll in steps until bottom reached
-            current_y_pos += scroll_length
-            await self.web_execute(f"window.scrollTo(0, {current_y_pos})")  # scroll one step
-            await asyncio.sleep(scroll_length / scroll_speed)
-
-        if scroll_back_top:  # scroll back to top in same style
-            while current_y_pos > 0:
-                current_y_pos -= scroll_length
-                await self.web_execute(f"window.scrollTo(0, {current_y_pos})")
-                await asyncio.sleep(scroll_length / scroll_speed / 2)  # double speed
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        bottom_y_pos:int = await self.web_execute(_SCROLL_JS % (scroll_length, scroll_speed, json.dumps(scroll_back_top)))
+        duration = loop.time() - started
+
+        # a step-by-step scroll needs one scrollTo round trip per step plus the height lookup
+        steps = math.ceil(bottom_y_pos / scroll_length) if bottom_y_pos > 0 else 0
+        stepwise_cdp_calls = 1 + steps * (2 if scroll_back_top else 1)
+        # counted, not recorded as a timing sample: scrolling has no configured timeout the timing tuner could adapt
+        if (collector := getattr(self, "_timing_collector", None)) is not None:
+            collector.count("web_scroll_page_down.saved_cdp_calls", stepwise_cdp_calls - 1)
+        LOG.debug("web_scroll_page_down(%d px) took %.1f ms with 1 CDP call instead of %d", bottom_y_pos, duration * 1000, stepwise_cdp_calls)
 
     async def web_select(self, selector_type:By, selector_value:str, selected_value:Any, timeout:int | float | None = None) -> Element:
         """
@@ -23,10 +23,12 @@ from unittest.mock import MagicMock
 
 import pytest
 
+from kleinanzeigen_bot.ad_record import AdRecord
 from kleinanzeigen_bot.app import KleinanzeigenBot
 from kleinanzeigen_bot.model.ad_model import Ad
 from kleinanzeigen_bot.model.config_model import Config
 from kleinanzeigen_bot.utils import i18n, loggers
+from kleinanzeigen_bot.utils.glob_scanner import GlobScan
 from kleinanzeigen_bot.utils.web_scraping_mixin import Browser
 
 loggers.configure_console_logging()
@@ -278,12 +280,14 @@ class SmokeKleinanzeigenBot(KleinanzeigenBot):
     async def login(self) -> None:
         return None
 
-    async def publish_ads(self, ad_cfgs:list[tuple[str, Ad, dict[str, Any]]]) -> None:
+    async def publish_ads(self, ad_cfgs:list[AdRecord]) -> None:
         return None
 
-    def load_ads(self, *, ignore_inactive:bool = True, exclude_ads_with_id:bool = True) -> list[tuple[str, Ad, dict[str, Any]]]:
+    def load_ads(
+        self, *, ignore_inactive:bool = True, exclude_ads_with_id:bool = True, scan:GlobScan | None = None
+    ) -> list[AdRecord]:
         # Use cast to satisfy type checker for dummy Ad value
-        return [("dummy_file", cast(Ad, None), {})]
+        return [AdRecord("dummy_file", cast(Ad, None), {})]
 
     def load_config(self) -> None:
         return None
@@ -302,10 +306,10 @@ def smoke_bot() -> SmokeKleinanzeigenBot:
 # ============================================================================
 
 
-def build_update_ad(base_ad_config:dict[str, Any], ad_id:int | None, title:str) -> tuple[str, Ad, dict[str, Any]]:
-    """Build an ad tuple for testing from a base config, id, and title."""
+def build_update_ad(base_ad_config:dict[str, Any], ad_id:int | None, title:str) -> AdRecord:
+    """Build an ad record for testing from a base config, id, and title."""
     ad_payload = copy.deepcopy(base_ad_config) | {"id": ad_id, "title": title}
-    return (f"{ad_id}.yaml", Ad.model_validate(ad_payload), ad_payload)
+    return AdRecord(f"{ad_id}.yaml", Ad.model_validate(ad_payload), ad_payload)
 
 
 def build_published_ads(*ad_specs:tuple[int, str]) -> list[dict[str, Any]]:
@@ -0,0 +1,524 @@
+# SPDX-FileCopyrightText: © Jens Bergmann and contributors
+# SPDX-License-Identifier: AGPL-3.0-or-later
+# SPDX-ArtifactOfProjectHomePage: https://github.com/Second-Hand-Friends/kleinanzeigen-bot/
+import dataclasses
+import json
+import logging
+import os
+from datetime import timedelta
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+
+from kleinanzeigen_bot import ad_cache, ad_loading
+from kleinanzeigen_bot.ad_cache import AdCache, AdIdIndex, ContentHashManifest, DueIndex, FileFingerprint, ImageDigests
+from kleinanzeigen_bot.ad_loading import check_ad_changed, load_ad_configs
+from kleinanzeigen_bot.model.ad_model import Ad, Contact
+from kleinanzeigen_bot.model.config_model import AdDefaults
+from kleinanzeigen_bot.utils import dicts, misc
+
+AD_YAML = """\
+# my favourite ad
+title: Test Title for caching  # keep this comment
+description: Test Description
+category: "160"
+price: 100
+price_type: FIXED
+contact:
+  name: Test User
+  zipcode: "12345"
+"""
+
+
+@pytest.fixture
+def workspace_dir(tmp_path:Path) -> Path:
+    (tmp_path / "config.yaml").write_text("")
+    ads_dir = tmp_path / "ads"
+    ads_dir.mkdir()
+    (ads_dir / "ad_1.yaml").write_text(AD_YAML, encoding = "utf-8")
+    (ads_dir / "ad_2.yaml").write_text(AD_YAML.replace("for caching", "second one"), encoding = "utf-8")
+    return tmp_path
+
+
+def _load(workspace_dir:Path, cache_file:Path | None, ad_defaults:AdDefaults | None = None) -> list[tuple[str, str, Any, dict[str, Any]]]:
+    return load_ad_configs(
+        config_file_path = str(workspace_dir / "config.yaml"),
+        ad_file_patterns = ["ads/*.yaml"],
+        ad_defaults = ad_defaults or AdDefaults(),
+        cache_file = cache_file,
+    )
+
+
+def _touch(path:Path) -> None:
+    stat = path.stat()
+    os.utime(path, ns = (stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+
+class TestAdCache:
+    def test_second_load_is_served_from_cache(self, workspace_dir:Path, caplog:pytest.LogCaptureFixture) -> None:
+        cache_file = workspace_dir / ".temp" / ad_cache.CACHE_FILE
+
+        with caplog.at_level(logging.INFO):
+            first = _load(workspace_dir, cache_file)
+        assert "Ad cache: 0 hit(s), 2 miss(es)" in caplog.text
+        assert cache_file.is_file()
+
+        caplog.clear()
+        with caplog.at_level(logging.INFO):
+            second = _load(workspace_dir, cache_file)
+        assert "Ad cache: 2 hit(s), 0 miss(es)" in caplog.text
+
+        assert [(p, r, a.model_dump(), raw) for p, r, a, raw in first] == [(p, r, a.model_dump(), raw) for p, r, a, raw in second]
+
+    def test_cached_raw_dict_keeps_yaml_comments(self, workspace_dir:Path, tmp_path:Path) -> None:
+        cache_file = workspace_dir / ".temp" / ad_cache.CACHE_FILE
+        _load(workspace_dir, cache_file)
+        _abspath, _relpath, _ad_cfg, ad_cfg_orig = _load(workspace_dir, cache_file)[0]
+
+        out_file = tmp_path / "saved.yaml"
+        dicts.save_dict(out_file, ad_cfg_orig)
+        saved = out_file.read_text(encoding = "utf-8")
+        assert "# my favourite ad" in saved
+        assert "# keep this comment" in saved
+
+    def test_returned_objects_are_independent_copies(self, workspace_dir:Path) -> None:
+        cache_file = workspace_dir / ".temp" / ad_cache.CACHE_FILE
+        _load(workspace_dir, cache_file)
+
+        _abspath, _relpath, ad_cfg, ad_cfg_orig = _load(workspace_dir, cache_file)[0]
+        ad_cfg.category = "mutated"
+        ad_cfg_orig["content_hash"] = "mutated"
+
+        _abspath, _relpath, ad_cfg, ad_cfg_orig = _load(workspace_dir, cache_file)[0]
+        assert ad_cfg.category == "160"
+        assert "content_hash" not in ad_cfg_orig
+
+    def test_modified_file_is_a_miss(self, workspace_dir:Path, caplog:pytest.LogCaptureFixture) -> None:
+        cache_file = workspace_dir / ".temp" / ad_cache.CACHE_FILE
+        _load(workspace_dir, cache_file)
+
+        ad_file = workspace_dir / "ads" / "ad_1.yaml"
+        ad_file.write_text(AD_YAML.replace("price: 100", "price: 90"), encoding = "utf-8")
+        _touch(ad_file)
+
+        with caplog.at_level(logging.INFO):
+            loaded = _load(workspace_dir, cache_file)
+        assert "Ad cache: 1 hit(s), 1 miss(es)" in caplog.text
+        assert loaded[0][2].price == 90
+
+    def test_changed_ad_defaults_invalidate_cache(self, workspace_dir:Path, caplog:pytest.LogCaptureFixture) -> None:
+        cache_file = workspace_dir / ".temp" / ad_cache.CACHE_FILE
+        _load(workspace_dir, cache_file)
+
+        with caplog.at_level(logging.INFO):
+            loaded = _load(workspace_dir, cache_file, AdDefaults(republication_interval = 3))
+        assert "Ad cache: 0 hit(s), 2 miss(es)" in caplog.text
+        assert all(ad_cfg.republication_interval == 3 for _p, _r, ad_cfg, _raw in loaded)
+
+    def test_corrupt_cache_file_is_ignored(self, workspace_dir:Path, caplog:pytest.LogCaptureFixture) -> None:
+        cache_file = workspace_dir / ".temp" / ad_cache.CACHE_FILE
+        cache_file.parent.mkdir()
+        cache_file.write_bytes(b"not a pickle")
+
+        with caplog.at_level(logging.INFO):
+            loaded = _load(workspace_dir, cache_file)
+        assert len(loaded) == 2
+        assert "Ad cache: 0 hit(s), 2 miss(es)" in caplog.text
+
+    def test_corrupted_entry_is_a_miss(self, workspace_dir:Path, caplog:pytest.LogCaptureFixture) -> None:
+        cache_file = workspace_dir / ".temp" / ad_cache.CACHE_FILE
+        _load(workspace_dir, cache_file)
+        cache = AdCache.load(cache_file, AdDefaults())
+        ad_file = str(workspace_dir / "ads" / "ad_1.yaml")
+        entry = cache._entries[ad_file]
+        cache._entries[ad_file] = entry._replace(payload = entry.payload.replace(b"Test Title", b"Evil Title"))
+        cache._dirty = True
+        cache.save()
+
+        with caplog.at_level(logging.INFO):
+            loaded = _load(workspace_dir, cache_file)
+        assert "Ad cache: 1 hit(s), 1 miss(es)" in caplog.text
+        assert loaded[0][2].title == "Test Title for caching"
+
+    def test_cached_ads_are_constructed_without_validation(self, workspace_dir:Path) -> None:
+        cache_file = workspace_dir / ".temp" / ad_cache.CACHE_FILE
+        first = _load(workspace_dir, cache_file)
+
+        with patch.object(Ad, "model_validate", side_effect = AssertionError("validated")):
+            second = _load(workspace_dir, cache_file)
+
+        for (_p, _r, validated, _raw), (_p2, _r2, constructed, _raw2) in zip(first, second, strict = True):
+            assert isinstance(constructed.contact, Contact)
+            assert constructed.model_fields_set == validated.model_fields_set
+            assert constructed.contact.model_fields_set == validated.contact.model_fields_set
+            assert constructed.update_content_hash().content_hash == validated.update_content_hash().content_hash
+
+    def test_entry_with_other_defaults_fingerprint_is_a_miss(self, workspace_dir:Path) -> None:
+        cache_file = workspace_dir / ".temp" / ad_cache.CACHE_FILE
+        _load(workspace_dir, cache_file)
+        ad_file = workspace_dir / "ads" / "ad_1.yaml"
+
+        cache = AdCache.load(cache_file, AdDefaults())
+        cache.defaults_fingerprint = "other"  # the entry was validated with other defaults
+        assert cache.get(str(ad_file), FileFingerprint.of(str(ad_file))) is None
+        assert cache.misses == 1
+
+    def test_cached_ads_are_only_validated_on_request(self, workspace_dir:Path) -> None:
+        cache_file = workspace_dir / ".temp" / ad_cache.CACHE_FILE
+        first = _load(workspace_dir, cache_file)
+
+        for validate_cached, expected_calls in ((False, 0), (True, 2)):
+            with patch.object(ad_loading, "_validate_ad_file", wraps = ad_loading._validate_ad_file) as validate:
+                loaded = load_ad_configs(
+                    config_file_path = str(workspace_dir / "config.yaml"),
+                    ad_file_patterns = ["ads/*.yaml"],
+                    ad_defaults = AdDefaults(),
+                    cache_file = cache_file,
+                    validate_cached = validate_cached,
+                )
+            assert validate.call_count == expected_calls
+            assert [a.model_dump() for _p, _r, a, _raw in loaded] == [a.model_dump() for _p, _r, a, _raw in first]
+
+    def test_entries_of_removed_files_are_pruned(self, workspace_dir:Path) -> None:
+        cache_file = workspace_dir / ".temp" / ad_cache.CACHE_FILE
+        _load(workspace_dir, cache_file)
+        (workspace_dir / "ads" / "ad_2.yaml").unlink()
+        _load(workspace_dir, cache_file)
+
+        cache = AdCache.load(cache_file, AdDefaults())
+        assert cache.get(str(workspace_dir / "ads" / "ad_2.yaml"), FileFingerprint(0, 0, 0)) is None
+        assert len(cache._entries) == 1
+
+    def test_partial_loads_keep_other_entries(self, workspace_dir:Path, caplog:pytest.LogCaptureFixture) -> None:
+        cache_file = workspace_dir / ".temp" / ad_cache.CACHE_FILE
+        config_file = str(workspace_dir / "config.yaml")
+        _load(workspace_dir, cache_file)
+        scan = ad_loading.scan_ad_files(config_file, ["ads/*.yaml"])
+        subset = dataclasses.replace(scan, files = dict(list(scan.files.items())[:1]))
+        load_ad_configs(config_file_path = config_file, ad_file_patterns = ["ads/*.yaml"], ad_defaults = AdDefaults(), cache_file = cache_file, scan = subset)
+
+        with caplog.at_level(logging.INFO):
+            _load(workspace_dir, cache_file)
+        assert "Ad cache: 2 hit(s), 0 miss(es)" in caplog.text
+
+    def test_without_cache_file_nothing_is_written(self, workspace_dir:Path, caplog:pytest.LogCaptureFixture) -> None:
+        with caplog.at_level(logging.INFO):
+            assert len(_load(workspace_dir, None)) == 2
+        assert "Ad cache" not in caplog.text
+        assert not (workspace_dir / ".temp").exists()
+
+
+def test_defaults_fingerprint_is_stable() -> None:
+    assert ad_cache.defaults_fingerprint(AdDefaults()) == ad_cache.defaults_fingerprint(AdDefaults())
+    assert ad_cache.defaults_fingerprint(AdDefaults()) != ad_cache.defaults_fingerprint(AdDefaults(active = False))
+
+
+class TestContentHashManifest:
+    @staticmethod
+    def _publish(workspace_dir:Path) -> Path:
+        """Give ad_1.yaml an id and a stored content hash, as after publishing."""
+        ad_file = workspace_dir / "ads" / "ad_1.yaml"
+        raw = dicts.load_dict(str(ad_file))
+        raw["id"] = 12345
+        raw["content_hash"] = ad_loading.compute_content_hash(raw)
+        dicts.save_dict(ad_file, raw)
+        return ad_file
+
+    def _check(self, workspace_dir:Path, manifest_file:Path) -> tuple[bool, ContentHashManifest]:
+        ad_file, _relpath, ad_cfg, ad_cfg_orig = _load(workspace_dir, None)[0]
+        manifest = ContentHashManifest.load(manifest_file, [ad_file])
+        changed = check_ad_changed(ad_cfg, ad_cfg_orig, "ad_1.yaml", ad_file = ad_file, manifest = manifest)
+        manifest.save()
+        return changed, manifest
+
+    def test_unchanged_file_reuses_recorded_hash(self, workspace_dir:Path) -> None:
+        self._publish(workspace_dir)
+        manifest_file = workspace_dir / ".temp" / ad_cache.MANIFEST_FILE
+
+        assert self._check(workspace_dir, manifest_file)[0] is False
+        assert manifest_file.is_file()
+
+        with patch.object(ad_loading, "compute_content_hash", wraps = ad_loading.compute_content_hash) as compute:
+            changed, manifest = self._check(workspace_dir, manifest_file)
+        assert changed is False
+        assert (manifest.hits, manifest.misses) == (1, 0)
+        compute.assert_not_called()
+
+    def test_modified_file_is_rehashed(self, workspace_dir:Path) -> None:
+        ad_file = self._publish(workspace_dir)
+        manifest_file = workspace_dir / ".temp" / ad_cache.MANIFEST_FILE
+        self._check(workspace_dir, manifest_file)
+
+        ad_file.write_text(ad_file.read_text(encoding = "utf-8").replace("price: 100", "price: 90"), encoding = "utf-8")
+        _touch(ad_file)
+
+        changed, manifest = self._check(workspace_dir, manifest_file)
+        assert changed is True
+        assert (manifest.hits, manifest.misses) == (0, 1)
+
+    def test_check_ad_changed_hashes_once(self, workspace_dir:Path) -> None:
+        ad_file = self._publish(workspace_dir)
+        ad_file.write_text(ad_file.read_text(encoding = "utf-8").replace("price: 100", "price: 90"), encoding = "utf-8")
+        _ad_file, _relpath, ad_cfg, ad_cfg_orig = _load(workspace_dir, None)[0]
+
+        with patch.object(ad_loading, "compute_content_hash", wraps = ad_loading.compute_content_hash) as compute:
+            assert check_ad_changed(ad_cfg, ad_cfg_orig, "ad_1.yaml") is True
+        assert compute.call_count == 1
+
+    def test_corrupt_or_outdated_manifest_is_ignored(self, workspace_dir:Path) -> None:
+        self._publish(workspace_dir)
+        manifest_file = workspace_dir / ".temp" / ad_cache.MANIFEST_FILE
+        manifest_file.parent.mkdir()
+
+        for content in ("not json", json.dumps({"format": 0, "app_version": "0", "entries": {}})):
+            manifest_file.write_text(content, encoding = "utf-8")
+            changed, manifest = self._check(workspace_dir, manifest_file)
+            assert changed is False
+            assert (manifest.hits, manifest.misses) == (0, 1)
+
+
+class TestImageDigests:
+    @staticmethod
+    def _publish_with_images(workspace_dir:Path) -> Path:
+        """Give ad_1.yaml an id, two images and a stored content hash, as after publishing."""
+        ads_dir = workspace_dir / "ads"
+        (ads_dir / "ad_1__img1.jpg").write_bytes(b"first image")
+        (ads_dir / "ad_1__img2.jpg").write_bytes(b"second image")
+        ad_file = ads_dir / "ad_1.yaml"
+        raw = dicts.load_dict(str(ad_file))
+        raw["id"] = 12345
+        raw["images"] = ["ad_1__img*.jpg"]
+        raw["content_hash"] = ad_loading.compute_content_hash(raw)
+        dicts.save_dict(ad_file, raw)
+        return ad_file
+
+    @staticmethod
+    def _load_changed(workspace_dir:Path, digests_file:Path) -> list[str]:
+        ads = ad_loading.load_ads(
+            config_file_path = str(workspace_dir / "config.yaml"),
+            ad_file_patterns = ["ads/*.yaml"],
+            ad_defaults = AdDefaults(),
+            categories = {},
+            ads_selector = "changed",
+            command = "publish",
+            image_digests_file = digests_file,
+        )
+        return [os.path.basename(record.ad_file) for record in ads]
+
+    def test_digests_are_reused_for_unmodified_files(self, tmp_path:Path) -> None:
+        images = [str(tmp_path / f"img{idx}.jpg") for idx in range(4)]
+        for idx, image in enumerate(images):
+            Path(image).write_bytes(b"image %d" % idx)
+        digests_file = tmp_path / ad_cache.IMAGE_DIGESTS_FILE
+
+        digests = ImageDigests.load(digests_file)
+        first = digests.digest(images)
+        digests.save()
+        assert (digests.hashed, digests.reused) == (4, 0)
+
+        with patch.object(ad_cache, "_sha256_file", wraps = ad_cache._sha256_file) as sha256_file:  # noqa: SLF001 — counting file reads
+            digests = ImageDigests.load(digests_file)
+            assert digests.digest(images) == first
+        sha256_file.assert_not_called()
+        assert (digests.hashed, digests.reused) == (0, 4)
+
+        Path(images[2]).write_bytes(b"replaced")
+        _touch(Path(images[2]))
+        digests = ImageDigests.load(digests_file)
+        assert digests.digest(images) != first
+        assert (digests.hashed, digests.reused) == (1, 3)
+
+    def test_baseline_is_recorded_for_unknown_ads(self, tmp_path:Path) -> None:
+        image = tmp_path / "img.jpg"
+        image.write_bytes(b"image")
+        digests = ImageDigests.load(tmp_path / ad_cache.IMAGE_DIGESTS_FILE)
+
+        assert digests.has_changed(1, [str(image)]) is False
+        renamed = image.rename(tmp_path / "renamed.jpg")
+        assert digests.has_changed(1, [str(renamed)]) is False
+        assert digests.has_changed(1, [str(tmp_path / "missing.jpg")]) is False
+
+    def test_read_only_check_records_no_baseline(self, tmp_path:Path) -> None:
+        image = tmp_path / "img.jpg"
+        image.write_bytes(b"image")
+        digests_file = tmp_path / ad_cache.IMAGE_DIGESTS_FILE
+        digests = ImageDigests.load(digests_file)
+
+        assert digests.has_changed(1, [str(image)], record = False) is False
+        digests.save()  # keeps the file digests, they are a cache
+        assert json.loads(digests_file.read_text(encoding = "utf-8"))["published"] == {}
+
+    def test_changed_selector_detects_replaced_images(self, workspace_dir:Path) -> None:
+        self._publish_with_images(workspace_dir)
+        digests_file = workspace_dir / ".temp" / ad_cache.IMAGE_DIGESTS_FILE
+
+        assert self._load_changed(workspace_dir, digests_file) == []
+        assert self._load_changed(workspace_dir, digests_file) == []
+
+        image = workspace_dir / "ads" / "ad_1__img2.jpg"
+        image.write_bytes(b"a better photo")
+        _touch(image)
+        assert self._load_changed(workspace_dir, digests_file) == ["ad_1.yaml"]
+        assert self._load_changed(workspace_dir, digests_file) == ["ad_1.yaml"]
+
+    def test_publishing_records_the_new_images(self, workspace_dir:Path) -> None:
+        self._publish_with_images(workspace_dir)
+        digests_file = workspace_dir / ".temp" / ad_cache.IMAGE_DIGESTS_FILE
+        self._load_changed(workspace_dir, digests_file)
+        image = workspace_dir / "ads" / "ad_1__img1.jpg"
+        image.write_bytes(b"a better photo")
+        _touch(image)
+
+        ads = ad_loading.load_ads(
+            config_file_path = str(workspace_dir / "config.yaml"),
+            ad_file_patterns = ["ads/*.yaml"],
+            ad_defaults = AdDefaults(),
+            categories = {},
+            ads_selector = "changed",
+            command = "publish",
+            image_digests_file = digests_file,
+        )
+        with ad_loading.recording_published_images(digests_file) as published:
+            for record in ads:
+                record.raw["id"] = 67890
+                record.raw["updated_on"] = "2024-01-01T00:00:00"
+                dicts.save_dict(record.ad_file, record.raw)
+                record.release_raw()
+                published.append(record)
+
+        assert self._load_changed(workspace_dir, digests_file) == []
+        assert "12345" not in json.loads(digests_file.read_bytes())["published"]
+
+
+class TestDueIndex:
+    @staticmethod
+    def _set_updated_on(ad_file:Path, days_ago:int, **extra:Any) -> None:
+        raw = dicts.load_dict(str(ad_file))
+        raw.update(id = 12345, updated_on = (misc.now() - timedelta(days = days_ago)).isoformat(timespec = "seconds"), **extra)
+        dicts.save_dict(ad_file, raw)
+        _touch(ad_file)
+
+    @staticmethod
+    def _load_due(workspace_dir:Path, due_index_file:Path) -> list[str]:
+        ads = ad_loading.load_ads(
+            config_file_path = str(workspace_dir / "config.yaml"),
+            ad_file_patterns = ["ads/*.yaml"],
+            ad_defaults = AdDefaults(),
+            categories = {},
+            ads_selector = "due",
+            command = "publish",
+            due_index_file = due_index_file,
+        )
+        return [os.path.basename(record.ad_file) for record in ads]
+
+    def test_ads_that_are_not_due_are_not_loaded(self, workspace_dir:Path, caplog:pytest.LogCaptureFixture) -> None:
+        ad_1 = workspace_dir / "ads" / "ad_1.yaml"
+        self._set_updated_on(ad_1, days_ago = 1)
+        self._set_updated_on(workspace_dir / "ads" / "ad_2.yaml", days_ago = 30)
+        due_index_file = workspace_dir / ".temp" / ad_cache.DUE_INDEX_FILE
+        assert self._load_due(workspace_dir, due_index_file) == ["ad_2.yaml"]
+
+        with patch.object(ad_loading, "_load_ad_files", wraps = ad_loading._load_ad_files) as load_ad_files, caplog.at_level(logging.INFO):  # noqa: SLF001 — counting parsed files
+            assert self._load_due(workspace_dir, due_index_file) == ["ad_2.yaml"]
+        assert [os.path.basename(ad_file) for ad_file in load_ad_files.call_args.args[0]] == ["ad_2.yaml"]
+        assert " -> SKIPPED: 1 ad not due for republication yet" in caplog.text
+        assert "Next ad becomes due at" in caplog.text
+
+        # modified files are loaded again and their entry is rebuilt
+        self._set_updated_on(ad_1, days_ago = 10)
+        assert self._load_due(workspace_dir, due_index_file) == ["ad_1.yaml", "ad_2.yaml"]
+
+    def test_candidates_and_next_due(self, workspace_dir:Path) -> None:
+        ad_files = {name: workspace_dir / "ads" / f"{name}.yaml" for name in ("ad_1", "ad_2", "ad_3", "ad_4")}
+        (ad_files["ad_3"]).write_text(AD_YAML, encoding = "utf-8")
+        (ad_files["ad_4"]).write_text(AD_YAML, encoding = "utf-8")
+        self._set_updated_on(ad_files["ad_1"], days_ago = 1)
+        self._set_updated_on(ad_files["ad_2"], days_ago = 5)
+        self._set_updated_on(ad_files["ad_3"], days_ago = 30, active = False)
+        due_index_file = workspace_dir / ad_cache.DUE_INDEX_FILE
+
+        index = DueIndex.load(due_index_file, AdDefaults(), map(str, ad_files.values()))
+        assert index.candidates(misc.now().timestamp()) == {str(path) for path in ad_files.values()}
+        for path in ad_files.values():
+            index.put(str(path), ad_loading.load_ad(dicts.load_dict(str(path)), AdDefaults()))
+        index.save()
+
+        index = DueIndex.load(due_index_file, AdDefaults(), map(str, ad_files.values()))
+        now = misc.now()
+        assert index.candidates(now.timestamp()) == {str(ad_files["ad_4"])}  # never published
+        assert index.candidates(now.timestamp(), ignore_inactive = False) == {str(ad_files["ad_3"]), str(ad_files["ad_4"])}
+        interval = timedelta(days = AdDefaults().republication_interval)
+        next_due = index.next_due_at(now.timestamp())
+        assert next_due is not None
+        assert abs(next_due - (now - timedelta(days = 5) + interval).timestamp()) < 60
+        assert index.candidates((now + interval).timestamp()) == {str(ad_files[name]) for name in ("ad_1", "ad_2", "ad_4")}
+
+        assert DueIndex.load(due_index_file, AdDefaults(republication_interval = 1), map(str, ad_files.values()))._entries == {}
+
+
+class TestAdIdIndex:
+    @staticmethod
+    def _set_id(ad_file:Path, ad_id:int) -> None:
+        raw = dicts.load_dict(str(ad_file))
+        raw["id"] = ad_id
+        dicts.save_dict(ad_file, raw)
+        _touch(ad_file)
+
+    @staticmethod
+    def _load_ids(workspace_dir:Path, id_index_file:Path, ads_selector:str) -> list[str]:
+        ads = ad_loading.load_ads(
+            config_file_path = str(workspace_dir / "config.yaml"),
+            ad_file_patterns = ["ads/*.yaml"],
+            ad_defaults = AdDefaults(),
+            categories = {},
+            ads_selector = ads_selector,
+            command = "update",
+            id_index_file = id_index_file,
+        )
+        return [os.path.basename(record.ad_file) for record in ads]
+
+    def test_numeric_selector_only_loads_matching_files(self, workspace_dir:Path, caplog:pytest.LogCaptureFixture) -> None:
+        ad_1, ad_2 = workspace_dir / "ads" / "ad_1.yaml", workspace_dir / "ads" / "ad_2.yaml"
+        self._set_id(ad_1, 111)
+        self._set_id(ad_2, 222)
+        id_index_file = workspace_dir / ".temp" / ad_cache.ID_INDEX_FILE
+        assert self._load_ids(workspace_dir, id_index_file, "222") == ["ad_2.yaml"]
+
+        with patch.object(ad_loading, "_load_ad_files", wraps = ad_loading._load_ad_files) as load_ad_files, caplog.at_level(logging.INFO):  # noqa: SLF001 — counting parsed files
+            assert self._load_ids(workspace_dir, id_index_file, "222") == ["ad_2.yaml"]
+        assert [os.path.basename(ad_file) for ad_file in load_ad_files.call_args.args[0]] == ["ad_2.yaml"]
+        assert " -> SKIPPED: 1 ad not in list of given ids" in caplog.text
+
+        # a stale entry is not trusted: the modified file is loaded again
+        self._set_id(ad_1, 222)
+        assert self._load_ids(workspace_dir, id_index_file, "222") == ["ad_1.yaml", "ad_2.yaml"]
+        assert self._load_ids(workspace_dir, id_index_file, "111") == []
+
+    def test_other_selectors_do_not_touch_the_index(self, workspace_dir:Path) -> None:
+        id_index_file = workspace_dir / ".temp" / ad_cache.ID_INDEX_FILE
+
+        with patch.object(ad_cache.AdIdIndex, "load", wraps = ad_cache.AdIdIndex.load) as load_index:
+            self._load_ids(workspace_dir, id_index_file, "all")
+
+        load_index.assert_not_called()
+        assert not id_index_file.exists()
+
+    def test_candidates(self, workspace_dir:Path) -> None:
+        ad_files = [str(workspace_dir / "ads" / name) for name in ("ad_1.yaml", "ad_2.yaml")]
+        id_index_file = workspace_dir / ad_cache.ID_INDEX_FILE
+
+        index = AdIdIndex.load(id_index_file, ad_files)
+        assert index.candidates([1]) == set(ad_files)
+        index.put(ad_files[0], 1)
+        index.put(ad_files[1], None)
+        index.save()
+
+        index = AdIdIndex.load(id_index_file, ad_files)
+        assert index.candidates([1]) == {ad_files[0]}
+        assert index.candidates([2]) == set()
+
+        (workspace_dir / "ads" / "ad_2.yaml").unlink()
+        AdIdIndex.load(id_index_file, ad_files[:1]).save()
+        assert list(json.loads(id_index_file.read_bytes())["entries"]) == ad_files[:1]
@@ -0,0 +1,136 @@
+# SPDX-FileCopyrightText: © Jens Bergmann and contributors
+# SPDX-License-Identifier: AGPL-3.0-or-later
+# SPDX-ArtifactOfProjectHomePage: https://github.com/Second-Hand-Friends/kleinanzeigen-bot/
+import logging
+import os
+from datetime import timedelta
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from kleinanzeigen_bot import ad_index, ad_loading
+from kleinanzeigen_bot.model.config_model import AdDefaults
+from kleinanzeigen_bot.utils import dicts, misc
+
+AD_YAML = """\
+title: Test Title for the index
+description: Test Description
+category: "160"
+price: 100
+price_type: FIXED
+contact:
+  name: Test User
+  zipcode: "12345"
+"""
+
+
+@pytest.fixture
+def workspace_dir(tmp_path:Path) -> Path:
+    (tmp_path / "config.yaml").write_text("")
+    ads_dir = tmp_path / "ads"
+    ads_dir.mkdir()
+    for idx in range(3):
+        (ads_dir / f"ad_{idx}.yaml").write_text(AD_YAML.replace("the index", f"ad {idx}"), encoding = "utf-8")
+    return tmp_path
+
+
+def _index(workspace_dir:Path) -> ad_index.AdIndex:
+    index = ad_index.AdIndex(
+        config_file_path = str(workspace_dir / "config.yaml"),
+        ad_file_patterns = ["ads/*.yaml"],
+        ad_defaults = AdDefaults(),
+    )
+    index.refresh()
+    return index
+
+
+def _edit(path:Path, old:str, new:str) -> None:
+    path.write_text(path.read_text(encoding = "utf-8").replace(old, new), encoding = "utf-8")
+    stat = path.stat()
+    os.utime(path, ns = (stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+
+def _publish(ad_file:Path, *, days_ago:int) -> None:
+    """Give *ad_file* an id, a stored content hash and a publication date, as after publishing."""
+    raw = dicts.load_dict(str(ad_file))
+    raw["id"] = 1000 + int(ad_file.stem.rsplit("_", 1)[1])
+    raw["updated_on"] = (misc.now() - timedelta(days = days_ago)).isoformat(timespec = "seconds")
+    raw["content_hash"] = ad_loading.compute_content_hash(raw)
+    dicts.save_dict(ad_file, raw)
+
+
+def test_refresh_only_loads_added_and_modified_files(workspace_dir:Path) -> None:
+    ads_dir = workspace_dir / "ads"
+    index = _index(workspace_dir)
+    assert len(index.entries) == 3
+
+    _edit(ads_dir / "ad_1.yaml", "price: 100", "price: 90")
+    (ads_dir / "ad_2.yaml").unlink()
+    (ads_dir / "ad_3.yaml").write_text(AD_YAML, encoding = "utf-8")
+
+    with patch.object(ad_loading, "_load_ad_file", wraps = ad_loading._load_ad_file) as load_ad_file:  # noqa: SLF001 — counting parsed files
+        changes = index.refresh()
+    assert changes == ad_index.IndexChanges(
+        added = [str(ads_dir / "ad_3.yaml")],
+        modified = [str(ads_dir / "ad_1.yaml")],
+        removed = [str(ads_dir / "ad_2.yaml")],
+    )
+    assert sorted(os.path.basename(call.args[0]) for call in load_ad_file.call_args_list) == ["ad_1.yaml", "ad_3.yaml"]
+    assert index.entries[str(ads_dir / "ad_1.yaml")].ad_cfg.price == 90
+
+    assert not index.refresh()
+
+
+def test_invalid_files_are_skipped_until_they_change(workspace_dir:Path, caplog:pytest.LogCaptureFixture) -> None:
+    ad_file = workspace_dir / "ads" / "ad_0.yaml"
+    _edit(ad_file, "price_type: FIXED", "price_type: NOT_A_PRICE_TYPE")
+
+    with caplog.at_level(logging.WARNING):
+        index = _index(workspace_dir)
+    assert str(ad_file) not in index.entries
+    assert sorted(os.path.basename(f) for f in index.entries) == ["ad_1.yaml", "ad_2.yaml"]
+    assert "ads/ad_0.yaml" in caplog.text
+
+    assert not index.refresh()
+    _edit(ad_file, "NOT_A_PRICE_TYPE", "FIXED")
+    assert index.refresh().added == [str(ad_file)]
+
+
+def test_select_and_next_due_at(workspace_dir:Path) -> None:
+    ads_dir = workspace_dir / "ads"
+    _publish(ads_dir / "ad_0.yaml", days_ago = 10)
+    _publish(ads_dir / "ad_1.yaml", days_ago = 1)
+    index = _index(workspace_dir)
+    new_ad, due_ad, recent_ad = (str(ads_dir / f"ad_{idx}.yaml") for idx in (2, 0, 1))
+
+    assert index.select({"new"}) == [new_ad]
+    assert index.select({"due"}) == [due_ad, new_ad]  # never published ads are always due
+    assert not index.select({"changed"})
+
+    next_due = index.next_due_at()
+    published_on = index.entries[recent_ad].ad_cfg.updated_on
+    assert next_due is not None
+    assert published_on is not None
+    assert next_due == published_on + timedelta(days = 7)
+
+    _edit(ads_dir / "ad_1.yaml", "price: 100", "price: 90")
+    index.refresh()
+    assert index.select({"changed"}) == [recent_ad]
+    assert index.select({"due", "changed"}) == [due_ad, recent_ad, new_ad]
+    assert index.select({"due"}, now = next_due) == [due_ad, recent_ad, new_ad]
+
+
+def test_subset_scan_restricts_load_ads(workspace_dir:Path) -> None:
+    index = _index(workspace_dir)
+    ad_file = str(workspace_dir / "ads" / "ad_1.yaml")
+    ads = ad_loading.load_ads(
+        config_file_path = str(workspace_dir / "config.yaml"),
+        ad_file_patterns = ["ads/*.yaml"],
+        ad_defaults = AdDefaults(),
+        categories = {},
+        ads_selector = "all",
+        command = "publish",
+        scan = index.subset_scan([ad_file]),
+    )
+    assert [record.ad_file for record in ads] == [ad_file]
@@ -11,21 +11,26 @@ from unittest.mock import patch
 import pytest
 from pydantic import ValidationError
 
+from kleinanzeigen_bot import ad_loading
 from kleinanzeigen_bot.ad_loading import (
     check_ad_changed,
     check_ad_republication,
     discover_ad_files,
     is_valid_ads_selector,
+    load_ad_configs,
     load_ads,
     resolve_ad_category,
     resolve_ad_images,
+    scan_ad_files,
     update_content_hashes,
 )
+from kleinanzeigen_bot.ad_record import AdRecord
 from kleinanzeigen_bot.model.ad_model import Ad, AdPartial
 from kleinanzeigen_bot.model.config_model import (
     Config,
 )
 from kleinanzeigen_bot.utils import dicts, misc
+from kleinanzeigen_bot.utils.pydantics import ContextualValidationError
 
 # --------------------------------------------------------------------------- #
 # Local fixtures (base_ad_config is in tests/conftest.py)
@@ -248,6 +253,21 @@ class TestResolveAdImages:
         with pytest.raises(AssertionError, match = "Unsupported image file type"):
             resolve_ad_images(str(ad_file), ["*.bmp"])
 
+    def test_uses_directory_listings_of_scan(self, tmp_path:Path) -> None:
+        ad_file = tmp_path / "ads" / "ad_test.yaml"
+        ad_file.parent.mkdir()
+        ad_file.write_text("")
+        (tmp_path / "ads" / "photo1.jpg").write_text("")
+        config_file = tmp_path / "config.yaml"
+        config_file.write_text("")
+
+        scan = scan_ad_files(str(config_file), ["ads/ad_*.yaml"])
+        assert scan.files == {str(ad_file): "ads/ad_test.yaml"}
+        (tmp_path / "ads" / "photo2.jpg").write_text("")  # not part of the scan anymore
+
+        assert resolve_ad_images(str(ad_file), ["*.jpg"], scan) == [str(tmp_path / "ads" / "photo1.jpg")]
+        assert len(resolve_ad_images(str(ad_file), ["*.jpg"])) == 2
+
 
 # --------------------------------------------------------------------------- #
 # update_content_hashes
@@ -268,11 +288,11 @@ class TestUpdateContentHashes:
         ]
 
         # Pre-compute hashes from the raw config dict (matching the production code path)
-        for _ad_file, _ad_cfg, ad_cfg_orig in ads:
-            ad_cfg_orig["content_hash"] = AdPartial.model_validate(ad_cfg_orig).update_content_hash().content_hash
+        for record in ads:
+            record.raw["content_hash"] = AdPartial.model_validate(record.raw).update_content_hash().content_hash
 
         # Make the middle ad's original hash differ
-        ads[1][2]["content_hash"] = "deliberately_wrong_hash"
+        ads[1].raw["content_hash"] = "deliberately_wrong_hash"
 
         with (
             caplog.at_level(logging.INFO),
@@ -407,7 +427,7 @@ def test_load_ads_with_changed_selector(
                 command = "publish",
             )
             assert len(ads) == 1
-            assert ads[0][1].title == "Changed Ad - Modified"
+            assert ads[0].ad_cfg.title == "Changed Ad - Modified"
 
 
 def test_load_ads_with_due_selector_includes_all_due_ads(
@@ -515,7 +535,7 @@ def test_load_ads_with_changed_selector_and_pending_price_reduction(
                 command = "update",
             )
             assert len(ads) == 1
-            assert ads[0][1].title == "Ad With Price Reduction"
+            assert ads[0].ad_cfg.title == "Ad With Price Reduction"
 
 
 def test_load_ads_with_changed_selector_no_price_reduction_when_not_configured(
@@ -696,7 +716,7 @@ def test_load_ads_with_numeric_ids_includes_only_specified(
                 command = "publish",
             )
             assert len(ads) == 1
-            assert ads[0][1].id == 101
+            assert ads[0].ad_cfg.id == 101
 
 
 def test_load_ads_skips_inactive_before_numeric_id(
@@ -769,6 +789,64 @@ def test_skipped_ads_do_not_validate_description_or_images(
         assert len(ads) == 0
 
 
+# --------------------------------------------------------------------------- #
+# load_ad_configs — parallel loading
+# --------------------------------------------------------------------------- #
+
+
+def _write_ads(tmp_path:Path, base_ad_config:dict[str, Any], count:int) -> Path:
+    ad_dir = tmp_path / "ads"
+    ad_dir.mkdir()
+    for idx in range(count):
+        dicts.save_dict(ad_dir / f"ad_{idx:02d}.yaml", base_ad_config | {"title": f"Parallel loaded test ad {idx:02d}", "price": idx + 1})
+    config_file = tmp_path / "config.yaml"
+    config_file.write_text("")
+    return config_file
+
+
+def test_load_ad_configs_parallel_matches_sequential(
+    tmp_path:Path, base_ad_config:dict[str, Any], test_bot_config:Config, monkeypatch:pytest.MonkeyPatch
+) -> None:
+    """Loading in worker processes yields the same ads in the same order as loading sequentially."""
+    config_file = _write_ads(tmp_path, base_ad_config, 6)
+    monkeypatch.setattr(ad_loading, "PARALLEL_LOAD_THRESHOLD", 0)
+
+    def load(workers:int) -> list[tuple[str, str, dict[str, Any], dict[str, Any]]]:
+        return [
+            (ad_file, ad_file_relative, ad_cfg.model_dump(), ad_cfg_orig)
+            for ad_file, ad_file_relative, ad_cfg, ad_cfg_orig in load_ad_configs(
+                config_file_path = str(config_file),
+                ad_file_patterns = ["ads/*.yaml"],
+                ad_defaults = test_bot_config.ad_defaults,
+                workers = workers,
+            )
+        ]
+
+    sequential = load(1)
+    assert len(sequential) == 6
+    assert load(2) == sequential
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_load_ad_configs_validation_error_names_file(
+    tmp_path:Path, base_ad_config:dict[str, Any], test_bot_config:Config, monkeypatch:pytest.MonkeyPatch, workers:int
+) -> None:
+    """A validation error names the offending ad file, also when raised in a worker process."""
+    config_file = _write_ads(tmp_path, base_ad_config, 3)
+    bad_file = tmp_path / "ads" / "ad_01.yaml"
+    dicts.save_dict(bad_file, base_ad_config | {"price_type": "INVALID"})
+    monkeypatch.setattr(ad_loading, "PARALLEL_LOAD_THRESHOLD", 0)
+
+    with pytest.raises(ContextualValidationError) as exc_info:
+        load_ad_configs(
+            config_file_path = str(config_file),
+            ad_file_patterns = ["ads/*.yaml"],
+            ad_defaults = test_bot_config.ad_defaults,
+            workers = workers,
+        )
+    assert exc_info.value.context == str(bad_file)
+
+
 # --------------------------------------------------------------------------- #
 # Helpers
 # --------------------------------------------------------------------------- #
@@ -778,9 +856,9 @@ def _build_ad(
     base_ad_config:dict[str, Any],
     ad_id:int | None,
     title:str,
-) -> tuple[str, Ad, dict[str, Any]]:
-    """Build an (ad_file, Ad, raw_dict) tuple for use in update_content_hashes tests."""
+) -> AdRecord:
+    """Build an :class:`AdRecord` for use in update_content_hashes tests."""
     ad_file = f"/fake/path/{title.replace(' ', '_')}.yaml"
     ad_cfg = Ad.model_validate(base_ad_config | {"id": str(ad_id) if ad_id else None, "title": title})
     ad_cfg_orig:dict[str, Any] = ad_cfg.model_dump()
-    return ad_file, ad_cfg, ad_cfg_orig
+    return AdRecord(ad_file, ad_cfg, ad_cfg_orig)
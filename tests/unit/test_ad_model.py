@@ -4,6 +4,7 @@
 from __future__ import annotations
 
 import math
+from typing import TYPE_CHECKING, Any
 
 import pytest
 
@@ -11,13 +12,19 @@ from kleinanzeigen_bot.model.ad_model import (
     MAX_DESCRIPTION_LENGTH,
     MAX_TITLE_LENGTH,
     MIN_TITLE_LENGTH,
+    Ad,
+    AdDefaultsMerger,
     AdPartial,
     ShippingOption,
     validate_condition_api_mapping,
 )
 from kleinanzeigen_bot.model.config_model import AdDefaults, AutoPriceReductionConfig
+from kleinanzeigen_bot.utils import dicts
 from kleinanzeigen_bot.utils.pydantics import ContextualModel, ContextualValidationError
 
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
 
 @pytest.mark.unit
 def test_shipping_costs_deprecated_in_schema() -> None:
@@ -434,3 +441,72 @@ def test_shipping_costs_in_content_hash_during_deprecation() -> None:
     hash_with_costs = AdPartial.model_validate(base | {"shipping_costs": 4.95}).update_content_hash().content_hash
     assert hash_with_costs != hash_without_costs, \
         "shipping_costs must still affect the content hash during deprecation"
+
+
+def _legacy_to_ad(partial:AdPartial, ad_defaults:AdDefaults) -> Ad:
+    """The per-ad merge `to_ad` used before `AdDefaultsMerger`."""
+    ad_cfg = partial.model_dump()
+    dicts.apply_defaults(
+        target = ad_cfg,
+        defaults = ad_defaults.model_dump(),
+        ignore = lambda k, _: k == "description",
+        override = lambda _, v: not isinstance(v, list) and (v is None or (isinstance(v, str) and v == "")),  # noqa: PLC1901
+    )
+    if not isinstance(ad_cfg.get("price_reduction_count"), int):
+        ad_cfg["price_reduction_count"] = 0
+    if not isinstance(ad_cfg.get("repost_count"), int):
+        ad_cfg["repost_count"] = 0
+    return Ad.model_validate(ad_cfg)
+
+
+def _outcome(convert:Callable[[], Ad]) -> Ad | list[Any]:
+    try:
+        return convert()
+    except ContextualValidationError as ex:
+        return ex.errors(include_context = False)
+
+
+@pytest.mark.unit
+def test_defaults_merger_matches_legacy_merge(
+    base_ad_cfg:dict[str, object],
+    complete_ad_cfg:dict[str, object],
+    base_ad_config:dict[str, Any],
+    description_test_cases:list[tuple[dict[str, Any], str, str]],
+) -> None:
+    ad_cfgs:list[dict[str, Any]] = [
+        base_ad_cfg | {"price": 10},
+        complete_ad_cfg,
+        base_ad_config,
+        base_ad_config | {"price_type": None, "shipping_type": None, "images": None, "contact": {"name": "", "zipcode": None, "street": ""}},
+        {"title": "Only a title here", "category": "160", "description": "Test", "price": 5, "contact": {}},
+    ]
+    defaults_variants = [
+        AdDefaults(),
+        AdDefaults.model_validate({
+            "active": False,
+            "price_type": "FIXED",
+            "shipping_type": "SHIPPING",
+            "sell_directly": True,
+            "images": ["*.jpg"],
+            "contact": {"name": "Default Name", "street": "Street 1", "zipcode": "54321", "location": "Town", "phone": "0123"},
+            "republication_interval": 3,
+            "auto_price_reduction": {"enabled": True, "strategy": "PERCENTAGE", "amount": 10, "min_price": 1, "delay_reposts": 2},
+        }),
+        *(AdDefaults.model_validate(config.get("ad_defaults", {})) for config, _raw, _expected in description_test_cases),
+    ]
+    for ad_defaults in defaults_variants:
+        merger = AdDefaultsMerger(ad_defaults)
+        for ad_cfg in ad_cfgs:
+            partial = AdPartial.model_validate(ad_cfg)
+            expected = _outcome(lambda: _legacy_to_ad(partial, ad_defaults))  # noqa: B023
+            assert _outcome(lambda: partial.to_ad(merger)) == expected  # noqa: B023
+            assert _outcome(lambda: partial.to_ad(ad_defaults)) == expected  # noqa: B023
+
+
+@pytest.mark.unit
+def test_defaults_merger_does_not_share_mutable_defaults(base_ad_cfg:dict[str, object]) -> None:
+    merger = AdDefaultsMerger(AdDefaults(images = ["*.jpg"]))
+    first = merger.apply({})
+    first["images"].append("other.png")
+    assert merger.apply({})["images"] == ["*.jpg"]
+    assert AdPartial.model_validate(base_ad_cfg | {"price": 1}).to_ad(merger).images == ["*.jpg"]
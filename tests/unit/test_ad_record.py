@@ -0,0 +1,62 @@
+# SPDX-FileCopyrightText: © Jens Bergmann and contributors
+# SPDX-License-Identifier: AGPL-3.0-or-later
+# SPDX-ArtifactOfProjectHomePage: https://github.com/Second-Hand-Friends/kleinanzeigen-bot/
+from pathlib import Path
+
+import pytest
+
+from kleinanzeigen_bot import ad_loading
+from kleinanzeigen_bot.ad_record import AdRecord
+from kleinanzeigen_bot.model.config_model import AdDefaults
+from kleinanzeigen_bot.utils import dicts
+
+AD_YAML = """\
+# keep this comment
+title: Test Title for records
+description: Test Description
+category: "160"
+price: 100
+contact:
+  name: Test User
+  zipcode: "12345"
+"""
+
+
+def _record(tmp_path:Path) -> AdRecord:
+    ad_file = tmp_path / "ad_1.yaml"
+    ad_file.write_text(AD_YAML, encoding = "utf-8")
+    return AdRecord(str(ad_file), ad_loading.load_ad(dicts.load_dict(str(ad_file)), AdDefaults()), ad_file_relative = "ad_1.yaml")
+
+
+def test_raw_is_loaded_on_demand_and_released(tmp_path:Path) -> None:
+    record = _record(tmp_path)
+    assert not record.has_raw
+    assert record.ad_file_relative == "ad_1.yaml"
+
+    raw = record.raw
+    assert raw["title"] == "Test Title for records"
+    assert record.raw is raw  # kept until released
+
+    raw["price"] = 90
+    dicts.save_dict(record.ad_file, raw)
+    record.release_raw()
+    assert not record.has_raw
+    assert record.raw["price"] == 90
+    assert "# keep this comment" in (tmp_path / "ad_1.yaml").read_text(encoding = "utf-8")
+
+
+def test_given_raw_is_used_without_reading_the_file(tmp_path:Path) -> None:
+    record = _record(tmp_path)
+    raw = {"title": "in memory"}
+    record = AdRecord(str(tmp_path / "missing.yaml"), record.ad_cfg, raw)
+    assert record.raw is raw
+    assert record.ad_file_relative == record.ad_file
+
+    record.release_raw()
+    with pytest.raises(FileNotFoundError):
+        _ = record.raw
+
+
+def test_records_have_no_instance_dict(tmp_path:Path) -> None:
+    record = _record(tmp_path)
+    assert not hasattr(record, "__dict__")
@@ -14,6 +14,7 @@ from unittest.mock import patch
 import pytest
 
 import kleinanzeigen_bot.price_reduction as _pr_mod  # noqa: PLC0414 — module import for patching in tests
+from kleinanzeigen_bot.ad_record import AdRecord
 from kleinanzeigen_bot.ad_status import (
     AprDetail,
     StatusRow,
@@ -206,9 +207,9 @@ def test_published_local() -> None:
 
 def test_build_status_rows() -> None:
     """build_status_rows produces a StatusRow per ad."""
-    ads:list[tuple[str, Ad, dict[str, Any]]] = [
-        ("ads/one.yaml", _ad(active = False, id = 123), _raw()),
-        ("ads/two.yaml", _ad(active = True, id = None), _raw()),
+    ads = [
+        AdRecord("ads/one.yaml", _ad(active = False, id = 123), _raw()),
+        AdRecord("ads/two.yaml", _ad(active = True, id = None), _raw()),
     ]
     rows = build_status_rows(ads, now = _now())
     assert len(rows) == 2
@@ -218,6 +219,23 @@ def test_build_status_rows() -> None:
     assert rows[1].status == "draft"
 
 
+def test_build_status_rows_with_forecast() -> None:
+    """With forecast, active ads with a price reduction get the projected prices of their next reposts."""
+    apr = {"enabled": True, "strategy": "FIXED", "amount": 20, "min_price": 50}
+    ads = [
+        AdRecord("ads/apr.yaml", _ad(id = 1, price = 100, auto_price_reduction = apr), _raw()),
+        AdRecord("ads/plain.yaml", _ad(id = 2), _raw()),
+        AdRecord("ads/inactive.yaml", _ad(active = False, price = 100, auto_price_reduction = apr), _raw()),
+    ]
+    assert all(row.price_forecast is None for row in build_status_rows(ads, now = _now()))
+
+    rows = build_status_rows(ads, now = _now(), forecast = 4)
+    assert rows[0].price_forecast == (100, 80, 60, 50)
+    assert rows[1].price_forecast is None
+    assert rows[2].price_forecast is None
+    assert "  price forecast: 100 -> 80 -> 60 -> 50" in render_status_rows(rows)
+
+
 # --------------------------------------------------------------------------- #
 # render_status_rows
 # --------------------------------------------------------------------------- #
@@ -467,7 +485,7 @@ class TestAprRendering:
         )
 
         with patch.object(_pr_mod, "evaluate_auto_price_reduction", return_value = decision):
-            rows = build_status_rows([("ads/a.yaml", _ad(id = 1, price = 20), _raw())], now = _now())
+            rows = build_status_rows([AdRecord("ads/a.yaml", _ad(id = 1, price = 20), _raw())], now = _now())
 
         output = render_status_rows(rows)
         assert "price reduction" in output
@@ -496,7 +514,7 @@ class TestAprRendering:
         )
 
         with patch.object(_pr_mod, "evaluate_auto_price_reduction", return_value = decision):
-            rows = build_status_rows([("ads/a.yaml", _ad(id = 1, price = 20), _raw())], now = _now())
+            rows = build_status_rows([AdRecord("ads/a.yaml", _ad(id = 1, price = 20), _raw())], now = _now())
 
         assert rows[0].apr_repost_detail == AprDetail(
             result_key = "no_new_reduction",
@@ -529,7 +547,7 @@ class TestAprRendering:
         )
 
         with patch.object(_pr_mod, "evaluate_auto_price_reduction", return_value = decision):
-            rows = build_status_rows([("ads/a.yaml", _ad(id = 1, price = 20), _raw())], now = _now())
+            rows = build_status_rows([AdRecord("ads/a.yaml", _ad(id = 1, price = 20), _raw())], now = _now())
 
         output = render_status_rows(rows)
         assert "APR update" not in output
@@ -554,7 +572,7 @@ class TestAprRendering:
                 delay_days = 0, elapsed_days = None, reference = None,
                 delay_reposts_ignored = False,
             )
-            build_status_rows([("ads/test.yaml", ad, raw)], now = _now())
+            build_status_rows([AdRecord("ads/test.yaml", ad, raw)], now = _now())
 
         assert mock_eval.call_count == 2
         replace_call, modify_call = mock_eval.call_args_list
@@ -570,7 +588,7 @@ class TestAprRendering:
         ad = _ad(active = False, id = 1)
         raw = _raw()
         with patch.object(_pr_mod, "evaluate_auto_price_reduction") as mock_eval:
-            build_status_rows([("ads/test.yaml", ad, raw)], now = _now())
+            build_status_rows([AdRecord("ads/test.yaml", ad, raw)], now = _now())
         mock_eval.assert_not_called()
 
     def test_apr_eval_draft_calls_replace_only(self) -> None:
@@ -588,7 +606,7 @@ class TestAprRendering:
                 delay_days = 0, elapsed_days = None, reference = None,
                 delay_reposts_ignored = False,
             )
-            build_status_rows([("ads/test.yaml", ad, raw)], now = _now())
+            build_status_rows([AdRecord("ads/test.yaml", ad, raw)], now = _now())
 
         assert mock_eval.call_count == 1
         only_call = mock_eval.call_args_list[0]
@@ -599,7 +617,7 @@ class TestAprRendering:
         ad = _ad(active = True, id = 1)
         raw = _raw()
         with patch.object(_pr_mod, "apply_auto_price_reduction") as mock_apply:
-            build_status_rows([("ads/test.yaml", ad, raw)], now = _now())
+            build_status_rows([AdRecord("ads/test.yaml", ad, raw)], now = _now())
             mock_apply.assert_not_called()
 
     def test_apr_eval_does_not_mutate_models(self) -> None:
@@ -621,7 +639,7 @@ class TestAprRendering:
         raw = _raw(price = 1000)
         ad_before = ad.model_dump(mode = "json")
         raw_before = copy.deepcopy(raw)
-        build_status_rows([("ads/test.yaml", ad, raw)], now = _now())
+        build_status_rows([AdRecord("ads/test.yaml", ad, raw)], now = _now())
         assert ad.model_dump(mode = "json") == ad_before, "Ad model should not be mutated"
         assert raw == raw_before, "Raw dict should not be mutated"
 
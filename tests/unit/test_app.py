@@ -1,11 +1,11 @@
 # SPDX-FileCopyrightText: © Jens Bergmann and contributors
 # SPDX-License-Identifier: AGPL-3.0-or-later
 # SPDX-ArtifactOfProjectHomePage: https://github.com/Second-Hand-Friends/kleinanzeigen-bot/
-import os
+import os, threading  # isort: skip
 from collections.abc import Generator
 from pathlib import Path
 from typing import Any
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from ruamel.yaml import YAML as _YAML
@@ -15,6 +15,7 @@ from kleinanzeigen_bot.app import KleinanzeigenBot
 from kleinanzeigen_bot.model.config_model import Config
 from kleinanzeigen_bot.runtime_config import RuntimeState
 from kleinanzeigen_bot.utils import xdg_paths
+from kleinanzeigen_bot.utils.resource_policy import ResourceBlocker
 
 
 @pytest.fixture
@@ -289,6 +290,17 @@ class TestKleinanzeigenBotAdOperations:
             assert test_bot.ads_selector == "new"
             mock_download.assert_awaited_once()
 
+    @pytest.mark.asyncio
+    async def test_run_timing_tune_prints_report(
+        self, test_bot:KleinanzeigenBot, mock_config_setup:None, capsys:pytest.CaptureFixture[str],  # pylint: disable=unused-argument
+    ) -> None:
+        """Test the timing-tune command prints the report for the workspace timing data."""
+        with patch("kleinanzeigen_bot.utils.timing_collector.load_sessions", return_value = []) as mock_load:
+            await test_bot.run(["script.py", "timing-tune"])
+
+        assert mock_load.call_args.args[0].name == "timing"
+        assert capsys.readouterr().out.startswith("No timing data found.")
+
     @pytest.mark.asyncio
     async def test_run_update_default_selector(self, test_bot:KleinanzeigenBot, mock_config_setup:None) -> None:  # pylint: disable=unused-argument
         """Test running update command with default selector falls back to changed."""
@@ -303,6 +315,135 @@ class TestKleinanzeigenBotAdOperations:
             await test_bot.run(["script.py", "extend"])
             assert test_bot.ads_selector == "all"
 
+    @pytest.mark.asyncio
+    async def test_start_browser_early_closes_browser_without_ads(self, test_bot:KleinanzeigenBot, mock_config_setup:None) -> None:  # pylint: disable=unused-argument
+        """Test the browser started while loading ads is closed again when no ads are selected."""
+        test_bot.config.ad_loading.start_browser_early = True
+        with (
+            patch.object(test_bot, "load_ads", return_value = []),
+            patch.object(test_bot, "close_browser_session") as mock_close,
+            patch.object(test_bot, "publish_ads", new_callable = AsyncMock) as mock_publish,
+        ):
+            await test_bot.run(["script.py", "publish"])
+        mock_close.assert_called()
+        mock_publish.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_open_logged_in_browser_uses_browser_daemon(self, test_bot:KleinanzeigenBot, tmp_path:Path) -> None:
+        """A running serve command's browser is used instead of launching one and handed back on close."""
+        test_bot.workspace = xdg_paths.Workspace.for_config(tmp_path / "config.yaml", "kleinanzeigen-bot")
+        lease = MagicMock()
+        with (
+            patch("kleinanzeigen_bot.browser_daemon.attach", new_callable = AsyncMock, return_value = lease) as mock_attach,
+            patch.object(test_bot, "create_browser_session", new_callable = AsyncMock) as mock_create,
+            patch.object(test_bot, "login", new_callable = AsyncMock) as mock_login,
+        ):
+            await test_bot._open_logged_in_browser()  # noqa: SLF001
+
+        assert mock_attach.await_args is not None
+        assert mock_attach.await_args.kwargs == {"state_dir": test_bot.workspace.state_dir, "timeout": test_bot.config.serve.attach_timeout}
+        mock_create.assert_not_awaited()
+        mock_login.assert_awaited_once()
+
+        test_bot.close_browser_session()
+        lease.release.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_close_browser_session_stops_resource_blocking_before_releasing_browser_daemon(
+        self, test_bot:KleinanzeigenBot, tmp_path:Path,
+    ) -> None:
+        """Request interception is disabled in the daemon's tabs before they are handed back."""
+        test_bot.workspace = xdg_paths.Workspace.for_config(tmp_path / "config.yaml", "kleinanzeigen-bot")
+        test_bot.config.browser.resource_blocking.enabled = True
+        test_bot.command = "delete"
+        events:list[str] = []
+        lease = MagicMock()
+        lease.release.side_effect = lambda: events.append("release")
+        with (
+            patch("kleinanzeigen_bot.browser_daemon.attach", new_callable = AsyncMock, return_value = lease),
+            patch.object(test_bot, "login", new_callable = AsyncMock),
+            patch.object(ResourceBlocker, "detach", new_callable = AsyncMock, side_effect = lambda: events.append("detach")),
+        ):
+            await test_bot._open_logged_in_browser()  # noqa: SLF001
+            assert test_bot._resource_blocker is not None  # noqa: SLF001
+            await test_bot._close_browser_session()  # noqa: SLF001
+
+        assert events == ["detach", "release"]
+        assert test_bot._resource_blocker is None  # noqa: SLF001
+
+    @pytest.mark.asyncio
+    async def test_open_logged_in_browser_without_browser_daemon(self, test_bot:KleinanzeigenBot, tmp_path:Path) -> None:
+        """Without a running serve command, or with serve.attach disabled, a browser is launched."""
+        test_bot.workspace = xdg_paths.Workspace.for_config(tmp_path / "config.yaml", "kleinanzeigen-bot")
+        for attach in (True, False):
+            test_bot.config.serve.attach = attach
+            with (
+                patch("kleinanzeigen_bot.browser_daemon.attach", new_callable = AsyncMock, return_value = None) as mock_attach,
+                patch.object(test_bot, "create_browser_session", new_callable = AsyncMock) as mock_create,
+                patch.object(test_bot, "login", new_callable = AsyncMock),
+            ):
+                await test_bot._open_logged_in_browser()  # noqa: SLF001
+
+            assert mock_attach.await_count == (1 if attach else 0)
+            mock_create.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_open_logged_in_browser_applies_resource_policy_of_command(self, test_bot:KleinanzeigenBot) -> None:
+        """Resources are only blocked when enabled and for the commands configured to block them."""
+        blocking = test_bot.config.browser.resource_blocking
+        for enabled, command, expected in (
+            (True, "delete", {"image", "media", "font", "third_party"}),
+            (True, "publish", None),
+            (False, "delete", None),
+        ):
+            blocking.enabled = enabled
+            test_bot.command = command
+            with (
+                patch.object(test_bot, "create_browser_session", new_callable = AsyncMock),
+                patch.object(test_bot, "login", new_callable = AsyncMock),
+                patch.object(test_bot, "set_resource_policy", new_callable = AsyncMock) as mock_set_policy,
+            ):
+                await test_bot._open_logged_in_browser()  # noqa: SLF001
+
+            if expected is None:
+                mock_set_policy.assert_not_awaited()
+            else:
+                assert mock_set_policy.await_args is not None
+                policy = mock_set_policy.await_args.args[0]
+                assert policy.blocked == expected
+                assert policy.site_domain == "kleinanzeigen.de"
+                assert "hcaptcha.com" in policy.allowed_hosts
+
+    @pytest.mark.asyncio
+    async def test_run_serve_starts_browser_daemon(self, test_bot:KleinanzeigenBot, mock_config_setup:None) -> None:  # pylint: disable=unused-argument
+        """Test the serve command runs the browser daemon in the workspace state directory."""
+        with patch("kleinanzeigen_bot.browser_daemon.serve", new_callable = AsyncMock) as mock_serve:
+            await test_bot.run(["script.py", "serve"])
+
+        assert mock_serve.await_args is not None
+        assert mock_serve.await_args.args == (test_bot,)
+        assert mock_serve.await_args.kwargs["state_dir"] == test_bot._workspace_or_raise().state_dir  # noqa: SLF001
+        assert mock_serve.await_args.kwargs["config"] is test_bot.config.serve
+
+    @pytest.mark.asyncio
+    async def test_start_browser_early_logs_in_while_loading(self, test_bot:KleinanzeigenBot, mock_config_setup:None) -> None:  # pylint: disable=unused-argument
+        """Test login runs concurrently with ad loading and publishing waits for both."""
+        test_bot.config.ad_loading.start_browser_early = True
+        login_started = threading.Event()
+        ads:list[Any] = [("ad.yaml", MagicMock(), {})]
+
+        def _load_ads(**_kwargs:Any) -> list[Any]:
+            assert login_started.wait(5), "login did not start while loading ads"
+            return ads
+
+        with (
+            patch.object(test_bot, "load_ads", side_effect = _load_ads),
+            patch.object(test_bot, "login", new_callable = AsyncMock, side_effect = login_started.set),
+            patch.object(test_bot, "publish_ads", new_callable = AsyncMock) as mock_publish,
+        ):
+            await test_bot.run(["script.py", "publish"])
+        mock_publish.assert_awaited_once_with(ads)
+
 
 class TestKleinanzeigenBotAdManagement:
     """Tests for ad management functionality."""
@@ -0,0 +1,245 @@
+# SPDX-FileCopyrightText: © Jens Bergmann and contributors
+# SPDX-License-Identifier: AGPL-3.0-or-later
+# SPDX-ArtifactOfProjectHomePage: https://github.com/Second-Hand-Friends/kleinanzeigen-bot/
+import asyncio, json, os, time  # isort: skip
+from pathlib import Path
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from kleinanzeigen_bot import browser_daemon
+from kleinanzeigen_bot.browser_daemon import DaemonEndpoint, PidLock
+from kleinanzeigen_bot.model.config_model import ServeConfig
+
+pytestmark = pytest.mark.unit
+
+# a process that is alive while the tests run, but is not the test process
+OTHER_PID = os.getppid()
+
+
+def _write_endpoint(state_dir:Path, pid:int = OTHER_PID) -> None:
+    (state_dir / browser_daemon.ENDPOINT_FILE).write_text(
+        json.dumps({"pid": pid, "host": "127.0.0.1", "port": 9333, "started_at": "2026-01-01T00:00:00"}), encoding = "utf-8",
+    )
+
+
+def _web() -> Any:
+    web = MagicMock()
+    web.connect_browser_session = AsyncMock()
+    web.create_browser_session = AsyncMock()
+    web.browser.config.host = "127.0.0.1"
+    web.browser.config.port = 9444
+    web.browser.send = AsyncMock()
+    return web
+
+
+class TestPidLock:
+    def test_acquire_and_release(self, tmp_path:Path) -> None:
+        lock = PidLock(tmp_path / "test.lock")
+
+        assert lock.try_acquire()
+        assert lock.owner() == os.getpid()
+        assert not lock.try_acquire()
+
+        lock.release()
+        assert not lock.path.exists()
+
+    def test_lock_of_running_process_is_respected(self, tmp_path:Path) -> None:
+        lock = PidLock(tmp_path / "test.lock")
+        lock.path.write_text(str(OTHER_PID), encoding = "utf-8")
+
+        assert not lock.try_acquire()
+        lock.release()  # not ours, left alone
+        assert lock.owner() == OTHER_PID
+
+    def test_stale_lock_is_taken_over(self, tmp_path:Path, monkeypatch:pytest.MonkeyPatch) -> None:
+        lock = PidLock(tmp_path / "test.lock")
+        lock.path.write_text("4242", encoding = "utf-8")
+        monkeypatch.setattr("psutil.pid_exists", lambda pid: pid == os.getpid())
+
+        assert lock.try_acquire()
+        assert lock.owner() == os.getpid()
+
+    def test_lock_without_pid_is_only_stale_after_grace_period(self, tmp_path:Path) -> None:
+        lock = PidLock(tmp_path / "test.lock")
+        lock.path.touch()
+        assert not lock.try_acquire()
+
+        old = time.time() - 60
+        os.utime(lock.path, (old, old))
+        assert lock.try_acquire()
+
+    @pytest.mark.asyncio
+    async def test_acquire_gives_up_after_timeout(self, tmp_path:Path) -> None:
+        lock = PidLock(tmp_path / "test.lock")
+        lock.path.write_text(str(OTHER_PID), encoding = "utf-8")
+
+        assert not await lock.acquire(0)
+
+
+def test_read_endpoint(tmp_path:Path, monkeypatch:pytest.MonkeyPatch) -> None:
+    assert browser_daemon.read_endpoint(tmp_path) is None
+
+    _write_endpoint(tmp_path)
+    assert browser_daemon.read_endpoint(tmp_path) == DaemonEndpoint(pid = OTHER_PID, host = "127.0.0.1", port = 9333, started_at = "2026-01-01T00:00:00")
+
+    monkeypatch.setattr("psutil.pid_exists", lambda _pid: False)
+    assert browser_daemon.read_endpoint(tmp_path) is None
+
+    (tmp_path / browser_daemon.ENDPOINT_FILE).write_text('{"pid": "broken"', encoding = "utf-8")
+    assert browser_daemon.read_endpoint(tmp_path) is None
+
+
+@pytest.mark.asyncio
+class TestAttach:
+    async def test_attach_without_daemon(self, tmp_path:Path) -> None:
+        web = _web()
+
+        assert await browser_daemon.attach(web, state_dir = tmp_path, timeout = 1) is None
+        web.connect_browser_session.assert_not_awaited()
+
+    async def test_attach_holds_session_until_released(self, tmp_path:Path) -> None:
+        _write_endpoint(tmp_path)
+        endpoint_file = tmp_path / browser_daemon.ENDPOINT_FILE
+        os.utime(endpoint_file, (0, 0))
+        web = _web()
+
+        lease = await browser_daemon.attach(web, state_dir = tmp_path, timeout = 1)
+
+        assert lease is not None
+        web.connect_browser_session.assert_awaited_once_with("127.0.0.1", 9333)
+        session_lock = PidLock(tmp_path / browser_daemon.SESSION_LOCK_FILE)
+        assert session_lock.owner() == os.getpid()
+
+        lease.release()
+        assert session_lock.owner() is None
+        assert endpoint_file.stat().st_mtime > 0  # the daemon's idle time starts now
+
+    async def test_attach_falls_back_when_browser_is_unreachable(self, tmp_path:Path) -> None:
+        _write_endpoint(tmp_path)
+        web = _web()
+        web.connect_browser_session.side_effect = AssertionError("Browser process not reachable")
+
+        assert await browser_daemon.attach(web, state_dir = tmp_path, timeout = 1) is None
+        assert PidLock(tmp_path / browser_daemon.SESSION_LOCK_FILE).owner() is None
+
+    async def test_attach_waits_for_a_starting_daemon(self, tmp_path:Path, monkeypatch:pytest.MonkeyPatch) -> None:
+        (tmp_path / browser_daemon.DAEMON_LOCK_FILE).write_text(str(OTHER_PID), encoding = "utf-8")
+        web = _web()
+        read_endpoint = browser_daemon.read_endpoint
+        reads = 0
+
+        def _read_endpoint(state_dir:Path) -> DaemonEndpoint | None:
+            nonlocal reads
+            reads += 1
+            if reads == 3:  # the daemon publishes its endpoint once logged in
+                _write_endpoint(tmp_path)
+            return read_endpoint(state_dir)
+
+        monkeypatch.setattr(browser_daemon, "read_endpoint", _read_endpoint)
+        monkeypatch.setattr(browser_daemon, "_LOCK_POLL_INTERVAL_SECONDS", 0.0)
+
+        lease = await browser_daemon.attach(web, state_dir = tmp_path, timeout = 60)
+
+        assert lease is not None
+        web.connect_browser_session.assert_awaited_once_with("127.0.0.1", 9333)
+        lease.release()
+
+    async def test_attach_times_out_while_the_daemon_is_starting(self, tmp_path:Path) -> None:
+        (tmp_path / browser_daemon.DAEMON_LOCK_FILE).write_text(str(OTHER_PID), encoding = "utf-8")
+        web = _web()
+
+        with pytest.raises(TimeoutError, match = "did not start its browser"):
+            await browser_daemon.attach(web, state_dir = tmp_path, timeout = 0)
+        web.connect_browser_session.assert_not_awaited()
+
+    async def test_attach_times_out_while_another_run_uses_the_browser(self, tmp_path:Path) -> None:
+        _write_endpoint(tmp_path)
+        (tmp_path / browser_daemon.SESSION_LOCK_FILE).write_text(str(OTHER_PID), encoding = "utf-8")
+        web = _web()
+
+        with pytest.raises(TimeoutError, match = "still in use"):
+            await browser_daemon.attach(web, state_dir = tmp_path, timeout = 0)
+        web.connect_browser_session.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+class TestServe:
+    @staticmethod
+    def _config(**values:Any) -> ServeConfig:
+        # model_construct allows sub-second intervals
+        return ServeConfig.model_construct(**{"attach": True, "idle_timeout": 0.05, "health_check_interval": 0.01, "attach_timeout": 1, **values})
+
+    @staticmethod
+    def _idle(monkeypatch:pytest.MonkeyPatch, *seconds:float) -> None:
+        """Let the daemon see the given idle times, one per check, instead of the endpoint file's age."""
+        idle_times = iter(seconds)
+        monkeypatch.setattr(browser_daemon, "_idle_seconds", lambda _state_dir: next(idle_times))
+
+    async def test_serve_publishes_endpoint_and_shuts_down_when_idle(self, tmp_path:Path, monkeypatch:pytest.MonkeyPatch) -> None:
+        self._idle(monkeypatch, 0.0, 60.0)
+        web = _web()
+        login = AsyncMock()
+        endpoints:list[DaemonEndpoint | None] = []
+        web.create_browser_session.side_effect = lambda: endpoints.append(browser_daemon.read_endpoint(tmp_path))
+        web.browser.send.side_effect = lambda *_args: endpoints.append(browser_daemon.read_endpoint(tmp_path))
+
+        await browser_daemon.serve(web, state_dir = tmp_path, config = self._config(idle_timeout = 30), login = login)
+
+        login.assert_awaited_once()
+        assert len(endpoints) == 2  # before the start, then at the single health check
+        assert endpoints[0] is None
+        assert endpoints[1] is not None
+        assert (endpoints[1].pid, endpoints[1].port) == (os.getpid(), 9444)
+        web.close_browser_session.assert_called_once()
+        assert not os.listdir(tmp_path)  # endpoint and lock files removed
+
+    async def test_serve_restarts_unresponsive_browser(self, tmp_path:Path, monkeypatch:pytest.MonkeyPatch) -> None:
+        self._idle(monkeypatch, 0.0, 0.0, 60.0)
+        web = _web()
+        login = AsyncMock()
+        failures = [ConnectionError("gone")]
+
+        async def _send(*_args:Any) -> None:
+            if failures:
+                raise failures.pop()
+
+        web.browser.send.side_effect = _send
+
+        await browser_daemon.serve(web, state_dir = tmp_path, config = self._config(idle_timeout = 30), login = login)
+
+        assert web.create_browser_session.await_count == 2
+        assert login.await_count == 2
+        assert web.close_browser_session.call_count == 2
+
+    async def test_serve_waits_while_a_run_is_attached(self, tmp_path:Path) -> None:
+        web = _web()
+        session_lock = tmp_path / browser_daemon.SESSION_LOCK_FILE
+        checks = 0
+
+        async def _send(*_args:Any) -> None:
+            nonlocal checks
+            checks += 1
+
+        async def _login() -> None:
+            # a run attaches as soon as the daemon is up
+            session_lock.write_text(str(OTHER_PID), encoding = "utf-8")
+
+        web.browser.send.side_effect = _send
+
+        serving = browser_daemon.serve(web, state_dir = tmp_path, config = self._config(), login = _login)
+        with pytest.raises((TimeoutError, asyncio.TimeoutError)):
+            await asyncio.wait_for(serving, timeout = 0.3)
+
+        assert checks == 0  # never checked nor shut down while the run held the browser
+        web.close_browser_session.assert_called_once()
+
+    async def test_serve_runs_once_per_workspace(self, tmp_path:Path) -> None:
+        (tmp_path / browser_daemon.DAEMON_LOCK_FILE).write_text(str(OTHER_PID), encoding = "utf-8")
+        web = _web()
+
+        await browser_daemon.serve(web, state_dir = tmp_path, config = self._config(), login = AsyncMock())
+
+        web.create_browser_session.assert_not_awaited()
+        assert (tmp_path / browser_daemon.DAEMON_LOCK_FILE).exists()
@@ -0,0 +1,144 @@
+# SPDX-FileCopyrightText: © Jens Bergmann and contributors
+# SPDX-License-Identifier: AGPL-3.0-or-later
+# SPDX-ArtifactOfProjectHomePage: https://github.com/Second-Hand-Friends/kleinanzeigen-bot/
+"""Equivalence tests: streaming canonical hashing vs. ``json.dumps`` of the pruned object.
+
+The inputs are generated from fixed seeds, so every run checks the same
+reproducible set of cases.
+"""
+import enum
+import hashlib
+import json
+import random
+from typing import Any
+
+import pytest
+
+from kleinanzeigen_bot.model.ad_model import AdPartial
+from kleinanzeigen_bot.utils import canonical_json
+
+SEEDS = range(300)
+_STRINGS = ["", "a", "Ä ö ü ß", 'quote " backslash \\ slash /', "tab\tnew\nline", "emoji 🚲", "\x00\x1f\x7f", "€ 10,-"]
+
+
+def _reference_digest(obj:Any) -> str:
+    return hashlib.sha256(json.dumps(canonical_json.prune_empty(obj), sort_keys = True).encode()).hexdigest()
+
+
+def _streamed_digest(obj:Any) -> str:
+    hasher = hashlib.sha256()
+    canonical_json.update_hash(hasher, obj)
+    return hasher.hexdigest()
+
+
+def _rnd(seed:int) -> random.Random:
+    return random.Random(seed)  # noqa: S311 — reproducible test data, not cryptography
+
+
+def _random_scalar(rnd:random.Random) -> Any:
+    return rnd.choice([
+        lambda: rnd.choice(_STRINGS) + str(rnd.random()),
+        lambda: rnd.choice(_STRINGS),
+        lambda: rnd.randint(-(10 ** 20), 10 ** 20),
+        lambda: rnd.uniform(-1e6, 1e6),
+        lambda: rnd.choice([0.0, -0.0, 1e-300, 1e300, float("inf"), float("-inf"), float("nan")]),
+        lambda: rnd.choice([True, False, None]),
+    ])()
+
+
+def _random_value(rnd:random.Random, depth:int = 0) -> Any:
+    kind = rnd.random()
+    if depth >= 4 or kind < 0.5:
+        return _random_scalar(rnd)
+    if kind < 0.65:
+        return rnd.choice([[], {}, (), set()])
+    size = rnd.randint(0, 5)
+    if kind < 0.85:
+        return {rnd.choice(_STRINGS) + str(rnd.randint(0, 50)): _random_value(rnd, depth + 1) for _ in range(size)}
+    items = [_random_value(rnd, depth + 1) for _ in range(size)]
+    return items if rnd.random() < 0.8 else tuple(items)
+
+
+def _random_ad(rnd:random.Random) -> dict[str, Any]:
+    ad:dict[str, Any] = {
+        "title": "Generated ad " + rnd.choice(_STRINGS).replace("\x00", "") + str(rnd.randint(0, 10 ** 6)),
+        "description": rnd.choice(_STRINGS) * rnd.randint(0, 50),
+        "category": str(rnd.randint(1, 300)),
+    }
+    optional:dict[str, Any] = {
+        "active": rnd.choice([True, False]),
+        "type": rnd.choice(["OFFER", "WANTED"]),
+        "price": rnd.randint(0, 10_000),
+        "price_type": rnd.choice(["FIXED", "NEGOTIABLE"]),
+        "shipping_type": rnd.choice(["PICKUP", "SHIPPING", "NOT_APPLICABLE"]),
+        "shipping_costs": round(rnd.uniform(0, 20), 2),
+        "special_attributes": {f"attr_{i}": rnd.choice(_STRINGS) for i in range(rnd.randint(0, 3))},
+        "images": [f"img_{i}.jpg" for i in range(rnd.randint(0, 3))],
+        "contact": {"name": rnd.choice(_STRINGS), "zipcode": rnd.choice([12345, "01234"]), "location": rnd.choice(_STRINGS)},
+        "republication_interval": rnd.randint(1, 30),
+        "sell_directly": rnd.choice([True, False]),
+        "description_prefix": rnd.choice([None, *_STRINGS]),
+        "id": rnd.randint(1, 10 ** 9),
+        "created_on": "2024-01-01T10:00:00",
+        "content_hash": "abc",
+        "repost_count": rnd.randint(0, 5),
+    }
+    ad.update({key: value for key, value in optional.items() if rnd.random() < 0.7})
+    if ad.get("price_type") == "FIXED":
+        ad["price"] = optional["price"]
+    return ad
+
+
+def _legacy_content_hash(ad:AdPartial) -> str:
+    """Content hash as computed before the streaming hasher was introduced."""
+    raw = ad.model_dump(
+        exclude = {"id", "created_on", "updated_on", "content_hash", "repost_count", "price_reduction_count"},
+        exclude_none = True,
+        exclude_unset = True,
+    )
+    return _reference_digest(raw)
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_update_hash_matches_json_dumps(seed:int) -> None:
+    obj = _random_value(_rnd(seed))
+    try:
+        expected = _reference_digest(obj)
+    except TypeError:  # e.g. a top-level set, which is only pruned when nested
+        with pytest.raises(TypeError):
+            _streamed_digest(obj)
+    else:
+        assert _streamed_digest(obj) == expected
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_content_hash_matches_legacy_algorithm(seed:int) -> None:
+    ad = AdPartial.model_validate(_random_ad(_rnd(seed)))
+    assert ad.update_content_hash().content_hash == _legacy_content_hash(ad)
+
+
+def test_large_documents_are_flushed_in_chunks() -> None:
+    obj = {"items": [{"value": i, "label": f"item {i}"} for i in range(5_000)]}
+    chunks:list[bytes] = []
+
+    class Recorder:
+        def update(self, data:bytes) -> None:
+            chunks.append(data)
+
+    canonical_json.update_hash(Recorder(), obj)
+    assert len(chunks) > 1
+    assert b"".join(chunks) == json.dumps(obj, sort_keys = True).encode()
+
+
+def test_non_string_keys_and_number_subclasses_match_json() -> None:
+    class Level(enum.IntEnum):
+        HIGH = 3
+
+    for obj in ({1: "a", 2: "b"}, {2.5: "x", 0.5: "y"}, {None: 1}, {False: 0}, {Level.HIGH: [Level.HIGH, 1.5]}):
+        assert _streamed_digest(obj) == _reference_digest(obj)
+
+
+@pytest.mark.parametrize("value", [b"bytes", {1, 2}, object()])
+def test_unserializable_values_raise_type_error(value:Any) -> None:
+    with pytest.raises(TypeError):
+        _streamed_digest({"value": value})
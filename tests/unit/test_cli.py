@@ -115,6 +115,21 @@ class TestCliParseArgs:
         assert parsed.preserve_local_settings is True
         assert parsed.command == "download"
 
+    def test_parses_no_cache_flag(self) -> None:
+        assert cli.parse_args(["script.py", "verify"]).use_ad_cache is True
+        assert cli.parse_args(["script.py", "--no-cache", "verify"]).use_ad_cache is False
+
+    def test_parses_forecast_option(self) -> None:
+        assert cli.parse_args(["script.py", "status"]).status_forecast == 0
+        assert cli.parse_args(["script.py", "--forecast=5", "status"]).status_forecast == 5
+
+    @pytest.mark.parametrize("value", ["0", "-1", "abc"])
+    def test_invalid_forecast_exits(self, value:str) -> None:
+        with pytest.raises(SystemExit) as exc_info:
+            cli.parse_args(["script.py", f"--forecast={value}", "status"])
+
+        assert exc_info.value.code == 2
+
 
 class TestCliHelpText:
     def test_show_help_uses_german_text(self, capsys:pytest.CaptureFixture[str], monkeypatch:pytest.MonkeyPatch) -> None:
@@ -11,10 +11,11 @@ from unittest.mock import AsyncMock, patch
 import pytest
 
 from kleinanzeigen_bot import delete_flow
+from kleinanzeigen_bot.ad_record import AdRecord
 from kleinanzeigen_bot.app import KleinanzeigenBot
 from kleinanzeigen_bot.delete_flow import DeleteResult
 from kleinanzeigen_bot.model.ad_model import Ad
-from kleinanzeigen_bot.published_ads import PublishedAdsFetchIncompleteError
+from kleinanzeigen_bot.published_ads import PublishedAdsFetchIncompleteError, PublishedAdsSnapshot
 
 
 def remove_fields(config:dict[str, Any], *fields:str) -> dict[str, Any]:
@@ -364,7 +365,7 @@ class TestDeleteAdsAfterDeletePolicy:
                 web = test_bot, root_url = test_bot.root_url,
                 after_delete = test_bot.config.deleting.after_delete,
                 delete_old_ads_by_title = test_bot.config.publishing.delete_old_ads_by_title,
-                ad_cfgs = [(ad_file, ad_cfg, ad_cfg_orig)],
+                ad_cfgs = [AdRecord(ad_file, ad_cfg, ad_cfg_orig)],
             )
 
         assert ad_cfg.repost_count == 0
@@ -389,12 +390,36 @@ class TestDeleteAdsAfterDeletePolicy:
                 web = test_bot, root_url = test_bot.root_url,
                 after_delete = test_bot.config.deleting.after_delete,
                 delete_old_ads_by_title = test_bot.config.publishing.delete_old_ads_by_title,
-                ad_cfgs = [(ad_file, ad_cfg, ad_cfg_orig)],
+                ad_cfgs = [AdRecord(ad_file, ad_cfg, ad_cfg_orig)],
             )
 
         mock_save.assert_not_called()
         assert ad_cfg.id == 12345
 
+    @pytest.mark.asyncio
+    async def test_delete_attempt_invalidates_published_ads_snapshot(
+        self, test_bot:KleinanzeigenBot, minimal_ad_config:dict[str, Any], tmp_path:Path,
+    ) -> None:
+        """Only an attempted delete forgets the run's published ads list."""
+        test_bot.config.deleting.after_delete = "NONE"
+        ad_file, ad_cfg, ad_cfg_orig = self._make_ad(minimal_ad_config, tmp_path)
+
+        for result, invalidated in ((DeleteResult(deleted = False, attempted = False), False), (DeleteResult(deleted = True, attempted = True), True)):
+            snapshot = PublishedAdsSnapshot(test_bot, test_bot.root_url)
+            with (
+                patch("kleinanzeigen_bot.delete_flow.delete_ad", new_callable = AsyncMock, return_value = result),
+                patch.object(test_bot, "web_sleep", new_callable = AsyncMock),
+                patch.object(snapshot, "invalidate") as invalidate_mock,
+            ):
+                await delete_flow.delete_ads(
+                    web = test_bot, root_url = test_bot.root_url,
+                    after_delete = test_bot.config.deleting.after_delete,
+                    delete_old_ads_by_title = test_bot.config.publishing.delete_old_ads_by_title,
+                    ad_cfgs = [AdRecord(ad_file, ad_cfg, ad_cfg_orig)],
+                    snapshot = snapshot,
+                )
+            assert invalidate_mock.called is invalidated
+
     @pytest.mark.asyncio
     async def test_delete_ads_counts_deletions(
         self, test_bot:KleinanzeigenBot, minimal_ad_config:dict[str, Any], tmp_path:Path,
@@ -422,7 +447,7 @@ class TestDeleteAdsAfterDeletePolicy:
                 web = test_bot, root_url = test_bot.root_url,
                 after_delete = test_bot.config.deleting.after_delete,
                 delete_old_ads_by_title = test_bot.config.publishing.delete_old_ads_by_title,
-                ad_cfgs = [ad1, ad2],
+                ad_cfgs = [AdRecord(*ad1), AdRecord(*ad2)],
             )
 
         # save_dict not called because after_delete is NONE
@@ -449,7 +474,7 @@ class TestDeleteAdsAfterDeletePolicy:
                 web = test_bot, root_url = test_bot.root_url,
                 after_delete = test_bot.config.deleting.after_delete,
                 delete_old_ads_by_title = True,
-                ad_cfgs = [(ad_file, ad_cfg, ad_cfg_orig)],
+                ad_cfgs = [AdRecord(ad_file, ad_cfg, ad_cfg_orig)],
             )
 
         mock_fetch.assert_awaited_once_with(test_bot, test_bot.root_url, strict = True)
@@ -471,7 +496,7 @@ class TestDeleteAdsAfterDeletePolicy:
                 web = test_bot, root_url = test_bot.root_url,
                 after_delete = test_bot.config.deleting.after_delete,
                 delete_old_ads_by_title = True,
-                ad_cfgs = [(ad_file, ad_cfg, ad_cfg_orig)],
+                ad_cfgs = [AdRecord(ad_file, ad_cfg, ad_cfg_orig)],
             )
 
         mock_fetch.assert_not_awaited()
@@ -499,7 +524,7 @@ class TestDeleteAdsAfterDeletePolicy:
                 web = test_bot, root_url = test_bot.root_url,
                 after_delete = test_bot.config.deleting.after_delete,
                 delete_old_ads_by_title = True,
-                ad_cfgs = [(title_ad_file, title_ad_cfg, title_ad_cfg_orig), (id_ad_file, id_ad_cfg, id_ad_cfg_orig)],
+                ad_cfgs = [AdRecord(title_ad_file, title_ad_cfg, title_ad_cfg_orig), AdRecord(id_ad_file, id_ad_cfg, id_ad_cfg_orig)],
             )
 
         mock_fetch.assert_awaited_once_with(test_bot, test_bot.root_url, strict = True)
@@ -530,7 +555,7 @@ class TestDeleteAdsAfterDeletePolicy:
                 web = test_bot, root_url = test_bot.root_url,
                 after_delete = test_bot.config.deleting.after_delete,
                 delete_old_ads_by_title = True,
-                ad_cfgs = [(ad_file, ad_cfg, ad_cfg_orig)],
+                ad_cfgs = [AdRecord(ad_file, ad_cfg, ad_cfg_orig)],
             )
 
         # Policy must be applied: deletion was attempted
@@ -6,11 +6,12 @@
 import logging
 from pathlib import Path
 from typing import Any, cast
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, call, patch
 
 import pytest
 
 from kleinanzeigen_bot import download_flow
+from kleinanzeigen_bot.ad_record import AdRecord
 from kleinanzeigen_bot.app import KleinanzeigenBot
 from kleinanzeigen_bot.model.ad_model import Ad
 from kleinanzeigen_bot.published_ads import PublishedAdsFetchIncompleteError
@@ -201,7 +202,11 @@ class TestDownloadFlow:
         extractor_mock.extract_own_ads_urls = AsyncMock(return_value = [])
 
         with (
-            patch("kleinanzeigen_bot.published_ads.fetch_published_ads", new_callable = AsyncMock, return_value = []) as mock_fetch_published_ads,
+            patch(
+                "kleinanzeigen_bot.published_ads.fetch_published_ads",
+                new_callable = AsyncMock,
+                side_effect = [PublishedAdsFetchIncompleteError("incomplete"), []],
+            ) as mock_fetch_published_ads,
             patch("kleinanzeigen_bot.extract.AdExtractor", return_value = extractor_mock),
         ):
             await download_flow.download_ads(
@@ -213,7 +218,11 @@ class TestDownloadFlow:
                 root_url = test_bot.root_url,
             )
 
-        mock_fetch_published_ads.assert_awaited_once_with(test_bot, test_bot.root_url, strict = False)
+        # an incomplete strict fetch falls back to a tolerant one instead of aborting
+        assert mock_fetch_published_ads.await_args_list == [
+            call(test_bot, test_bot.root_url, strict = True),
+            call(test_bot, test_bot.root_url),
+        ]
 
     @pytest.mark.asyncio
     @pytest.mark.parametrize(
@@ -284,8 +293,8 @@ class TestDownloadFlow:
                 root_url = test_bot.root_url,
             )
 
-        # Verify published ads fetched with strict=False (tolerant mode for "all")
-        mock_fetch_published_ads.assert_awaited_once_with(test_bot, test_bot.root_url, strict = False)
+        # A complete strict fetch also serves the tolerant view used for "all"
+        mock_fetch_published_ads.assert_awaited_once_with(test_bot, test_bot.root_url, strict = True)
 
         # Verify download_ad called with correct active parameter
         extractor_mock.download_ad.assert_awaited_once_with(123, active = scenario["expected_active"])
@@ -373,8 +382,8 @@ class TestDownloadFlow:
         extractor_mock.download_ad = AsyncMock()
 
         # Mock load_ads to return the saved_ad_ids
-        saved_ads:list[tuple[str, MagicMock, dict[str, Any]]] = [
-            (
+        saved_ads = [
+            AdRecord(
                 f"ad_{ad_id}.yaml",
                 MagicMock(spec = Ad, id = ad_id),
                 {},
@@ -400,8 +409,8 @@ class TestDownloadFlow:
                 root_url = test_bot.root_url,
             )
 
-        # Verify published ads fetched with strict=False (tolerant mode for "new")
-        mock_fetch_published_ads.assert_awaited_once_with(test_bot, test_bot.root_url, strict = False)
+        # A complete strict fetch also serves the tolerant view used for "new"
+        mock_fetch_published_ads.assert_awaited_once_with(test_bot, test_bot.root_url, strict = True)
 
         # Verify download_ad called with correct active parameter
         extractor_mock.download_ad.assert_awaited_once_with(999, active = scenario["expected_active"])
@@ -424,7 +433,7 @@ class TestDownloadFlow:
         extractor_mock.download_ad = AsyncMock()
 
         # Mock load_ads to return ad 123 as already saved
-        saved_ads:list[tuple[str, MagicMock, dict[str, Any]]] = [("ad_123.yaml", MagicMock(spec = Ad, id = 123), {})]
+        saved_ads = [AdRecord("ad_123.yaml", MagicMock(spec = Ad, id = 123), {})]
 
         with (
             patch("kleinanzeigen_bot.published_ads.fetch_published_ads", new_callable = AsyncMock, return_value = []),
@@ -495,7 +504,7 @@ class TestDownloadFlow:
         extractor_mock.download_ad = AsyncMock()
 
         # Mock load_ads to return different saved ads (999 is new but not in published profile)
-        saved_ads:list[tuple[str, MagicMock, dict[str, Any]]] = [("ad_123.yaml", MagicMock(spec = Ad, id = 123), {})]
+        saved_ads = [AdRecord("ad_123.yaml", MagicMock(spec = Ad, id = 123), {})]
 
         with (
             patch("kleinanzeigen_bot.published_ads.fetch_published_ads", new_callable = AsyncMock, return_value = []),
@@ -12,6 +12,7 @@ from unittest.mock import AsyncMock, MagicMock, patch
 import pytest
 
 from kleinanzeigen_bot import extend_flow, runtime_config
+from kleinanzeigen_bot.ad_record import AdRecord
 from kleinanzeigen_bot.app import KleinanzeigenBot
 from kleinanzeigen_bot.model.ad_model import Ad
 from kleinanzeigen_bot.utils import dicts, misc, xdg_paths
@@ -100,9 +101,9 @@ class TestExtendAdsMethod:
         ad_cfg = Ad.model_validate(ad_config)
 
         with patch.object(test_bot, "web_request", new_callable = AsyncMock) as mock_request, patch.object(test_bot, "web_sleep", new_callable = AsyncMock):
-            mock_request.return_value = {"content": '{"ads": []}'}
+            mock_request.return_value = {"content": '{"ads": [], "paging": {"pageNum": 1, "last": 1}}'}
 
-            await extend_flow.extend_ads(web = test_bot, root_url = test_bot.root_url, ad_cfgs = [("test.yaml", ad_cfg, ad_config)])
+            await extend_flow.extend_ads(web = test_bot, root_url = test_bot.root_url, ad_cfgs = [AdRecord("test.yaml", ad_cfg, ad_config)])
 
             # Verify no extension was attempted
             mock_request.assert_called_once()  # Only the API call to get published ads
@@ -114,9 +115,9 @@ class TestExtendAdsMethod:
 
         with patch.object(test_bot, "web_request", new_callable = AsyncMock) as mock_request, patch.object(test_bot, "web_sleep", new_callable = AsyncMock):
             # Return empty published ads list
-            mock_request.return_value = {"content": '{"ads": []}'}
+            mock_request.return_value = {"content": '{"ads": [], "paging": {"pageNum": 1, "last": 1}}'}
 
-            await extend_flow.extend_ads(web = test_bot, root_url = test_bot.root_url, ad_cfgs = [("test.yaml", ad_cfg, base_ad_config_with_id)])
+            await extend_flow.extend_ads(web = test_bot, root_url = test_bot.root_url, ad_cfgs = [AdRecord("test.yaml", ad_cfg, base_ad_config_with_id)])
 
             # Verify no extension was attempted
             mock_request.assert_called_once()
@@ -144,7 +145,7 @@ class TestExtendAdsMethod:
         ):
             mock_request.return_value = {"content": json.dumps(published_ads_json)}
 
-            await extend_flow.extend_ads(web = test_bot, root_url = test_bot.root_url, ad_cfgs = [("test.yaml", ad_cfg, base_ad_config_with_id)])
+            await extend_flow.extend_ads(web = test_bot, root_url = test_bot.root_url, ad_cfgs = [AdRecord("test.yaml", ad_cfg, base_ad_config_with_id)])
 
             # Verify extend_ad was not called
             mock_extend_ad.assert_not_called()
@@ -172,7 +173,7 @@ class TestExtendAdsMethod:
         ):
             mock_request.return_value = {"content": json.dumps(published_ads_json)}
 
-            await extend_flow.extend_ads(web = test_bot, root_url = test_bot.root_url, ad_cfgs = [("test.yaml", ad_cfg, base_ad_config_with_id)])
+            await extend_flow.extend_ads(web = test_bot, root_url = test_bot.root_url, ad_cfgs = [AdRecord("test.yaml", ad_cfg, base_ad_config_with_id)])
 
             # Verify extend_ad was not called
             mock_extend_ad.assert_not_called()
@@ -195,7 +196,7 @@ class TestExtendAdsMethod:
         ):
             mock_request.return_value = {"content": json.dumps(published_ads_json)}
 
-            await extend_flow.extend_ads(web = test_bot, root_url = test_bot.root_url, ad_cfgs = [("test.yaml", ad_cfg, base_ad_config_with_id)])
+            await extend_flow.extend_ads(web = test_bot, root_url = test_bot.root_url, ad_cfgs = [AdRecord("test.yaml", ad_cfg, base_ad_config_with_id)])
 
             # Verify extend_ad was not called
             mock_extend_ad.assert_not_called()
@@ -219,7 +220,7 @@ class TestExtendAdsMethod:
             mock_request.return_value = {"content": json.dumps(published_ads_json)}
             mock_extend_ad.return_value = True
 
-            await extend_flow.extend_ads(web = test_bot, root_url = test_bot.root_url, ad_cfgs = [("test.yaml", ad_cfg, base_ad_config_with_id)])
+            await extend_flow.extend_ads(web = test_bot, root_url = test_bot.root_url, ad_cfgs = [AdRecord("test.yaml", ad_cfg, base_ad_config_with_id)])
 
             # Verify extend_ad was called
             mock_extend_ad.assert_called_once()
@@ -256,7 +257,7 @@ class TestExtendAdsMethod:
 
             await extend_flow.extend_ads(
                 web = test_bot, root_url = test_bot.root_url,
-                ad_cfgs = [("test1.yaml", ad_cfg1, base_ad_config_with_id), ("test2.yaml", ad_cfg2, ad_config2)],
+                ad_cfgs = [AdRecord("test1.yaml", ad_cfg1, base_ad_config_with_id), AdRecord("test2.yaml", ad_cfg2, ad_config2)],
             )
 
             # Verify extend_ad was called only once (for the ad within window)
@@ -286,7 +287,7 @@ class TestExtendAdsMethod:
             mock_request.return_value = {"content": json.dumps(published_ads_json)}
 
             # Should not raise — gracefully skips invalid endDate
-            await extend_flow.extend_ads(web = test_bot, root_url = test_bot.root_url, ad_cfgs = [("test.yaml", ad_cfg, base_ad_config_with_id)])
+            await extend_flow.extend_ads(web = test_bot, root_url = test_bot.root_url, ad_cfgs = [AdRecord("test.yaml", ad_cfg, base_ad_config_with_id)])
 
             # Verify extend_ad was NOT called (invalid endDate → skip)
             mock_extend_ad.assert_not_called()
@@ -488,7 +489,7 @@ class TestExtendEdgeCases:
             mock_request.return_value = {"content": json.dumps(published_ads_json)}
             mock_extend_ad.return_value = True
 
-            await extend_flow.extend_ads(web = test_bot, root_url = test_bot.root_url, ad_cfgs = [("test.yaml", ad_cfg, base_ad_config_with_id)])
+            await extend_flow.extend_ads(web = test_bot, root_url = test_bot.root_url, ad_cfgs = [AdRecord("test.yaml", ad_cfg, base_ad_config_with_id)])
 
             # Verify extend_ad was called (8 days is within the window)
             mock_extend_ad.assert_called_once()
@@ -511,7 +512,7 @@ class TestExtendEdgeCases:
         ):
             mock_request.return_value = {"content": json.dumps(published_ads_json)}
 
-            await extend_flow.extend_ads(web = test_bot, root_url = test_bot.root_url, ad_cfgs = [("test.yaml", ad_cfg, base_ad_config_with_id)])
+            await extend_flow.extend_ads(web = test_bot, root_url = test_bot.root_url, ad_cfgs = [AdRecord("test.yaml", ad_cfg, base_ad_config_with_id)])
 
             # Verify extend_ad was not called (9 days is outside the window)
             mock_extend_ad.assert_not_called()
@@ -545,7 +546,7 @@ class TestExtendEdgeCases:
             mock_request.return_value = {"content": json.dumps(published_ads_json)}
             mock_extend_ad.return_value = True
 
-            await extend_flow.extend_ads(web = test_bot, root_url = test_bot.root_url, ad_cfgs = [("test.yaml", ad_cfg, base_ad_config_with_id)])
+            await extend_flow.extend_ads(web = test_bot, root_url = test_bot.root_url, ad_cfgs = [AdRecord("test.yaml", ad_cfg, base_ad_config_with_id)])
 
             # Verify extend_ad was called (date was parsed correctly)
             mock_extend_ad.assert_called_once()
@@ -19,7 +19,7 @@ import kleinanzeigen_bot.extract as extract_module
 from kleinanzeigen_bot.model.ad_model import OPTION_NAME_BY_CARRIER_CODE, AdPartial, ContactPartial
 from kleinanzeigen_bot.model.config_model import Config, DownloadConfig
 from kleinanzeigen_bot.utils import dicts
-from kleinanzeigen_bot.utils.web_scraping_mixin import Browser, By, Element
+from kleinanzeigen_bot.utils.web_scraping_mixin import MISSING, Browser, By, Element
 
 SCHEMA_PATH:Final[Path] = Path(__file__).resolve().parents[2] / "schemas" / "ad.schema.json"
 
@@ -194,16 +194,17 @@ class TestAdExtractorPricing:
         self, test_extractor:extract_module.AdExtractor, price_text:str, expected_price:int | None, expected_type:str
     ) -> None:
         """Test price extraction with different formats"""
-        with patch.object(test_extractor, "web_text", new_callable = AsyncMock, return_value = price_text):
+        with patch.object(test_extractor, "web_snapshot", new_callable = AsyncMock, return_value = {"price": price_text}) as mock_snapshot:
             price, price_type = await test_extractor._extract_pricing_info_from_ad_page()
             assert price == expected_price
             assert price_type == expected_type
+            mock_snapshot.assert_awaited_once_with(extract_module._PRICE_FIELDS, required = ("price",))
 
     @pytest.mark.asyncio
     # pylint: disable=protected-access
-    async def test_extract_pricing_info_timeout(self, test_extractor:extract_module.AdExtractor) -> None:
+    async def test_extract_pricing_info_missing(self, test_extractor:extract_module.AdExtractor) -> None:
         """Test price extraction when element is not found"""
-        with patch.object(test_extractor, "web_text", new_callable = AsyncMock, side_effect = TimeoutError):
+        with patch.object(test_extractor, "web_snapshot", new_callable = AsyncMock, side_effect = TimeoutError("price missing")):
             price, price_type = await test_extractor._extract_pricing_info_from_ad_page()
             assert price is None
             assert price_type == "NOT_APPLICABLE"
@@ -228,14 +229,14 @@ class TestAdExtractorShipping:
         """Test shipping info extraction with different text formats."""
         with (
             patch.object(test_extractor, "page", MagicMock()),
-            patch.object(test_extractor, "web_text", new_callable = AsyncMock, return_value = shipping_text),
+            patch.object(test_extractor, "web_snapshot", new_callable = AsyncMock, return_value = {"shipping": shipping_text}),
             patch.object(test_extractor, "web_request", new_callable = AsyncMock) as mock_web_request,
         ):
             if expected_cost:
                 shipping_response:dict[str, Any] = {
                     "data": {"shippingOptionsResponse": {"options": [{"id": "DHL_001", "priceInEuroCent": int(expected_cost * 100), "packageSize": "SMALL"}]}}
                 }
-                mock_web_request.return_value = {"content": json.dumps(shipping_response)}
+                mock_web_request.return_value = {"json": (shipping_response)}
 
             shipping_type, costs, options = await test_extractor._extract_shipping_info_from_ad_page()
 
@@ -251,7 +252,7 @@ class TestAdExtractorShipping:
     async def test_extract_shipping_info_with_all_matching_options(self, test_extractor:extract_module.AdExtractor) -> None:
         """Test shipping info extraction with all matching options enabled."""
         shipping_response = {
-            "content": json.dumps(
+            "json": (
                 {
                     "data": {
                         "shippingOptionsResponse": {
@@ -271,7 +272,7 @@ class TestAdExtractorShipping:
 
         with (
             patch.object(test_extractor, "page", MagicMock()),
-            patch.object(test_extractor, "web_text", new_callable = AsyncMock, return_value = "+ Versand ab 4,89 €"),
+            patch.object(test_extractor, "web_snapshot", new_callable = AsyncMock, return_value = {"shipping": "+ Versand ab 4,89 €"}),
             patch.object(test_extractor, "web_request", new_callable = AsyncMock, return_value = shipping_response),
         ):
             shipping_type, costs, options = await test_extractor._extract_shipping_info_from_ad_page()
@@ -288,7 +289,7 @@ class TestAdExtractorShipping:
     async def test_extract_shipping_info_with_all_matching_options_no_match(self, test_extractor:extract_module.AdExtractor) -> None:
         """Test shipping extraction when include-all is enabled but no option matches the price."""
         shipping_response = {
-            "content": json.dumps(
+            "json": (
                 {
                     "data": {
                         "shippingOptionsResponse": {
@@ -306,7 +307,7 @@ class TestAdExtractorShipping:
 
         with (
             patch.object(test_extractor, "page", MagicMock()),
-            patch.object(test_extractor, "web_text", new_callable = AsyncMock, return_value = "+ Versand ab 4,89 €"),
+            patch.object(test_extractor, "web_snapshot", new_callable = AsyncMock, return_value = {"shipping": "+ Versand ab 4,89 €"}),
             patch.object(test_extractor, "web_request", new_callable = AsyncMock, return_value = shipping_response),
         ):
             shipping_type, costs, options = await test_extractor._extract_shipping_info_from_ad_page()
@@ -320,7 +321,7 @@ class TestAdExtractorShipping:
     async def test_extract_shipping_info_with_excluded_options(self, test_extractor:extract_module.AdExtractor) -> None:
         """Test shipping info extraction with excluded options."""
         shipping_response = {
-            "content": json.dumps(
+            "json": (
                 {
                     "data": {
                         "shippingOptionsResponse": {
@@ -340,7 +341,7 @@ class TestAdExtractorShipping:
 
         with (
             patch.object(test_extractor, "page", MagicMock()),
-            patch.object(test_extractor, "web_text", new_callable = AsyncMock, return_value = "+ Versand ab 4,89 €"),
+            patch.object(test_extractor, "web_snapshot", new_callable = AsyncMock, return_value = {"shipping": "+ Versand ab 4,89 €"}),
             patch.object(test_extractor, "web_request", new_callable = AsyncMock, return_value = shipping_response),
         ):
             shipping_type, costs, options = await test_extractor._extract_shipping_info_from_ad_page()
@@ -357,7 +358,7 @@ class TestAdExtractorShipping:
     async def test_extract_shipping_info_with_excluded_matching_option(self, test_extractor:extract_module.AdExtractor) -> None:
         """Test shipping info extraction when the matching option is excluded."""
         shipping_response = {
-            "content": json.dumps(
+            "json": (
                 {
                     "data": {
                         "shippingOptionsResponse": {
@@ -376,7 +377,7 @@ class TestAdExtractorShipping:
 
         with (
             patch.object(test_extractor, "page", MagicMock()),
-            patch.object(test_extractor, "web_text", new_callable = AsyncMock, return_value = "+ Versand ab 4,89 €"),
+            patch.object(test_extractor, "web_snapshot", new_callable = AsyncMock, return_value = {"shipping": "+ Versand ab 4,89 €"}),
             patch.object(test_extractor, "web_request", new_callable = AsyncMock, return_value = shipping_response),
         ):
             shipping_type, costs, options = await test_extractor._extract_shipping_info_from_ad_page()
@@ -390,7 +391,7 @@ class TestAdExtractorShipping:
     async def test_extract_shipping_info_with_no_matching_option(self, test_extractor:extract_module.AdExtractor) -> None:
         """Test shipping info extraction when price exists but NO matching option in API response."""
         shipping_response = {
-            "content": json.dumps(
+            "json": (
                 {
                     "data": {
                         "shippingOptionsResponse": {
@@ -406,7 +407,7 @@ class TestAdExtractorShipping:
 
         with (
             patch.object(test_extractor, "page", MagicMock()),
-            patch.object(test_extractor, "web_text", new_callable = AsyncMock, return_value = "+ Versand ab 7,00 €"),
+            patch.object(test_extractor, "web_snapshot", new_callable = AsyncMock, return_value = {"shipping": "+ Versand ab 7,00 €"}),
             patch.object(test_extractor, "web_request", new_callable = AsyncMock, return_value = shipping_response),
         ):
             shipping_type, costs, options = await test_extractor._extract_shipping_info_from_ad_page()
@@ -417,17 +418,19 @@ class TestAdExtractorShipping:
 
     @pytest.mark.asyncio
     # pylint: disable=protected-access
-    async def test_extract_shipping_info_timeout(self, test_extractor:extract_module.AdExtractor) -> None:
-        """Test shipping info extraction when shipping element is missing (TimeoutError)."""
+    async def test_extract_shipping_info_missing(self, test_extractor:extract_module.AdExtractor) -> None:
+        """Test shipping info extraction when the shipping element is missing."""
         with (
             patch.object(test_extractor, "page", MagicMock()),
-            patch.object(test_extractor, "web_text", new_callable = AsyncMock, side_effect = TimeoutError),
+            patch.object(test_extractor, "web_snapshot", new_callable = AsyncMock, side_effect = TimeoutError("shipping missing")),
+            patch.object(test_extractor, "web_request", new_callable = AsyncMock) as mock_web_request,
         ):
             shipping_type, costs, options = await test_extractor._extract_shipping_info_from_ad_page()
 
             assert shipping_type == "NOT_APPLICABLE"
             assert costs is None
             assert options is None
+            mock_web_request.assert_not_awaited()
 
 
 class TestAdExtractorNavigation:
@@ -1214,85 +1217,60 @@ class TestAdExtractorCategory:
         config = test_bot_config.with_values({"ad_defaults": {"description": {"prefix": "Test Prefix", "suffix": "Test Suffix"}}})
         return extract_module.AdExtractor(browser_mock, config, Path("downloaded-ads"))
 
+    @staticmethod
+    def _category_snapshot(hrefs:list[Any], first:Any = MISSING, second:Any = MISSING) -> dict[str, Any]:
+        return {"breadcrumb": True, "breadcrumb_hrefs": hrefs, "legacy_first_href": first, "legacy_second_href": second}
+
     @pytest.mark.asyncio
     # pylint: disable=protected-access
     async def test_extract_category(self, extractor:extract_module.AdExtractor) -> None:
         """Test category extraction from breadcrumb."""
-        category_line = MagicMock()
-        first_part = MagicMock()
-        first_part.attrs = {"href": "/s-familie-kind-baby/c17"}
-        second_part = MagicMock()
-        second_part.attrs = {"href": "/s-spielzeug/c23"}
+        snapshot = self._category_snapshot(["/s-familie-kind-baby/c17", "/s-spielzeug/c23"])
 
-        with (
-            patch.object(extractor, "web_find", new_callable = AsyncMock, side_effect = [category_line]) as mock_web_find,
-            patch.object(extractor, "web_find_all", new_callable = AsyncMock, return_value = [first_part, second_part]) as mock_web_find_all,
-        ):
+        with patch.object(extractor, "web_snapshot", new_callable = AsyncMock, return_value = snapshot) as mock_snapshot:
             result = await extractor._extract_category_from_ad_page()
             assert result == "17/23"
 
-            mock_web_find.assert_awaited_once_with(By.ID, "vap-brdcrmb")
-            mock_web_find_all.assert_awaited_once_with(By.CSS_SELECTOR, "a", parent = category_line)
+            mock_snapshot.assert_awaited_once_with(extract_module._CATEGORY_FIELDS, required = ("breadcrumb",))
 
     @pytest.mark.asyncio
     # pylint: disable=protected-access
     async def test_extract_category_single_identifier(self, extractor:extract_module.AdExtractor) -> None:
         """Test category extraction when only a single breadcrumb code exists."""
-        category_line = MagicMock()
-        first_part = MagicMock()
-        first_part.attrs = {"href": "/s-kleidung/c42"}
+        snapshot = self._category_snapshot(["/s-kleidung/c42"])
 
-        with (
-            patch.object(extractor, "web_find", new_callable = AsyncMock, side_effect = [category_line]) as mock_web_find,
-            patch.object(extractor, "web_find_all", new_callable = AsyncMock, return_value = [first_part]) as mock_web_find_all,
-        ):
+        with patch.object(extractor, "web_snapshot", new_callable = AsyncMock, return_value = snapshot):
             result = await extractor._extract_category_from_ad_page()
             assert result == "42/42"
 
-            mock_web_find.assert_awaited_once_with(By.ID, "vap-brdcrmb")
-            mock_web_find_all.assert_awaited_once_with(By.CSS_SELECTOR, "a", parent = category_line)
-
     @pytest.mark.asyncio
     # pylint: disable=protected-access
     async def test_extract_category_fallback_to_legacy_selectors(self, extractor:extract_module.AdExtractor) -> None:
-        """Test category extraction when breadcrumb links are not available and legacy selectors are used."""
-        category_line = MagicMock()
-        first_part = MagicMock()
-        first_part.attrs = {"href": 12345}  # Ensure str() conversion happens
-        second_part = MagicMock()
-        second_part.attrs = {"href": 67890}  # This will need str() conversion
-
-        with (
-            patch.object(extractor, "web_find", new_callable = AsyncMock) as mock_web_find,
-            patch.object(extractor, "web_find_all", new_callable = AsyncMock, side_effect = TimeoutError) as mock_web_find_all,
-        ):
-            mock_web_find.side_effect = [category_line, first_part, second_part]
+        """Test category extraction when breadcrumb links carry no codes and legacy selectors are used."""
+        snapshot = self._category_snapshot(["/s-startseite"], first = 12345, second = 67890)  # Ensure str() conversion happens
 
+        with patch.object(extractor, "web_snapshot", new_callable = AsyncMock, return_value = snapshot):
             result = await extractor._extract_category_from_ad_page()
             assert result == "12345/67890"
 
-            mock_web_find.assert_any_call(By.ID, "vap-brdcrmb")
-            mock_web_find.assert_any_call(By.CSS_SELECTOR, "a:nth-of-type(2)", parent = category_line)
-            mock_web_find.assert_any_call(By.CSS_SELECTOR, "a:nth-of-type(3)", parent = category_line)
-            mock_web_find_all.assert_awaited_once_with(By.CSS_SELECTOR, "a", parent = category_line)
-
     @pytest.mark.asyncio
     async def test_extract_category_legacy_selectors_timeout(self, extractor:extract_module.AdExtractor) -> None:
-        """Ensure fallback timeout re-raises with translated message."""
-        category_line = MagicMock()
-
-        async def fake_web_find(selector_type:By, selector_value:str, *, parent:Element | None = None, timeout:int | float | None = None) -> Element:
-            if selector_type == By.ID and selector_value == "vap-brdcrmb":
-                return category_line
-            raise TimeoutError("legacy selectors missing")
-
+        """Ensure missing fallback selectors raise a TimeoutError with translated message."""
         with (
-            patch.object(extractor, "web_find", new_callable = AsyncMock, side_effect = fake_web_find),
-            patch.object(extractor, "web_find_all", new_callable = AsyncMock, side_effect = TimeoutError),
+            patch.object(extractor, "web_snapshot", new_callable = AsyncMock, return_value = self._category_snapshot([])),
             pytest.raises(TimeoutError, match = "Unable to locate breadcrumb fallback selectors"),
         ):
             await extractor._extract_category_from_ad_page()
 
+    @pytest.mark.asyncio
+    async def test_extract_category_missing_breadcrumb(self, extractor:extract_module.AdExtractor) -> None:
+        """Ensure a missing breadcrumb container propagates the snapshot timeout."""
+        with (
+            patch.object(extractor, "web_snapshot", new_callable = AsyncMock, side_effect = TimeoutError("breadcrumb missing")),
+            pytest.raises(TimeoutError, match = "breadcrumb missing"),
+        ):
+            await extractor._extract_category_from_ad_page()
+
     @pytest.mark.asyncio
     # pylint: disable=protected-access
     async def test_extract_special_attributes_empty(self, extractor:extract_module.AdExtractor) -> None:
@@ -1474,36 +1452,26 @@ class TestAdExtractorContact:
         config = test_bot_config.with_values({"ad_defaults": {"description": {"prefix": "Test Prefix", "suffix": "Test Suffix"}}})
         return extract_module.AdExtractor(browser_mock, config, Path("downloaded-ads"))
 
+    @staticmethod
+    def _contact_snapshot(**overrides:Any) -> dict[str, Any]:
+        snapshot:dict[str, Any] = {
+            "locality": "12345 Berlin - Mitte",
+            "street": MISSING,
+            "contact": True,
+            "name_link": MISSING,
+            "name_text": "Test User",
+            "phone": MISSING,
+        }
+        snapshot.update(overrides)
+        return snapshot
+
     @pytest.mark.asyncio
     # pylint: disable=protected-access
     async def test_extract_contact_info(self, extractor:extract_module.AdExtractor) -> None:
         """Test extraction of contact information."""
-        street_element = MagicMock()
-        contact_person_element = MagicMock()
-        name_element = MagicMock()
-
-        async def visible_text_side_effect(element:Any) -> str:
-            if element is street_element:
-                return "Example Street 123,"
-            return ""
-
-        with (
-            patch.object(extractor, "page", MagicMock()),
-            patch.object(extractor, "web_text", new_callable = AsyncMock) as mock_web_text,
-            patch.object(extractor, "web_find", new_callable = AsyncMock) as mock_web_find,
-            patch.object(extractor, "web_probe", new_callable = AsyncMock, side_effect = [street_element, None]),
-            patch.object(extractor, "extract_visible_text", new_callable = AsyncMock, side_effect = visible_text_side_effect),
-        ):
-            mock_web_text.side_effect = [
-                "12345 Berlin - Mitte",
-                "Test User",
-            ]
-
-            mock_web_find.side_effect = [
-                contact_person_element,
-                name_element,
-            ]
+        snapshot = self._contact_snapshot(street = "Example Street 123,")
 
+        with patch.object(extractor, "web_snapshot", new_callable = AsyncMock, return_value = snapshot) as mock_snapshot:
             contact_info = await extractor._extract_contact_from_ad_page()
             assert contact_info.street == "Example Street 123"
             assert contact_info.zipcode == "12345"
@@ -1511,89 +1479,48 @@ class TestAdExtractorContact:
             assert contact_info.name == "Test User"
             assert contact_info.phone is None
 
+            mock_snapshot.assert_awaited_once_with(extract_module._CONTACT_FIELDS, required = ("locality", "contact"))
+
     @pytest.mark.asyncio
     # pylint: disable=protected-access
     async def test_extract_contact_info_timeout(self, extractor:extract_module.AdExtractor) -> None:
-        """Test contact info extraction when elements are not found."""
+        """Test contact info extraction when the contact box is not found."""
         with (
-            patch.object(extractor, "page", MagicMock()),
-            patch.object(extractor, "web_text", new_callable = AsyncMock, side_effect = TimeoutError()),
-            patch.object(extractor, "web_find", new_callable = AsyncMock, side_effect = TimeoutError()),
+            patch.object(extractor, "web_snapshot", new_callable = AsyncMock, side_effect = TimeoutError()),
             pytest.raises(TimeoutError),
         ):
             await extractor._extract_contact_from_ad_page()
 
     @pytest.mark.asyncio
     # pylint: disable=protected-access
-    async def test_extract_contact_info_with_street_timeout(self, extractor:extract_module.AdExtractor) -> None:
-        """Test street extraction timeout does not abort contact extraction."""
-        contact_person_element = MagicMock()
-        name_element = MagicMock()
-        street_element = MagicMock()
-
-        with (
-            patch.object(extractor, "page", MagicMock()),
-            patch.object(extractor, "web_text", new_callable = AsyncMock) as mock_web_text,
-            patch.object(extractor, "web_find", new_callable = AsyncMock) as mock_web_find,
-            patch.object(extractor, "web_probe", new_callable = AsyncMock, side_effect = [street_element, None]),
-            patch.object(extractor, "extract_visible_text", new_callable = AsyncMock, side_effect = TimeoutError()),
-        ):
-            mock_web_text.side_effect = ["12345 Berlin - Mitte", "Test User"]
-            mock_web_find.side_effect = [contact_person_element, name_element]
+    async def test_extract_contact_info_prefers_linked_name(self, extractor:extract_module.AdExtractor) -> None:
+        """Test the linked contact name wins over the plain text one."""
+        snapshot = self._contact_snapshot(name_link = "Linked User", name_text = "Plain User")
 
+        with patch.object(extractor, "web_snapshot", new_callable = AsyncMock, return_value = snapshot):
             contact_info = await extractor._extract_contact_from_ad_page()
-            assert contact_info.street is None
-            assert contact_info.zipcode == "12345"
-            assert contact_info.location == "Berlin - Mitte"
-            assert contact_info.name == "Test User"
-            assert contact_info.phone is None
+            assert contact_info.name == "Linked User"
 
     @pytest.mark.asyncio
     # pylint: disable=protected-access
-    async def test_extract_contact_info_with_phone_timeout(self, extractor:extract_module.AdExtractor) -> None:
-        """Test phone extraction timeout does not abort contact extraction."""
-        contact_person_element = MagicMock()
-        name_element = MagicMock()
-        phone_element = MagicMock()
-
+    async def test_extract_contact_info_without_name(self, extractor:extract_module.AdExtractor) -> None:
+        """Test a contact box without any name raises a TimeoutError."""
         with (
-            patch.object(extractor, "page", MagicMock()),
-            patch.object(extractor, "web_text", new_callable = AsyncMock) as mock_web_text,
-            patch.object(extractor, "web_find", new_callable = AsyncMock) as mock_web_find,
-            patch.object(extractor, "web_probe", new_callable = AsyncMock, side_effect = [None, phone_element]),
+            patch.object(extractor, "web_snapshot", new_callable = AsyncMock, return_value = self._contact_snapshot(name_text = MISSING)),
+            pytest.raises(TimeoutError, match = "No contact name found"),
         ):
-            mock_web_text.side_effect = ["12345 Berlin - Mitte", "Test User", TimeoutError()]
-            mock_web_find.side_effect = [contact_person_element, name_element]
-
-            contact_info = await extractor._extract_contact_from_ad_page()
-            assert contact_info.street is None
-            assert contact_info.zipcode == "12345"
-            assert contact_info.location == "Berlin - Mitte"
-            assert contact_info.name == "Test User"
-            assert contact_info.phone is None
+            await extractor._extract_contact_from_ad_page()
 
     @pytest.mark.asyncio
     # pylint: disable=protected-access
     async def test_extract_contact_info_with_phone(self, extractor:extract_module.AdExtractor) -> None:
         """Test extraction of contact information including phone number."""
-        contact_person_element = MagicMock()
-        name_element = MagicMock()
-        phone_element = MagicMock()
-
-        with (
-            patch.object(extractor, "page", MagicMock()),
-            patch.object(extractor, "web_text", new_callable = AsyncMock) as mock_web_text,
-            patch.object(extractor, "web_find", new_callable = AsyncMock) as mock_web_find,
-            patch.object(extractor, "web_probe", new_callable = AsyncMock, side_effect = [None, phone_element]),
-        ):
-            mock_web_text.side_effect = ["12345 Berlin - Mitte", "Test User", "+49(0)1234 567890"]
-
-            mock_web_find.side_effect = [
-                contact_person_element,
-                name_element,
-            ]
+        snapshot = self._contact_snapshot(phone = "+49(0)1234 567890")
 
+        with patch.object(extractor, "web_snapshot", new_callable = AsyncMock, return_value = snapshot):
             contact_info = await extractor._extract_contact_from_ad_page()
+            assert contact_info.street is None
+            assert contact_info.name == "Test User"
             assert contact_info.phone == "01234567890"  # Normalized phone number
 
 
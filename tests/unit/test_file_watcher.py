@@ -0,0 +1,65 @@
+# SPDX-FileCopyrightText: © Jens Bergmann and contributors
+# SPDX-License-Identifier: AGPL-3.0-or-later
+# SPDX-ArtifactOfProjectHomePage: https://github.com/Second-Hand-Friends/kleinanzeigen-bot/
+import sys
+import threading
+from collections.abc import Iterator
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from kleinanzeigen_bot.utils import file_watcher
+
+
+def test_polling_watcher_reports_a_change_per_interval() -> None:
+    watcher = file_watcher.PollingWatcher(poll_interval = 0.05)
+    assert watcher.wait(0) is False
+    assert watcher.wait(1) is True
+    assert watcher.wait(0) is False
+
+
+def test_create_watcher_falls_back_to_polling() -> None:
+    with patch.object(file_watcher, "InotifyWatcher", side_effect = OSError("unavailable")):
+        watcher = file_watcher.create_watcher(5)
+    assert isinstance(watcher, file_watcher.PollingWatcher)
+    assert watcher.poll_interval == 5
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason = "inotify is Linux only")
+class TestInotifyWatcher:
+    @pytest.fixture
+    def watcher(self) -> Iterator[file_watcher.InotifyWatcher]:
+        try:
+            watcher = file_watcher.InotifyWatcher()
+        except OSError as ex:
+            pytest.skip(f"inotify not usable: {ex}")
+        yield watcher
+        watcher.close()
+
+    def test_reports_changes_in_watched_directories_only(self, watcher:file_watcher.InotifyWatcher, tmp_path:Path) -> None:
+        watched, other = tmp_path / "watched", tmp_path / "other"
+        watched.mkdir()
+        other.mkdir()
+        watcher.watch([str(watched)])
+        assert watcher.wait(0) is False
+
+        (other / "ad.yaml").write_text("x")
+        assert watcher.wait(0.05) is False
+
+        (watched / "ad.yaml").write_text("x")
+        assert watcher.wait(1) is True
+        assert watcher.wait(0) is False  # events were consumed
+
+        watcher.watch([str(other)])
+        (watched / "ad.yaml").write_text("y")
+        assert watcher.wait(0.05) is False
+
+    def test_wait_returns_once_writes_settle(self, watcher:file_watcher.InotifyWatcher, tmp_path:Path) -> None:
+        watcher.watch([str(tmp_path)])
+        writer = threading.Timer(0.05, (tmp_path / "img.jpg").write_bytes, args = (b"data",))
+        writer.start()
+        try:
+            assert watcher.wait(5) is True
+        finally:
+            writer.join()
@@ -0,0 +1,97 @@
+# SPDX-FileCopyrightText: © Jens Bergmann and contributors
+# SPDX-License-Identifier: AGPL-3.0-or-later
+# SPDX-ArtifactOfProjectHomePage: https://github.com/Second-Hand-Friends/kleinanzeigen-bot/
+import os
+from pathlib import Path
+
+import pytest
+from wcmatch import glob
+
+from kleinanzeigen_bot.utils import glob_scanner
+
+TREE_FILES = [
+    "ad_root.yaml",
+    "ads/ad_one.yml",
+    "ads/notes.txt",
+    "ads/.ad_hidden.yaml",
+    "ads/sub/ad_two.json",
+    "ads/sub/ad_two__img1.jpg",
+    "ads/sub/ad_two__img2.png",
+    "ads/sub/.private/ad_three.yaml",
+    "ads/sub/deeper/ad_four.yaml",
+    "other/ad_five.yaml",
+    ".git/objects/ad_six.yaml",
+]
+
+
+@pytest.fixture
+def tree(tmp_path:Path) -> Path:
+    for rel_path in TREE_FILES:
+        file = tmp_path / rel_path
+        file.parent.mkdir(parents = True, exist_ok = True)
+        file.write_text("x", encoding = "utf-8")
+    return tmp_path
+
+
+def _glob_files(root:Path, patterns:list[str]) -> dict[str, str]:
+    """Reference result: one glob.glob call per pattern, files only."""
+    files:dict[str, str] = {}
+    for pattern in patterns:
+        for match in glob.glob(pattern, root_dir = root, flags = glob_scanner.DEFAULT_FLAGS):
+            if (root / match).is_file():
+                files[os.path.normpath(root / match)] = match
+    return files
+
+
+@pytest.mark.parametrize("patterns", [
+    ["./**/ad_*.{json,yml,yaml}"],
+    ["**/ad_*.yaml"],
+    ["ads/*"],
+    ["ads/**"],
+    ["ads/sub/*.json", "other/*.yaml"],
+    ["**/.private/*"],
+    ["ads/.*"],
+    ["{ads,other}/**/*.yaml"],
+    ["ads/@(sub|nope)/ad_*"],
+    ["./ads/*.yml", "**/*.yml"],
+    ["**/*.yml", "./ads/*.yml"],
+    ["nonexistent/**/*.yaml"],
+])
+def test_scan_matches_glob(tree:Path, patterns:list[str]) -> None:
+    assert glob_scanner.scan(str(tree), patterns).files == _glob_files(tree, patterns)
+
+
+def test_scan_delegates_patterns_outside_root(tree:Path) -> None:
+    root = tree / "ads"
+    patterns = ["../other/*.yaml", str(tree / "ad_root.yaml")]
+    assert glob_scanner.scan(str(root), patterns).files == {
+        str(tree / "other" / "ad_five.yaml"): "../other/ad_five.yaml",
+        str(tree / "ad_root.yaml"): str(tree / "ad_root.yaml"),
+    }
+
+
+def test_scan_prunes_unreachable_directories(tree:Path) -> None:
+    result = glob_scanner.scan(str(tree), ["ads/sub/*.json"])
+    assert set(result.listings) == {str(tree), str(tree / "ads"), str(tree / "ads" / "sub")}
+    assert sorted(result.listings[str(tree / "ads" / "sub")]) == ["ad_two.json", "ad_two__img1.jpg", "ad_two__img2.png"]
+
+
+def test_scan_does_not_follow_symlinks_under_globstar(tree:Path) -> None:
+    (tree / "ads" / "link").symlink_to(tree / "other", target_is_directory = True)
+    assert glob_scanner.scan(str(tree), ["**/ad_five.yaml"]).files == _glob_files(tree, ["**/ad_five.yaml"])
+    assert glob_scanner.scan(str(tree), ["ads/link/*.yaml"]).files == _glob_files(tree, ["ads/link/*.yaml"])
+
+
+@pytest.mark.parametrize("pattern", ["*.{jpg,png}", "./ad_two__img1.jpg", "sub/*.jpg", "*.gif"])
+def test_glob_listed_matches_glob(tree:Path, pattern:str) -> None:
+    result = glob_scanner.scan(str(tree), ["**/ad_*.json"])
+    base_dir = str(tree / "ads" / "sub") if not pattern.startswith("sub/") else str(tree / "ads")
+    listed = result.glob_listed(base_dir, pattern)
+    assert listed is not None
+    assert sorted(listed) == sorted(glob.glob(pattern, root_dir = base_dir, flags = glob_scanner.DEFAULT_FLAGS))
+
+
+@pytest.mark.parametrize("pattern", ["**/*.jpg", "*/ad_two.json", "../sub/*.jpg", "deeper/*.yaml"])
+def test_glob_listed_declines_unanswerable_patterns(tree:Path, pattern:str) -> None:
+    result = glob_scanner.scan(str(tree), ["ads/sub/*.json"])
+    assert result.glob_listed(str(tree / "ads" / "sub"), pattern) is None
@@ -3,7 +3,7 @@
 # SPDX-ArtifactOfProjectHomePage: https://github.com/Second-Hand-Friends/kleinanzeigen-bot/
 import asyncio
 import inspect
-from collections.abc import Callable
+from collections.abc import Awaitable, Callable, Generator
 from pathlib import Path
 from typing import Any, cast
 from unittest.mock import AsyncMock, MagicMock, call, patch
@@ -28,7 +28,7 @@ from kleinanzeigen_bot.login_flow import (
     wait_for_post_auth0_submit_transition,
 )
 from kleinanzeigen_bot.model.config_model import DiagnosticsConfig
-from kleinanzeigen_bot.utils.web_scraping_mixin import By, Element
+from kleinanzeigen_bot.utils.web_scraping_mixin import MISSING, By, Element, Read, SnapshotField
 
 
 def _login_detection_result(is_logged_in:bool, reason:LoginDetectionReason) -> LoginDetectionResult:
@@ -1124,13 +1124,39 @@ class TestKleinanzeigenBotAuthentication:
 class TestClassifyPostSubmitState:
     """Tests for _classify_post_submit_state()."""
 
+    @pytest.fixture(autouse = True)
+    def settled_page_wait(self, test_bot:KleinanzeigenBot) -> Generator[AsyncMock, None, None]:
+        """Replace ``web_await`` by a few immediate checks of the condition, as on a page that does not change anymore."""
+
+        async def fake_web_await(condition:Callable[[], Awaitable[bool]], **_:object) -> bool:
+            error:Exception = TimeoutError()
+            for _attempt in range(3):
+                try:
+                    if await condition():
+                        return True
+                except Exception as ex:  # noqa: BLE001 web_await retries failed checks until the timeout
+                    error = ex
+            raise error
+
+        with patch.object(test_bot, "web_await", new_callable = AsyncMock, side_effect = fake_web_await) as mock_await:
+            yield mock_await
+
+    @staticmethod
+    def _page(**present:object) -> Callable[..., Awaitable[dict[str, object]]]:
+        """``web_snapshot`` side effect for a page on which only the *present* snapshot fields are found."""
+
+        async def fake_snapshot(fields:dict[str, SnapshotField], **_:object) -> dict[str, object]:
+            return {name: present.get(name, False if field.read is Read.EXISTS else MISSING) for name, field in fields.items()}
+
+        return fake_snapshot
+
     @pytest.mark.asyncio
     async def test_classify_still_on_password_page(self, test_bot:KleinanzeigenBot) -> None:
         """Should classify STILL_ON_PASSWORD_PAGE when URL contains /u/login/password."""
         with (
             patch("kleinanzeigen_bot.login_flow.current_page_url", return_value = "https://kleinanzeigen.de/u/login/password"),
             patch.object(test_bot, "timeout", return_value = 5.0),
-            patch.object(test_bot, "web_probe", new_callable = AsyncMock, return_value = None),
+            patch.object(test_bot, "web_snapshot", new_callable = AsyncMock, side_effect = self._page()),
         ):
             result = await login_flow._classify_post_submit_state(test_bot)
 
@@ -1140,15 +1166,13 @@ class TestClassifyPostSubmitState:
     @pytest.mark.asyncio
     async def test_classify_auth0_error_selector_alert(self, test_bot:KleinanzeigenBot) -> None:
         """Should report AUTH0_INLINE_ERROR when [role='alert'] element has visible text."""
-        mock_element = MagicMock(spec = Element)
         with (
             patch("kleinanzeigen_bot.login_flow.current_page_url", return_value = "https://kleinanzeigen.de/u/login/password"),
             patch.object(test_bot, "timeout", return_value = 5.0),
-            patch.object(test_bot, "web_probe", new_callable = AsyncMock) as mock_probe,
-            patch.object(test_bot, "extract_visible_text", new_callable = AsyncMock, return_value = "Falsches Passwort"),
+            patch.object(test_bot, "web_snapshot", new_callable = AsyncMock) as mock_snapshot,
         ):
-            # Return the mock element only for the FIRST probe ([role='alert'])
-            mock_probe.side_effect = [mock_element, None, None, None]
+            # Only the FIRST error selector ([role='alert']) has text
+            mock_snapshot.side_effect = self._page(auth0_error_0 = "Falsches Passwort")
 
             result = await login_flow._classify_post_submit_state(test_bot)
 
@@ -1160,16 +1184,15 @@ class TestClassifyPostSubmitState:
     @pytest.mark.asyncio
     async def test_classify_auth0_error_selector_error_element_password(self, test_bot:KleinanzeigenBot) -> None:
         """Should report AUTH0_INLINE_ERROR when #error-element-password has visible text."""
-        mock_element = MagicMock(spec = Element)
         with (
             patch("kleinanzeigen_bot.login_flow.current_page_url", return_value = "https://kleinanzeigen.de/u/login/password"),
             patch.object(test_bot, "timeout", return_value = 5.0),
-            patch.object(test_bot, "web_probe", new_callable = AsyncMock) as mock_probe,
-            patch.object(test_bot, "extract_visible_text", new_callable = AsyncMock, return_value = "Password is required"),
+            patch.object(test_bot, "web_snapshot", new_callable = AsyncMock) as mock_snapshot,
         ):
-            # Error probes 1-3 miss, 4th (#error-element-password) hits.
-            # MFA probes (calls 5-7) all miss.
-            mock_probe.side_effect = [None, None, None, mock_element, None, None, None]
+            # Error selectors 1-3 miss, 4th (#error-element-password) hits.
+            # MFA signals all miss.
+            assert login_flow._AUTH0_POST_SUBMIT_ERROR_SELECTORS[3] == (By.CSS_SELECTOR, "#error-element-password")
+            mock_snapshot.side_effect = self._page(auth0_error_3 = "Password is required")
 
             result = await login_flow._classify_post_submit_state(test_bot)
 
@@ -1180,33 +1203,33 @@ class TestClassifyPostSubmitState:
     @pytest.mark.asyncio
     async def test_classify_mfa_one_time_code_input(self, test_bot:KleinanzeigenBot) -> None:
         """Should report MFA_DETECTED when input[autocomplete='one-time-code'] is present."""
-        mock_element = MagicMock(spec = Element)
         with (
             patch("kleinanzeigen_bot.login_flow.current_page_url", return_value = "https://login.kleinanzeigen.de/u/mfa"),
             patch.object(test_bot, "timeout", return_value = 5.0),
-            patch.object(test_bot, "web_probe", new_callable = AsyncMock) as mock_probe,
+            patch.object(test_bot, "web_snapshot", new_callable = AsyncMock) as mock_snapshot,
         ):
             # Error selectors are gated to password page only, so only MFA
-            # probes run. One-time-code probe (1st) hits; SMS and email miss.
-            mock_probe.side_effect = [mock_element, None, None]
+            # signals are read. One-time-code input hits; SMS and email miss.
+            mock_snapshot.side_effect = self._page(one_time_code_input = True)
 
             result = await login_flow._classify_post_submit_state(test_bot)
 
         assert "MFA_DETECTED" in result
         assert "ONE_TIME_CODE_INPUT" in result
+        assert mock_snapshot.await_args is not None
+        assert not any(name.startswith("auth0_error_") for name in mock_snapshot.await_args.args[0])
 
     @pytest.mark.asyncio
     async def test_classify_mfa_sms_prompt(self, test_bot:KleinanzeigenBot) -> None:
         """Should report SMS_VERIFICATION when German SMS prompt text is present."""
-        mock_element = MagicMock(spec = Element)
         with (
             patch("kleinanzeigen_bot.login_flow.current_page_url", return_value = "https://login.kleinanzeigen.de/u/mfa-sms"),
             patch.object(test_bot, "timeout", return_value = 5.0),
-            patch.object(test_bot, "web_probe", new_callable = AsyncMock) as mock_probe,
+            patch.object(test_bot, "web_snapshot", new_callable = AsyncMock) as mock_snapshot,
         ):
-            # Error selectors gated to password page. One-time-code probe (1st)
-            # misses; SMS text probe (2nd) hits; email probe (3rd) misses.
-            mock_probe.side_effect = [None, mock_element, None]
+            # Error selectors gated to password page. One-time-code input
+            # misses; SMS text hits; email text misses.
+            mock_snapshot.side_effect = self._page(sms_verification = True)
 
             result = await login_flow._classify_post_submit_state(test_bot)
 
@@ -1219,7 +1242,7 @@ class TestClassifyPostSubmitState:
         with (
             patch("kleinanzeigen_bot.login_flow.current_page_url", return_value = "https://kleinanzeigen.de/meine-anzeigen"),
             patch.object(test_bot, "timeout", return_value = 5.0),
-            patch.object(test_bot, "web_probe", new_callable = AsyncMock, return_value = None),
+            patch.object(test_bot, "web_snapshot", new_callable = AsyncMock, side_effect = self._page()),
         ):
             result = await login_flow._classify_post_submit_state(test_bot)
 
@@ -1229,14 +1252,12 @@ class TestClassifyPostSubmitState:
     @pytest.mark.asyncio
     async def test_classify_combined_password_page_and_error(self, test_bot:KleinanzeigenBot) -> None:
         """Should preserve multiple facts: URL classification + AUTH0_INLINE_ERROR."""
-        mock_element = MagicMock(spec = Element)
         with (
             patch("kleinanzeigen_bot.login_flow.current_page_url", return_value = "https://kleinanzeigen.de/u/login/password"),
             patch.object(test_bot, "timeout", return_value = 5.0),
-            patch.object(test_bot, "web_probe", new_callable = AsyncMock) as mock_probe,
-            patch.object(test_bot, "extract_visible_text", new_callable = AsyncMock, return_value = "Invalid password"),
+            patch.object(test_bot, "web_snapshot", new_callable = AsyncMock) as mock_snapshot,
         ):
-            mock_probe.side_effect = [mock_element, None, None, None]
+            mock_snapshot.side_effect = self._page(auth0_error_0 = "Invalid password")
 
             result = await login_flow._classify_post_submit_state(test_bot)
 
@@ -1249,56 +1270,36 @@ class TestClassifyPostSubmitState:
     #  IP range block detection tests (issue #1120)
     # ------------------------------------------------------------------ #
 
-    @staticmethod
-    async def _ip_probe_return(sel_type:object, sel_value:object, **kwargs:object) -> MagicMock | None:
-        """Return a mock for the IP-block text probe, ``None`` for everything else."""
-        if sel_type is By.TEXT and sel_value == login_flow._IP_RANGE_BLOCKED_TEXT:
-            return MagicMock(spec = Element)
-        return None
-
-    @staticmethod
-    async def _ip_probe_raise(sel_type:object, sel_value:object, **kwargs:object) -> MagicMock | None:
-        """Raise RuntimeError on the IP-block text probe, ``None`` otherwise."""
-        if sel_type is By.TEXT and sel_value == login_flow._IP_RANGE_BLOCKED_TEXT:
-            raise RuntimeError("boom")
-        return None
-
-    @staticmethod
-    async def _ip_probe_with_auth0_alert(sel_type:object, sel_value:object, **kwargs:object) -> MagicMock | None:
-        """Return a mock for ``[role='alert']`` and the IP-block text; ``None`` otherwise."""
-        if sel_type is By.CSS_SELECTOR and sel_value == "[role='alert']":
-            return MagicMock(spec = Element)
-        if sel_type is By.TEXT and sel_value == login_flow._IP_RANGE_BLOCKED_TEXT:
-            return MagicMock(spec = Element)
-        return None
-
     @pytest.mark.asyncio
     async def test_classify_ip_range_blocked(self, test_bot:KleinanzeigenBot) -> None:
         """Should report IP_RANGE_BLOCKED when IP-block heading text is present on password page."""
         with (
             patch("kleinanzeigen_bot.login_flow.current_page_url", return_value = "https://login.kleinanzeigen.de/u/login/password"),
             patch.object(test_bot, "timeout", return_value = 5.0),
-            patch.object(test_bot, "web_probe", new_callable = AsyncMock) as mock_probe,
+            patch.object(test_bot, "web_snapshot", new_callable = AsyncMock) as mock_snapshot,
         ):
-            mock_probe.side_effect = self._ip_probe_return
+            mock_snapshot.side_effect = self._page(ip_range_blocked = True)
 
             result = await login_flow._classify_post_submit_state(test_bot)
 
         assert "STILL_ON_PASSWORD_PAGE" in result
         assert "IP_RANGE_BLOCKED" in result
         assert "AUTH0_INLINE_ERROR" not in result
+        assert mock_snapshot.await_args is not None
+        fields = mock_snapshot.await_args.args[0]
+        assert fields["ip_range_blocked"] == SnapshotField(By.TEXT, login_flow._IP_RANGE_BLOCKED_TEXT, Read.EXISTS)
 
     @pytest.mark.asyncio
     async def test_classify_ip_range_blocked_probe_exception_preserves_facts(
         self, test_bot:KleinanzeigenBot,
     ) -> None:
-        """When IP-block probe raises, password-page fact is preserved."""
+        """When the snapshot reading the IP-block text raises, password-page fact is preserved."""
         with (
             patch("kleinanzeigen_bot.login_flow.current_page_url", return_value = "https://login.kleinanzeigen.de/u/login/password"),
             patch.object(test_bot, "timeout", return_value = 5.0),
-            patch.object(test_bot, "web_probe", new_callable = AsyncMock) as mock_probe,
+            patch.object(test_bot, "web_snapshot", new_callable = AsyncMock) as mock_snapshot,
         ):
-            mock_probe.side_effect = self._ip_probe_raise
+            mock_snapshot.side_effect = RuntimeError("boom")
 
             result = await login_flow._classify_post_submit_state(test_bot)
 
@@ -1313,16 +1314,16 @@ class TestClassifyPostSubmitState:
         with (
             patch("kleinanzeigen_bot.login_flow.current_page_url", return_value = "https://kleinanzeigen.de/meine-anzeigen"),
             patch.object(test_bot, "timeout", return_value = 5.0),
-            patch.object(test_bot, "web_probe", new_callable = AsyncMock) as mock_probe,
+            patch.object(test_bot, "web_snapshot", new_callable = AsyncMock) as mock_snapshot,
         ):
-            # Error selectors are gated to password page; IP-block probe is
-            # also gated to password page; MFA probes gated to non-destination.
-            # meine-anzeigen is a valid destination, so no probes run at all.
-            mock_probe.side_effect = self._ip_probe_return
+            # Error selectors are gated to password page; IP-block text is
+            # also gated to password page; MFA signals gated to non-destination.
+            # meine-anzeigen is a valid destination, so no snapshot is taken at all.
+            mock_snapshot.side_effect = self._page(ip_range_blocked = True)
 
             result = await login_flow._classify_post_submit_state(test_bot)
 
-        mock_probe.assert_not_awaited()
+        mock_snapshot.assert_not_awaited()
         assert "IP_RANGE_BLOCKED" not in result
         assert result.startswith("UNKNOWN (url=")
 
@@ -1334,16 +1335,17 @@ class TestClassifyPostSubmitState:
         with (
             patch("kleinanzeigen_bot.login_flow.current_page_url", return_value = "https://login.kleinanzeigen.de/u/login/password"),
             patch.object(test_bot, "timeout", return_value = 5.0),
-            patch.object(test_bot, "web_probe", new_callable = AsyncMock) as mock_probe,
-            patch.object(test_bot, "extract_visible_text", new_callable = AsyncMock, return_value = "Falsches Passwort"),
+            patch.object(test_bot, "web_snapshot", new_callable = AsyncMock) as mock_snapshot,
         ):
-            mock_probe.side_effect = self._ip_probe_with_auth0_alert
+            mock_snapshot.side_effect = self._page(auth0_error_0 = "Falsches Passwort", ip_range_blocked = True)
 
             result = await login_flow._classify_post_submit_state(test_bot)
 
         assert "STILL_ON_PASSWORD_PAGE" in result
         assert "AUTH0_INLINE_ERROR" in result
         assert "IP_RANGE_BLOCKED" in result
+        # all signals are read from one snapshot
+        mock_snapshot.assert_awaited_once()
 
     @pytest.mark.asyncio
     async def test_classify_never_raises(self, test_bot:KleinanzeigenBot) -> None:
@@ -1363,15 +1365,14 @@ class TestClassifyPostSubmitState:
     @pytest.mark.asyncio
     async def test_classify_mfa_email_prompt(self, test_bot:KleinanzeigenBot) -> None:
         """Should report EMAIL_VERIFICATION when German email prompt text is present."""
-        mock_element = MagicMock(spec = Element)
         with (
             patch("kleinanzeigen_bot.login_flow.current_page_url", return_value = "https://login.kleinanzeigen.de/u/mfa-email"),
             patch.object(test_bot, "timeout", return_value = 5.0),
-            patch.object(test_bot, "web_probe", new_callable = AsyncMock) as mock_probe,
+            patch.object(test_bot, "web_snapshot", new_callable = AsyncMock) as mock_snapshot,
         ):
-            # Error selectors gated to password page. OTC probe (1st) misses,
-            # SMS probe (2nd) misses, email prompt probe (3rd) hits.
-            mock_probe.side_effect = [None, None, mock_element]
+            # Error selectors gated to password page. OTC input misses,
+            # SMS text misses, email prompt text hits.
+            mock_snapshot.side_effect = self._page(email_verification = True)
 
             result = await login_flow._classify_post_submit_state(test_bot)
 
@@ -1385,14 +1386,12 @@ class TestClassifyPostSubmitState:
     @pytest.mark.asyncio
     async def test_classify_auth0_error_blank_text_not_reported(self, test_bot:KleinanzeigenBot) -> None:
         """Auth0 error element with whitespace-only text should not produce AUTH0_INLINE_ERROR."""
-        mock_element = MagicMock(spec = Element)
         with (
             patch("kleinanzeigen_bot.login_flow.current_page_url", return_value = "https://kleinanzeigen.de/u/login/password"),
             patch.object(test_bot, "timeout", return_value = 5.0),
-            patch.object(test_bot, "web_probe", new_callable = AsyncMock) as mock_probe,
-            patch.object(test_bot, "extract_visible_text", new_callable = AsyncMock, return_value = "   \n  "),
+            patch.object(test_bot, "web_snapshot", new_callable = AsyncMock) as mock_snapshot,
         ):
-            mock_probe.side_effect = [mock_element, None, None, None]
+            mock_snapshot.side_effect = self._page(auth0_error_0 = "   \n  ")
 
             result = await login_flow._classify_post_submit_state(test_bot)
 
@@ -1405,15 +1404,13 @@ class TestClassifyPostSubmitState:
 
     @pytest.mark.asyncio
     async def test_classify_probe_exception_preserves_facts(self, test_bot:KleinanzeigenBot) -> None:
-        """When an error probe raises, password-page fact is preserved."""
+        """When the snapshot raises, password-page fact is preserved."""
         with (
             patch("kleinanzeigen_bot.login_flow.current_page_url", return_value = "https://kleinanzeigen.de/u/login/password"),
             patch.object(test_bot, "timeout", return_value = 5.0),
-            patch.object(test_bot, "web_probe", new_callable = AsyncMock) as mock_probe,
+            patch.object(test_bot, "web_snapshot", new_callable = AsyncMock) as mock_snapshot,
         ):
-            # First error probe raises; remaining error probes miss.
-            # MFA probes all miss.
-            mock_probe.side_effect = [RuntimeError("boom"), None, None, None, None, None, None]
+            mock_snapshot.side_effect = ProtocolException({"message": "boom", "code": -32000})
 
             result = await login_flow._classify_post_submit_state(test_bot)
 
@@ -1423,25 +1420,47 @@ class TestClassifyPostSubmitState:
     @pytest.mark.asyncio
     async def test_classify_role_alert_gated_from_non_password_page(self, test_bot:KleinanzeigenBot) -> None:
         """[role='alert'] on non-password URL must not produce AUTH0_INLINE_ERROR."""
-        mock_element = MagicMock(spec = Element)
         with (
             patch("kleinanzeigen_bot.login_flow.current_page_url", return_value = "https://kleinanzeigen.de/meine-anzeigen"),
             patch.object(test_bot, "timeout", return_value = 5.0),
-            patch.object(test_bot, "web_probe", new_callable = AsyncMock) as mock_probe,
+            patch.object(test_bot, "web_snapshot", new_callable = AsyncMock) as mock_snapshot,
         ):
             # Error selectors are gated to password page only, so even though
-            # mock_element is returned for any probe, no error label appears.
-            # MFA probes are gated to non-destination URLs — meine-anzeigen is
-            # a valid destination, so no MFA probes run either.
-            mock_probe.return_value = mock_element
+            # the page has an alert text, no error label appears.
+            # MFA signals are gated to non-destination URLs — meine-anzeigen is
+            # a valid destination, so no MFA signals are read either.
+            mock_snapshot.side_effect = self._page(auth0_error_0 = "Etwas ist schiefgelaufen")
 
             result = await login_flow._classify_post_submit_state(test_bot)
 
-        # Verify no probes ran at all — both error and MFA probes are gated
-        mock_probe.assert_not_awaited()
+        # Verify no snapshot was taken at all — both error and MFA signals are gated
+        mock_snapshot.assert_not_awaited()
         assert "AUTH0_INLINE_ERROR" not in result
         assert result.startswith("UNKNOWN (url=")
 
+    # ------------------------------------------------------------------ #
+    #  Waiting for late signals
+    # ------------------------------------------------------------------ #
+
+    @pytest.mark.asyncio
+    async def test_classify_waits_up_to_quick_dom_for_a_signal(self, test_bot:KleinanzeigenBot, settled_page_wait:AsyncMock) -> None:
+        """The snapshot is retaken within quick_dom until a signal shows up, e.g. an error rendered after the URL settled."""
+        pages = [self._page(), self._page(auth0_error_0 = "Falsches Passwort")]
+
+        async def rendering_page(fields:dict[str, SnapshotField], **kwargs:object) -> dict[str, object]:
+            return await pages.pop(0)(fields, **kwargs)
+
+        with (
+            patch("kleinanzeigen_bot.login_flow.current_page_url", return_value = "https://kleinanzeigen.de/u/login/password"),
+            patch.object(test_bot, "web_snapshot", new_callable = AsyncMock, side_effect = rendering_page) as mock_snapshot,
+        ):
+            result = await login_flow._classify_post_submit_state(test_bot)
+
+        assert result == "STILL_ON_PASSWORD_PAGE + AUTH0_INLINE_ERROR"
+        assert mock_snapshot.await_count == 2
+        assert settled_page_wait.await_args is not None
+        assert settled_page_wait.await_args.kwargs["timeout"] == test_bot.timeout("quick_dom")
+
     @pytest.mark.asyncio
     async def test_wait_for_post_auth0_submit_transition_safe_diagnostics(
         self, test_bot:KleinanzeigenBot,
@@ -4,12 +4,12 @@
 import logging
 from datetime import datetime, timedelta, timezone
 from types import SimpleNamespace
-from typing import Any, Protocol, runtime_checkable
+from typing import Any, Protocol, cast, runtime_checkable
 
 import pytest
 
 from kleinanzeigen_bot import price_reduction
-from kleinanzeigen_bot.model.ad_model import AdUpdateStrategy, calculate_auto_price
+from kleinanzeigen_bot.model.ad_model import Ad, AdUpdateStrategy, calculate_auto_price, calculate_auto_price_with_trace, price_reduction_schedule
 from kleinanzeigen_bot.model.config_model import AutoPriceReductionConfig
 from kleinanzeigen_bot.utils.pydantics import ContextualValidationError
 
@@ -975,7 +975,52 @@ def test_evaluate_with_null_config_returns_disabled(
         updated_on = None,
         created_on = None,
     )
-    decision = price_reduction.evaluate_auto_price_reduction(ad_cfg, "ad_null.yaml")  # type: ignore[arg-type]
+    decision = price_reduction.evaluate_auto_price_reduction(cast(Ad, ad_cfg), "ad_null.yaml")
     assert decision.enabled is False
     assert decision.reason == "not_configured"
     assert decision.base_price == 150
+
+
+@pytest.mark.unit
+def test_price_reduction_schedule_is_shared_and_extended_on_demand() -> None:
+    schedule = price_reduction_schedule(1000, "PERCENTAGE", 10, 50)
+    assert price_reduction_schedule(1000, "PERCENTAGE", 10, 50) is schedule
+
+    config = AutoPriceReductionConfig(enabled = True, strategy = "PERCENTAGE", amount = 10, min_price = 50)
+    assert calculate_auto_price(base_price = 1000, auto_price_reduction = config, target_reduction_cycle = 2) == 810
+    assert [step.cycle for step in schedule.steps(2)] == [1, 2]
+    assert schedule.price_at(0) == 1000
+    assert schedule.price_at(3) == 729
+
+    # the trace ends at the floor, later cycles keep the floor price
+    assert schedule.price_at(1000) == 50
+    assert schedule.finished
+    assert schedule.steps(1000)[-1].floor_applied
+    _price, steps, floor = calculate_auto_price_with_trace(base_price = 1000, auto_price_reduction = config, target_reduction_cycle = 1000)
+    assert steps == schedule.steps(1000)
+    assert floor == 50
+
+
+@pytest.mark.unit
+def test_forecast_auto_price_follows_repost_delay() -> None:
+    ad_cfg = cast(Ad, SimpleNamespace(
+        price = 100,
+        auto_price_reduction = _price_cfg(amount = 10, min_price = 75, delay_reposts = 2),
+        price_reduction_count = 0,
+        repost_count = 1,
+    ))
+    # repost 1 and 2 are still within the delay, then one reduction per repost down to the floor
+    assert price_reduction.forecast_auto_price(ad_cfg, 6) == [100, 100, 90, 81, 75, 75]
+
+    ad_cfg.price_reduction_count = 2
+    ad_cfg.repost_count = 5
+    assert price_reduction.forecast_auto_price(ad_cfg, 2) == [75, 75]
+
+
+@pytest.mark.unit
+def test_forecast_auto_price_without_reduction_is_none() -> None:
+    ad_cfg = cast(Ad, SimpleNamespace(price = 100, auto_price_reduction = _price_cfg(enabled = False), price_reduction_count = 0, repost_count = 0))
+    assert price_reduction.forecast_auto_price(ad_cfg, 3) is None
+    ad_cfg.auto_price_reduction = _price_cfg()
+    ad_cfg.price = None
+    assert price_reduction.forecast_auto_price(ad_cfg, 3) is None
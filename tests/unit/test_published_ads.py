@@ -3,14 +3,17 @@
 # SPDX-ArtifactOfProjectHomePage: https://github.com/Second-Hand-Friends/kleinanzeigen-bot/
 """Tests for JSON API pagination helper methods."""
 
+import asyncio
 import json
-from unittest.mock import AsyncMock, patch
+from pathlib import Path
+from typing import Any
+from unittest.mock import AsyncMock, call, patch
 
 import pytest
 
 from kleinanzeigen_bot import published_ads
 from kleinanzeigen_bot.app import KleinanzeigenBot
-from kleinanzeigen_bot.published_ads import PublishedAdsFetchIncompleteError
+from kleinanzeigen_bot.published_ads import PublishedAdsFetchIncompleteError, PublishedAdsIndex, PublishedAdsSnapshot
 from kleinanzeigen_bot.utils import misc
 
 
@@ -106,7 +109,7 @@ class TestJSONPagination:
                 pytest.fail(f"Expected result[0]['id'] == 1, got {result[0]['id']}")
             if result[1]["id"] != 2:
                 pytest.fail(f"Expected result[1]['id'] == 2, got {result[1]['id']}")
-            mock_request.assert_awaited_once_with(f"{bot.root_url}/m-meine-anzeigen-verwalten.json?sort=DEFAULT&pageNum=1")
+            mock_request.assert_awaited_once_with(f"{bot.root_url}/m-meine-anzeigen-verwalten.json?sort=DEFAULT&pageNum=1", json_response = True)
 
     @pytest.mark.asyncio
     async def test_fetch_published_ads_single_page_with_paging(self, bot:KleinanzeigenBot) -> None:
@@ -122,7 +125,26 @@ class TestJSONPagination:
                 pytest.fail(f"Expected 1 ad, got {len(result)}")
             if result[0].get("id") != 1:
                 pytest.fail(f"Expected ad id 1, got {result[0].get('id')}")
-            mock_request.assert_awaited_once_with(f"{bot.root_url}/m-meine-anzeigen-verwalten.json?sort=DEFAULT&pageNum=1")
+            mock_request.assert_awaited_once_with(f"{bot.root_url}/m-meine-anzeigen-verwalten.json?sort=DEFAULT&pageNum=1", json_response = True)
+
+    @pytest.mark.asyncio
+    async def test_fetch_published_ads_uses_decoded_json_payload(self, bot:KleinanzeigenBot) -> None:
+        """Responses fetched in JSON mode carry the decoded payload and are used without decoding again."""
+        response_data = {"ads": [{"id": 1, "state": "active", "title": "Ad 1"}], "paging": {"pageNum": 1, "last": 1}}
+
+        with patch.object(bot, "web_request", new_callable = AsyncMock, return_value = {"statusCode": 200, "json": response_data}):
+            result = await published_ads.fetch_published_ads(web = bot, root_url = bot.root_url, strict = True)
+
+        assert [ad["id"] for ad in result] == [1]
+
+    @pytest.mark.asyncio
+    async def test_fetch_published_ads_decoded_non_dict_payload_strict_raises(self, bot:KleinanzeigenBot) -> None:
+        """A decoded payload that is not an object is reported with a preview of the payload."""
+        with (
+            patch.object(bot, "web_request", new_callable = AsyncMock, return_value = {"statusCode": 200, "json": ["unexpected"]}),
+            pytest.raises(published_ads.PublishedAdsFetchIncompleteError, match = r'\["unexpected"\]'),
+        ):
+            await published_ads.fetch_published_ads(web = bot, root_url = bot.root_url, strict = True)
 
     @pytest.mark.asyncio
     async def test_fetch_published_ads_multi_page(self, bot:KleinanzeigenBot) -> None:
@@ -146,9 +168,9 @@ class TestJSONPagination:
                 pytest.fail(f"Expected ids [1, 2, 3, 4, 5, 6] but got {[ad['id'] for ad in result]}")
             if mock_request.call_count != 3:
                 pytest.fail(f"Expected 3 web_request calls but got {mock_request.call_count}")
-            mock_request.assert_any_await(f"{bot.root_url}/m-meine-anzeigen-verwalten.json?sort=DEFAULT&pageNum=1")
-            mock_request.assert_any_await(f"{bot.root_url}/m-meine-anzeigen-verwalten.json?sort=DEFAULT&pageNum=2")
-            mock_request.assert_any_await(f"{bot.root_url}/m-meine-anzeigen-verwalten.json?sort=DEFAULT&pageNum=3")
+            mock_request.assert_any_await(f"{bot.root_url}/m-meine-anzeigen-verwalten.json?sort=DEFAULT&pageNum=1", json_response = True)
+            mock_request.assert_any_await(f"{bot.root_url}/m-meine-anzeigen-verwalten.json?sort=DEFAULT&pageNum=2", json_response = True)
+            mock_request.assert_any_await(f"{bot.root_url}/m-meine-anzeigen-verwalten.json?sort=DEFAULT&pageNum=3", json_response = True)
 
     @pytest.mark.asyncio
     async def test_fetch_published_ads_empty_list(self, bot:KleinanzeigenBot) -> None:
@@ -342,6 +364,7 @@ class TestJSONPagination:
                 pytest.fail(f"Expected ids [10, 20] but got {[ad['id'] for ad in result]}")
             mock_request.assert_awaited_once_with(
                 f"{bot.root_url}/m-meine-anzeigen-verwalten.json?sort=DEFAULT&pageNum=1",
+                json_response = True,
             )
 
     @pytest.mark.asyncio
@@ -489,3 +512,183 @@ class TestJSONPagination:
             pytest.raises(PublishedAdsFetchIncompleteError, match = "Unexpected pagination response type"),
         ):
             await published_ads.fetch_published_ads(web = bot, root_url = bot.root_url, strict = True)
+
+    # ── fetch_published_ads – concurrent page requests ────────────────────
+
+    @staticmethod
+    def _page_response(page:int, last:int, ads_per_page:int = 2) -> dict[str, str]:
+        ads = [{"id": (page - 1) * ads_per_page + i + 1, "state": "active"} for i in range(ads_per_page)]
+        paging:dict[str, int] = {"pageNum": page, "last": last}
+        if page < last:
+            paging["next"] = page + 1
+        return {"content": json.dumps({"ads": ads, "paging": paging})}
+
+    @pytest.mark.asyncio
+    async def test_fetch_published_ads_requests_remaining_pages_concurrently(self, bot:KleinanzeigenBot) -> None:
+        """Pages after page 1 should be in flight together and still be reassembled in page order."""
+        last_page = 6
+        in_flight = 0
+        max_in_flight = 0
+
+        async def fake_request(url:str, *, json_response:bool = False) -> dict[str, str]:
+            nonlocal in_flight, max_in_flight
+            page = int(url.rsplit("pageNum=", maxsplit = 1)[1])
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            # later pages answer first to make sure results are reordered
+            await asyncio.sleep(0.001 * (last_page - page))
+            in_flight -= 1
+            return self._page_response(page, last_page)
+
+        with (
+            patch.object(bot, "web_request", new_callable = AsyncMock, side_effect = fake_request) as mock_request,
+            patch.object(published_ads, "MAX_CONCURRENT_PAGE_REQUESTS", 3),
+        ):
+            result = await published_ads.fetch_published_ads(web = bot, root_url = bot.root_url, strict = True)
+
+        assert [ad["id"] for ad in result] == list(range(1, 2 * last_page + 1))
+        assert mock_request.await_count == last_page
+        assert max_in_flight == 3
+
+    @pytest.mark.asyncio
+    async def test_fetch_published_ads_concurrent_failure_keeps_page_order_semantics(self, bot:KleinanzeigenBot) -> None:
+        """A failing later page should stop at that page (non-strict) or raise for that page (strict)."""
+        responses:dict[int, dict[str, Any] | Exception] = {
+            1: self._page_response(1, 4),
+            2: self._page_response(2, 4),
+            3: TimeoutError("timeout"),
+            4: self._page_response(4, 4),
+        }
+
+        async def fake_request(url:str, *, json_response:bool = False) -> dict[str, Any]:
+            response = responses[int(url.rsplit("pageNum=", maxsplit = 1)[1])]
+            if isinstance(response, Exception):
+                raise response
+            return response
+
+        with patch.object(bot, "web_request", new_callable = AsyncMock, side_effect = fake_request):
+            result = await published_ads.fetch_published_ads(web = bot, root_url = bot.root_url)
+            assert [ad["id"] for ad in result] == [1, 2, 3, 4]
+
+            with pytest.raises(PublishedAdsFetchIncompleteError, match = "Pagination request failed on page 3"):
+                await published_ads.fetch_published_ads(web = bot, root_url = bot.root_url, strict = True)
+
+    @pytest.mark.asyncio
+    async def test_fetch_published_ads_concurrent_requests_respect_page_limit(self, bot:KleinanzeigenBot) -> None:
+        """A bogus huge 'last' must not issue more than MAX_PAGE_LIMIT requests, and strict mode fails up front."""
+        with patch.object(bot, "web_request", new_callable = AsyncMock,
+                side_effect = lambda url, **_: self._page_response(int(url.rsplit("pageNum=", maxsplit = 1)[1]), 10_000, 1)) as mock_request:
+            result = await published_ads.fetch_published_ads(web = bot, root_url = bot.root_url)
+            assert len(result) == 100
+            assert mock_request.await_count == 100
+
+            mock_request.reset_mock()
+            with pytest.raises(PublishedAdsFetchIncompleteError, match = "Stopping pagination after 100 pages"):
+                await published_ads.fetch_published_ads(web = bot, root_url = bot.root_url, strict = True)
+            assert mock_request.await_count == 1
+
+
+@pytest.mark.unit
+class TestPublishedAdsSnapshot:
+    """Tests for the run-scoped PublishedAdsSnapshot."""
+
+    ADS = [{"id": 1, "state": "active"}]
+
+    @pytest.fixture
+    def bot(self) -> KleinanzeigenBot:
+        return KleinanzeigenBot()
+
+    @pytest.mark.asyncio
+    async def test_one_strict_fetch_serves_all_views_until_invalidated(self, bot:KleinanzeigenBot) -> None:
+        snapshot = PublishedAdsSnapshot(bot, bot.root_url)
+        with patch("kleinanzeigen_bot.published_ads.fetch_published_ads", new_callable = AsyncMock, return_value = self.ADS) as fetch_mock:
+            assert await snapshot.get() == self.ADS
+            assert await snapshot.get(strict = True) == self.ADS
+            fetch_mock.assert_awaited_once_with(bot, bot.root_url, strict = True)
+
+            snapshot.invalidate()
+            assert await snapshot.get() == self.ADS
+            assert fetch_mock.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_incomplete_fetch_falls_back_to_lenient_fetch_for_lenient_callers(self, bot:KleinanzeigenBot) -> None:
+        snapshot = PublishedAdsSnapshot(bot, bot.root_url)
+        error = PublishedAdsFetchIncompleteError("incomplete")
+        with patch("kleinanzeigen_bot.published_ads.fetch_published_ads", new_callable = AsyncMock, side_effect = [error, self.ADS]) as fetch_mock:
+            with pytest.raises(PublishedAdsFetchIncompleteError, match = "incomplete"):
+                await snapshot.get(strict = True)
+            assert await snapshot.get() == self.ADS
+            assert await snapshot.get() == self.ADS
+            with pytest.raises(PublishedAdsFetchIncompleteError, match = "incomplete"):
+                await snapshot.get(strict = True)
+
+        assert fetch_mock.await_args_list == [call(bot, bot.root_url, strict = True), call(bot, bot.root_url)]
+
+    @pytest.mark.asyncio
+    async def test_complete_list_is_persisted_for_the_ttl(self, bot:KleinanzeigenBot, tmp_path:Path) -> None:
+        cache_file = tmp_path / published_ads.PUBLISHED_ADS_FILE
+
+        def new_snapshot(account:str = "user", ttl:float = 60) -> PublishedAdsSnapshot:
+            return PublishedAdsSnapshot(bot, bot.root_url, account = account, cache_file = cache_file, ttl = ttl)
+
+        with patch("kleinanzeigen_bot.published_ads.fetch_published_ads", new_callable = AsyncMock, return_value = self.ADS) as fetch_mock:
+            assert await new_snapshot().get() == self.ADS
+            assert cache_file.is_file()
+            assert await new_snapshot().get(strict = True) == self.ADS
+            assert fetch_mock.await_count == 1
+
+            # another account never sees the list
+            await new_snapshot(account = "other").get()
+            assert fetch_mock.await_count == 2
+
+            # expired lists are fetched again
+            with patch("kleinanzeigen_bot.published_ads.time.time", return_value = 10**12):
+                await new_snapshot(account = "other").get()
+            assert fetch_mock.await_count == 3
+
+            new_snapshot(account = "other").invalidate()
+            assert not cache_file.exists()
+
+    @pytest.mark.asyncio
+    async def test_zero_ttl_does_not_persist(self, bot:KleinanzeigenBot, tmp_path:Path) -> None:
+        cache_file = tmp_path / published_ads.PUBLISHED_ADS_FILE
+        snapshot = PublishedAdsSnapshot(bot, bot.root_url, cache_file = cache_file, ttl = 0)
+        with patch("kleinanzeigen_bot.published_ads.fetch_published_ads", new_callable = AsyncMock, return_value = self.ADS):
+            await snapshot.get()
+        assert not cache_file.exists()
+
+
+@pytest.mark.unit
+class TestPublishedAdsIndex:
+    """Tests for the lookup tables of PublishedAdsIndex."""
+
+    ADS:list[dict[str, Any]] = [
+        {"id": "1", "state": "active", "title": "Fahrrad"},
+        {"id": 2, "state": "paused", "title": "Cafe\u0301"},  # decomposed "é"
+        {"id": 2, "state": "active", "title": "duplicate id"},
+        {"id": 3, "state": "active", "title": "Fahrrad"},
+        {"id": "nope", "state": "active", "title": "Fahrrad"},
+        {"id": None, "state": "active"},
+    ]
+
+    def test_lookups_match_linear_scans(self) -> None:
+        index = PublishedAdsIndex(self.ADS)
+
+        for ad_id in (1, 2, 3, 4, None):
+            assert index.get(ad_id) is next((ad for ad in self.ADS if published_ads.ad_matches_id(ad, ad_id)), None)
+        assert index.ids_by_title("Fahrrad") == [1, 3]
+        assert index.ids_by_title("Café") == [2]  # composed "é"
+        assert index.ids_by_title("unknown") == []
+        assert index.with_state("paused") == [self.ADS[1]]
+        assert index.unindexed == self.ADS[4:]
+
+    def test_behaves_like_the_indexed_list(self) -> None:
+        index = PublishedAdsIndex(self.ADS)
+
+        assert index == self.ADS
+        assert list(index) == self.ADS
+        assert len(index) == len(self.ADS)
+        assert index[0] is self.ADS[0]
+        assert index[-2:] == self.ADS[-2:]
+        assert PublishedAdsIndex.of(index) is index
+        assert PublishedAdsIndex.of(self.ADS) == index
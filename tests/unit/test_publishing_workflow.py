@@ -13,11 +13,12 @@ from collections.abc import Iterator
 from contextlib import ExitStack, contextmanager
 from pathlib import Path, PureWindowsPath
 from typing import Any
-from unittest.mock import AsyncMock, MagicMock, call, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from nodriver.core.connection import ProtocolException
 
+from kleinanzeigen_bot.ad_record import AdRecord
 from kleinanzeigen_bot.app import KleinanzeigenBot
 from kleinanzeigen_bot.model.ad_model import Ad, AdUpdateStrategy
 from kleinanzeigen_bot.model.config_model import (
@@ -209,7 +210,7 @@ class TestKleinanzeigenBotPublishAdsBasics:
         test_bot.keep_old_ads = False
 
         payload:dict[str, Any] = {"ads": [], "paging": {"pageNum": 1, "last": 1}}
-        ad_cfgs:list[tuple[str, Ad, dict[str, Any]]] = [("ad.yaml", Ad.model_validate(base_ad_config), {})]
+        ad_cfgs = [AdRecord("ad.yaml", Ad.model_validate(base_ad_config), {})]
 
         with (
             patch.object(test_bot, "web_request", new_callable = AsyncMock, return_value = {"content": json.dumps(payload)}) as web_request_mock,
@@ -221,17 +222,17 @@ class TestKleinanzeigenBotPublishAdsBasics:
 
             # web_request is called once for initial published-ads snapshot
             expected_url = f"{test_bot.root_url}/m-meine-anzeigen-verwalten.json?sort=DEFAULT&pageNum=1"
-            web_request_mock.assert_awaited_once_with(expected_url)
+            web_request_mock.assert_awaited_once_with(expected_url, json_response = True)
             publish_ad_mock.assert_awaited_once()
             call_args = publish_ad_mock.call_args
             assert call_args is not None
             assert call_args.args[1] == "ad.yaml"
-            assert call_args.args[2] is ad_cfgs[0][1]
+            assert call_args.args[2] is ad_cfgs[0].ad_cfg
             assert call_args.args[5] == AdUpdateStrategy.REPLACE
             web_await_mock.assert_awaited_once()
             delete_ad_mock.assert_awaited_once_with(
                 web = test_bot, root_url = test_bot.root_url,
-                ad_cfg = ad_cfgs[0][1],
+                ad_cfg = ad_cfgs[0].ad_cfg,
                 published_ads_list = [],
                 delete_old_ads_by_title = False,
             )
@@ -275,7 +276,7 @@ class TestKleinanzeigenBotPublishAdsBasics:
             patch.object(test_bot, "web_sleep", new_callable = AsyncMock) as sleep_mock,
             patch.object(test_bot, "web_await", new_callable = AsyncMock, return_value = True),
         ):
-            await test_bot.publish_ads([(ad_file, ad_cfg, ad_cfg_orig)])
+            await test_bot.publish_ads([AdRecord(ad_file, ad_cfg, ad_cfg_orig)])
 
             assert publish_mock.await_count == 2
             assert seen_prices == [(100, 0), (100, 0)]
@@ -310,7 +311,7 @@ class TestKleinanzeigenBotPublishAdsBasics:
             ) as publish_mock,
             patch.object(test_bot, "web_sleep", new_callable = AsyncMock) as sleep_mock,
         ):
-            await test_bot.publish_ads([(ad_file, ad_cfg, ad_cfg_orig)])
+            await test_bot.publish_ads([AdRecord(ad_file, ad_cfg, ad_cfg_orig)])
 
             assert publish_mock.await_count == 1
             sleep_mock.assert_not_awaited()
@@ -343,7 +344,7 @@ class TestKleinanzeigenBotPublishAdsBasics:
             ) as publish_mock,
             patch.object(test_bot, "web_sleep", new_callable = AsyncMock) as sleep_mock,
         ):
-            await test_bot.publish_ads([("ad.yaml", ad_cfg, ad_cfg_orig)])
+            await test_bot.publish_ads([AdRecord("ad.yaml", ad_cfg, ad_cfg_orig)])
 
             assert publish_mock.await_count == 1
             sleep_mock.assert_not_awaited()
@@ -390,7 +391,7 @@ class TestKleinanzeigenBotPublishAdsBasics:
             patch("kleinanzeigen_bot.delete_flow.delete_ad", new_callable = AsyncMock) as delete_ad_mock,
             caplog.at_level("INFO"),
         ):
-            await test_bot.publish_ads([(ad_file, ad_cfg, ad_cfg_orig)])
+            await test_bot.publish_ads([AdRecord(ad_file, ad_cfg, ad_cfg_orig)])
 
             assert web_await_mock.await_count == 0
             assert sleep_mock.await_count == 0
@@ -403,7 +404,7 @@ class TestKleinanzeigenBotPublishAdsBasics:
             assert any("Ad ID: 12345" in record.getMessage() for record in caplog.records)
 
     @pytest.mark.asyncio
-    async def test_publish_ads_fetches_published_ads_strictly_for_id_less_title_cleanup(
+    async def test_publish_ads_fetches_published_ads_once_strictly_for_id_less_title_cleanup(
         self,
         test_bot:KleinanzeigenBot,
         base_ad_config:dict[str, Any],
@@ -416,7 +417,6 @@ class TestKleinanzeigenBotPublishAdsBasics:
         ad_cfg_orig = copy.deepcopy(base_ad_config)
         ad_file = "ad.yaml"
 
-        non_strict_ads = [{"id": 10, "state": "active"}]
         strict_ads = [
             {"id": 10, "state": "active"},
             {"id": 11, "state": "active"},
@@ -426,18 +426,16 @@ class TestKleinanzeigenBotPublishAdsBasics:
             patch(
                 "kleinanzeigen_bot.published_ads.fetch_published_ads",
                 new_callable = AsyncMock,
-                side_effect = [non_strict_ads, strict_ads],
+                return_value = strict_ads,
             ) as fetch_mock,
             patch("kleinanzeigen_bot.publishing_workflow.publish_ad", new_callable = AsyncMock) as publish_mock,
             patch.object(test_bot, "web_await", new_callable = AsyncMock, return_value = True),
             patch("kleinanzeigen_bot.delete_flow.delete_ad", new_callable = AsyncMock),
         ):
-            await test_bot.publish_ads([(ad_file, ad_cfg, ad_cfg_orig)])
+            await test_bot.publish_ads([AdRecord(ad_file, ad_cfg, ad_cfg_orig)])
 
-            fetch_mock.assert_has_awaits([
-                call(test_bot, test_bot.root_url),
-                call(test_bot, test_bot.root_url, strict = True),
-            ])
+            # the lenient view is served from the same strict sweep
+            fetch_mock.assert_awaited_once_with(test_bot, test_bot.root_url, strict = True)
             assert publish_mock.await_count == 1
             assert publish_mock.call_args.args[4] == strict_ads
 
@@ -462,7 +460,7 @@ class TestKleinanzeigenBotPublishAdsBasics:
             patch(
                 "kleinanzeigen_bot.published_ads.fetch_published_ads",
                 new_callable = AsyncMock,
-                side_effect = [[], PublishedAdsFetchIncompleteError("incomplete published-ad fetch")],
+                side_effect = [PublishedAdsFetchIncompleteError("incomplete published-ad fetch"), []],
             ) as fetch_mock,
             patch("kleinanzeigen_bot.publishing_workflow.publish_ad", new_callable = AsyncMock) as publish_mock,
             patch.object(test_bot, "web_sleep", new_callable = AsyncMock) as sleep_mock,
@@ -470,7 +468,7 @@ class TestKleinanzeigenBotPublishAdsBasics:
             patch("kleinanzeigen_bot.delete_flow.delete_ad", new_callable = AsyncMock) as delete_mock,
             caplog.at_level(logging.INFO),
         ):
-            await test_bot.publish_ads([(ad_file, ad_cfg, ad_cfg_orig)])
+            await test_bot.publish_ads([AdRecord(ad_file, ad_cfg, ad_cfg_orig)])
 
             assert fetch_mock.await_count == 2
             publish_mock.assert_not_awaited()
@@ -506,9 +504,9 @@ class TestKleinanzeigenBotPublishAdsBasics:
             patch.object(test_bot, "web_await", new_callable = AsyncMock, return_value = True),
             patch("kleinanzeigen_bot.delete_flow.delete_ad", new_callable = AsyncMock) as delete_mock,
         ):
-            await test_bot.publish_ads([(ad_file, ad_cfg, ad_cfg_orig)])
+            await test_bot.publish_ads([AdRecord(ad_file, ad_cfg, ad_cfg_orig)])
 
-            fetch_mock.assert_awaited_once_with(test_bot, test_bot.root_url)
+            fetch_mock.assert_awaited_once_with(test_bot, test_bot.root_url, strict = True)
             publish_mock.assert_awaited_once()
             assert publish_mock.call_args.args[4] == published_ads
             delete_mock.assert_not_awaited()
@@ -750,7 +748,7 @@ class TestKleinanzeigenBotDiagnostics:
             patch.object(test_bot, "web_request", new_callable = AsyncMock, return_value = ads_response),
             patch("kleinanzeigen_bot.publishing_workflow.publish_ad", new_callable = AsyncMock, side_effect = TimeoutError("boom")),
         ):
-            await test_bot.publish_ads([(ad_file, ad_cfg, ad_cfg_orig)])
+            await test_bot.publish_ads([AdRecord(ad_file, ad_cfg, ad_cfg_orig)])
 
         expected_retries = SUBMISSION_MAX_RETRIES
         assert page.save_screenshot.await_count == expected_retries
@@ -792,7 +790,7 @@ class TestKleinanzeigenBotDiagnostics:
             patch.object(test_bot, "web_request", new_callable = AsyncMock, return_value = ads_response),
             patch("kleinanzeigen_bot.publishing_workflow.publish_ad", new_callable = AsyncMock, side_effect = TimeoutError("boom")),
         ):
-            await test_bot.publish_ads([(ad_file, ad_cfg, ad_cfg_orig)])
+            await test_bot.publish_ads([AdRecord(ad_file, ad_cfg, ad_cfg_orig)])
 
         entries = os.listdir(tmp_path)
         log_files = [name for name in entries if fnmatch.fnmatch(name, "publish_error_*_attempt*_ad_000001_Test.log")]
@@ -829,7 +827,7 @@ class TestKleinanzeigenBotDiagnostics:
             ),
             patch("kleinanzeigen_bot.publishing_workflow.publish_ad", new_callable = AsyncMock, side_effect = TimeoutError("boom")),
         ):
-            await test_bot.publish_ads([(ad_file, ad_cfg, ad_cfg_orig)])
+            await test_bot.publish_ads([AdRecord(ad_file, ad_cfg, ad_cfg_orig)])
 
         page.save_screenshot.assert_not_called()
         page.get_content.assert_not_called()
@@ -0,0 +1,121 @@
+# SPDX-FileCopyrightText: © Jens Bergmann and contributors
+# SPDX-License-Identifier: AGPL-3.0-or-later
+# SPDX-ArtifactOfProjectHomePage: https://github.com/Second-Hand-Friends/kleinanzeigen-bot/
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from nodriver.cdp import fetch as cdp_fetch
+from nodriver.cdp import network as cdp_network
+
+from kleinanzeigen_bot.utils.resource_policy import ResourceBlocker, ResourcePolicy
+
+pytestmark = pytest.mark.unit
+
+RT = cdp_network.ResourceType
+SITE = "https://www.kleinanzeigen.de"
+
+
+def _page(target_id:str = "T1") -> Any:
+    page = MagicMock()
+    page.target.target_id = target_id
+    page.send = AsyncMock()
+    return page
+
+
+def _paused(resource_type:cdp_network.ResourceType, url:str) -> Any:
+    return MagicMock(request_id = cdp_fetch.RequestId("R1"), resource_type = resource_type, request = MagicMock(url = url))
+
+
+def test_for_site_derives_site_domain_and_rejects_unknown_kinds() -> None:
+    policy = ResourcePolicy.for_site(["image"], SITE, ["hcaptcha.com"])
+
+    assert policy == ResourcePolicy(blocked = frozenset({"image"}), site_domain = "kleinanzeigen.de", allowed_hosts = ("hcaptcha.com",))
+    with pytest.raises(ValueError, match = "Unknown resource kinds: video"):
+        ResourcePolicy.for_site(["image", "video"], SITE)
+
+
+@pytest.mark.parametrize(("resource_type", "url", "expected"), [
+    (RT.IMAGE, "https://img.kleinanzeigen.de/api/v1/prod-ads/images/1.jpg", "image"),
+    (RT.FONT, "https://static.kleinanzeigen.de/fonts/a.woff2", "font"),
+    (RT.STYLESHEET, "https://static.kleinanzeigen.de/css/a.css", None),
+    (RT.SCRIPT, "https://static.kleinanzeigen.de/js/a.js", None),
+    (RT.SCRIPT, "https://www.googletagmanager.com/gtm.js", "third_party"),
+    (RT.XHR, "https://tracker.example.com/collect", "third_party"),
+    (RT.DOCUMENT, "https://ads.example.com/frame.html", None),
+    (RT.SCRIPT, "https://www.google.com/recaptcha/api.js", None),
+    (RT.IMAGE, "https://newassets.hcaptcha.com/captcha/challenge.png", None),
+    (RT.IMAGE, "data:image/png;base64,AAAA", None),
+    (RT.SCRIPT, "https://evilkleinanzeigen.de/a.js", "third_party"),
+])
+def test_policy_match(resource_type:cdp_network.ResourceType, url:str, expected:str | None) -> None:
+    policy = ResourcePolicy.for_site(["image", "media", "font", "third_party"], SITE, ["google.com", "hcaptcha.com"])
+
+    assert policy.match(resource_type, url) == expected
+
+
+def test_policy_only_pauses_blocked_resource_types_without_third_party() -> None:
+    patterns = ResourcePolicy.for_site(["image", "font"], SITE).request_patterns()
+    assert [pattern.resource_type for pattern in patterns] == [RT.IMAGE, RT.FONT]
+
+    patterns = ResourcePolicy.for_site(["image", "third_party"], SITE).request_patterns()
+    assert [(pattern.url_pattern, pattern.resource_type) for pattern in patterns] == [("*", None)]
+
+
+@pytest.mark.asyncio
+async def test_blocker_fails_blocked_requests_and_counts_them() -> None:
+    blocker = ResourceBlocker(ResourcePolicy.for_site(["image", "third_party"], SITE))
+    page = _page()
+
+    await blocker.attach(page)
+    await blocker.attach(page)  # attached once per tab
+
+    page.add_handler.assert_called_once_with(cdp_fetch.RequestPaused, blocker._on_request_paused)  # noqa: SLF001
+    assert page.send.await_count == 1
+    assert blocker.is_attached(page)
+
+    page.send.reset_mock()
+    await blocker._on_request_paused(_paused(RT.IMAGE, "https://img.kleinanzeigen.de/1.jpg"), page)  # noqa: SLF001
+    await blocker._on_request_paused(_paused(RT.SCRIPT, "https://tracker.example.com/t.js"), page)  # noqa: SLF001
+    await blocker._on_request_paused(_paused(RT.SCRIPT, "https://static.kleinanzeigen.de/a.js"), page)  # noqa: SLF001
+
+    commands = [call.args[0] for call in page.send.await_args_list]
+    assert [next(command)["method"] for command in commands] == ["Fetch.failRequest", "Fetch.failRequest", "Fetch.continueRequest"]
+    assert blocker.blocked == {"image": 1, "third_party": 1}
+
+
+@pytest.mark.asyncio
+async def test_blocker_ignores_requests_of_closed_tabs() -> None:
+    blocker = ResourceBlocker(ResourcePolicy.for_site(["image"], SITE))
+    page = _page()
+    page.send.side_effect = ConnectionError("tab closed")
+
+    await blocker._on_request_paused(_paused(RT.IMAGE, "https://img.kleinanzeigen.de/1.jpg"), page)  # noqa: SLF001
+
+    assert blocker.blocked == {"image": 1}
+
+
+@pytest.mark.asyncio
+async def test_blocker_detach_disables_interception() -> None:
+    blocker = ResourceBlocker(ResourcePolicy.for_site(["image"], SITE))
+    pages = [_page("T1"), _page("T2")]
+    for page in pages:
+        await blocker.attach(page)
+    pages[1].send.side_effect = ConnectionError("tab closed")
+
+    await blocker.detach()
+
+    for page in pages:
+        page.remove_handler.assert_called_once_with(cdp_fetch.RequestPaused, blocker._on_request_paused)  # noqa: SLF001
+        assert not blocker.is_attached(page)
+
+
+@pytest.mark.asyncio
+async def test_blocker_without_blocked_kinds_does_not_intercept() -> None:
+    blocker = ResourceBlocker(ResourcePolicy.for_site([], SITE))
+    page = _page()
+
+    await blocker.attach(page)
+
+    page.send.assert_not_awaited()
+    page.add_handler.assert_not_called()
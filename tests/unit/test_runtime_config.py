@@ -170,6 +170,33 @@ publishing:
         assert state.timing_collector.output_dir == workspace.diagnostics_dir.parent / "timing"
         assert state.timing_collector.command == "verify"
 
+    def test_load_config_learns_adaptive_timeouts(self, tmp_path:Path, monkeypatch:pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("BOT_USERNAME", "env_user")
+        monkeypatch.setenv("BOT_PASSWORD", "env_pass")
+
+        config_path = tmp_path / "config.yaml"
+        _write_minimal_config(config_path)
+        with config_path.open("a", encoding = "utf-8") as fd:
+            fd.write("\ntimeouts:\n  adaptive_enabled: true\n  adaptive_min_samples: 2\n")
+        workspace = xdg_paths.Workspace.for_config(config_path, "kleinanzeigen-bot")
+        collector = TimingCollector(runtime_config.timing_dir(workspace), "publish")
+        for _ in range(2):
+            collector.record(
+                key = "default",
+                operation_type = "web_find",
+                description = "web_find(ID, title)",
+                configured_timeout = 5.0,
+                effective_timeout = 5.0,
+                actual_duration = 0.4,
+                attempt_index = 0,
+                success = True,
+            )
+        assert collector.flush() is not None
+
+        state = runtime_config.load_config(str(config_path), workspace, "publish")
+
+        assert state.learned_timeouts == {"web_find(ID, title)": 1.0}
+
     def test_load_config_handles_empty_categories(
         self,
         tmp_path:Path,
@@ -0,0 +1,95 @@
+# SPDX-FileCopyrightText: © Jens Bergmann and contributors
+# SPDX-License-Identifier: AGPL-3.0-or-later
+# SPDX-ArtifactOfProjectHomePage: https://github.com/Second-Hand-Friends/kleinanzeigen-bot/
+import asyncio
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from kleinanzeigen_bot.utils.tab_pool import TabPool
+
+pytestmark = pytest.mark.unit
+
+
+def _browser() -> Any:
+    browser = MagicMock()
+    browser.get = AsyncMock(side_effect = lambda *_args, **_kwargs: AsyncMock())
+    return browser
+
+
+def test_tab_pool_rejects_invalid_size() -> None:
+    with pytest.raises(ValueError, match = "at least 1"):
+        TabPool(_browser(), 0)
+
+
+@pytest.mark.asyncio
+async def test_tab_pool_opens_tabs_lazily_and_reuses_released_ones() -> None:
+    browser = _browser()
+    pool = TabPool(browser, 2)
+
+    first = await pool.acquire()
+    second = await pool.acquire()
+    assert first is not second
+    assert pool.in_use == 2
+    browser.get.assert_awaited_with("about:blank", new_tab = True)
+
+    pool.release(first)
+    assert await pool.acquire() is first
+    assert browser.get.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_tab_pool_acquire_waits_for_a_released_tab() -> None:
+    pool = TabPool(_browser(), 1)
+    page = await pool.acquire()
+
+    waiting = asyncio.create_task(pool.acquire())
+    await asyncio.sleep(0)
+    assert not waiting.done()
+
+    pool.release(page)
+    assert await asyncio.wait_for(waiting, timeout = 1) is page
+
+
+@pytest.mark.asyncio
+async def test_tab_pool_discard_closes_tab_and_frees_slot() -> None:
+    browser = _browser()
+    pool = TabPool(browser, 1)
+    page = await pool.acquire()
+    page.close.side_effect = RuntimeError("target closed")
+
+    await pool.discard(page)
+
+    page.close.assert_awaited_once()
+    replacement = await asyncio.wait_for(pool.acquire(), timeout = 1)
+    assert replacement is not page
+    with pytest.raises(ValueError, match = "does not belong"):
+        pool.release(page)
+
+
+@pytest.mark.asyncio
+async def test_tab_pool_acquire_frees_slot_when_opening_fails() -> None:
+    browser = _browser()
+    browser.get.side_effect = [RuntimeError("browser gone"), AsyncMock()]
+    pool = TabPool(browser, 1)
+
+    with pytest.raises(RuntimeError, match = "browser gone"):
+        await pool.acquire()
+    assert await asyncio.wait_for(pool.acquire(), timeout = 1) is not None
+
+
+@pytest.mark.asyncio
+async def test_tab_pool_close_closes_idle_tabs_only() -> None:
+    pool = TabPool(_browser(), 2)
+    idle = await pool.acquire()
+    busy = await pool.acquire()
+    pool.release(idle)
+
+    await pool.close()
+
+    idle.close.assert_awaited_once()
+    busy.close.assert_not_awaited()
+    assert pool.in_use == 1
+    with pytest.raises(ValueError, match = "already released"):
+        pool.release(idle)
@@ -47,6 +47,19 @@ class TestTimingCollector:
         assert len(data[0]["records"]) == 1
         assert data[0]["records"][0]["operation_key"] == "default"
 
+    def test_flush_writes_counters_apart_from_records(self, tmp_path:Path) -> None:
+        collector = TimingCollector(tmp_path / ".temp" / "timing", "download")
+        collector.count("web_scroll_page_down.saved_cdp_calls", 600)
+        collector.count("web_scroll_page_down.saved_cdp_calls", 300)
+
+        file_path = collector.flush()
+
+        assert file_path is not None
+        data = json.loads(file_path.read_text(encoding = "utf-8"))
+        assert data[0]["records"] == []
+        assert data[0]["counters"] == {"web_scroll_page_down.saved_cdp_calls": 900}
+        assert not collector.counters
+
     def test_flush_prunes_old_and_malformed_sessions(self, tmp_path:Path, monkeypatch:pytest.MonkeyPatch) -> None:
         monkeypatch.chdir(tmp_path)
 
@@ -0,0 +1,115 @@
+# SPDX-FileCopyrightText: © Jens Bergmann and contributors
+# SPDX-License-Identifier: AGPL-3.0-or-later
+# SPDX-ArtifactOfProjectHomePage: https://github.com/Second-Hand-Friends/kleinanzeigen-bot/
+from typing import Any
+
+import pytest
+
+from kleinanzeigen_bot.model.config_model import TimeoutConfig
+from kleinanzeigen_bot.utils.timing_tuner import learned_timeouts, percentile, propose_timeouts, render_proposals
+
+pytestmark = pytest.mark.unit
+
+
+def _record(description:str, duration:float, *, success:bool = True, attempt:int = 0, key:str = "default", configured:float = 5.0) -> dict[str, Any]:
+    return {
+        "operation_key": key,
+        "operation_type": description.split("(", 1)[0],
+        "description": description,
+        "configured_timeout_sec": configured,
+        "effective_timeout_sec": configured,
+        "actual_duration_sec": duration,
+        "attempt_index": attempt,
+        "success": success,
+    }
+
+
+def _sessions(*records:dict[str, Any]) -> list[dict[str, Any]]:
+    return [{"session_id": "abc", "command": "publish", "records": list(records)}]
+
+
+TIMEOUTS = TimeoutConfig(adaptive_min_samples = 3, adaptive_min = 0.5)
+
+
+def test_percentile_uses_nearest_rank() -> None:
+    values = [float(value) for value in range(1, 101)]
+    assert percentile(values, 95) == 95.0
+    assert percentile(values, 100) == 100.0
+    assert percentile([0.3], 99) == 0.3
+    with pytest.raises(ValueError, match = "empty"):
+        percentile([], 95)
+
+
+def test_propose_timeouts_learns_from_successful_first_attempts() -> None:
+    sessions = _sessions(*(_record("web_find(ID, title)", duration) for duration in (0.2, 0.4, 0.6, 0.8)))
+
+    [proposal] = propose_timeouts(sessions, TIMEOUTS)
+
+    assert proposal.samples == 4
+    assert proposal.successes == 4
+    assert proposal.configured_timeout == 5.0
+    assert proposal.observed == 0.8
+    assert proposal.proposed_timeout == pytest.approx(1.2)
+    assert learned_timeouts([proposal]) == {"web_find(ID, title)": pytest.approx(1.2)}
+
+
+@pytest.mark.parametrize(
+    ("records", "expected"),
+    [
+        # too few first attempts
+        ([_record("op(x)", 0.2), _record("op(x)", 0.2)], None),
+        # a retry succeeded, the first attempt was too short
+        ([_record("op(x)", 0.2)] * 3 + [_record("op(x)", 1.0, attempt = 1)], None),
+        # probe that keeps missing
+        ([_record("op(x)", 5.0, success = False)] * 3, 0.5),
+        ([_record("op(x)", 0.2)] * 3 + [_record("op(x)", 5.0, success = False)] * 3, 0.5),
+        # misses not in a row: learned from the successes
+        ([_record("op(x)", 5.0, success = False)] * 2 + [_record("op(x)", 0.2)] + [_record("op(x)", 5.0, success = False)] * 2, 0.5),
+        ([_record("op(x)", 5.0, success = False), _record("op(x)", 1.0)] * 2, 1.5),
+        # a retry found it: the misses were too short, not probes
+        ([_record("op(x)", 5.0, success = False)] * 3 + [_record("op(x)", 6.0, attempt = 1)], None),
+        # learned value is clamped to adaptive_min and to the configured timeout
+        ([_record("op(x)", 0.01)] * 3, 0.5),
+        ([_record("op(x)", 4.9)] * 3, 5.0),
+    ],
+)
+def test_propose_timeouts_limits(records:list[dict[str, Any]], expected:float | None) -> None:
+    [proposal] = propose_timeouts(_sessions(*records), TIMEOUTS)
+    assert proposal.proposed_timeout == (None if expected is None else pytest.approx(expected))
+
+
+def test_propose_timeouts_applies_multiplier_and_skips_foreign_records() -> None:
+    records:list[Any] = [
+        _record("op(x)", 0.2, configured = 2.0),
+        _record("web_scroll_page_down()", 0.6, key = "removed_key"),
+        {"description": 42},
+        "not a record",
+    ]
+    sessions:list[Any] = [{"session_id": "abc", "records": records}, {"session_id": "broken", "records": None}]
+
+    [proposal] = propose_timeouts(sessions, TimeoutConfig(multiplier = 2.0, adaptive_min_samples = 1))
+
+    assert proposal.description == "op(x)"
+    assert proposal.configured_timeout == 4.0
+
+
+def test_learned_timeouts_drops_proposals_that_do_not_shorten() -> None:
+    proposals = propose_timeouts(_sessions(*[_record("slow(x)", 4.9)] * 3, *[_record("fast(x)", 0.1)] * 3), TIMEOUTS)
+    assert learned_timeouts(proposals) == {"fast(x)": 0.5}
+
+
+def test_render_proposals() -> None:
+    proposals = propose_timeouts(_sessions(*[_record("web_find(ID, title)", 0.4)] * 3, _record("rare(x)", 0.1)), TIMEOUTS)
+
+    output = render_proposals(proposals, TIMEOUTS)
+
+    lines = output.splitlines()
+    assert lines[0].split() == ["configured", "proposed", "p95", "ok/runs", "operation"]
+    assert lines[1].split() == ["5.00s", "-", "0.10s", "1/1", "rare(x)", "[default]"]
+    assert lines[2].split() == ["5.00s", "0.60s", "0.40s", "3/3", "web_find(ID,", "title)", "[default]"]
+    assert len({line.index("s ") for line in lines[1:3]}) == 1  # right-aligned columns
+    assert lines[-1] == "1 of 2 operations would get a shorter timeout (4.4s less in total, adaptive timeouts are disabled)."
+
+
+def test_render_proposals_without_data() -> None:
+    assert render_proposals([], TIMEOUTS).startswith("No timing data found.")
@@ -13,6 +13,7 @@ import time
 import zipfile
 from collections.abc import Awaitable, Callable
 from pathlib import Path
+from types import SimpleNamespace
 from typing import Any, NoReturn, Protocol, cast
 from unittest.mock import ANY, AsyncMock, MagicMock, Mock, mock_open, patch
 
@@ -26,7 +27,16 @@ from nodriver.core.tab import Tab as Page
 from kleinanzeigen_bot.model.config_model import Config
 from kleinanzeigen_bot.utils import files, loggers
 from kleinanzeigen_bot.utils.browser_diagnostics import _format_url_host, _is_admin  # noqa: PLC2701
-from kleinanzeigen_bot.utils.web_scraping_mixin import By, Is, WebScrapingMixin, _allocate_selector_group_budgets  # noqa: PLC2701
+from kleinanzeigen_bot.utils.resource_policy import ResourcePolicy
+from kleinanzeigen_bot.utils.web_scraping_mixin import (
+    MISSING,
+    By,
+    Is,
+    Read,
+    SnapshotField,
+    WebScrapingMixin,
+    _allocate_selector_group_budgets,  # noqa: PLC2701
+)
 
 
 class ConfigProtocol(Protocol):
@@ -50,10 +60,14 @@ class RecordingCollector:
 
     def __init__(self, sink:list[dict[str, Any]]) -> None:
         self._sink = sink
+        self.counters:dict[str, int] = {}
 
     def record(self, **kwargs:Any) -> None:
         self._sink.append(kwargs)
 
+    def count(self, name:str, amount:int = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + amount
+
 
 class FailingCollector:
     """Helper collector that raises to test error handling."""
@@ -467,6 +481,44 @@ class TestWebScrapingErrorHandling:
         with pytest.raises(ProtocolException):
             await web_scraper.web_request("https://example.com")
 
+    @pytest.mark.asyncio
+    async def test_web_request_json_response_is_decoded_once(
+        self, web_scraper:WebScrapingMixin, mock_page:TrulyAwaitableMockPage, caplog:pytest.LogCaptureFixture,
+    ) -> None:
+        """In JSON mode the page returns one JSON string that is decoded here and logged with its size."""
+        payload = '{"statusCode":200,"statusMessage":"OK","headers":{},"json":{"ads":[{"id":1}]}}'
+        mock_page.evaluate.return_value = payload
+
+        with caplog.at_level(logging.DEBUG):
+            response = await web_scraper.web_request("https://example.com/api", json_response = True)
+
+        assert response == {"statusCode": 200, "statusMessage": "OK", "headers": {}, "json": {"ads": [{"id": 1}]}}
+        assert "JSON.parse(responseText)" in mock_page.evaluate.call_args.args[0]
+        assert f"{len(payload)} chars" in caplog.text
+        assert "decoded in" in caplog.text
+
+    @pytest.mark.asyncio
+    async def test_web_request_json_response_validates_status(self, web_scraper:WebScrapingMixin, mock_page:TrulyAwaitableMockPage) -> None:
+        """JSON mode still checks the status code; a non-JSON body is returned as text."""
+        mock_page.evaluate.return_value = '{"statusCode":404,"statusMessage":"Not Found","headers":{},"content":"Page not found"}'
+
+        with pytest.raises(AssertionError, match = "Invalid response"):
+            await web_scraper.web_request("https://example.com/api", json_response = True)
+
+        response = await web_scraper.web_request("https://example.com/api", valid_response_codes = 404, json_response = True)
+        assert response["content"] == "Page not found"
+        assert "json" not in response
+
+    @pytest.mark.asyncio
+    async def test_web_request_json_response_malformed_raises_protocol_exception(
+        self, web_scraper:WebScrapingMixin, mock_page:TrulyAwaitableMockPage,
+    ) -> None:
+        """A truncated JSON envelope is treated like any other broken page response."""
+        mock_page.evaluate.return_value = '{"statusCode":200,'
+
+        with pytest.raises(ProtocolException, match = "Malformed JSON response"):
+            await web_scraper.web_request("https://example.com/api", json_response = True)
+
     @pytest.mark.asyncio
     async def test_web_check_element_not_found(self, web_scraper:WebScrapingMixin, mock_page:TrulyAwaitableMockPage) -> None:
         """Test element not found error in web_check."""
@@ -571,6 +623,35 @@ class TestTimeoutAndRetryHelpers:
         assert recorded[0]["success"] is True
         assert recorded[0]["attempt_index"] == 0
 
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(("adaptive_enabled", "expected_timeouts"), [(True, [1.0, 1.5, 2.25]), (False, [5.0, 7.5, 11.25])])
+    async def test_run_with_timeout_retries_uses_learned_timeouts(
+        self, web_scraper:WebScrapingMixin, *, adaptive_enabled:bool, expected_timeouts:list[float],
+    ) -> None:
+        """Learned timeouts replace the configured ones when adaptive timeouts are enabled, growing with the same backoff."""
+        web_scraper.config.timeouts.adaptive_enabled = adaptive_enabled
+        web_scraper._learned_timeouts = {"web_find(ID, test)": 1.0}
+        timeouts:list[float] = []
+
+        async def always_timeout(timeout:float) -> str:
+            timeouts.append(timeout)
+            raise TimeoutError("boom")
+
+        with pytest.raises(TimeoutError, match = "boom"):
+            await web_scraper._run_with_timeout_retries(always_timeout, description = "web_find(ID, test)")
+
+        assert timeouts == pytest.approx(expected_timeouts)
+        assert web_scraper.effective_timeout(operation = "web_find(ID, other)") == 5.0
+
+    def test_effective_timeout_never_exceeds_configured_timeout(self, web_scraper:WebScrapingMixin) -> None:
+        """A learned timeout never lengthens the configured timeout, also after a config change."""
+        web_scraper.config.timeouts.adaptive_enabled = True
+        web_scraper._learned_timeouts = {"web_find(ID, test)": 4.0}
+
+        assert web_scraper.effective_timeout(operation = "web_find(ID, test)") == 4.0
+        assert web_scraper.effective_timeout(override = 2.0, operation = "web_find(ID, test)") == 2.0
+        assert web_scraper.effective_timeout(attempt = 2, operation = "web_find(ID, test)") == pytest.approx(9.0)
+
     @pytest.mark.asyncio
     async def test_run_with_timeout_retries_records_timeout_timing(self, web_scraper:WebScrapingMixin) -> None:
         """_run_with_timeout_retries should emit timing records for timed out attempts."""
@@ -1087,27 +1168,35 @@ class TestWebScrolling:
 
     @pytest.mark.asyncio
     async def test_web_scroll_page_down_scrolls_and_returns(self, web_scraper:WebScrapingMixin) -> None:
-        """web_scroll_page_down should scroll both directions when requested."""
-        scripts:list[str] = []
-
-        async def exec_side_effect(script:str) -> int | None:
-            scripts.append(script)
-            if script == "document.body.scrollHeight":
-                return 20
-            return None
-
-        cast(Any, web_scraper).web_execute = AsyncMock(side_effect = exec_side_effect)
+        """web_scroll_page_down should run the whole animation in one in-page call."""
+        mock_execute = AsyncMock(return_value = 20)
+        cast(Any, web_scraper).web_execute = mock_execute
 
         with patch("kleinanzeigen_bot.utils.web_scraping_mixin.asyncio.sleep", new_callable = AsyncMock) as mock_sleep:
             await web_scraper.web_scroll_page_down(scroll_length = 10, scroll_speed = 10, scroll_back_top = True)
 
-        assert scripts[0] == "document.body.scrollHeight"
-        # Expect four scrollTo operations: two down, two up
-        assert scripts.count("document.body.scrollHeight") == 1
-        scroll_calls = [script for script in scripts if script.startswith("window.scrollTo")]
-        assert scroll_calls == ["window.scrollTo(0, 10)", "window.scrollTo(0, 20)", "window.scrollTo(0, 10)", "window.scrollTo(0, 0)"]
-        sleep_durations = [call.args[0] for call in mock_sleep.await_args_list]
-        assert sleep_durations == [1.0, 1.0, 0.5, 0.5]
+        mock_execute.assert_awaited_once()
+        assert mock_execute.await_args is not None
+        assert mock_execute.await_args.args[0].rstrip().endswith("})(10, 10, true)")
+        mock_sleep.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(("scroll_back_top", "expected_calls"), [(False, 601), (True, 1201)])
+    async def test_web_scroll_page_down_logs_saved_cdp_calls(
+        self, web_scraper:WebScrapingMixin, caplog:pytest.LogCaptureFixture, *, scroll_back_top:bool, expected_calls:int,
+    ) -> None:
+        """The CDP calls a step-by-step scroll would have needed are logged and counted; no timing is recorded."""
+        records:list[dict[str, Any]] = []
+        collector = RecordingCollector(records)
+        cast(Any, web_scraper)._timing_collector = collector
+        cast(Any, web_scraper).web_execute = AsyncMock(return_value = 6000)
+
+        with caplog.at_level(logging.DEBUG):
+            await web_scraper.web_scroll_page_down(scroll_back_top = scroll_back_top)
+
+        assert f"with 1 CDP call instead of {expected_calls}" in caplog.text
+        assert records == []
+        assert collector.counters == {"web_scroll_page_down.saved_cdp_calls": expected_calls - 1}
 
     @pytest.mark.asyncio
     async def test_session_expiration_handling(self, web_scraper:WebScrapingMixin, mock_browser:AsyncMock) -> None:
@@ -1201,6 +1290,49 @@ class TestWebScrolling:
         assert elapsed >= 0.15, f"Expected >= 0.15s elapsed, got {elapsed:.3f}s"
         assert elapsed < 1.0, f"Expected < 1.0s elapsed, got {elapsed:.3f}s"
 
+    @pytest.mark.asyncio
+    async def test_web_await_rechecks_as_soon_as_the_page_changes(self, web_scraper:WebScrapingMixin, mock_page:TrulyAwaitableMockPage) -> None:
+        """A page change reported by the in-page observer wakes web_await, at most once per minimum gap."""
+        mock_page.send = AsyncMock(return_value = (SimpleNamespace(value = "mutation"), None))
+        results:Any = iter([False, False, "found"])
+
+        with patch("kleinanzeigen_bot.utils.web_scraping_mixin.asyncio.sleep", new_callable = AsyncMock) as mock_sleep:
+            result = await web_scraper.web_await(lambda: next(results), timeout = 5, apply_multiplier = False)
+
+        assert result == "found"
+        assert mock_page.send.await_count == 2
+        # the mutations were reported at once, so each check waits out the rest of the gap
+        assert mock_sleep.await_count == 2
+        assert all(0 < c.args[0] <= 0.05 for c in mock_sleep.await_args_list)
+
+    @pytest.mark.asyncio
+    async def test_web_await_keeps_backoff_on_page_changes(self, web_scraper:WebScrapingMixin) -> None:
+        """Page changes end the wait early but do not reset the backoff to the minimum."""
+        results = iter([False] * 6 + [True])
+
+        with (
+            patch.object(web_scraper, "_web_await_change", new_callable = AsyncMock, side_effect = [False, False, False, True, False, True]) as mock_change,
+            patch("kleinanzeigen_bot.utils.web_scraping_mixin.asyncio.sleep", new_callable = AsyncMock),
+        ):
+            assert await web_scraper.web_await(lambda: next(results), timeout = 60, apply_multiplier = False)
+
+        assert [c.args[0] for c in mock_change.await_args_list] == [0.005, 0.01, 0.02, 0.04, 0.04, 0.08]
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("event_driven", [True, False])
+    async def test_web_await_polls_with_backoff_without_observer(
+        self, web_scraper:WebScrapingMixin, mock_page:TrulyAwaitableMockPage, *, event_driven:bool,
+    ) -> None:
+        """Without an observer, web_await polls starting at a few ms and backs off up to the cap."""
+        mock_page.send = AsyncMock(side_effect = ProtocolException({"message": "Execution context was destroyed", "code": -32000}))
+        results = iter([False] * 9 + [True])
+
+        with patch("kleinanzeigen_bot.utils.web_scraping_mixin.asyncio.sleep", new_callable = AsyncMock) as mock_sleep:
+            assert await web_scraper.web_await(lambda: next(results), timeout = 60, apply_multiplier = False, event_driven = event_driven)
+
+        assert [c.args[0] for c in mock_sleep.await_args_list] == [0.005, 0.01, 0.02, 0.04, 0.08, 0.16, 0.32, 0.5, 0.5]
+        assert mock_page.send.await_count == (9 if event_driven else 0)
+
     @pytest.mark.asyncio
     async def test_web_await_reattach_exhaustion(self, web_scraper:WebScrapingMixin, mock_page:TrulyAwaitableMockPage) -> None:
         """web_await raises TimeoutError when condition keeps raising ProtocolException(-32601)."""
@@ -1330,6 +1462,107 @@ class TestWebScrolling:
             await web_scraper.web_find(By.ID, "test-id", timeout = 0.05)
 
 
+class TestWebSnapshot:
+    """Test the batched web_snapshot DOM read."""
+
+    SPEC:dict[str, SnapshotField] = {
+        "title": SnapshotField(By.ID, "title"),
+        "links": SnapshotField(By.CSS_SELECTOR, "a", Read.ATTRIBUTE, "href", multiple = True),
+        "banner": SnapshotField(By.TEXT, "Willkommen", Read.EXISTS),
+        "price": SnapshotField(By.XPATH, "//span[@class='price']", Read.DISPLAYED),
+    }
+
+    @pytest.mark.asyncio
+    async def test_web_snapshot_maps_page_result(self, web_scraper:WebScrapingMixin) -> None:
+        """Fields absent from the page result become MISSING, False or an empty list, in a single call."""
+        mock_execute = AsyncMock(return_value = json.dumps({"title": "Hello"}))
+        cast(Any, web_scraper).web_execute = mock_execute
+
+        snapshot = await web_scraper.web_snapshot(self.SPEC)
+
+        assert snapshot == {"title": "Hello", "links": [], "banner": False, "price": MISSING}
+        mock_execute.assert_awaited_once()
+        assert mock_execute.await_args is not None
+        script = mock_execute.await_args.args[0]
+        assert '["links", "css", "a", "ATTRIBUTE", "href", true]' in script
+        assert '["banner", "text", "Willkommen", "EXISTS", "", false]' in script
+
+    @pytest.mark.asyncio
+    async def test_web_snapshot_retakes_until_required_fields_are_present(self, web_scraper:WebScrapingMixin) -> None:
+        """With required fields the snapshot is retaken until they are all present."""
+        mock_execute = AsyncMock(side_effect = [
+            json.dumps({}),
+            json.dumps({"title": "Hello"}),
+            json.dumps({"title": "Hello", "links": ["/a"], "banner": True}),
+        ])
+        cast(Any, web_scraper).web_execute = mock_execute
+
+        with patch.object(web_scraper, "_web_await_change", new_callable = AsyncMock, return_value = True):
+            snapshot = await web_scraper.web_snapshot(self.SPEC, required = ("links", "banner"))
+
+        assert snapshot == {"title": "Hello", "links": ["/a"], "banner": True, "price": MISSING}
+        assert mock_execute.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_web_snapshot_required_timeout_names_absent_fields(self, web_scraper:WebScrapingMixin) -> None:
+        """A required field that never shows up raises a TimeoutError naming it."""
+        cast(Any, web_scraper).web_execute = AsyncMock(return_value = json.dumps({"title": "Hello"}))
+
+        with pytest.raises(TimeoutError, match = r"Snapshot fields \['banner'\] not found"):
+            await web_scraper.web_snapshot(self.SPEC, required = ("title", "banner"), timeout = 0.05)
+
+    @pytest.mark.asyncio
+    async def test_web_snapshot_rejects_non_string_result(self, web_scraper:WebScrapingMixin) -> None:
+        """A page result that is not the JSON string raises ProtocolException."""
+        cast(Any, web_scraper).web_execute = AsyncMock(return_value = None)
+
+        with pytest.raises(ProtocolException, match = "Unexpected snapshot result"):
+            await web_scraper.web_snapshot(self.SPEC)
+
+
+class TestResourcePolicy:
+    """Test blocking page resources per command."""
+
+    @pytest.mark.asyncio
+    async def test_web_open_applies_resource_policy_once_per_tab(self, web_scraper:WebScrapingMixin, mock_page:TrulyAwaitableMockPage) -> None:
+        """The policy is enabled on the page before it navigates, and only once."""
+        policy = ResourcePolicy.for_site(["image"], "https://www.kleinanzeigen.de")
+        await web_scraper.set_resource_policy(policy)
+        mock_page.target = SimpleNamespace(target_id = "T1")
+        cast(Any, web_scraper.browser).get = AsyncMock(return_value = mock_page)
+
+        with patch.object(web_scraper, "web_await", new_callable = AsyncMock), \
+                patch.object(web_scraper, "_resize_viewport_after_open", new_callable = AsyncMock):
+            await web_scraper.web_open("https://www.kleinanzeigen.de/m-meine-anzeigen.html")
+            await web_scraper.web_open("https://www.kleinanzeigen.de/", reload_if_already_open = True)
+
+        send = cast(AsyncMock, mock_page.send)
+        assert send.await_count == 1
+        assert send.await_args is not None
+        assert next(send.await_args.args[0])["method"] == "Fetch.enable"
+
+    @pytest.mark.asyncio
+    async def test_close_browser_session_logs_blocked_requests(self, web_scraper:WebScrapingMixin, caplog:pytest.LogCaptureFixture) -> None:
+        """Closing the session reports the blocked requests and ends the policy."""
+        await web_scraper.set_resource_policy(ResourcePolicy.for_site(["image", "font"], "https://www.kleinanzeigen.de"))
+        blocker = web_scraper._resource_blocker  # noqa: SLF001
+        assert blocker is not None
+        blocker.blocked.update({"image": 3, "font": 1})
+        cast(Any, web_scraper.browser).stop = MagicMock()
+
+        with caplog.at_level(logging.INFO):
+            web_scraper.close_browser_session()
+
+        assert "Blocked 4 page resources not needed by this command (image: 3, font: 1)" in caplog.text
+        assert web_scraper._resource_blocker is None  # noqa: SLF001
+
+    @pytest.mark.asyncio
+    async def test_set_resource_policy_without_blocked_kinds(self, web_scraper:WebScrapingMixin) -> None:
+        """A policy that blocks nothing does not intercept requests at all."""
+        await web_scraper.set_resource_policy(ResourcePolicy.for_site([], "https://www.kleinanzeigen.de"))
+        assert web_scraper._resource_blocker is None  # noqa: SLF001
+
+
 class TestWebScrapingBrowserConfiguration:
     """Test browser configuration in WebScrapingMixin."""
 